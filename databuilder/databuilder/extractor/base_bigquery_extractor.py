@@ -4,10 +4,13 @@
 import json
 import logging
 import re
-from collections import namedtuple
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import (
-    Any, Dict, Iterator, List,
+    Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar,
 )
 
 import google.oauth2.service_account
@@ -23,6 +26,38 @@ TableKey = namedtuple('TableKey', ['schema', 'table_name'])
 
 LOGGER = logging.getLogger(__name__)
 
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+class ProjectRateLimiter:
+    """
+    Spaces out the requests sent for each project, across the threads of an extractor, to stay within
+    the API quota of the project.
+    """
+
+    def __init__(self, max_requests_per_second: float) -> None:
+        self._interval = 1.0 / max_requests_per_second if max_requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, project_id: str) -> None:
+        """
+        Waits until a request can be sent for the project.
+        :param project_id:
+        :return:
+        """
+        if not self._interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(project_id, now))
+            self._next_slot[project_id] = slot + self._interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
 
 class BaseBigQueryExtractor(Extractor):
     PROJECT_ID_KEY = 'project_id'
@@ -33,6 +68,10 @@ class BaseBigQueryExtractor(Extractor):
     FILTER_KEY = 'filter'
     # metadata for tables created after the cutoff time would not be extracted from bigquery.
     CUTOFF_TIME_KEY = 'cutoff_time'
+    # Number of requests (e.g. to get tables) sent concurrently
+    MAX_WORKERS_KEY = 'max_workers'
+    # Maximum number of requests sent per second for a project, unlimited by default
+    MAX_REQUESTS_PER_SECOND_KEY = 'max_requests_per_second'
     _DEFAULT_SCOPES = ['https://www.googleapis.com/auth/bigquery.readonly']
     DEFAULT_PAGE_SIZE = 300
     NUM_RETRIES = 3
@@ -50,6 +89,9 @@ class BaseBigQueryExtractor(Extractor):
         self.filter = conf.get_string(BaseBigQueryExtractor.FILTER_KEY, '')
         self.cutoff_time = conf.get_string(BaseBigQueryExtractor.CUTOFF_TIME_KEY,
                                            datetime.now(timezone.utc).strftime(BaseBigQueryExtractor.DATE_TIME_FORMAT))
+        self.max_workers = conf.get_int(BaseBigQueryExtractor.MAX_WORKERS_KEY, 1)
+        self._rate_limiter = ProjectRateLimiter(
+            conf.get_float(BaseBigQueryExtractor.MAX_REQUESTS_PER_SECOND_KEY, 0))
 
         if self.key_path:
             credentials = (
@@ -66,12 +108,60 @@ class BaseBigQueryExtractor(Extractor):
                 google_auth: Any = getattr(google, 'auth')
                 credentials, _ = google_auth.default(scopes=self._DEFAULT_SCOPES)
 
-        http = httplib2.Http()
-        authed_http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
+        self._credentials = credentials
+        self._thread_local = threading.local()
+        authed_http = self._get_http()
         self.bigquery_service = build('bigquery', 'v2', http=authed_http, cache_discovery=False)
         self.logging_service = build('logging', 'v2', http=authed_http, cache_discovery=False)
         self.iter: Iterator[Any] = iter([])
 
+    def _get_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """
+        Returns the authorized http of the current thread, as httplib2 is not thread safe.
+        """
+        http = getattr(self._thread_local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._thread_local.http = http
+        return http
+
+    def _execute(self, request: Any, project_id: Optional[str] = None) -> Any:
+        """
+        Executes a request built by the API clients. It can be called from any thread, and waits for the request
+        quota of the project. Requests are retried on rate limit and server errors.
+        :param request:
+        :param project_id: Project whose quota the request counts against, the project of the extractor by default
+        :return: The response
+        """
+        self._rate_limiter.acquire(project_id or self.project_id)
+        return request.execute(http=self._get_http(), num_retries=BaseBigQueryExtractor.NUM_RETRIES)
+
+    def _map_concurrently(self, fetch: Callable[[T], R], items: Iterable[T]) -> Iterator[Tuple[T, R]]:
+        """
+        Applies fetch to the items on a pool of {max_workers} threads, and yields each item with its result
+        in the order of the items, so that the output is the same as when fetched one after another.
+        Items are consumed lazily, up to twice the number of workers ahead of the results.
+        :param fetch: Sends the requests of an item, through _execute
+        :param items:
+        :return:
+        """
+        if self.max_workers <= 1:
+            for item in items:
+                yield item, fetch(item)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending: Deque[Tuple[T, Future]] = deque()
+            for item in items:
+                pending.append((item, executor.submit(fetch, item)))
+                if len(pending) >= self.max_workers * 2:
+                    done_item, future = pending.popleft()
+                    yield done_item, future.result()
+
+            while pending:
+                done_item, future = pending.popleft()
+                yield done_item, future.result()
+
     def extract(self) -> Any:
         try:
             return next(self.iter)
@@ -125,43 +215,39 @@ class BaseBigQueryExtractor(Extractor):
         return datasets
 
     def _page_dataset_list_results(self) -> Iterator[Any]:
-        response = self.bigquery_service.datasets().list(
+        response = self._execute(self.bigquery_service.datasets().list(
             projectId=self.project_id,
             all=False,  # Do not return hidden datasets
             filter=self.filter,
-            maxResults=self.pagesize).execute(
-                num_retries=BaseBigQueryExtractor.NUM_RETRIES)
+            maxResults=self.pagesize))
 
         while response:
             yield response
 
             if 'nextPageToken' in response:
-                response = self.bigquery_service.datasets().list(
+                response = self._execute(self.bigquery_service.datasets().list(
                     projectId=self.project_id,
                     all=True,
                     filter=self.filter,
-                    pageToken=response['nextPageToken']).execute(
-                        num_retries=BaseBigQueryExtractor.NUM_RETRIES)
+                    pageToken=response['nextPageToken']))
             else:
                 response = None
 
     def _page_table_list_results(self, dataset: DatasetRef) -> Iterator[Dict[str, Any]]:
-        response = self.bigquery_service.tables().list(
+        response = self._execute(self.bigquery_service.tables().list(
             projectId=dataset.projectId,
             datasetId=dataset.datasetId,
-            maxResults=self.pagesize).execute(
-                num_retries=BaseBigQueryExtractor.NUM_RETRIES)
+            maxResults=self.pagesize), project_id=dataset.projectId)
 
         while response:
             yield response
 
             if 'nextPageToken' in response:
-                response = self.bigquery_service.tables().list(
+                response = self._execute(self.bigquery_service.tables().list(
                     projectId=dataset.projectId,
                     datasetId=dataset.datasetId,
                     maxResults=self.pagesize,
-                    pageToken=response['nextPageToken']).execute(
-                        num_retries=BaseBigQueryExtractor.NUM_RETRIES)
+                    pageToken=response['nextPageToken']), project_id=dataset.projectId)
             else:
                 response = None
 
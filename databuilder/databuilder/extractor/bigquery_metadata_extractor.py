@@ -3,7 +3,7 @@
 
 import logging
 from typing import (
-    Any, Callable, Dict, List, Set, cast,
+    Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, cast,
 )
 
 from googleapiclient.errors import HttpError
@@ -31,7 +31,41 @@ class BigQueryMetadataExtractor(BaseBigQueryExtractor):
         BaseBigQueryExtractor.init(self, conf)
         self.iter = iter(self._iterate_over_tables())
 
-    def _retrieve_tables(self, dataset: DatasetRef) -> Any: # noqa: max-complexity: 12
+    def _retrieve_tables(self, dataset: DatasetRef) -> Any:
+        # Tables are fetched concurrently when max_workers is set, and yielded in the order they are listed
+        table_refs = self._iterate_over_table_refs(dataset)
+        for (table_id, tableRef), table in self._map_concurrently(self._get_table, table_refs):
+            if table is None:
+                continue
+
+            # BigQuery tables also have interesting metadata about partitioning
+            # data location (EU/US), mod/create time, etc... Extract that some other time?
+            cols: List[ColumnMetadata] = []
+            # Not all tables have schemas
+            if 'schema' in table:
+                schema = table['schema']
+                if 'fields' in schema:
+                    total_cols = 0
+                    for column in schema['fields']:
+                        # TRICKY: this mutates :cols:
+                        total_cols = self._iterate_over_cols('', column, cols, total_cols + 1)
+
+            table_meta = TableMetadata(
+                database='bigquery',
+                cluster=tableRef['projectId'],
+                schema=tableRef['datasetId'],
+                name=table_id,
+                description=table.get('description', None),
+                columns=cols,
+                is_view=table['type'] == 'VIEW')
+
+            yield table_meta
+
+    def _iterate_over_table_refs(self, dataset: DatasetRef) -> Iterator[Tuple[str, Dict[str, str]]]:
+        """
+        Yields the name and the reference of the tables of the dataset, with a single table per group of
+        sharded tables.
+        """
         grouped_tables: Set[str] = set([])
 
         for page in self._page_table_list_results(dataset):
@@ -57,39 +91,20 @@ class BigQueryMetadataExtractor(BaseBigQueryExtractor):
                     table_id = table_prefix
                     grouped_tables.add(table_prefix)
 
-                try:
-                    table = self.bigquery_service.tables().get(
-                        projectId=tableRef['projectId'],
-                        datasetId=tableRef['datasetId'],
-                        tableId=tableRef['tableId']).execute(num_retries=BigQueryMetadataExtractor.NUM_RETRIES)
-                except HttpError as err:
-                    # While iterating over the tables in a dataset, some temporary tables might be deleted
-                    # this causes 404 errors, so we should handle them gracefully
-                    LOGGER.error(err)
-                    continue
-
-                # BigQuery tables also have interesting metadata about partitioning
-                # data location (EU/US), mod/create time, etc... Extract that some other time?
-                cols: List[ColumnMetadata] = []
-                # Not all tables have schemas
-                if 'schema' in table:
-                    schema = table['schema']
-                    if 'fields' in schema:
-                        total_cols = 0
-                        for column in schema['fields']:
-                            # TRICKY: this mutates :cols:
-                            total_cols = self._iterate_over_cols('', column, cols, total_cols + 1)
-
-                table_meta = TableMetadata(
-                    database='bigquery',
-                    cluster=tableRef['projectId'],
-                    schema=tableRef['datasetId'],
-                    name=table_id,
-                    description=table.get('description', None),
-                    columns=cols,
-                    is_view=table['type'] == 'VIEW')
-
-                yield table_meta
+                yield table_id, tableRef
+
+    def _get_table(self, table_ref: Tuple[str, Dict[str, str]]) -> Optional[Dict[str, Any]]:
+        _, tableRef = table_ref
+        try:
+            return self._execute(self.bigquery_service.tables().get(
+                projectId=tableRef['projectId'],
+                datasetId=tableRef['datasetId'],
+                tableId=tableRef['tableId']), project_id=tableRef['projectId'])
+        except HttpError as err:
+            # While iterating over the tables in a dataset, some temporary tables might be deleted
+            # this causes 404 errors, so we should handle them gracefully
+            LOGGER.error(err)
+            return None
 
     def _iterate_over_cols(self,
                            parent: str,
@@ -15,6 +15,7 @@ from typing import (
 from pyhocon import ConfigTree
 
 from databuilder.extractor.base_bigquery_extractor import BaseBigQueryExtractor
+from databuilder.utils.usage_aggregator import DEFAULT_MAX_KEYS_IN_MEMORY, UsageAggregator
 
 TableColumnUsageTuple = namedtuple('TableColumnUsageTuple', ['database', 'cluster', 'schema',
                                                              'table', 'column', 'email'])
@@ -34,6 +35,10 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
     DELAY_TIME = 'delay_time'
     TABLE_DECORATORS = ['$', '@']
     COUNT_READS_ONLY_FROM_PROJECT_ID_KEY = 'count_reads_only_from_project_id_key'
+    # Number of distinct (table, user) pairs counted in memory before the counts are spilled to disk
+    MAX_KEYS_IN_MEMORY_KEY = 'max_keys_in_memory'
+    # Directory of the spilled counts, the default temporary directory if not set
+    SPILL_DIR_KEY = 'spill_dir'
 
     def init(self, conf: ConfigTree) -> None:
         BaseBigQueryExtractor.init(self, conf)
@@ -43,7 +48,11 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
 
         self.email_pattern = conf.get_string(BigQueryTableUsageExtractor.EMAIL_PATTERN, None)
         self.delay_time = conf.get_int(BigQueryTableUsageExtractor.DELAY_TIME, 100)
-        self.table_usage_counts: Dict[TableColumnUsageTuple, int] = {}
+        self.table_usage_counts = UsageAggregator(
+            max_keys_in_memory=conf.get_int(BigQueryTableUsageExtractor.MAX_KEYS_IN_MEMORY_KEY,
+                                            DEFAULT_MAX_KEYS_IN_MEMORY),
+            spill_dir=conf.get_string(BigQueryTableUsageExtractor.SPILL_DIR_KEY, None),
+            key_factory=TableColumnUsageTuple._make)
         # GCP console allows running queries using tables from a project different from the one the extractor is
         # used for; only usage metadata of referenced tables present in the given project_id_key for the
         # extractor is taken into account and usage metadata of referenced tables from other projects
@@ -51,7 +60,7 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
         self.count_reads_only_from_same_project = conf.get_bool(
             BigQueryTableUsageExtractor.COUNT_READS_ONLY_FROM_PROJECT_ID_KEY, True)
         self._count_usage()
-        self.iter = iter(self.table_usage_counts)
+        self.iter = self.table_usage_counts.items()
 
     def _count_usage(self) -> None:  # noqa: C901
         count = 0
@@ -139,8 +148,7 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
                                             column='*',
                                             email=email)
 
-            new_count = self.table_usage_counts.get(key, 0) + 1
-            self.table_usage_counts[key] = new_count
+            self.table_usage_counts.add(key)
 
     def _retrieve_records(self) -> Iterator[Optional[Dict]]:
         """
@@ -163,14 +171,12 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
 
     def extract(self) -> Optional[Tuple[Any, int]]:
         try:
-            key = next(self.iter)
-            return key, self.table_usage_counts[key]
+            return next(self.iter)
         except StopIteration:
             return None
 
     def _page_over_results(self, body: Dict) -> Iterator[Dict]:
-        response = self.logging_service.entries().list(body=body).execute(
-            num_retries=BigQueryTableUsageExtractor.NUM_RETRIES)
+        response = self._execute(self.logging_service.entries().list(body=body))
         while response:
             if 'entries' in response:
                 yield response
@@ -178,8 +184,7 @@ class BigQueryTableUsageExtractor(BaseBigQueryExtractor):
             try:
                 if 'nextPageToken' in response:
                     body['pageToken'] = response['nextPageToken']
-                    response = self.logging_service.entries().list(body=body).execute(
-                        num_retries=BigQueryTableUsageExtractor.NUM_RETRIES)
+                    response = self._execute(self.logging_service.entries().list(body=body))
                 else:
                     response = None
             except Exception:
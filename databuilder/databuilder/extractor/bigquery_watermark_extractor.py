@@ -40,6 +40,7 @@ class BigQueryWatermarkExtractor(BaseBigQueryExtractor):
             if 'tables' not in page:
                 continue
 
+            partitioned_tables: List[Dict[str, Any]] = []
             for table in page['tables']:
                 tableRef = table['tableReference']
                 table_id = tableRef['tableId']
@@ -63,12 +64,15 @@ class BigQueryWatermarkExtractor(BaseBigQueryExtractor):
                         else:
                             sharded_table_watermarks[prefix] = {'high': date, 'low': date, 'table': table}
                     else:
-                        partitions = self._get_partitions(table, tableRef)
-                        if not partitions:
-                            continue
-                        low, high = self._get_partition_watermarks(table, tableRef, partitions)
-                        yield low
-                        yield high
+                        partitioned_tables.append(table)
+
+            # Partitions of the tables of the page are queried concurrently when max_workers is set
+            for table, partitions in self._map_concurrently(self._get_table_partitions, partitioned_tables):
+                if not partitions:
+                    continue
+                low, high = self._get_partition_watermarks(table, table['tableReference'], partitions)
+                yield low
+                yield high
 
             for prefix, td in sharded_table_watermarks.items():
                 table = td['table']
@@ -94,6 +98,9 @@ class BigQueryWatermarkExtractor(BaseBigQueryExtractor):
                     cluster=tableRef['projectId']
                 )
 
+    def _get_table_partitions(self, table: Dict[str, Any]) -> List[PartitionInfo]:
+        return self._get_partitions(table, table['tableReference'])
+
     def _get_partitions(self,
                         table: str,
                         tableRef: Dict[str, str]
@@ -115,7 +122,7 @@ class BigQueryWatermarkExtractor(BaseBigQueryExtractor):
                 table=tableRef['tableId']),
             'useLegacySql': True
         }
-        result = self.bigquery_service.jobs().query(projectId=self.project_id, body=body).execute()
+        result = self._execute(self.bigquery_service.jobs().query(projectId=self.project_id, body=body))
 
         if 'rows' not in result:
             return []
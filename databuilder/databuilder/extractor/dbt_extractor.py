@@ -6,7 +6,7 @@ import logging
 import os
 from enum import Enum
 from typing import (
-    Dict, Iterator, List, Optional, Tuple, Union,
+    Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union,
 )
 
 from pyhocon import ConfigTree
@@ -41,6 +41,19 @@ class InvalidDbtInputs(Exception):
     pass
 
 
+class _LowerCaseReader:
+    """
+    Lowercases the content of a binary file while it is read, the same way the whole file content is lowercased
+    when it is loaded at once: as bytes, so that only ASCII letters are lowercased.
+    """
+
+    def __init__(self, f: BinaryIO) -> None:
+        self._f = f
+
+    def read(self, size: int = -1) -> bytes:
+        return self._f.read(size).lower()
+
+
 class DbtExtractor(Extractor):
     """
     Extracts metadata from the dbt manifest.json and catalog.json files.
@@ -91,6 +104,11 @@ class DbtExtractor(Extractor):
     # properly format the string value.
     FORCE_TABLE_KEY_LOWER = 'force_table_key_lower'
 
+    # Parses the manifest and catalog files incrementally (requires ijson), instead of loading them at once.
+    # Manifest nodes are extracted one at a time and only the catalog columns are kept in memory, which is
+    # needed for large dbt projects. The manifest and catalog must be provided as file locations.
+    STREAMING_PARSE = 'streaming_parse'
+
     def init(self, conf: ConfigTree) -> None:
         self._conf = conf
         self._database_name = conf.get_string(DbtExtractor.DATABASE_NAME)
@@ -107,6 +125,7 @@ class DbtExtractor(Extractor):
         self._schema_filter = conf.get_string(DbtExtractor.SCHEMA_FILTER, '')
         self._model_name_key = DBT_MODEL_NAME_KEY(
             conf.get_string(DbtExtractor.MODEL_NAME_KEY, DBT_MODEL_NAME_KEY.NAME.value)).value
+        self._streaming_parse = conf.get_bool(DbtExtractor.STREAMING_PARSE, False)
         self._clean_inputs()
         self._extract_iter: Union[None, Iterator] = None
 
@@ -170,9 +189,56 @@ class DbtExtractor(Extractor):
                 'Must provide a dbt manifest file and dbt catalog file.'
             )
 
+        if self._streaming_parse:
+            for dbt_file in (self._dbt_catalog, self._dbt_manifest):
+                if not os.path.isfile(dbt_file):
+                    raise InvalidDbtInputs(
+                        'The location of a dbt catalog and manifest file must be provided when %s is set, '
+                        'found: %s' % (DbtExtractor.STREAMING_PARSE, dbt_file)
+                    )
+            return
+
         self._validate_catalog()
         self._validate_manifest()
 
+    def _stream_items(self, dbt_file: str, prefix: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Yields the key and value pairs of the object at the prefix of a JSON file, one at a time.
+        Keys and values are lowercased, like the content of files that are loaded at once.
+        """
+        import ijson
+
+        with open(dbt_file, 'rb') as f:
+            yield from ijson.kvitems(_LowerCaseReader(f), prefix, use_float=True)
+
+    def _get_manifest_nodes(self) -> Iterator[Tuple[str, Dict]]:
+        if self._streaming_parse:
+            return self._stream_items(self._dbt_manifest, 'nodes')
+        return iter(self._dbt_manifest['nodes'].items())
+
+    def _get_manifest_child_map(self) -> Iterator[Tuple[str, List[str]]]:
+        if self._streaming_parse:
+            return self._stream_items(self._dbt_manifest, 'child_map')
+        return iter(self._dbt_manifest['child_map'].items())
+
+    def _get_catalog_nodes(self) -> Dict[str, Dict]:
+        if not self._streaming_parse:
+            return self._dbt_catalog['nodes']
+
+        # Only the parts of the catalog nodes of models needed to extract tables are kept
+        catalog_nodes = {}
+        for tbl_node, catalog_content in self._stream_items(self._dbt_catalog, 'nodes'):
+            if tbl_node.startswith(DBT_MODEL_PREFIX):
+                catalog_nodes[tbl_node] = {
+                    'metadata': {'type': catalog_content['metadata']['type']},
+                    'columns': {
+                        col_name: {k: col_content[k] for k in ('name', 'type', 'index')} if col_content else col_content
+                        for col_name, col_content in catalog_content['columns'].items()
+                    }
+                }
+        LOGGER.info('Loaded the columns of %i dbt models from the catalog', len(catalog_nodes))
+        return catalog_nodes
+
     def extract(self) -> Union[TableMetadata, None]:
         """
         For every feature table from Feast, a multiple objets are extracted:
@@ -232,14 +298,15 @@ class DbtExtractor(Extractor):
         Generates the extract iterator for all of the model types created by the dbt files.
         """
         dbt_id_to_table_key = {}
-        for tbl_node, manifest_content in self._dbt_manifest['nodes'].items():
+        catalog_nodes = self._get_catalog_nodes()
+        for tbl_node, manifest_content in self._get_manifest_nodes():
 
-            if manifest_content['resource_type'] == DBT_MODEL_TYPE and tbl_node in self._dbt_catalog['nodes']:
+            if manifest_content['resource_type'] == DBT_MODEL_TYPE and tbl_node in catalog_nodes:
                 LOGGER.info(
                     'Extracting dbt {}.{}'.format(manifest_content['schema'], manifest_content[self._model_name_key])
                 )
 
-                catalog_content = self._dbt_catalog['nodes'][tbl_node]
+                catalog_content = catalog_nodes[tbl_node]
 
                 tbl_columns: List[ColumnMetadata] = self._get_column_values(
                     manifest_columns=manifest_content['columns'], catalog_columns=catalog_content['columns']
@@ -282,7 +349,7 @@ class DbtExtractor(Extractor):
                                       source=os.path.join(self._source_url, manifest_content.get('original_file_path')))
 
         if self._extract_lineage:
-            for upstream, downstreams in self._dbt_manifest['child_map'].items():
+            for upstream, downstreams in self._get_manifest_child_map():
                 if upstream not in dbt_id_to_table_key:
                     continue
                 valid_downstreams = [
@@ -2,11 +2,14 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import concurrent.futures
+import itertools
 import logging
+import threading
+import time
 from collections import namedtuple
 from datetime import datetime
 from typing import (  # noqa: F401
-    Any, Dict, Iterator, List, Optional, Tuple, Union,
+    Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union,
 )
 
 from pyhocon import ConfigFactory, ConfigTree  # noqa: F401
@@ -28,6 +31,18 @@ TableKey = namedtuple('TableKey', ['schema', 'table_name'])
 LOGGER = logging.getLogger(__name__)
 
 
+class _ScrapeTask(object):
+    """
+    A table being scraped by a worker thread, with the spark job group of its queries
+    """
+
+    def __init__(self, table: Table) -> None:
+        self.table = table
+        self.job_group = f'amundsen_scrape_{table.database}.{table.name}'
+        # Tables are started as soon as they are created
+        self.started = time.monotonic()
+
+
 # TODO once column tags work properly, consider deprecating this for TableMetadata directly
 class ScrapedColumnMetadata(object):
     def __init__(self, name: str, data_type: str, description: Optional[str], sort_order: int,
@@ -144,10 +159,16 @@ class DeltaLakeMetadataExtractor(Extractor):
     CLUSTER_KEY = "cluster"
     # By default, this will only process and emit delta-lake tables, but it can support all hive table types.
     DELTA_TABLES_ONLY = "delta_tables_only"
+    # Number of tables scraped concurrently
+    MAX_WORKERS_KEY = "max_workers"
+    # Tables that take longer to scrape are skipped and their spark jobs cancelled, 0 for no timeout
+    TABLE_TIMEOUT_SEC_KEY = "table_timeout_sec"
     DEFAULT_CONFIG = ConfigFactory.from_dict({DATABASE_KEY: "delta",
                                               EXCLUDE_LIST_SCHEMAS_KEY: [],
                                               SCHEMA_LIST_KEY: [],
-                                              DELTA_TABLES_ONLY: True})
+                                              DELTA_TABLES_ONLY: True,
+                                              MAX_WORKERS_KEY: 8,
+                                              TABLE_TIMEOUT_SEC_KEY: 0})
     PARTITION_COLUMN_TAG = 'is_partition'
 
     # For backwards compatibility, the delta lake extractor does not extract nested columns for indexing
@@ -162,6 +183,8 @@ class DeltaLakeMetadataExtractor(Extractor):
         self.exclude_list = self.conf.get_list(DeltaLakeMetadataExtractor.EXCLUDE_LIST_SCHEMAS_KEY)
         self.schema_list = self.conf.get_list(DeltaLakeMetadataExtractor.SCHEMA_LIST_KEY)
         self.delta_tables_only = self.conf.get_bool(DeltaLakeMetadataExtractor.DELTA_TABLES_ONLY)
+        self.max_workers = self.conf.get_int(DeltaLakeMetadataExtractor.MAX_WORKERS_KEY)
+        self.table_timeout_sec = self.conf.get_float(DeltaLakeMetadataExtractor.TABLE_TIMEOUT_SEC_KEY)
         self.extract_nested_columns = self.conf.get_bool(DeltaLakeMetadataExtractor.EXTRACT_NESTED_COLUMNS,
                                                          default=False)
 
@@ -197,6 +220,8 @@ class DeltaLakeMetadataExtractor(Extractor):
             schemas = self.get_schemas(self.exclude_list)
             LOGGER.info("working on %s", schemas)
             tables = self.get_all_tables(schemas)
+        if self.delta_tables_only:
+            tables = self.filter_delta_tables(tables)
         # TODO add the programmatic information as well?
         scraped_tables = self.scrape_all_tables(tables)
         for scraped_table in scraped_tables:
@@ -236,11 +261,102 @@ class DeltaLakeMetadataExtractor(Extractor):
         '''Returns all tables for a specific schema.'''
         return self.spark.catalog.listTables(schema)
 
-    def scrape_all_tables(self, tables: List[Table]) -> List[Optional[ScrapedTableMetadata]]:
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self.scrape_table, table) for table in tables]
-        scraped_tables = [f.result() for f in futures]
-        return scraped_tables
+    def get_table_formats(self, schema: str) -> Optional[Dict[str, str]]:
+        '''Returns the format of each table of a schema, with a single command for the whole schema,
+        or None if the tables of the schema cannot be described at once.'''
+        try:
+            rows = self.spark.sql(f"show table extended in {schema} like '*'").collect()
+        except Exception as e:
+            LOGGER.warning("Failed to describe the tables of schema %s at once: %s", schema, e)
+            return None
+        table_formats = {}
+        for row in rows:
+            row_dict = row.asDict()
+            table_format = ''
+            for line in (row_dict.get('information') or '').splitlines():
+                if line.startswith('Provider:'):
+                    table_format = line[len('Provider:'):].strip().lower()
+            table_formats[row_dict['tableName'].lower()] = table_format
+        return table_formats
+
+    def filter_delta_tables(self, tables: List[Table]) -> List[Table]:
+        '''Filters out the tables that are not delta tables, based on the formats of the tables
+        of each schema, so that they are not described one by one.'''
+        ret = []
+        for schema, schema_tables in itertools.groupby(tables, key=lambda t: t.database):
+            table_formats = self.get_table_formats(schema) if schema else None
+            for table in schema_tables:
+                table_format = table_formats.get(table.name.lower()) if table_formats is not None else None
+                if table_format is None or table_format == 'delta':
+                    ret.append(table)
+                else:
+                    LOGGER.info("Skipping none delta table %s.%s", schema, table.name)
+        return ret
+
+    def scrape_all_tables(self, tables: List[Table]) -> Iterator[Optional[ScrapedTableMetadata]]:
+        '''Scrapes the tables on up to max_workers threads at a time, and yields them as they complete.
+        A table that fails to scrape, or takes longer than table_timeout_sec, is yielded as None.
+        The spark jobs of a table that timed out are cancelled (requires the pinned thread mode of pyspark,
+        the default as of spark 3.2). Cancelling does not stop the driver side work of the table, so its thread is
+        abandoned rather than waited for, and another table is started in its place.'''
+        pending_tables = iter(tables)
+        running: Dict[concurrent.futures.Future, _ScrapeTask] = {}
+        while True:
+            for table in itertools.islice(pending_tables, max(self.max_workers - len(running), 0)):
+                task = _ScrapeTask(table)
+                running[self._start_scrape_task(task)] = task
+            if not running:
+                return
+
+            done, _ = concurrent.futures.wait(running, timeout=self._get_wait_timeout(running.values()),
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                yield future.result()
+
+            for future in self._get_timed_out(running):
+                task = running.pop(future)
+                LOGGER.error("Timed out scraping table %s.%s after %s seconds",
+                             task.table.database, task.table.name, self.table_timeout_sec)
+                self.spark.sparkContext.cancelJobGroup(task.job_group)
+                yield None
+
+    def _start_scrape_task(self, task: _ScrapeTask) -> concurrent.futures.Future:
+        '''Scrapes the table on a thread of its own, rather than on a pool of which a table that hangs would hold a
+        thread forever. The thread is a daemon thread, so that a table that hangs does not keep the job running.'''
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+
+        def run() -> None:
+            try:
+                future.set_result(self._run_scrape_task(task))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=task.job_group, daemon=True).start()
+        return future
+
+    def _run_scrape_task(self, task: _ScrapeTask) -> Optional[ScrapedTableMetadata]:
+        self.spark.sparkContext.setJobGroup(task.job_group, f"Scraping {task.table.database}.{task.table.name}",
+                                            interruptOnCancel=True)
+        try:
+            return self.scrape_table(task.table)
+        except Exception:
+            # A table failing to scrape should not fail the others
+            LOGGER.exception("Failed to scrape table %s.%s", task.table.database, task.table.name)
+            return None
+
+    def _get_wait_timeout(self, tasks: Iterable[_ScrapeTask]) -> Optional[float]:
+        if not self.table_timeout_sec:
+            return None
+        deadline = min(task.started + self.table_timeout_sec for task in tasks)
+        return max(deadline - time.monotonic(), 0)
+
+    def _get_timed_out(self, running: Dict[concurrent.futures.Future, _ScrapeTask]) -> List[concurrent.futures.Future]:
+        if not self.table_timeout_sec:
+            return []
+        now = time.monotonic()
+        return [future for future, task in running.items() if now - task.started >= self.table_timeout_sec]
 
     def scrape_table(self, table: Table) -> Optional[ScrapedTableMetadata]:
         '''Takes a table object and creates a scraped table metadata object.'''
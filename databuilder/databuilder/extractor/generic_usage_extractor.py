@@ -20,6 +20,7 @@ from databuilder.extractor import sql_alchemy_extractor
 from databuilder.extractor.base_extractor import Extractor
 from databuilder.extractor.sql_alchemy_extractor import SQLAlchemyExtractor
 from databuilder.models.table_column_usage import ColumnReader, TableColumnUsage
+from databuilder.utils.usage_aggregator import DEFAULT_MAX_KEYS_IN_MEMORY, UsageAggregator
 
 LOGGER = logging.getLogger(__name__)
 
@@ -43,13 +44,19 @@ class GenericUsageExtractor(Extractor):
     POPULARTIY_TABLE_SCHEMA = 'popularity_table_schema'
     POPULARITY_TABLE_NAME = 'popularity_table_name'
     DATABASE_KEY = 'database_key'
+    # Sums the read counts of the rows of the same table and user, e.g. when the table holds daily counts
+    AGGREGATE_USAGE = 'aggregate_usage'
+    # Number of distinct (table, user) pairs summed in memory before the counts are spilled to disk
+    MAX_KEYS_IN_MEMORY = 'max_keys_in_memory'
 
     DEFAULT_CONFIG = ConfigFactory.from_dict(
         {WHERE_CLAUSE_SUFFIX_KEY: ' ',
          POPULARITY_TABLE_DATABASE: 'PROD',
          POPULARTIY_TABLE_SCHEMA: 'SCHEMA',
          POPULARITY_TABLE_NAME: 'TABLE',
-         DATABASE_KEY: 'snowflake'}
+         DATABASE_KEY: 'snowflake',
+         AGGREGATE_USAGE: False,
+         MAX_KEYS_IN_MEMORY: DEFAULT_MAX_KEYS_IN_MEMORY}
     )
 
     def init(self, conf: ConfigTree) -> None:
@@ -59,6 +66,8 @@ class GenericUsageExtractor(Extractor):
         self._popularity_table_schema = conf.get_string(GenericUsageExtractor.POPULARTIY_TABLE_SCHEMA)
         self._popularity_table_name = conf.get_string(GenericUsageExtractor.POPULARITY_TABLE_NAME)
         self._database_key = conf.get_string(GenericUsageExtractor.DATABASE_KEY)
+        self._aggregate_usage = conf.get_bool(GenericUsageExtractor.AGGREGATE_USAGE)
+        self._max_keys_in_memory = conf.get_int(GenericUsageExtractor.MAX_KEYS_IN_MEMORY)
 
         self.sql_stmt = self.SQL_STATEMENT.format(
             where_clause_suffix=self._where_clause_suffix,
@@ -91,7 +100,8 @@ class GenericUsageExtractor(Extractor):
         Using raw level iterator, it groups to table and yields TableColumnUsage
         :return:
         """
-        for row in self._get_raw_extract_iter():
+        rows = self._get_aggregated_extract_iter() if self._aggregate_usage else self._get_raw_extract_iter()
+        for row in rows:
             col_readers = []
             col_readers.append(ColumnReader(database=self._database_key,
                                             cluster=row["database"],
@@ -102,6 +112,20 @@ class GenericUsageExtractor(Extractor):
                                             read_count=row["read_count"]))
             yield TableColumnUsage(col_readers=col_readers)
 
+    def _get_aggregated_extract_iter(self) -> Iterator[Dict[str, Any]]:
+        """
+        Sums the read counts of the rows of the same table and user, with bounded memory
+        :return:
+        """
+        aggregator = UsageAggregator(max_keys_in_memory=self._max_keys_in_memory)
+        for row in self._get_raw_extract_iter():
+            aggregator.add((row["database"], row["schema"], row["name"], row["user_email"]),
+                           count=int(row["read_count"]))
+
+        for (database, schema, name, user_email), read_count in aggregator.items():
+            yield {"database": database, "schema": schema, "name": name, "user_email": user_email,
+                   "read_count": read_count}
+
     def _get_raw_extract_iter(self) -> Iterator[Dict[str, Any]]:
         """
         Provides iterator of result row from SQLAlchemy extractor
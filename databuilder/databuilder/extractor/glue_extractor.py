@@ -1,16 +1,25 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
-    Any, Dict, Iterator, List, Union,
+    Any, Callable, Dict, Iterator, List, Optional, Union,
 )
 
 import boto3
+from botocore.config import Config
 from pyhocon import ConfigFactory, ConfigTree
+from statsd import StatsClient
 
 from databuilder.extractor.base_extractor import Extractor
 from databuilder.models.table_metadata import ColumnMetadata, TableMetadata
 
+LOGGER = logging.getLogger(__name__)
+
 
 class GlueExtractor(Extractor):
     """
@@ -23,6 +32,14 @@ class GlueExtractor(Extractor):
     RESOURCE_SHARE_TYPE = 'resource_share_type'
     REGION_NAME_KEY = "region"
     PARTITION_BADGE_LABEL_KEY = "partition_badge_label"
+    # Number of databases crawled concurrently. When set, tables are listed per database instead of searched
+    # across the catalog, which does not support filters.
+    DATABASE_CONCURRENCY_KEY = 'database_concurrency'
+    # Maximum number of attempts of a call. Calls are retried in the adaptive mode of botocore, which lowers the
+    # rate of calls of the client when Glue throttles them.
+    MAX_ATTEMPTS_KEY = 'max_attempts'
+    # Whether to emit the latency of each page through statsd, with prefix amundsen.databuilder.extractor.glue
+    IS_STATSD_ENABLED_KEY = 'is_statsd_enabled'
 
     DEFAULT_CONFIG = ConfigFactory.from_dict({
         CLUSTER_KEY: 'gold',
@@ -31,6 +48,9 @@ class GlueExtractor(Extractor):
         RESOURCE_SHARE_TYPE: "ALL",
         REGION_NAME_KEY: None,
         PARTITION_BADGE_LABEL_KEY: None,
+        DATABASE_CONCURRENCY_KEY: 0,
+        MAX_ATTEMPTS_KEY: 10,
+        IS_STATSD_ENABLED_KEY: False,
     })
 
     def init(self, conf: ConfigTree) -> None:
@@ -41,10 +61,22 @@ class GlueExtractor(Extractor):
         self._resource_share_type = conf.get(GlueExtractor.RESOURCE_SHARE_TYPE)
         self._region_name = conf.get(GlueExtractor.REGION_NAME_KEY)
         self._partition_badge_label = conf.get(GlueExtractor.PARTITION_BADGE_LABEL_KEY)
+        self._database_concurrency = conf.get_int(GlueExtractor.DATABASE_CONCURRENCY_KEY)
+        if self._database_concurrency and self._filters is not None:
+            raise ValueError(f'{GlueExtractor.FILTER_KEY} is not supported with '
+                             f'{GlueExtractor.DATABASE_CONCURRENCY_KEY}')
+
+        client_config = Config(retries={'max_attempts': conf.get_int(GlueExtractor.MAX_ATTEMPTS_KEY),
+                                        'mode': 'adaptive'},
+                               max_pool_connections=max(10, self._database_concurrency))
         if self._region_name is not None:
-            self._glue = boto3.client('glue', region_name=self._region_name)
+            self._glue = boto3.client('glue', region_name=self._region_name, config=client_config)
         else:
-            self._glue = boto3.client('glue')
+            self._glue = boto3.client('glue', config=client_config)
+        self._statsd = StatsClient(prefix='amundsen.databuilder.extractor.glue') \
+            if conf.get_bool(GlueExtractor.IS_STATSD_ENABLED_KEY) else None
+        self.page_latencies: List[float] = []
+        self._metrics_lock = threading.Lock()
         self._extract_iter: Union[None, Iterator] = None
 
     def extract(self) -> Union[TableMetadata, None]:
@@ -103,22 +135,144 @@ class GlueExtractor(Extractor):
         Provides iterator of results row from glue client
         :return:
         """
-        tables = self._search_tables()
-        return iter(tables)
-
-    def _search_tables(self) -> List[Dict[str, Any]]:
-        tables = []
-        kwargs = {}
-        if self._filters is not None:
-            kwargs['Filters'] = self._filters
-            kwargs['MaxResults'] = self._max_results
-        if self._resource_share_type:
-            kwargs['ResourceShareType'] = self._resource_share_type
-        data = self._glue.search_tables(**kwargs)
-        tables += data['TableList']
-        while 'NextToken' in data:
-            token = data['NextToken']
-            kwargs['NextToken'] = token
-            data = self._glue.search_tables(**kwargs)
-            tables += data['TableList']
-        return tables
+        return iter(self._search_tables())
+
+    def _search_tables(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the tables of the catalog as pages of results arrive
+        :return:
+        """
+        if self._database_concurrency:
+            yield from self._crawl_databases()
+        else:
+            kwargs = {}
+            if self._filters is not None:
+                kwargs['Filters'] = self._filters
+                kwargs['MaxResults'] = self._max_results
+            if self._resource_share_type:
+                kwargs['ResourceShareType'] = self._resource_share_type
+            for page in self._get_pages(self._glue.search_tables, 'TableList', **kwargs):
+                yield from page
+
+        self._report_page_latencies()
+
+    def _crawl_databases(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lists the tables of each database on a bounded pool of threads, and yields them as pages arrive.
+        Pages are handed over through a bounded queue, so that the crawl does not run ahead of the consumer.
+        :return:
+        """
+        kwargs = {'ResourceShareType': self._resource_share_type} if self._resource_share_type else {}
+        databases = [database['Name']
+                     for page in self._get_pages(self._glue.get_databases, 'DatabaseList', **kwargs)
+                     for database in page]
+        LOGGER.info('Crawling %i databases with %i threads', len(databases), self._database_concurrency)
+
+        pages = _PageQueue(maxsize=self._database_concurrency * 2)
+        with ThreadPoolExecutor(max_workers=self._database_concurrency) as executor:
+            futures = [executor.submit(self._crawl_database, database, pages) for database in databases]
+            try:
+                for page in pages.get_pages(producer_count=len(databases)):
+                    yield from page
+            finally:
+                # Let the threads finish early, e.g. on failure or if the consumer stopped, and skip the databases
+                # that are not crawled yet
+                pages.stop()
+                for future in futures:
+                    future.cancel()
+
+    def _crawl_database(self, database: str, pages: '_PageQueue') -> None:
+        try:
+            # GetTables returns up to 100 tables per page
+            for page in self._get_pages(self._glue.get_tables, 'TableList', is_stopped=pages.is_stopped,
+                                        DatabaseName=database, MaxResults=min(self._max_results, 100)):
+                if not pages.put(page):
+                    return
+        except Exception as e:
+            pages.put(e)
+        finally:
+            pages.put(_PageQueue.PRODUCER_DONE)
+
+    def _get_pages(self, call: Callable[..., Dict[str, Any]], result_key: str,
+                   is_stopped: Optional[Callable[[], bool]] = None,
+                   **kwargs: Any) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Follows the NextToken of a paginated call, and yields the results of each page as it arrives
+        :param call: Method of the glue client
+        :param result_key: Key of the results in the response
+        :param is_stopped: Checked before each page is requested, no more pages are requested once it returns True
+        :return:
+        """
+        next_token: Optional[str] = None
+        while True:
+            if is_stopped is not None and is_stopped():
+                return
+            if next_token:
+                kwargs['NextToken'] = next_token
+            start = time.perf_counter()
+            data = call(**kwargs)
+            self._record_page_latency(time.perf_counter() - start)
+
+            yield data[result_key]
+
+            next_token = data.get('NextToken')
+            if not next_token:
+                return
+
+    def _record_page_latency(self, latency_sec: float) -> None:
+        LOGGER.debug('Fetched a page in %.3f seconds', latency_sec)
+        with self._metrics_lock:
+            self.page_latencies.append(latency_sec)
+        if self._statsd:
+            self._statsd.timing('page_latency', latency_sec * 1000)
+
+    def _report_page_latencies(self) -> None:
+        if not self.page_latencies:
+            return
+
+        latencies = sorted(self.page_latencies)
+        LOGGER.info('Fetched %i pages from Glue in %.1f seconds, latency per page: p50 %.3fs, p95 %.3fs, max %.3fs',
+                    len(latencies), sum(latencies), latencies[len(latencies) // 2],
+                    latencies[int(len(latencies) * 0.95)], latencies[-1])
+
+
+class _PageQueue:
+    """
+    Bounded queue handing pages over from the threads crawling databases to the consumer.
+    Threads hand over an exception if they fail, and PRODUCER_DONE once they are done.
+    """
+    PRODUCER_DONE = object()
+
+    def __init__(self, maxsize: int) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._stopped = threading.Event()
+
+    def put(self, item: Any) -> bool:
+        """
+        Blocks until there is room for the item, unless the consumer stopped.
+        :return: False if the consumer stopped
+        """
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get_pages(self, producer_count: int) -> Iterator[Any]:
+        remaining = producer_count
+        while remaining:
+            item = self._queue.get()
+            if item is _PageQueue.PRODUCER_DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def is_stopped(self) -> bool:
+        return self._stopped.is_set()
@@ -35,10 +35,13 @@ class Neo4jExtractor(Extractor):
     """NEO4J_ENCRYPTED is a boolean indicating whether to use SSL/TLS when connecting."""
     NEO4J_VALIDATE_SSL = 'neo4j_validate_ssl'
     """NEO4J_VALIDATE_SSL is a boolean indicating whether to validate the server's SSL/TLS cert against system CAs."""
+    NEO4J_FETCH_SIZE = 'neo4j_fetch_size'
+    """NEO4J_FETCH_SIZE is the number of records fetched from the server at a time, while the result is consumed."""
 
     DEFAULT_CONFIG = ConfigFactory.from_dict({
         NEO4J_MAX_CONN_LIFE_TIME_SEC: 50,
         NEO4J_DATABASE_NAME: neo4j.DEFAULT_DATABASE,
+        NEO4J_FETCH_SIZE: 1000,
     })
 
     def init(self, conf: ConfigTree) -> None:
@@ -50,6 +53,7 @@ class Neo4jExtractor(Extractor):
         self.graph_url = self.conf.get_string(Neo4jExtractor.GRAPH_URL_CONFIG_KEY)
         self.cypher_query = self.conf.get_string(Neo4jExtractor.CYPHER_QUERY_CONFIG_KEY)
         self.db_name = self.conf.get_string(Neo4jExtractor.NEO4J_DATABASE_NAME)
+        self.fetch_size = self.conf.get_int(Neo4jExtractor.NEO4J_FETCH_SIZE)
 
         uri = self.conf.get_string(Neo4jExtractor.GRAPH_URL_CONFIG_KEY)
         driver_args = {
@@ -96,23 +100,25 @@ class Neo4jExtractor(Extractor):
 
     def _execute_query(self, tx: Any) -> Any:
         """
-        Create an iterator to execute sql.
+        Execute the query and return its result, which fetches records lazily while it is iterated.
         """
         LOGGER.info('Executing query %s', self.cypher_query)
-        result = tx.run(self.cypher_query)
-        return [record for record in result]
+        return tx.run(self.cypher_query)
 
     def _get_extract_iter(self) -> Iterator[Any]:
         """
-        Execute {cypher_query} and yield result one at a time
+        Execute {cypher_query} and yield result one at a time.
+        The result is streamed from the server {fetch_size} records at a time, within a transaction that stays
+        open until the result is consumed. Unlike a transaction function, it is therefore not retried on failure.
         """
         with self.driver.session(
-            database=self.db_name
+            database=self.db_name,
+            fetch_size=self.fetch_size,
+            default_access_mode=neo4j.READ_ACCESS
         ) as session:
-            if not hasattr(self, 'results'):
-                self.results = session.read_transaction(self._execute_query)
+            results = self.results if hasattr(self, 'results') else self._execute_query(session)
 
-            for result in self.results:
+            for result in results:
                 if hasattr(self, 'model_class'):
                     obj = self.model_class(**result)
                     yield obj
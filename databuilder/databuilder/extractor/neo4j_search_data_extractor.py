@@ -1,9 +1,15 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import logging
 import textwrap
-from typing import Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any, Deque, Iterator, List, Optional,
+)
 
+import neo4j
 from pyhocon import ConfigTree
 
 from databuilder import Scoped
@@ -11,6 +17,8 @@ from databuilder.extractor.base_extractor import Extractor
 from databuilder.extractor.neo4j_extractor import Neo4jExtractor
 from databuilder.publisher.neo4j_csv_publisher import JOB_PUBLISH_TAG
 
+LOGGER = logging.getLogger(__name__)
+
 
 class Neo4jSearchDataExtractor(Extractor):
     """
@@ -19,6 +27,11 @@ class Neo4jSearchDataExtractor(Extractor):
     """
     CYPHER_QUERY_CONFIG_KEY = 'cypher_query'
     ENTITY_TYPE = 'entity_type'
+    # Number of entities per page. When set, entities are walked in key order and the default query is run per
+    # page, instead of over all entities at once. Not supported with a custom cypher_query.
+    PAGE_SIZE = 'page_size'
+    # Number of pages fetched concurrently, each over its own session
+    PAGE_CONCURRENCY = 'page_concurrency'
 
     DEFAULT_NEO4J_TABLE_CYPHER_QUERY = textwrap.dedent(
         """
@@ -148,19 +161,53 @@ class Neo4jSearchDataExtractor(Extractor):
         'feature': DEFAULT_NEO4J_FEATURE_CYPHER_QUERY,
     }
 
+    LABEL_BY_ENTITY = {
+        'table': 'Table',
+        'user': 'User',
+        'dashboard': 'Dashboard',
+        'feature': 'Feature',
+    }
+
+    PAGE_KEYS_CYPHER_QUERY = textwrap.dedent(
+        """
+        MATCH ({entity}:{label})
+        WHERE {entity}.key > $last_key {publish_tag_filter}
+        RETURN {entity}.key AS key
+        ORDER BY {entity}.key
+        LIMIT $page_size
+        """
+    )
+
+    # Restricts the query to the entities of a page, bound to the variable the query matches them with
+    PAGE_FILTER_CYPHER_QUERY = textwrap.dedent(
+        """
+        UNWIND $keys AS page_key
+        MATCH ({entity}:{label} {{key: page_key}})
+        WITH {entity}
+        """
+    )
+
     def init(self, conf: ConfigTree) -> None:
         """
         Initialize Neo4jExtractor object from configuration and use that for extraction
         """
         self.conf = conf
         self.entity = conf.get_string(Neo4jSearchDataExtractor.ENTITY_TYPE, default='table').lower()
+        self.publish_tag = conf.get_string(JOB_PUBLISH_TAG, '')
+        self.page_size = conf.get_int(Neo4jSearchDataExtractor.PAGE_SIZE, 0)
+        self.page_concurrency = conf.get_int(Neo4jSearchDataExtractor.PAGE_CONCURRENCY, 1)
         # extract cypher query from conf, if specified, else use default query
         if Neo4jSearchDataExtractor.CYPHER_QUERY_CONFIG_KEY in conf:
+            if self.page_size:
+                raise ValueError(f'{Neo4jSearchDataExtractor.PAGE_SIZE} is not supported with '
+                                 f'{Neo4jSearchDataExtractor.CYPHER_QUERY_CONFIG_KEY}')
             self.cypher_query = conf.get_string(Neo4jSearchDataExtractor.CYPHER_QUERY_CONFIG_KEY)
         else:
             default_query = Neo4jSearchDataExtractor.DEFAULT_QUERY_BY_ENTITY[self.entity]
-            self.cypher_query = self._add_publish_tag_filter(conf.get_string(JOB_PUBLISH_TAG, ''),
-                                                             cypher_query=default_query)
+            # When paginated, the publish tag is filtered on when walking the keys
+            publish_tag = '' if self.page_size else self.publish_tag
+            self.cypher_query = self._add_publish_tag_filter(publish_tag, cypher_query=default_query)
+        self._extract_iter: Optional[Iterator[Any]] = None
 
         self.neo4j_extractor = Neo4jExtractor()
         # write the cypher query in configs in Neo4jExtractor scope
@@ -178,9 +225,78 @@ class Neo4jSearchDataExtractor(Extractor):
 
     def extract(self) -> Any:
         """
-        Invoke extract() method defined by neo4j_extractor
+        Invoke extract() method defined by neo4j_extractor, or extract the next record of the current page
+        when paginated
+        """
+        if not self.page_size:
+            return self.neo4j_extractor.extract()
+
+        if not self._extract_iter:
+            self._extract_iter = self._get_paginated_extract_iter()
+
+        try:
+            return next(self._extract_iter)
+        except StopIteration:
+            return None
+
+    def _get_paginated_extract_iter(self) -> Iterator[Any]:
+        """
+        Walks the keys of the entities page by page, and yields the records of the query run for each page.
+        Up to {page_concurrency} pages are fetched ahead concurrently, and their records are yielded in key order.
+        """
+        label = Neo4jSearchDataExtractor.LABEL_BY_ENTITY[self.entity]
+        page_query = Neo4jSearchDataExtractor.PAGE_FILTER_CYPHER_QUERY.format(entity=self.entity, label=label) \
+            + self.cypher_query
+        model_class = getattr(self.neo4j_extractor, 'model_class', None)
+
+        with ThreadPoolExecutor(max_workers=self.page_concurrency) as executor:
+            pending_pages: Deque[Future] = deque()
+            for keys in self._get_page_keys(label):
+                pending_pages.append(executor.submit(self._fetch_page, page_query, keys))
+                if len(pending_pages) < self.page_concurrency:
+                    continue
+                yield from self._get_page_records(pending_pages.popleft(), model_class)
+
+            while pending_pages:
+                yield from self._get_page_records(pending_pages.popleft(), model_class)
+
+    def _get_page_keys(self, label: str) -> Iterator[List[str]]:
+        """
+        Yields the keys of the entities, page by page in key order, starting after the last key of the previous page
         """
-        return self.neo4j_extractor.extract()
+        publish_tag_filter = f'AND {self.entity}.published_tag = $publish_tag' if self.publish_tag else ''
+        keys_query = Neo4jSearchDataExtractor.PAGE_KEYS_CYPHER_QUERY.format(
+            entity=self.entity, label=label, publish_tag_filter=publish_tag_filter)
+        last_key = ''
+        page_count = 0
+        while True:
+            keys = self._run_query(keys_query, last_key=last_key, page_size=self.page_size,
+                                   publish_tag=self.publish_tag)
+            if not keys:
+                LOGGER.info('Extracted %i pages of %s', page_count, self.entity)
+                return
+
+            page_count += 1
+            last_key = keys[-1]['key']
+            yield [record['key'] for record in keys]
+
+    def _fetch_page(self, page_query: str, keys: List[str]) -> List[Any]:
+        return self._run_query(page_query, keys=keys)
+
+    def _run_query(self, query: str, **params: Any) -> List[Any]:
+        """
+        Runs the query within a read transaction of its own session, so that it can be called concurrently.
+        """
+        def _execute(tx: Any) -> List[Any]:
+            return list(tx.run(query, parameters=params))
+
+        with self.neo4j_extractor.driver.session(database=self.neo4j_extractor.db_name,
+                                                 default_access_mode=neo4j.READ_ACCESS) as session:
+            return session.read_transaction(_execute)
+
+    def _get_page_records(self, page: Future, model_class: Any) -> Iterator[Any]:
+        for record in page.result():
+            yield model_class(**record) if model_class else record
 
     def get_scope(self) -> str:
         return 'extractor.search_data'
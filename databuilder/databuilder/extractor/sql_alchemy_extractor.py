@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import importlib
-from typing import Any
+from typing import Any, Dict
 
 from pyhocon import ConfigFactory, ConfigTree
 from sqlalchemy import create_engine
@@ -16,6 +16,15 @@ class SQLAlchemyExtractor(Extractor):
     CONN_STRING = 'conn_string'
     EXTRACT_SQL = 'extract_sql'
     CONNECT_ARGS = 'connect_args'
+    # Whether to stream the result through a server side cursor, on dialects supporting it
+    STREAM_RESULTS = 'stream_results'
+    # Maximum number of rows buffered at a time while streaming the result
+    FETCH_SIZE = 'fetch_size'
+
+    _DEFAULT_CONFIG = ConfigFactory.from_dict({
+        STREAM_RESULTS: True,
+        FETCH_SIZE: 1000
+    })
     """
     An Extractor that extracts records via SQLAlchemy. Database that supports SQLAlchemy can use this extractor
     """
@@ -25,7 +34,7 @@ class SQLAlchemyExtractor(Extractor):
         Establish connections and import data model class if provided
         :param conf:
         """
-        self.conf = conf
+        self.conf = conf.with_fallback(SQLAlchemyExtractor._DEFAULT_CONFIG)
         self.conn_string = conf.get_string(SQLAlchemyExtractor.CONN_STRING)
 
         self.connection = self._get_connection()
@@ -45,7 +54,9 @@ class SQLAlchemyExtractor(Extractor):
 
     def _get_connection(self) -> Any:
         """
-        Create a SQLAlchemy connection to Database
+        Create a SQLAlchemy connection to Database.
+        Unless disabled, results are streamed with a server side cursor (e.g. on PostgreSQL and MySQL), so that
+        only {fetch_size} rows are held in memory at a time.
         """
         connect_args = {
             k: v
@@ -53,7 +64,13 @@ class SQLAlchemyExtractor(Extractor):
                 self.CONNECT_ARGS, default=ConfigTree()
             ).items()
         }
-        engine = create_engine(self.conn_string, connect_args=connect_args)
+        engine_args: Dict[str, Any] = {}
+        if self.conf.get_bool(SQLAlchemyExtractor.STREAM_RESULTS):
+            engine_args['execution_options'] = {
+                'stream_results': True,
+                'max_row_buffer': self.conf.get_int(SQLAlchemyExtractor.FETCH_SIZE),
+            }
+        engine = create_engine(self.conn_string, connect_args=connect_args, **engine_args)
         conn = engine.connect()
         return conn
 
@@ -65,8 +82,8 @@ class SQLAlchemyExtractor(Extractor):
             self.results = self.connection.execute(self.extract_sql)
 
         if hasattr(self, 'model_class'):
-            results = [self.model_class(**result)
-                       for result in self.results]
+            results = (self.model_class(**result)
+                       for result in self.results)
         else:
             results = self.results
         self.iter = iter(results)
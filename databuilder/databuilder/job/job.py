@@ -62,14 +62,7 @@ class DefaultJob(Job):
         try:
             is_success = True
             self._init()
-            try:
-                self.task.run()
-            finally:
-                self.task.close()
-
-            self.publisher.init(Scoped.get_scoped_conf(self.conf, self.publisher.get_scope()))
-            Job.closer.register(self.publisher.close)
-            self.publisher.publish()
+            self._run_and_publish()
 
         except Exception as e:
             is_success = False
@@ -87,3 +80,17 @@ class DefaultJob(Job):
             Job.closer.close()
 
         logging.info('Job completed')
+
+    def _run_and_publish(self) -> None:
+        """
+        Runs the task to completion, then publishes.
+        :return:
+        """
+        try:
+            self.task.run()
+        finally:
+            self.task.close()
+
+        self.publisher.init(Scoped.get_scoped_conf(self.conf, self.publisher.get_scope()))
+        Job.closer.register(self.publisher.close)
+        self.publisher.publish()
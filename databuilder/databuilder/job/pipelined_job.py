@@ -0,0 +1,143 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import queue
+import threading
+from typing import (
+    Any, List, Optional, Tuple,
+)
+
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder import Scoped
+from databuilder.callback import call_back
+from databuilder.job.base_job import Job
+from databuilder.job.job import DefaultJob
+from databuilder.publisher.base_publisher import Publisher
+from databuilder.task.base_task import Task
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PipelinedJob(DefaultJob):
+    """
+    A job that overlaps the task and the publisher. Instead of publishing once the task is complete, the loader
+    hands over chunks of finished files while the task is still running, and the publisher publishes them on a
+    separate thread, each chunk with the publisher's own transaction handling.
+
+    The number of chunks waiting to be published is bounded: once it is reached, the loader blocks until the
+    publisher catches up. If publishing a chunk fails, the task is aborted and the job fails. If the task fails,
+    the chunks that are not published yet, including the last chunk handed over when the task is closed, are
+    dropped. Chunks that were already published stay published.
+
+    The task's loader needs to support `register_chunk_listener` (e.g. FsNeo4jCSVLoader) and the publisher needs
+    to support `publish_chunk` (e.g. Neo4jCsvPublisher, Neo4jCsvUnwindPublisher).
+    Note that relations are published with the chunk of the record that produced them, so a relation can only be
+    created if its nodes were produced by the same or an earlier record.
+    """
+    # Config keys
+    MAX_PENDING_CHUNKS = 'max_pending_chunks'
+
+    _DEFAULT_CONFIG = ConfigFactory.from_dict({
+        MAX_PENDING_CHUNKS: 2
+    })
+
+    def __init__(self,
+                 conf: ConfigTree,
+                 task: Task,
+                 publisher: Publisher) -> None:
+        super(PipelinedJob, self).__init__(conf=conf, task=task, publisher=publisher)
+
+        loader = getattr(self.task, 'loader', None)
+        if not hasattr(loader, 'register_chunk_listener'):
+            raise RuntimeError(f'Loader of the task does not support handing over chunks: {loader}')
+        if not hasattr(self.publisher, 'publish_chunk'):
+            raise RuntimeError(f'Publisher does not support publishing chunks: {self.publisher}')
+
+        self._max_pending_chunks = \
+            self.scoped_conf.with_fallback(PipelinedJob._DEFAULT_CONFIG).get_int(PipelinedJob.MAX_PENDING_CHUNKS)
+        self._chunks: queue.Queue = queue.Queue(maxsize=self._max_pending_chunks)
+        self._publish_error: Optional[Exception] = None
+        self._aborted = threading.Event()
+        self._held_chunk: Optional[Tuple[List[str], List[str]]] = None
+
+    def _run_and_publish(self) -> None:
+        """
+        Runs the task while publishing the chunks handed over by its loader.
+        :return:
+        """
+        self.publisher.init(Scoped.get_scoped_conf(self.conf, self.publisher.get_scope()))
+        Job.closer.register(self.publisher.close)
+        self.task.loader.register_chunk_listener(self._on_chunk)  # type: ignore
+
+        publisher_thread = threading.Thread(target=self._publish_chunks, name='publisher', daemon=True)
+        publisher_thread.start()
+        try:
+            try:
+                self.task.run()
+            finally:
+                self.task.close()
+            # The task succeeded, so its last chunk can be published
+            self._put_held_chunk()
+        except Exception:
+            self._aborted.set()
+            if self._publish_error is None:
+                call_back.notify_callbacks(self.publisher.call_backs, is_success=False)
+                raise
+        finally:
+            self._put(None)
+            publisher_thread.join()
+
+        if self._publish_error:
+            call_back.notify_callbacks(self.publisher.call_backs, is_success=False)
+            raise self._publish_error
+
+        call_back.notify_callbacks(self.publisher.call_backs, is_success=True)
+
+    def _on_chunk(self, node_files: List[str], relation_files: List[str]) -> None:
+        # The loader also hands over its last, possibly partial, chunk when the task closes it, including when the
+        # task fails. A chunk is held back until the next one is handed over or the task succeeds, so that the
+        # last chunk of a failed task is never published.
+        self._put_held_chunk()
+        self._held_chunk = (node_files, relation_files)
+        if self._publish_error:
+            # Fail the task as soon as possible
+            raise RuntimeError('Aborting the task as publishing failed') from self._publish_error
+
+    def _put_held_chunk(self) -> None:
+        held_chunk, self._held_chunk = self._held_chunk, None
+        if held_chunk:
+            LOGGER.info('Queueing chunk of %i node files and %i relation files', len(held_chunk[0]),
+                        len(held_chunk[1]))
+            self._put(held_chunk)
+
+    def _put(self, chunk: Optional[Tuple[List[str], List[str]]]) -> None:
+        """
+        Blocks until there is room for the chunk, unless the publisher has stopped.
+        """
+        while self._publish_error is None:
+            try:
+                self._chunks.put(chunk, timeout=1)
+                return
+            except queue.Full:
+                pass
+
+    def _publish_chunks(self) -> None:
+        count = 0
+        while True:
+            chunk: Any = self._chunks.get()
+            if chunk is None:
+                LOGGER.info('Published %i chunks', count)
+                return
+            if self._aborted.is_set():
+                LOGGER.info('Skipping chunk as the task failed')
+                continue
+
+            try:
+                self.publisher.publish_chunk(*chunk)  # type: ignore
+                count += 1
+            except Exception as e:
+                LOGGER.exception('Failed to publish chunk')
+                self._publish_error = e
+                return
@@ -0,0 +1,36 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from typing import Any, Dict
+
+from pyhocon import ConfigTree
+
+from databuilder.loader.file_system_mysql_csv_loader import FSMySQLCSVLoader
+from databuilder.utils.arrow_utils import (
+    DEFAULT_RECORD_BATCH_SIZE, ArrowRecordWriter, get_arrow_writer,
+)
+
+
+class FSMySQLArrowLoader(FSMySQLCSVLoader):
+    """
+    Write table record Arrow IPC file(s) instead of CSV file(s), with the same columns.
+    The files are consumed by MySQLCSVPublisher as well, which read them in record batches
+    instead of parsing and inferring types of CSV values.
+    It shares the configuration scope of FSMySQLCSVLoader, and requires pyarrow.
+    """
+    # Config keys
+    RECORD_BATCH_SIZE = 'record_batch_size'
+
+    def init(self, conf: ConfigTree) -> None:
+        super().init(conf)
+        self._record_batch_size = conf.get_int(FSMySQLArrowLoader.RECORD_BATCH_SIZE, DEFAULT_RECORD_BATCH_SIZE)
+
+    def _get_writer(self,
+                    csv_record_dict: Dict[str, Any],
+                    file_mapping: Dict[Any, Any],
+                    key: Any,
+                    dir_path: str,
+                    file_suffix: str
+                    ) -> ArrowRecordWriter:
+        return get_arrow_writer(csv_record_dict, file_mapping, key, dir_path, file_suffix,
+                                closer=self._closer, batch_size=self._record_batch_size)
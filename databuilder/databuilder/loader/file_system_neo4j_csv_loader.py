@@ -7,16 +7,20 @@ import os
 import shutil
 from csv import DictWriter
 from typing import (
-    Any, Dict, FrozenSet,
+    Any, Callable, Dict, FrozenSet, List, Optional, Tuple,
 )
 
 from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder.job.base_job import Job
 from databuilder.loader.base_loader import Loader
-from databuilder.models.graph_serializable import GraphSerializable
+from databuilder.models.graph_serializable import (
+    NODE_KEY, NODE_LABEL, RELATION_END_KEY, RELATION_END_LABEL, RELATION_REVERSE_TYPE, RELATION_START_KEY,
+    RELATION_START_LABEL, RELATION_TYPE, GraphSerializable,
+)
 from databuilder.serializers import neo4_serializer
 from databuilder.utils.closer import Closer
+from databuilder.utils.delta_state_store import DeltaStateStore
 
 LOGGER = logging.getLogger(__name__)
 
@@ -32,17 +36,32 @@ class FsNeo4jCSVLoader(Loader):
     RELATION_DIR_PATH = 'relationship_dir_path'
     FORCE_CREATE_DIR = 'force_create_directory'
     SHOULD_DELETE_CREATED_DIR = 'delete_created_directories'
+    # Number of rows after which the written files are handed over to the chunk listener, if one is registered
+    CHUNK_SIZE = 'chunk_size'
+    # A DeltaStateStore instance. When set, rows that did not change since the last successful publish are
+    # written with their identifying columns only, so that the publisher merely marks them as still alive.
+    DELTA_STATE_STORE = 'delta_state_store'
 
     _DEFAULT_CONFIG = ConfigFactory.from_dict({
         SHOULD_DELETE_CREATED_DIR: True,
-        FORCE_CREATE_DIR: False
+        FORCE_CREATE_DIR: False,
+        CHUNK_SIZE: 50000
     })
 
+    _NODE_IDENTITY_KEYS = (NODE_KEY, NODE_LABEL)
+    _RELATION_IDENTITY_KEYS = (RELATION_START_LABEL, RELATION_END_LABEL, RELATION_START_KEY, RELATION_END_KEY,
+                               RELATION_TYPE, RELATION_REVERSE_TYPE)
+
     def __init__(self) -> None:
         self._node_file_mapping: Dict[Any, DictWriter] = {}
         self._relation_file_mapping: Dict[Any, DictWriter] = {}
         self._keys: Dict[FrozenSet[str], int] = {}
         self._closer = Closer()
+        self._chunk_listener: Optional[Callable[[List[str], List[str]], None]] = None
+        self._chunk_index = 0
+        self._chunk_row_count = 0
+        self._unchanged_row_count = 0
+        self._delta_state_store: Optional[DeltaStateStore] = None
 
     def init(self, conf: ConfigTree) -> None:
         """
@@ -61,6 +80,8 @@ class FsNeo4jCSVLoader(Loader):
         self._delete_created_dir = \
             conf.get_bool(FsNeo4jCSVLoader.SHOULD_DELETE_CREATED_DIR)
         self._force_create_dir = conf.get_bool(FsNeo4jCSVLoader.FORCE_CREATE_DIR)
+        self._chunk_size = conf.get_int(FsNeo4jCSVLoader.CHUNK_SIZE)
+        self._delta_state_store = conf.get(FsNeo4jCSVLoader.DELTA_STATE_STORE, None)
         self._create_directory(self._node_dir)
         self._create_directory(self._relation_dir)
 
@@ -108,22 +129,27 @@ class FsNeo4jCSVLoader(Loader):
         :return:
         """
 
+        node_dir = self._get_chunk_dir(self._node_dir)
         node = csv_serializable.next_node()
         while node:
-            node_dict = neo4_serializer.serialize_node(node)
+            node_dict = self._strip_unchanged(neo4_serializer.serialize_node(node),
+                                              FsNeo4jCSVLoader._NODE_IDENTITY_KEYS)
             key = (node.label, self._make_key(node_dict))
             file_suffix = '{}_{}'.format(*key)
             node_writer = self._get_writer(node_dict,
                                            self._node_file_mapping,
                                            key,
-                                           self._node_dir,
+                                           node_dir,
                                            file_suffix)
             node_writer.writerow(node_dict)
+            self._chunk_row_count += 1
             node = csv_serializable.next_node()
 
+        relation_dir = self._get_chunk_dir(self._relation_dir)
         relation = csv_serializable.next_relation()
         while relation:
-            relation_dict = neo4_serializer.serialize_relationship(relation)
+            relation_dict = self._strip_unchanged(neo4_serializer.serialize_relationship(relation),
+                                                  FsNeo4jCSVLoader._RELATION_IDENTITY_KEYS)
             key2 = (relation.start_label,
                     relation.end_label,
                     relation.type,
@@ -133,11 +159,72 @@ class FsNeo4jCSVLoader(Loader):
             relation_writer = self._get_writer(relation_dict,
                                                self._relation_file_mapping,
                                                key2,
-                                               self._relation_dir,
+                                               relation_dir,
                                                file_suffix)
             relation_writer.writerow(relation_dict)
+            self._chunk_row_count += 1
             relation = csv_serializable.next_relation()
 
+        # Chunks are only cut between records, so that relations find the nodes of the same record
+        if self._chunk_listener and self._chunk_row_count >= self._chunk_size:
+            self._hand_off_chunk()
+
+    def _strip_unchanged(self, row: Dict[str, Any], identity_keys: Tuple[str, ...]) -> Dict[str, Any]:
+        """
+        Reduces a row that did not change since the last successful publish to its identifying columns.
+        :param row: The serialized node or relationship
+        :param identity_keys: Columns identifying the node or relationship
+        :return:
+        """
+        if self._delta_state_store is None:
+            return row
+
+        key = '\x1f'.join(str(row[k]) for k in identity_keys)
+        if not self._delta_state_store.is_unchanged(key, row):
+            return row
+
+        self._unchanged_row_count += 1
+        return {k: row[k] for k in identity_keys}
+
+    def register_chunk_listener(self, chunk_listener: Callable[[List[str], List[str]], None]) -> None:
+        """
+        Registers a callable that receives the node files and relationship files of each finished chunk.
+        Once registered, the loader writes each chunk into its own sub directory and hands it over every
+        chunk_size rows, and when the loader is closed.
+        :param chunk_listener:
+        :return:
+        """
+        self._chunk_listener = chunk_listener
+
+    def _get_chunk_dir(self, path: str) -> str:
+        if not self._chunk_listener:
+            return path
+
+        chunk_dir = os.path.join(path, f'chunk_{self._chunk_index}')
+        os.makedirs(chunk_dir, exist_ok=True)
+        return chunk_dir
+
+    def _hand_off_chunk(self) -> None:
+        """
+        Closes the files of the current chunk and hands them over to the chunk listener.
+        :return:
+        """
+        if not self._chunk_listener or not self._chunk_row_count:
+            return
+
+        self._closer.close()
+        self._node_file_mapping.clear()
+        self._relation_file_mapping.clear()
+
+        node_dir = self._get_chunk_dir(self._node_dir)
+        relation_dir = self._get_chunk_dir(self._relation_dir)
+        self._chunk_index += 1
+        self._chunk_row_count = 0
+
+        LOGGER.info('Handing over chunk %s', node_dir)
+        self._chunk_listener([os.path.join(node_dir, f) for f in sorted(os.listdir(node_dir))],
+                             [os.path.join(relation_dir, f) for f in sorted(os.listdir(relation_dir))])
+
     def _get_writer(self,
                     csv_record_dict: Dict[str, Any],
                     file_mapping: Dict[Any, DictWriter],
@@ -179,9 +266,15 @@ class FsNeo4jCSVLoader(Loader):
     def close(self) -> None:
         """
         Any closeable callable registered in _closer, it will close.
+        If a chunk listener is registered, the last chunk is handed over.
         :return:
         """
+        if self._chunk_listener:
+            self._hand_off_chunk()
         self._closer.close()
+        if self._delta_state_store is not None:
+            LOGGER.info('%i rows did not change since the last publish', self._unchanged_row_count)
+            self._delta_state_store.close()
 
     def get_scope(self) -> str:
         return "loader.filesystem_csv_neo4j"
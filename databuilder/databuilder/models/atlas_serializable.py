@@ -15,6 +15,8 @@ class AtlasSerializable(object, metaclass=abc.ABCMeta):
 
     Any model class that needs to be pushed to a atlas should inherit this class.
     """
+    # Subclasses may define __slots__ to avoid the per-instance __dict__
+    __slots__ = ()
 
     @abc.abstractmethod
     def create_next_atlas_entity(self) -> Union[AtlasEntity, None]:
@@ -24,6 +24,8 @@ from databuilder.utils.atlas import AtlasRelationshipTypes, AtlasSerializedEntit
 
 
 class Badge:
+    __slots__ = ('name', 'category')
+
     def __init__(self, name: str, category: str):
         # Amundsen UI always formats badge display with first letter capitalized while other letters are lowercase.
         # Clicking table badges in UI always results in searching lower cases badges
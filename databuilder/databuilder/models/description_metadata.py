@@ -29,6 +29,9 @@ class DescriptionMetadata(GraphSerializable, AtlasSerializable):
     # The default editable source.
     DEFAULT_SOURCE = "description"
 
+    __slots__ = ('source', 'text', 'label', 'start_label', 'start_key', 'description_key', '_node_iter',
+                 '_relation_iter')
+
     def __init__(self,
                  text: Optional[str],
                  source: str = DEFAULT_SOURCE,
@@ -52,8 +55,9 @@ class DescriptionMetadata(GraphSerializable, AtlasSerializable):
         self.start_key = start_key
         self.description_key = description_key or self.get_description_default_key(start_key)
 
-        self._node_iter = self._create_node_iterator()
-        self._relation_iter = self._create_relation_iterator()
+        # Iterators are created on first use
+        self._node_iter: Optional[Iterator[GraphNode]] = None
+        self._relation_iter: Optional[Iterator[GraphRelationship]] = None
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, DescriptionMetadata):
@@ -119,12 +123,16 @@ class DescriptionMetadata(GraphSerializable, AtlasSerializable):
 
     def create_next_node(self) -> Optional[GraphNode]:
         # return the string representation of the data
+        if self._node_iter is None:
+            self._node_iter = self._create_node_iterator()
         try:
             return next(self._node_iter)
         except StopIteration:
             return None
 
     def create_next_relation(self) -> Optional[GraphRelationship]:
+        if self._relation_iter is None:
+            self._relation_iter = self._create_relation_iterator()
         try:
             return next(self._relation_iter)
         except StopIteration:
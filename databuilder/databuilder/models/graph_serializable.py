@@ -25,6 +25,8 @@ class GraphSerializable(object, metaclass=abc.ABCMeta):
 
     Any model class that needs to be pushed to a graph database should inherit this class.
     """
+    # Subclasses may define __slots__ to avoid the per-instance __dict__
+    __slots__ = ()
 
     def __init__(self) -> None:
         pass
@@ -67,16 +67,19 @@ class TagMetadata(GraphSerializable, TableSerializable, AtlasSerializable):
     TAG_ENTITY_RELATION_TYPE = 'TAG'
     ENTITY_TAG_RELATION_TYPE = 'TAGGED_BY'
 
+    __slots__ = ('_name', '_tag_type', '_nodes', '_relations', '_records', '_atlas_entity_iterator')
+
     def __init__(self,
                  name: str,
                  tag_type: str = 'default',
                  ):
         self._name = name
         self._tag_type = tag_type
-        self._nodes = self._create_node_iterator()
-        self._relations = self._create_relation_iterator()
-        self._records = self._create_record_iterator()
-        self._atlas_entity_iterator = self._create_next_atlas_entity()
+        # Iterators are created on first use
+        self._nodes: Optional[Iterator[GraphNode]] = None
+        self._relations: Optional[Iterator[GraphRelationship]] = None
+        self._records: Optional[Iterator[RDSModel]] = None
+        self._atlas_entity_iterator: Optional[Iterator[AtlasEntity]] = None
 
     @staticmethod
     def get_tag_key(name: str) -> str:
@@ -103,6 +106,8 @@ class TagMetadata(GraphSerializable, TableSerializable, AtlasSerializable):
 
     def create_next_node(self) -> Optional[GraphNode]:
         # return the string representation of the data
+        if self._nodes is None:
+            self._nodes = self._create_node_iterator()
         try:
             return next(self._nodes)
         except StopIteration:
@@ -110,12 +115,16 @@ class TagMetadata(GraphSerializable, TableSerializable, AtlasSerializable):
 
     def create_next_relation(self) -> Optional[GraphRelationship]:
         # We don't emit any relations for Tag ingestion
+        if self._relations is None:
+            self._relations = self._create_relation_iterator()
         try:
             return next(self._relations)
         except StopIteration:
             return None
 
     def create_next_record(self) -> Union[RDSModel, None]:
+        if self._records is None:
+            self._records = self._create_record_iterator()
         try:
             return next(self._records)
         except StopIteration:
@@ -170,6 +179,8 @@ class TagMetadata(GraphSerializable, TableSerializable, AtlasSerializable):
         yield self._create_atlas_glossary_entity()
 
     def create_next_atlas_entity(self) -> Union[AtlasEntity, None]:
+        if self._atlas_entity_iterator is None:
+            self._atlas_entity_iterator = self._create_next_atlas_entity()
         try:
             return next(self._atlas_entity_iterator)
         except StopIteration:
@@ -185,6 +196,9 @@ class ColumnMetadata:
     COLUMN_DESCRIPTION = 'description'
     COLUMN_DESCRIPTION_FORMAT = '{db}://{cluster}.{schema}/{tbl}/{col}/{description_id}'
 
+    # Extractions may keep millions of columns alive, slots keep them compact
+    __slots__ = ('name', 'description', 'type', 'sort_order', 'badges', '_column_key', '_type_metadata')
+
     def __init__(self,
                  name: str,
                  description: Union[str, None],
@@ -273,6 +287,10 @@ class TableMetadata(GraphSerializable, TableSerializable, AtlasSerializable):
     serialized_rels_keys: Set[Any] = set()
     serialized_records_keys: Set[Any] = set()
 
+    __slots__ = ('database', 'cluster', 'schema', 'name', 'description', 'columns', 'is_view', 'attrs', 'tags',
+                 '_node_iterator', '_relation_iterator', '_record_iterator', '_atlas_entity_iterator',
+                 '_atlas_relation_iterator')
+
     def __init__(self,
                  database: str,
                  cluster: str,
@@ -311,11 +329,12 @@ class TableMetadata(GraphSerializable, TableSerializable, AtlasSerializable):
         if kwargs:
             self.attrs = copy.deepcopy(kwargs)
 
-        self._node_iterator = self._create_next_node()
-        self._relation_iterator = self._create_next_relation()
-        self._record_iterator = self._create_record_iterator()
-        self._atlas_entity_iterator = self._create_next_atlas_entity()
-        self._atlas_relation_iterator = self._create_atlas_relation_iterator()
+        # Iterators are created on first use, as a table is usually serialized for a single target
+        self._node_iterator: Optional[Iterator[GraphNode]] = None
+        self._relation_iterator: Optional[Iterator[GraphRelationship]] = None
+        self._record_iterator: Optional[Iterator[RDSModel]] = None
+        self._atlas_entity_iterator: Optional[Iterator[AtlasEntity]] = None
+        self._atlas_relation_iterator: Optional[Iterator[AtlasRelationship]] = None
 
     def __repr__(self) -> str:
         return f'TableMetadata({self.database!r}, {self.cluster!r}, {self.schema!r}, {self.name!r} ' \
@@ -369,6 +388,8 @@ class TableMetadata(GraphSerializable, TableSerializable, AtlasSerializable):
         return _format_as_list(tags)
 
     def create_next_node(self) -> Union[GraphNode, None]:
+        if self._node_iterator is None:
+            self._node_iterator = self._create_next_node()
         try:
             return next(self._node_iterator)
         except StopIteration:
@@ -466,6 +487,8 @@ class TableMetadata(GraphSerializable, TableSerializable, AtlasSerializable):
             yield from type_metadata.create_node_iterator()
 
     def create_next_relation(self) -> Union[GraphRelationship, None]:
+        if self._relation_iterator is None:
+            self._relation_iterator = self._create_next_relation()
         try:
             return next(self._relation_iterator)
         except StopIteration:
@@ -562,6 +585,8 @@ class TableMetadata(GraphSerializable, TableSerializable, AtlasSerializable):
             yield from type_metadata.create_relation_iterator()
 
     def create_next_record(self) -> Union[RDSModel, None]:
+        if self._record_iterator is None:
+            self._record_iterator = self._create_record_iterator()
         try:
             return next(self._record_iterator)
         except StopIteration:
@@ -811,6 +836,8 @@ class TableMetadata(GraphSerializable, TableSerializable, AtlasSerializable):
             yield tag_relation
 
     def create_next_atlas_relation(self) -> Union[AtlasRelationship, None]:
+        if self._atlas_relation_iterator is None:
+            self._atlas_relation_iterator = self._create_atlas_relation_iterator()
         try:
             return next(self._atlas_relation_iterator)
         except StopIteration:
@@ -832,6 +859,8 @@ class TableMetadata(GraphSerializable, TableSerializable, AtlasSerializable):
                     yield tag_entity
 
     def create_next_atlas_entity(self) -> Union[AtlasEntity, None]:
+        if self._atlas_entity_iterator is None:
+            self._atlas_entity_iterator = self._create_next_atlas_entity()
         try:
             return next(self._atlas_entity_iterator)
         except StopIteration:
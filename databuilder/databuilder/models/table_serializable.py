@@ -14,6 +14,8 @@ class TableSerializable(object, metaclass=abc.ABCMeta):
 
     Any model class that needs to be pushed to a relational database should inherit this class.
     """
+    # Subclasses may define __slots__ to avoid the per-instance __dict__
+    __slots__ = ()
 
     def __init__(self) -> None:
         pass
@@ -28,6 +28,9 @@ class TypeMetadata(abc.ABC, GraphSerializable):
     DATA_TYPE = 'data_type'
     SORT_ORDER = 'sort_order'
 
+    __slots__ = ('name', 'parent', 'type_str', 'sort_order', '_description', '_badges', '_node_iter',
+                 '_relation_iter')
+
     @abc.abstractmethod
     def __init__(self,
                  name: str,
@@ -43,8 +46,9 @@ class TypeMetadata(abc.ABC, GraphSerializable):
         self._description: Optional[DescriptionMetadata] = None
         self._badges: Optional[List[Badge]] = None
 
-        self._node_iter = self.create_node_iterator()
-        self._relation_iter = self.create_relation_iterator()
+        # Iterators are created on first use
+        self._node_iter: Optional[Iterator[GraphNode]] = None
+        self._relation_iter: Optional[Iterator[GraphRelationship]] = None
 
     def get_description(self) -> Optional[DescriptionMetadata]:
         return self._description
@@ -103,12 +107,16 @@ class TypeMetadata(abc.ABC, GraphSerializable):
         raise NotImplementedError
 
     def create_next_node(self) -> Optional[GraphNode]:
+        if self._node_iter is None:
+            self._node_iter = self.create_node_iterator()
         try:
             return next(self._node_iter)
         except StopIteration:
             return None
 
     def create_next_relation(self) -> Optional[GraphRelationship]:
+        if self._relation_iter is None:
+            self._relation_iter = self.create_relation_iterator()
         try:
             return next(self._relation_iter)
         except StopIteration:
@@ -154,6 +162,8 @@ class TypeMetadata(abc.ABC, GraphSerializable):
 class ArrayTypeMetadata(TypeMetadata):
     kind = 'array'
 
+    __slots__ = ('array_inner_type',)
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super(ArrayTypeMetadata, self).__init__(*args, **kwargs)
         self.array_inner_type: Optional[TypeMetadata] = None
@@ -241,6 +251,8 @@ class ArrayTypeMetadata(TypeMetadata):
 class MapTypeMetadata(TypeMetadata):
     kind = 'map'
 
+    __slots__ = ('map_key_type', 'map_value_type')
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super(MapTypeMetadata, self).__init__(*args, **kwargs)
         self.map_key_type: Optional[TypeMetadata] = None
@@ -339,6 +351,8 @@ class ScalarTypeMetadata(TypeMetadata):
     """
     kind = 'scalar'
 
+    __slots__ = ()
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super(ScalarTypeMetadata, self).__init__(*args, **kwargs)
 
@@ -416,6 +430,8 @@ class ScalarTypeMetadata(TypeMetadata):
 class StructTypeMetadata(TypeMetadata):
     kind = 'struct'
 
+    __slots__ = ('struct_items',)
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super(StructTypeMetadata, self).__init__(*args, **kwargs)
         self.struct_items: Optional[Dict[str, TypeMetadata]] = None
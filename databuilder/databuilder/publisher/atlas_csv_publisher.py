@@ -1,13 +1,16 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from os import listdir
 from os.path import isfile, join
 from typing import (
-    Any, Dict, Iterator, List, Tuple,
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple,
 )
 
-import pandas
 from amundsen_common.utils.atlas import AtlasCommonParams, AtlasCommonTypes
 from apache_atlas.exceptions import AtlasServiceException
 from apache_atlas.model.glossary import (
@@ -21,16 +24,39 @@ from apache_atlas.model.typedef import AtlasClassificationDef, AtlasTypesDef
 from pyhocon import ConfigTree
 
 from databuilder.publisher.base_publisher import Publisher
+from databuilder.publisher.publisher_config_constants import PublisherConfigs
 from databuilder.types.atlas import AtlasEntityInitializer
 from databuilder.utils.atlas import (
     AtlasRelationshipTypes, AtlasSerializedEntityFields, AtlasSerializedEntityOperation,
     AtlasSerializedRelationshipFields,
 )
+from databuilder.utils.publisher_utils import (
+    DEFAULT_CSV_READ_BATCH_SIZE, chunkify_list, read_records_in_batches,
+)
 
 LOGGER = logging.getLogger(__name__)
 
+# Phases whose throughput is measured
+ENTITY_CREATE_PHASE = 'entity_create'
+ENTITY_UPDATE_PHASE = 'entity_update'
+GLOSSARY_TERM_PHASE = 'glossary_term'
+CLASSIFICATION_PHASE = 'classification'
+GUID_RESOLUTION_PHASE = 'guid_resolution'
+RELATION_PHASE = 'relation'
+
 
 class AtlasCSVPublisher(Publisher):
+    """
+    A Publisher takes entity and relationship CSV files and syncs them to Atlas: entities first, then relations.
+
+    With more than one entity sync worker, the entity chunks of each batch of records, and the entities to update,
+    are sent concurrently. Batches are synced one after another, so entities of earlier files exist when the
+    entities referencing them are created.
+
+    With bulk relationships, the GUIDs of the relation ends are resolved in batches per entity type and kept in a
+    bounded LRU cache, and relations are created concurrently on the same workers, referring to the ends by GUID.
+    Ends whose GUID cannot be resolved are referred to by qualified name, as without bulk relationships.
+    """
     # atlas client
     ATLAS_CLIENT = 'atlas_client'
     # A directory that contains CSV files for entities
@@ -41,6 +67,16 @@ class AtlasCSVPublisher(Publisher):
     ATLAS_ENTITY_CREATE_BATCH_SIZE = 'batch_size'
     # whether entity types should be registered before data is synced to Atlas
     REGISTER_ENTITY_TYPES = 'register_entity_types'
+    # number of CSV rows held in memory at a time
+    CSV_READ_BATCH_SIZE = PublisherConfigs.CSV_READ_BATCH_SIZE
+    # number of threads sending entity chunks, entity updates and relations to atlas
+    ENTITY_SYNC_WORKERS = 'entity_sync_workers'
+    # whether relation ends are resolved to GUIDs in batches before the relations are created concurrently
+    BULK_RELATIONSHIPS = 'bulk_relationships'
+    # number of qualified names resolved to GUIDs per request
+    GUID_LOOKUP_BATCH_SIZE = 'guid_lookup_batch_size'
+    # number of resolved GUIDs kept in memory
+    GUID_CACHE_SIZE = 'guid_cache_size'
 
     def __init__(self) -> None:
         super().__init__()
@@ -51,6 +87,16 @@ class AtlasCSVPublisher(Publisher):
         self._config = conf
         self._atlas_client = self._config.get(AtlasCSVPublisher.ATLAS_CLIENT)
         self._register_entity_types = self._config.get_bool(AtlasCSVPublisher.REGISTER_ENTITY_TYPES, True)
+        self._csv_read_batch_size = self._config.get_int(AtlasCSVPublisher.CSV_READ_BATCH_SIZE,
+                                                         DEFAULT_CSV_READ_BATCH_SIZE)
+        self._entity_sync_workers = self._config.get_int(AtlasCSVPublisher.ENTITY_SYNC_WORKERS, 1)
+        self._bulk_relationships = self._config.get_bool(AtlasCSVPublisher.BULK_RELATIONSHIPS, False)
+        self._guid_lookup_batch_size = self._config.get_int(AtlasCSVPublisher.GUID_LOOKUP_BATCH_SIZE, 100)
+        self._guid_cache_size = self._config.get_int(AtlasCSVPublisher.GUID_CACHE_SIZE, 100000)
+        self._guid_cache: 'OrderedDict[Tuple[str, str], str]' = OrderedDict()
+        self._guid_cache_lock = threading.Lock()
+        # phase -> [number of items, elapsed seconds]
+        self._phase_metrics: Dict[str, List[float]] = {}
 
         if self._register_entity_types:
             LOGGER.info('Registering Atlas Entity Types.')
@@ -83,33 +129,73 @@ class AtlasCSVPublisher(Publisher):
         """
         LOGGER.info('Creating entities using Entity files: %s', self._entity_files)
         for entity_file in self._entity_files:
-            entities_to_create, entities_to_update, \
-                glossary_terms_create, classifications_create = self._create_entity_instances(entity_file=entity_file)
-            self._sync_entities_to_atlas(entities_to_create)
-            self._update_entities(entities_to_update)
-            self._create_glossary_terms(glossary_terms_create)
-            self._create_classifications(classifications_create)
+            for entity_records in read_records_in_batches(entity_file, self._csv_read_batch_size):
+                entities_to_create, entities_to_update, glossary_terms_create, classifications_create = \
+                    self._create_entity_instances(entity_records=entity_records)
+                with self._measure(ENTITY_CREATE_PHASE, len(entities_to_create)):
+                    self._sync_entities_to_atlas(entities_to_create)
+                with self._measure(ENTITY_UPDATE_PHASE, len(entities_to_update)):
+                    self._update_entities(entities_to_update)
+                with self._measure(GLOSSARY_TERM_PHASE, len(glossary_terms_create)):
+                    self._create_glossary_terms(glossary_terms_create)
+                with self._measure(CLASSIFICATION_PHASE, len(classifications_create)):
+                    self._create_classifications(classifications_create)
 
         LOGGER.info('Creating relations using relation files: %s', self._relationship_files)
         for relation_file in self._relationship_files:
             self._create_relations(relation_file=relation_file)
 
+        self._log_phase_metrics()
+
+    def get_phase_metrics(self) -> Dict[str, Tuple[int, float]]:
+        """
+        :return: Number of items synced and elapsed seconds of each phase, e.g. entity_create or relation
+        """
+        return {phase: (int(count), elapsed) for phase, (count, elapsed) in self._phase_metrics.items()}
+
+    def _measure(self, phase: str, count: int) -> '_PhaseMeasure':
+        return _PhaseMeasure(self._phase_metrics, phase, count)
+
+    def _log_phase_metrics(self) -> None:
+        for phase, (count, elapsed) in self.get_phase_metrics().items():
+            LOGGER.info('Synced %i items in phase %s in %.1f seconds, %.1f per second',
+                        count, phase, elapsed, count / elapsed if elapsed else 0)
+
+    def _run_concurrently(self, function: Callable[[Any], None], items: List[Any]) -> None:
+        """
+        Calls the function on each item, on the entity sync workers. Returns once all items are done.
+        :param function:
+        :param items:
+        :return:
+        """
+        if self._entity_sync_workers <= 1 or len(items) <= 1:
+            for item in items:
+                function(item)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self._entity_sync_workers, len(items)),
+                                thread_name_prefix='atlas_publisher') as executor:
+            for _ in executor.map(function, items):
+                pass
+
     def _update_entities(self, entities_to_update: List[AtlasEntity]) -> None:
         """
         Go over the entities list , create atlas relationships instances and sync them with atlas
         :param entities_to_update:
         :return:
         """
-        for entity_to_update in entities_to_update:
-            existing_entity = self._atlas_client.entity.get_entity_by_attribute(
-                entity_to_update.attributes[AtlasCommonParams.type_name],
-                [(AtlasCommonParams.qualified_name, entity_to_update.attributes[AtlasCommonParams.qualified_name])],
-            )
-            existing_entity.entity.attributes.update(entity_to_update.attributes)
-            try:
-                self._atlas_client.entity.update_entity(existing_entity)
-            except AtlasServiceException:
-                LOGGER.error('Fail to update entity', exc_info=True)
+        self._run_concurrently(self._update_entity, entities_to_update)
+
+    def _update_entity(self, entity_to_update: AtlasEntity) -> None:
+        existing_entity = self._atlas_client.entity.get_entity_by_attribute(
+            entity_to_update.attributes[AtlasCommonParams.type_name],
+            [(AtlasCommonParams.qualified_name, entity_to_update.attributes[AtlasCommonParams.qualified_name])],
+        )
+        existing_entity.entity.attributes.update(entity_to_update.attributes)
+        try:
+            self._atlas_client.entity.update_entity(existing_entity)
+        except AtlasServiceException:
+            LOGGER.error('Fail to update entity', exc_info=True)
 
     def _create_relations(self, relation_file: str) -> None:
         """
@@ -118,8 +204,9 @@ class AtlasCSVPublisher(Publisher):
         :return:
         """
 
-        with open(relation_file, encoding='utf8') as relation_csv:
-            for relation_record in pandas.read_csv(relation_csv, na_filter=False).to_dict(orient='records'):
+        for relation_records in read_records_in_batches(relation_file, self._csv_read_batch_size):
+            relation_dicts = []
+            for relation_record in relation_records:
                 if relation_record[AtlasSerializedRelationshipFields.relation_type] == AtlasRelationshipTypes.tag:
                     self._assign_glossary_term(relation_record)
                     continue
@@ -127,13 +214,99 @@ class AtlasCSVPublisher(Publisher):
                     self._assign_classification(relation_record)
                     continue
 
-                relation = self._create_relation(relation_record)
-                try:
-                    self._atlas_client.relationship.create_relationship(relation)
-                except AtlasServiceException:
-                    LOGGER.error('Fail to create atlas relationship', exc_info=True)
-                except Exception as e:
-                    LOGGER.error(e)
+                if not self._bulk_relationships:
+                    with self._measure(RELATION_PHASE, 1):
+                        self._create_relationship(self._create_relation(relation_record))
+                    continue
+                relation_dicts.append(relation_record)
+
+            if relation_dicts:
+                self._create_relations_in_bulk(relation_dicts)
+
+    def _create_relations_in_bulk(self, relation_dicts: List[Dict[str, str]]) -> None:
+        """
+        Resolve the GUIDs of the relation ends in batches, then create the relations concurrently
+        :param relation_dicts:
+        :return:
+        """
+        ends = set()
+        for relation_dict in relation_dicts:
+            ends.add((relation_dict[AtlasSerializedRelationshipFields.entity_type_1],
+                      relation_dict[AtlasSerializedRelationshipFields.qualified_name_1]))
+            ends.add((relation_dict[AtlasSerializedRelationshipFields.entity_type_2],
+                      relation_dict[AtlasSerializedRelationshipFields.qualified_name_2]))
+        self._resolve_guids(ends)
+
+        relations = [self._create_relation(relation_dict) for relation_dict in relation_dicts]
+        with self._measure(RELATION_PHASE, len(relations)):
+            self._run_concurrently(self._create_relationship, relations)
+
+    def _create_relationship(self, relation: AtlasRelationship) -> None:
+        try:
+            self._atlas_client.relationship.create_relationship(relation)
+        except AtlasServiceException:
+            LOGGER.error('Fail to create atlas relationship', exc_info=True)
+        except Exception as e:
+            LOGGER.error(e)
+
+    def _resolve_guids(self, entities: Iterable[Tuple[str, str]]) -> None:
+        """
+        Look up the GUIDs of the entities missing from the GUID cache, guid_lookup_batch_size entities of the same
+        type per request, and add them to the cache
+        :param entities: (entity type, qualified name) pairs
+        :return:
+        """
+        qualified_names_by_type: Dict[str, List[str]] = {}
+        for entity_type, qualified_name in entities:
+            if self._get_cached_guid(entity_type, qualified_name) is None:
+                qualified_names_by_type.setdefault(entity_type, []).append(qualified_name)
+
+        lookups = [(entity_type, chunk) for entity_type, qualified_names in qualified_names_by_type.items()
+                   for chunk in chunkify_list(qualified_names, self._guid_lookup_batch_size)]
+        with self._measure(GUID_RESOLUTION_PHASE, sum(len(chunk) for _, chunk in lookups)):
+            self._run_concurrently(self._lookup_guids, lookups)
+
+    def _lookup_guids(self, lookup: Tuple[str, List[str]]) -> None:
+        entity_type, qualified_names = lookup
+        try:
+            result = self._atlas_client.entity.get_entities_by_attribute(
+                entity_type,
+                [{AtlasCommonParams.qualified_name: qualified_name} for qualified_name in qualified_names],
+                min_ext_info=True,
+                ignore_relationships=True,
+            )
+        except AtlasServiceException:
+            LOGGER.warning('Fail to look up GUIDs of %i %s entities', len(qualified_names), entity_type,
+                           exc_info=True)
+            return
+
+        for entity in (result.entities or []) if result else []:
+            qualified_name = (entity.attributes or {}).get(AtlasCommonParams.qualified_name)
+            if entity.guid and qualified_name:
+                self._cache_guid(entity_type, qualified_name, entity.guid)
+
+    def _get_cached_guid(self, entity_type: str, qualified_name: str) -> Optional[str]:
+        with self._guid_cache_lock:
+            guid = self._guid_cache.get((entity_type, qualified_name))
+            if guid is not None:
+                self._guid_cache.move_to_end((entity_type, qualified_name))
+            return guid
+
+    def _cache_guid(self, entity_type: str, qualified_name: str, guid: str) -> None:
+        with self._guid_cache_lock:
+            self._guid_cache[(entity_type, qualified_name)] = guid
+            self._guid_cache.move_to_end((entity_type, qualified_name))
+            if len(self._guid_cache) > self._guid_cache_size:
+                self._guid_cache.popitem(last=False)
+
+    def _get_entity_guid(self, entity_type: str, qualified_name: str) -> str:
+        guid = self._get_cached_guid(entity_type, qualified_name)
+        if guid is None:
+            entity = self._atlas_client.entity.get_entity_by_attribute(entity_type, uniq_attributes=[
+                (AtlasCommonParams.qualified_name, qualified_name)])
+            guid = entity.entity.guid
+            self._cache_guid(entity_type, qualified_name, guid)
+        return guid
 
     def _render_unique_attributes(self, entity_type: str, qualified_name: str) -> Dict[Any, Any]:
         """
@@ -153,6 +326,9 @@ class AtlasCSVPublisher(Publisher):
         return AtlasRelatedObjectId(attrs=self._render_unique_attributes(entity_type, qn))
 
     def _get_atlas_object_id_by_qn(self, entity_type: str, qn: str) -> AtlasObjectId:
+        guid = self._get_cached_guid(entity_type, qn) if self._bulk_relationships else None
+        if guid is not None:
+            return AtlasObjectId(attrs={AtlasCommonParams.guid: guid, AtlasCommonParams.type_name: entity_type})
         return AtlasObjectId(attrs=self._render_unique_attributes(entity_type, qn))
 
     def _create_relation(self, relation_dict: Dict[str, str]) -> AtlasRelationship:
@@ -176,31 +352,30 @@ class AtlasCSVPublisher(Publisher):
 
         return relation
 
-    def _create_entity_instances(self, entity_file: str) -> Tuple[List[AtlasEntity], List[AtlasEntity],
-                                                                  List[Dict], List[Dict]]:
+    def _create_entity_instances(self, entity_records: List[Dict]) -> Tuple[List[AtlasEntity], List[AtlasEntity],
+                                                                            List[Dict], List[Dict]]:
         """
-        Go over the entities file and try creating instances
-        :param entity_file:
+        Go over the entity records read from an entities file and try creating instances
+        :param entity_records:
         :return:
         """
         entities_to_create = []
         entities_to_update = []
         glossary_terms_to_create = []
         classifications_to_create = []
-        with open(entity_file, encoding='utf8') as entity_csv:
-            for entity_record in pandas.read_csv(entity_csv, na_filter=False).to_dict(orient='records'):
-                if entity_record[AtlasSerializedEntityFields.type_name] == AtlasCommonTypes.tag:
-                    glossary_terms_to_create.append(entity_record)
-                    continue
-
-                if entity_record[AtlasSerializedEntityFields.type_name] == AtlasCommonTypes.badge:
-                    classifications_to_create.append(entity_record)
-                    continue
-
-                if entity_record[AtlasSerializedEntityFields.operation] == AtlasSerializedEntityOperation.CREATE:
-                    entities_to_create.append(self._create_entity_from_dict(entity_record))
-                if entity_record[AtlasSerializedEntityFields.operation] == AtlasSerializedEntityOperation.UPDATE:
-                    entities_to_update.append(self._create_entity_from_dict(entity_record))
+        for entity_record in entity_records:
+            if entity_record[AtlasSerializedEntityFields.type_name] == AtlasCommonTypes.tag:
+                glossary_terms_to_create.append(entity_record)
+                continue
+
+            if entity_record[AtlasSerializedEntityFields.type_name] == AtlasCommonTypes.badge:
+                classifications_to_create.append(entity_record)
+                continue
+
+            if entity_record[AtlasSerializedEntityFields.operation] == AtlasSerializedEntityOperation.CREATE:
+                entities_to_create.append(self._create_entity_from_dict(entity_record))
+            if entity_record[AtlasSerializedEntityFields.operation] == AtlasSerializedEntityOperation.UPDATE:
+                entities_to_update.append(self._create_entity_from_dict(entity_record))
         return entities_to_create, entities_to_update, glossary_terms_to_create, classifications_to_create
 
     def _extract_entity_relations_details(self, relation_details: str) -> Iterator[Tuple]:
@@ -246,15 +421,16 @@ class AtlasCSVPublisher(Publisher):
         :param entities: list of entities
         :return:
         """
-        entities_chunks = self._chunks(entities)
-        for entity_chunk in entities_chunks:
-            LOGGER.info(f'Syncing chunk of {len(entity_chunk)} entities with atlas')
-            chunk = AtlasEntitiesWithExtInfo()
-            chunk.entities = entity_chunk
-            try:
-                self._atlas_client.entity.create_entities(chunk)
-            except AtlasServiceException:
-                LOGGER.error('Error during entity syncing', exc_info=True)
+        self._run_concurrently(self._sync_entity_chunk, list(self._chunks(entities)))
+
+    def _sync_entity_chunk(self, entity_chunk: List[AtlasEntity]) -> None:
+        LOGGER.info(f'Syncing chunk of {len(entity_chunk)} entities with atlas')
+        chunk = AtlasEntitiesWithExtInfo()
+        chunk.entities = entity_chunk
+        try:
+            self._atlas_client.entity.create_entities(chunk)
+        except AtlasServiceException:
+            LOGGER.error('Error during entity syncing', exc_info=True)
 
     def _create_glossary_terms(self, glossary_terms: List[Dict]) -> None:
         for glossary_term_spec in glossary_terms:
@@ -296,10 +472,7 @@ class AtlasCSVPublisher(Publisher):
         term = next(filter(lambda t: t.get('name') == term_name,
                            self._atlas_client.glossary.get_glossary_terms(glossary_guid)))
 
-        entity = self._atlas_client.entity.get_entity_by_attribute(entity_type, uniq_attributes=[
-            (AtlasCommonParams.qualified_name, entity_qn)])
-
-        entity_guid = entity.entity.guid
+        entity_guid = self._get_entity_guid(entity_type, entity_qn)
 
         e = AtlasRelatedObjectId({AtlasCommonParams.guid: entity_guid, AtlasCommonParams.type_name: entity_type})
 
@@ -361,3 +534,22 @@ class AtlasCSVPublisher(Publisher):
 
     def get_scope(self) -> str:
         return 'publisher.atlas_csv_publisher'
+
+
+class _PhaseMeasure:
+    """
+    Adds the number of items and the elapsed time of a block to the metrics of a phase.
+    """
+
+    def __init__(self, phase_metrics: Dict[str, List[float]], phase: str, count: int) -> None:
+        self._phase_metrics = phase_metrics
+        self._phase = phase
+        self._count = count
+
+    def __enter__(self) -> None:
+        self._start = time.time()
+
+    def __exit__(self, *args: Any) -> None:
+        metrics = self._phase_metrics.setdefault(self._phase, [0, 0.0])
+        metrics[0] += self._count
+        metrics[1] += time.time() - self._start
@@ -8,17 +8,24 @@ from os.path import (
     basename, isfile, join, splitext,
 )
 from typing import (
-    Dict, List, Optional, Type,
+    Any, Dict, List, Optional, Tuple, Type,
 )
 
-import pandas
 from amundsen_rds.models import RDSModel
 from amundsen_rds.models.base import Base
 from pyhocon import ConfigFactory, ConfigTree
-from sqlalchemy import create_engine
+from sqlalchemy import (
+    Boolean, Integer, Numeric, String, Table, bindparam, create_engine, text,
+)
+from sqlalchemy.dialects import mysql, postgresql
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.types import TypeEngine
 
 from databuilder.publisher.base_publisher import Publisher
+from databuilder.publisher.publisher_config_constants import PublisherConfigs
+from databuilder.utils.publisher_utils import (
+    DEFAULT_CSV_READ_BATCH_SIZE, chunkify_list, read_records_in_batches,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -49,10 +56,21 @@ class MySQLCSVPublisher(Publisher):
     TRANSACTION_SIZE = 'transaction_size'
     # A progress report frequency that determines how often it report the progress.
     PROGRESS_REPORT_FREQUENCY = 'progress_report_frequency'
+    # Number of CSV rows held in memory at a time
+    CSV_READ_BATCH_SIZE = PublisherConfigs.CSV_READ_BATCH_SIZE
+    # If its value is true, records are inserted or updated with multi-row upsert statements
+    # (INSERT ... ON DUPLICATE KEY UPDATE for MySQL, INSERT ... ON CONFLICT for PostgreSQL and SQLite)
+    # instead of one SELECT and one INSERT or UPDATE per record.
+    BULK_UPSERT = 'bulk_upsert'
+    # Number of records per upsert statement
+    UPSERT_BATCH_SIZE = 'upsert_batch_size'
 
     _DEFAULT_CONFIG = ConfigFactory.from_dict({TRANSACTION_SIZE: 500,
                                                PROGRESS_REPORT_FREQUENCY: 500,
-                                               ENGINE_ECHO: False})
+                                               ENGINE_ECHO: False,
+                                               CSV_READ_BATCH_SIZE: DEFAULT_CSV_READ_BATCH_SIZE,
+                                               BULK_UPSERT: False,
+                                               UPSERT_BATCH_SIZE: 1000})
 
     def __init__(self) -> None:
         super(MySQLCSVPublisher, self).__init__()
@@ -73,6 +91,10 @@ class MySQLCSVPublisher(Publisher):
                                      connect_args=connect_args)
         self._session_factory = sessionmaker(bind=self._engine)
         self._transaction_size = conf.get_int(MySQLCSVPublisher.TRANSACTION_SIZE)
+        self._csv_read_batch_size = conf.get_int(MySQLCSVPublisher.CSV_READ_BATCH_SIZE)
+        self._bulk_upsert = conf.get_bool(MySQLCSVPublisher.BULK_UPSERT)
+        self._upsert_batch_size = conf.get_int(MySQLCSVPublisher.UPSERT_BATCH_SIZE)
+        self._upsert_statements: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
 
         self._publish_tag: str = conf.get_string(MySQLCSVPublisher.JOB_PUBLISH_TAG)
         if not self._publish_tag:
@@ -148,17 +170,91 @@ class MySQLCSVPublisher(Publisher):
         :param session:
         :return:
         """
-        with open(record_file, 'r', encoding='utf8') as record_csv:
-            table_name = self._get_table_name_from_file(record_file)
-            table_model = self._get_model_from_table_name(table_name)
-            if not table_model:
-                raise RuntimeError(f'Failed to get model for table: {table_name}')
+        table_name = self._get_table_name_from_file(record_file)
+        table_model = self._get_model_from_table_name(table_name)
+        if not table_model:
+            raise RuntimeError(f'Failed to get model for table: {table_name}')
+
+        for record_dicts in read_records_in_batches(record_file, self._csv_read_batch_size):
+            record_dicts = [self._convert_record(table=table_model.__table__, record_dict=record_dict)
+                            for record_dict in record_dicts]
+            if self._bulk_upsert:
+                self._upsert(table=table_model.__table__, record_dicts=record_dicts, session=session)
+                continue
 
-            for record_dict in pandas.read_csv(record_csv, na_filter=False).to_dict(orient='records'):
+            for record_dict in record_dicts:
                 record = self._create_record(model=table_model, record_dict=record_dict)
                 session.merge(record)
                 self._execute(session)
-            session.commit()
+        session.commit()
+
+    def _convert_record(self, table: Table, record_dict: Dict) -> Dict:
+        """
+        Convert the values of the record, read as strings, to the types of the columns of the table,
+        e.g. booleans and integers. Empty values of columns that are not strings are converted to None.
+        :param table:
+        :param record_dict:
+        :return:
+        """
+        return {key: _to_column_type(table.columns[key].type, value) if key in table.columns else value
+                for key, value in record_dict.items()}
+
+    def _upsert(self, table: Table, record_dicts: List[Dict], session: Session) -> None:
+        """
+        Insert or update the records with one statement per batch of upsert_batch_size records.
+        Like with session.merge, the columns missing from the records are left unchanged on update.
+        :param table:
+        :param record_dicts:
+        :param session:
+        :return:
+        """
+        for batch in chunkify_list(record_dicts, self._upsert_batch_size):
+            publisher_last_updated_epoch_ms = int(time.time() * 1000)
+            rows = [dict(record_dict,
+                         published_tag=self._publish_tag,
+                         publisher_last_updated_epoch_ms=publisher_last_updated_epoch_ms)
+                    for record_dict in batch]
+            statement = self._get_upsert_statement(table=table, column_names=tuple(rows[0].keys()))
+            session.execute(statement, rows)
+            self._execute(session, record_count=len(rows))
+
+    def _get_upsert_statement(self, table: Table, column_names: Tuple[str, ...]) -> Any:
+        """
+        Get the multi-row upsert statement of the table for the given columns, based on the database dialect
+        :param table:
+        :param column_names:
+        :return:
+        """
+        key = (table.name, column_names)
+        if key in self._upsert_statements:
+            return self._upsert_statements[key]
+
+        dialect = self._engine.dialect.name
+        primary_key_names = [column.name for column in table.primary_key.columns]
+        update_column_names = [name for name in column_names if name not in primary_key_names]
+        if dialect == 'mysql':
+            mysql_statement = mysql.insert(table)
+            statement = mysql_statement.on_duplicate_key_update(
+                {name: mysql_statement.inserted[name] for name in update_column_names})
+        elif dialect == 'postgresql':
+            postgresql_statement = postgresql.insert(table)
+            statement = postgresql_statement.on_conflict_do_update(
+                index_elements=primary_key_names,
+                set_={name: postgresql_statement.excluded[name] for name in update_column_names})
+        elif dialect == 'sqlite':
+            # SQLAlchemy has no insert construct with ON CONFLICT for SQLite before 1.4
+            quote = self._engine.dialect.identifier_preparer.quote
+            statement = text(
+                f'INSERT INTO {quote(table.name)} ({", ".join(quote(name) for name in column_names)}) '
+                f'VALUES ({", ".join(f":{name}" for name in column_names)}) '
+                f'ON CONFLICT ({", ".join(quote(name) for name in primary_key_names)}) DO UPDATE SET '
+                f'{", ".join(f"{quote(name)} = excluded.{quote(name)}" for name in update_column_names)}'
+            ).bindparams(*[bindparam(name, type_=table.c[name].type) for name in column_names])
+        else:
+            raise NotImplementedError(f'{MySQLCSVPublisher.BULK_UPSERT} is not supported for {dialect}')
+
+        self._upsert_statements[key] = statement
+        return statement
 
     def _get_model_from_table_name(self, table_name: str) -> Optional[Type[RDSModel]]:
         """
@@ -191,19 +287,22 @@ class MySQLCSVPublisher(Publisher):
         record.publisher_last_updated_epoch_ms = int(time.time() * 1000)
         return record
 
-    def _execute(self, session: Session) -> None:
+    def _execute(self, session: Session, record_count: int = 1) -> None:
         """
         Commit pending record changes
         :param session:
+        :param record_count: Number of records changed since the last call
         :return:
         """
         try:
-            self._count += 1
-            if self._count > 1 and self._count % self._transaction_size == 0:
+            previous_count = self._count
+            self._count += record_count
+            if self._count > 1 and self._count // self._transaction_size > previous_count // self._transaction_size:
                 session.commit()
                 LOGGER.info(f'Committed {self._count} records so far')
 
-            if self._count > 1 and self._count % self._progress_report_frequency == 0:
+            if self._count > 1 and \
+                    self._count // self._progress_report_frequency > previous_count // self._progress_report_frequency:
                 LOGGER.info(f'Processed {self._count} records so far')
 
         except Exception as e:
@@ -212,3 +311,17 @@ class MySQLCSVPublisher(Publisher):
 
     def get_scope(self) -> str:
         return 'publisher.mysql'
+
+
+def _to_column_type(column_type: TypeEngine, value: Any) -> Any:
+    if not isinstance(value, str) or isinstance(column_type, String):
+        return value
+    if value == '':
+        return None
+    if isinstance(column_type, Boolean):
+        return value.lower() == 'true'
+    if isinstance(column_type, Integer):
+        return int(value)
+    if isinstance(column_type, Numeric):
+        return float(value)
+    return value
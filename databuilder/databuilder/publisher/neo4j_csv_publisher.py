@@ -5,15 +5,13 @@ import csv
 import ctypes
 import logging
 import time
-from io import open
 from os import listdir
 from os.path import isfile, join
 from typing import (
-    Dict, List, Set,
+    Dict, Iterable, Iterator, List, Set, Tuple,
 )
 
 import neo4j
-import pandas
 from jinja2 import Template
 from neo4j import GraphDatabase, Transaction
 from neo4j.api import (
@@ -27,6 +25,9 @@ from databuilder.publisher.neo4j_preprocessor import NoopRelationPreprocessor
 from databuilder.publisher.publisher_config_constants import (
     Neo4jCsvPublisherConfigs, PublishBehaviorConfigs, PublisherConfigs,
 )
+from databuilder.utils.publisher_utils import (
+    DEFAULT_CSV_READ_BATCH_SIZE, create_props_param, get_node_label, jittered_backoff, read_records_in_batches,
+)
 
 # Setting field_size_limit to solve the error below
 # _csv.Error: field larger than field limit (131072)
@@ -44,6 +45,10 @@ NEO4J_END_POINT_KEY = Neo4jCsvPublisherConfigs.NEO4J_END_POINT_KEY
 NEO4J_TRANSACTION_SIZE = Neo4jCsvPublisherConfigs.NEO4J_TRANSACTION_SIZE
 # A progress report frequency that determines how often it report the progress.
 NEO4J_PROGRESS_REPORT_FREQUENCY = 'neo4j_progress_report_frequency'
+# Number of CSV rows sent with a single statement, using UNWIND. With 1, a statement is executed per row.
+NEO4J_BATCH_SIZE = 'neo4j_batch_size'
+# Number of CSV rows held in memory at a time
+CSV_READ_BATCH_SIZE = PublisherConfigs.CSV_READ_BATCH_SIZE
 # A boolean flag to make it fail if relationship is not created
 NEO4J_RELATIONSHIP_CREATION_CONFIRM = 'neo4j_relationship_creation_confirm'
 
@@ -115,6 +120,8 @@ RELATION_REQUIRED_KEYS = {RELATION_START_LABEL, RELATION_START_KEY,
 
 DEFAULT_CONFIG = ConfigFactory.from_dict({NEO4J_TRANSACTION_SIZE: 500,
                                           NEO4J_PROGRESS_REPORT_FREQUENCY: 500,
+                                          NEO4J_BATCH_SIZE: 1,
+                                          CSV_READ_BATCH_SIZE: DEFAULT_CSV_READ_BATCH_SIZE,
                                           NEO4J_RELATIONSHIP_CREATION_CONFIRM: False,
                                           NEO4J_MAX_CONN_LIFE_TIME_SEC: 50,
                                           NEO4J_DATABASE_NAME: neo4j.DEFAULT_DATABASE,
@@ -122,10 +129,30 @@ DEFAULT_CONFIG = ConfigFactory.from_dict({NEO4J_TRANSACTION_SIZE: 500,
                                           ADD_PUBLISHER_METADATA: True,
                                           RELATION_PREPROCESSOR: NoopRelationPreprocessor()})
 
-# transient error retries and sleep time
+# transient error retries and base of the backoff between them
 RETRIES_NUMBER = 5
 SLEEP_TIME = 2
 
+# Statements are rendered once per statement shape. PARAM is the parameter prefix: `$` when a statement is
+# executed per row, `row.` when rows are sent in a batch.
+NODE_MERGE_TEMPLATE = Template("""
+    {% if batched %}UNWIND $batch AS row{% endif %}
+    MERGE (node:{{ LABEL }} {key: {{ PARAM }}KEY})
+    ON CREATE SET {{ PROP_BODY }}
+    {% if update %} ON MATCH SET {{ PROP_BODY }} {% endif %}
+""")
+
+RELATION_MERGE_TEMPLATE = Template("""
+    {% if batched %}UNWIND $batch AS row{% endif %}
+    MATCH (n1:{{ START_LABEL }} {key: {{ PARAM }}START_KEY}), (n2:{{ END_LABEL }} {key: {{ PARAM }}END_KEY})
+    MERGE (n1)-[r1:{{ TYPE }}]->(n2)-[r2:{{ REVERSE_TYPE }}]->(n1)
+    {% if update_prop_body %}
+    ON CREATE SET {{ prop_body }}
+    ON MATCH SET {{ prop_body }}
+    {% endif %}
+    RETURN n1.key, n2.key
+""")
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -138,7 +165,8 @@ class Neo4jCsvPublisher(Publisher):
     Neo4j follows Label Node properties Graph and more information about this is in:
     https://neo4j.com/docs/developer-manual/current/introduction/graphdb-concepts/
 
-    #TODO User UNWIND batch operation for better performance
+    Merge statements are rendered once per label (or relation type), CSV header and create-only flag, and cached.
+    With neo4j_batch_size > 1, consecutive rows that share a statement are sent together using UNWIND.
     """
 
     def __init__(self) -> None:
@@ -149,11 +177,11 @@ class Neo4jCsvPublisher(Publisher):
 
         self._count: int = 0
         self._progress_report_frequency = conf.get_int(NEO4J_PROGRESS_REPORT_FREQUENCY)
+        self._batch_size = conf.get_int(NEO4J_BATCH_SIZE)
+        self._csv_read_batch_size = conf.get_int(CSV_READ_BATCH_SIZE)
+        self._statement_cache: Dict[Tuple, str] = {}
         self._node_files = self._list_files(conf, NODE_FILES_DIR)
-        self._node_files_iter = iter(self._node_files)
-
         self._relation_files = self._list_files(conf, RELATION_FILES_DIR)
-        self._relation_files_iter = iter(self._relation_files)
 
         uri = conf.get_string(NEO4J_END_POINT_KEY)
         driver_args = {
@@ -216,41 +244,52 @@ class Neo4jCsvPublisher(Publisher):
         path = conf.get_string(path_key)
         return [join(path, f) for f in listdir(path) if isfile(join(path, f))]
 
-    def publish_impl(self) -> None:  # noqa: C901
+    def publish_impl(self) -> None:
         """
         Publishes Nodes first and then Relations
         :return:
         """
 
         start = time.time()
+        self._publish_files(node_files=self._node_files, relation_files=self._relation_files)
+
+        # TODO: Add statsd support
+        LOGGER.info('Successfully published. Elapsed: %i seconds', time.time() - start)
 
-        LOGGER.info('Creating indices using Node files: %s', self._node_files)
-        for node_file in self._node_files:
+    def publish_chunk(self, node_files: List[str], relation_files: List[str]) -> None:
+        """
+        Publishes a chunk of Node files and Relation files, e.g. handed over by the loader while the task is still
+        running (see PipelinedJob). Relations in a chunk can only refer to Nodes of the same or an earlier chunk.
+        :param node_files:
+        :param relation_files:
+        :return:
+        """
+        self._publish_files(node_files=node_files, relation_files=relation_files)
+
+    def _publish_files(self, node_files: List[str], relation_files: List[str]) -> None:
+        """
+        Publishes Nodes first and then Relations, committing every transaction size statements.
+        If it fails, the ongoing transaction is rolled back.
+        :param node_files:
+        :param relation_files:
+        :return:
+        """
+        LOGGER.info('Creating indices using Node files: %s', node_files)
+        for node_file in node_files:
             self._create_indices(node_file=node_file)
 
-        LOGGER.info('Publishing Node files: %s', self._node_files)
+        LOGGER.info('Publishing Node files: %s', node_files)
         try:
             tx = self._session.begin_transaction()
-            while True:
-                try:
-                    node_file = next(self._node_files_iter)
-                    tx = self._publish_node(node_file, tx=tx)
-                except StopIteration:
-                    break
+            for node_file in node_files:
+                tx = self._publish_node(node_file, tx=tx)
 
-            LOGGER.info('Publishing Relationship files: %s', self._relation_files)
-            while True:
-                try:
-                    relation_file = next(self._relation_files_iter)
-                    tx = self._publish_relation(relation_file, tx=tx)
-                except StopIteration:
-                    break
+            LOGGER.info('Publishing Relationship files: %s', relation_files)
+            for relation_file in relation_files:
+                tx = self._publish_relation(relation_file, tx=tx)
 
             tx.commit()
             LOGGER.info('Committed total %i statements', self._count)
-
-            # TODO: Add statsd support
-            LOGGER.info('Successfully published. Elapsed: %i seconds', time.time() - start)
         except Exception as e:
             LOGGER.exception('Failed to publish. Rolling back.')
             if not tx.closed():
@@ -262,19 +301,16 @@ class Neo4jCsvPublisher(Publisher):
 
     def _create_indices(self, node_file: str) -> None:
         """
-        Go over the node file and try creating unique index
+        Try creating unique index for the label of the node file
         :param node_file:
         :return:
         """
         LOGGER.info('Creating indices. (Existing indices will be ignored)')
 
-        with open(node_file, 'r', encoding='utf8') as node_csv:
-            for node_record in pandas.read_csv(node_csv,
-                                               na_filter=False).to_dict(orient='records'):
-                label = node_record[NODE_LABEL_KEY]
-                if label not in self.labels:
-                    self._try_create_index(label)
-                    self.labels.add(label)
+        label = get_node_label(node_file)
+        if label is not None and label not in self.labels:
+            self._try_create_index(label)
+            self.labels.add(label)
 
         LOGGER.info('Indices have been created.')
 
@@ -297,12 +333,9 @@ class Neo4jCsvPublisher(Publisher):
         :return:
         """
 
-        with open(node_file, 'r', encoding='utf8') as node_csv:
-            for node_record in pandas.read_csv(node_csv,
-                                               na_filter=False).to_dict(orient="records"):
-                stmt = self.create_node_merge_statement(node_record=node_record)
-                params = self._create_props_param(node_record)
-                tx = self._execute_statement(stmt, tx, params)
+        for node_records in read_records_in_batches(node_file, self._csv_read_batch_size):
+            for stmt, params, batch in self._create_batches(node_records, is_node=True):
+                tx = self._execute_statement(stmt, tx, params, row_count=len(batch))
         return tx
 
     def is_create_only_node(self, node_record: dict) -> bool:
@@ -316,23 +349,53 @@ class Neo4jCsvPublisher(Publisher):
         else:
             return False
 
-    def create_node_merge_statement(self, node_record: dict) -> str:
+    def create_node_merge_statement(self, node_record: dict, batched: bool = False) -> str:
         """
-        Creates node merge statement
+        Creates node merge statement. The statement is rendered once per label, header and create-only flag.
         :param node_record:
+        :param batched: Whether the statement takes a batch of rows through UNWIND
         :return:
         """
-        template = Template("""
-            MERGE (node:{{ LABEL }} {key: $KEY})
-            ON CREATE SET {{ PROP_BODY }}
-            {% if update %} ON MATCH SET {{ PROP_BODY }} {% endif %}
-        """)
-
-        prop_body = self._create_props_body(node_record, NODE_REQUIRED_KEYS, 'node')
-
-        return template.render(LABEL=node_record["LABEL"],
-                               PROP_BODY=prop_body,
-                               update=(not self.is_create_only_node(node_record)))
+        update = not self.is_create_only_node(node_record)
+        cache_key = ('node', node_record[NODE_LABEL_KEY], tuple(node_record.keys()), update, batched)
+        stmt = self._statement_cache.get(cache_key)
+        if stmt is None:
+            param = 'row.' if batched else '$'
+            prop_body = self._create_props_body(node_record.keys(), NODE_REQUIRED_KEYS, 'node', param)
+            stmt = NODE_MERGE_TEMPLATE.render(batched=batched,
+                                              PARAM=param,
+                                              LABEL=node_record[NODE_LABEL_KEY],
+                                              PROP_BODY=prop_body,
+                                              update=update)
+            self._statement_cache[cache_key] = stmt
+        return stmt
+
+    def _create_batches(self, records: List[dict], is_node: bool) -> Iterator[Tuple[str, dict, List[dict]]]:
+        """
+        Pairs records with their (cached) merge statement and params. With a batch size above 1, consecutive
+        records that share the same statement are batched together, up to the batch size.
+        :param records:
+        :param is_node:
+        :return: Iterator of statement, params and the records they cover
+        """
+        create_statement = self.create_node_merge_statement if is_node else self.create_relationship_merge_statement
+        if self._batch_size == 1:
+            for record in records:
+                yield create_statement(record), self._create_props_param(record), [record]
+            return
+
+        batch: List[dict] = []
+        batch_stmt = ''
+        for record in records:
+            stmt = create_statement(record, True)
+            if batch and (stmt != batch_stmt or len(batch) >= self._batch_size):
+                yield batch_stmt, {'batch': [self._create_props_param(r) for r in batch]}, batch
+                batch = []
+            batch_stmt = stmt
+            batch.append(record)
+
+        if batch:
+            yield batch_stmt, {'batch': [self._create_props_param(r) for r in batch]}, batch
 
     def _publish_relation(self, relation_file: str, tx: Transaction) -> Transaction:
         """
@@ -353,9 +416,8 @@ class Neo4jCsvPublisher(Publisher):
             LOGGER.info('Pre-processing relation with %s', self._relation_preprocessor)
 
             count = 0
-            with open(relation_file, 'r', encoding='utf8') as relation_csv:
-                for rel_record in pandas.read_csv(relation_csv,
-                                                  na_filter=False).to_dict(orient="records"):
+            for rel_records in read_records_in_batches(relation_file, self._csv_read_batch_size):
+                for rel_record in rel_records:
                     # TODO not sure if deadlock on badge node arises in preporcessing or not
                     stmt, params = self._relation_preprocessor.preprocess_cypher(
                         start_label=rel_record[RELATION_START_LABEL],
@@ -371,88 +433,88 @@ class Neo4jCsvPublisher(Publisher):
 
             LOGGER.info('Executed pre-processing Cypher statement %i times', count)
 
-        with open(relation_file, 'r', encoding='utf8') as relation_csv:
-            for rel_record in pandas.read_csv(relation_csv, na_filter=False).to_dict(orient="records"):
-                exception_exists = True
-                retries_for_exception = RETRIES_NUMBER
-                while exception_exists and retries_for_exception > 0:
-                    try:
-                        stmt = self.create_relationship_merge_statement(rel_record=rel_record)
-                        params = self._create_props_param(rel_record)
-                        tx = self._execute_statement(stmt, tx, params,
-                                                     expect_result=self._confirm_rel_created)
-                        exception_exists = False
-                    except TransientError as e:
-                        if rel_record[RELATION_START_LABEL] in self.deadlock_node_labels \
-                                or rel_record[RELATION_END_LABEL] in self.deadlock_node_labels:
-                            time.sleep(SLEEP_TIME)
-                            retries_for_exception -= 1
-                        else:
-                            raise e
+        for rel_records in read_records_in_batches(relation_file, self._csv_read_batch_size):
+            tx = self._publish_relation_batch(rel_records, tx)
 
         return tx
 
-    def create_relationship_merge_statement(self, rel_record: dict) -> str:
+    def _publish_relation_batch(self, rel_records: List[dict], tx: Transaction) -> Transaction:
+        for stmt, params, batch in self._create_batches(rel_records, is_node=False):
+            exception_exists = True
+            retries_for_exception = RETRIES_NUMBER
+            while exception_exists and retries_for_exception > 0:
+                try:
+                    tx = self._execute_statement(stmt, tx, params,
+                                                 expect_result=self._confirm_rel_created,
+                                                 row_count=len(batch))
+                    exception_exists = False
+                except TransientError as e:
+                    if batch[0][RELATION_START_LABEL] in self.deadlock_node_labels \
+                            or batch[0][RELATION_END_LABEL] in self.deadlock_node_labels:
+                        time.sleep(jittered_backoff(RETRIES_NUMBER - retries_for_exception, SLEEP_TIME))
+                        retries_for_exception -= 1
+                    else:
+                        raise e
+
+        return tx
+
+    def create_relationship_merge_statement(self, rel_record: dict, batched: bool = False) -> str:
         """
-        Creates relationship merge statement
+        Creates relationship merge statement. The statement is rendered once per relation and header.
         :param rel_record:
+        :param batched: Whether the statement takes a batch of rows through UNWIND
         :return:
         """
-        template = Template("""
-            MATCH (n1:{{ START_LABEL }} {key: $START_KEY}), (n2:{{ END_LABEL }} {key: $END_KEY})
-            MERGE (n1)-[r1:{{ TYPE }}]->(n2)-[r2:{{ REVERSE_TYPE }}]->(n1)
-            {% if update_prop_body %}
-            ON CREATE SET {{ prop_body }}
-            ON MATCH SET {{ prop_body }}
-            {% endif %}
-            RETURN n1.key, n2.key
-        """)
-
-        prop_body_r1 = self._create_props_body(rel_record, RELATION_REQUIRED_KEYS, 'r1')
-        prop_body_r2 = self._create_props_body(rel_record, RELATION_REQUIRED_KEYS, 'r2')
-        prop_body = ' , '.join([prop_body_r1, prop_body_r2])
-
-        return template.render(START_LABEL=rel_record["START_LABEL"],
-                               END_LABEL=rel_record["END_LABEL"],
-                               TYPE=rel_record["TYPE"],
-                               REVERSE_TYPE=rel_record["REVERSE_TYPE"],
-                               update_prop_body=prop_body_r1,
-                               prop_body=prop_body)
+        cache_key = ('relation', rel_record[RELATION_START_LABEL], rel_record[RELATION_END_LABEL],
+                     rel_record[RELATION_TYPE], rel_record[RELATION_REVERSE_TYPE], tuple(rel_record.keys()), batched)
+        stmt = self._statement_cache.get(cache_key)
+        if stmt is None:
+            param = 'row.' if batched else '$'
+            prop_body_r1 = self._create_props_body(rel_record.keys(), RELATION_REQUIRED_KEYS, 'r1', param)
+            prop_body_r2 = self._create_props_body(rel_record.keys(), RELATION_REQUIRED_KEYS, 'r2', param)
+            prop_body = ' , '.join([prop_body_r1, prop_body_r2])
+
+            stmt = RELATION_MERGE_TEMPLATE.render(batched=batched,
+                                                  PARAM=param,
+                                                  START_LABEL=rel_record[RELATION_START_LABEL],
+                                                  END_LABEL=rel_record[RELATION_END_LABEL],
+                                                  TYPE=rel_record[RELATION_TYPE],
+                                                  REVERSE_TYPE=rel_record[RELATION_REVERSE_TYPE],
+                                                  update_prop_body=prop_body_r1,
+                                                  prop_body=prop_body)
+            self._statement_cache[cache_key] = stmt
+        return stmt
 
     def _create_props_param(self, record_dict: dict) -> dict:
-        params = {}
-        for k, v in record_dict.items():
-            if k.endswith(UNQUOTED_SUFFIX):
-                k = k[:-len(UNQUOTED_SUFFIX)]
-
-            params[k] = v
-        return params
+        return create_props_param(record_dict, {})
 
     def _create_props_body(self,
-                           record_dict: dict,
+                           record_keys: Iterable[str],
                            excludes: Set,
-                           identifier: str) -> str:
+                           identifier: str,
+                           param: str = '$') -> str:
         """
         Creates properties body with params required for resolving template.
 
         e.g: Note that node.key3 is not quoted if header has UNQUOTED_SUFFIX.
         identifier.key1 = 'val1' , identifier.key2 = 'val2', identifier.key3 = val3
 
-        :param record_dict: A dict represents CSV row
+        :param record_keys: The header of the CSV file
         :param excludes: set of excluded columns that does not need to be in properties
         (e.g: KEY, LABEL ...)
         :param identifier: identifier that will be used in CYPHER query as shown on above example
+        :param param: Prefix to refer to a parameter, `$` or `row.` for batched statements
         :return: Properties body for Cypher statement
         """
         props = []
-        for k, v in record_dict.items():
+        for k in record_keys:
             if k in excludes:
                 continue
 
             if k.endswith(UNQUOTED_SUFFIX):
                 k = k[:-len(UNQUOTED_SUFFIX)]
 
-            props.append(f'{identifier}.{k} = ${k}')
+            props.append(f'{identifier}.{k} = {param}{k}')
 
         if self.add_publisher_metadata:
             props.append(f"{identifier}.{PUBLISHED_TAG_PROPERTY_NAME} = '{self.publish_tag}'")
@@ -469,7 +531,8 @@ class Neo4jCsvPublisher(Publisher):
                            stmt: str,
                            tx: Transaction,
                            params: dict = None,
-                           expect_result: bool = False) -> Transaction:
+                           expect_result: bool = False,
+                           row_count: int = 1) -> Transaction:
         """
         Executes statement against Neo4j. If execution fails, it rollsback and raise exception.
         If 'expect_result' flag is True, it confirms if result object is not null.
@@ -477,22 +540,28 @@ class Neo4jCsvPublisher(Publisher):
         :param tx:
         :param count:
         :param expect_result: By having this True, it will validate if result object is not None.
+        :param row_count: Number of CSV rows the statement is executed for
         :return:
         """
         try:
             LOGGER.debug('Executing statement: %s with params %s', stmt, params)
 
             result = tx.run(str(stmt), parameters=params)
-            if expect_result and not result.single():
-                raise RuntimeError(f'Failed to executed statement: {stmt}')
-
-            self._count += 1
-            if self._count > 1 and self._count % self._transaction_size == 0:
+            if expect_result:
+                if row_count == 1 and not result.single():
+                    raise RuntimeError(f'Failed to executed statement: {stmt}')
+                if row_count > 1 and len(list(result)) < row_count:
+                    raise RuntimeError(f'Failed to executed statement for all rows: {stmt}')
+
+            previous_count = self._count
+            self._count += row_count
+            if self._count > 1 and self._count // self._transaction_size > previous_count // self._transaction_size:
                 tx.commit()
                 LOGGER.info(f'Committed {self._count} statements so far')
                 return self._session.begin_transaction()
 
-            if self._count > 1 and self._count % self._progress_report_frequency == 0:
+            if self._count > 1 and \
+                    self._count // self._progress_report_frequency > previous_count // self._progress_report_frequency:
                 LOGGER.info(f'Processed {self._count} statements so far')
 
             return tx
@@ -4,19 +4,20 @@
 import csv
 import ctypes
 import logging
+import threading
 import time
-from io import open
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import (
-    Dict, List, Set,
+    Any, Callable, Dict, List, Set,
 )
 
 import neo4j
-import pandas
 from jinja2 import Template
 from neo4j import GraphDatabase, Neo4jDriver
 from neo4j.api import (
     SECURITY_TYPE_SECURE, SECURITY_TYPE_SELF_SIGNED_CERTIFICATE, parse_neo4j_uri,
 )
+from neo4j.exceptions import TransientError
 from pyhocon import ConfigFactory, ConfigTree
 
 from databuilder.models.graph_serializable import (
@@ -28,8 +29,8 @@ from databuilder.publisher.publisher_config_constants import (
     Neo4jCsvPublisherConfigs, PublishBehaviorConfigs, PublisherConfigs,
 )
 from databuilder.utils.publisher_utils import (
-    chunkify_list, create_neo4j_node_key_constraint, create_props_param, execute_neo4j_statement, get_props_body_keys,
-    list_files,
+    chunkify_list, create_neo4j_node_key_constraint, create_props_param, execute_neo4j_statement, get_node_label,
+    get_props_body_keys, jittered_backoff, list_files, read_first_record, read_records_in_batches,
 )
 
 # Setting field_size_limit to solve the error below
@@ -50,7 +51,13 @@ DEFAULT_CONFIG = ConfigFactory.from_dict({Neo4jCsvPublisherConfigs.NEO4J_TRANSAC
                                           PublishBehaviorConfigs.ADD_PUBLISHER_METADATA: True,
                                           PublishBehaviorConfigs.PUBLISH_REVERSE_RELATIONSHIPS: True,
                                           PublishBehaviorConfigs.PRESERVE_ADHOC_UI_DATA: True,
-                                          PublishBehaviorConfigs.PRESERVE_EMPTY_PROPS: True})
+                                          PublishBehaviorConfigs.PRESERVE_EMPTY_PROPS: True,
+                                          Neo4jCsvPublisherConfigs.NEO4J_PUBLISH_WORKERS: 1,
+                                          Neo4jCsvPublisherConfigs.NEO4J_MAX_RETRIES: 5,
+                                          Neo4jCsvPublisherConfigs.NEO4J_RETRY_BASE_SEC: 1})
+
+# Group of the relation files touching deadlock prone labels
+DEADLOCK_GROUP = 'deadlock'
 
 LOGGER = logging.getLogger(__name__)
 
@@ -64,6 +71,12 @@ class Neo4jCsvUnwindPublisher(Publisher):
     The merge statements make use of the UNWIND clause to allow for batched params to be applied to each
     statement. This improves performance by reducing the amount of individual transactions to the database,
     and by allowing Neo4j to compile and cache the statement.
+
+    With more than one publish worker, files are published concurrently, each worker using its own sessions from
+    the driver's connection pool. Node files are published first, files of the same label by the same worker.
+    Relation files are published once all nodes exist, files between the same pair of labels by the same worker,
+    and files touching any of the deadlock prone labels one after another by a single worker.
+    Transactions failing with a transient error, such as a deadlock, are retried with jittered exponential backoff.
     """
 
     def init(self, conf: ConfigTree) -> None:
@@ -71,14 +84,17 @@ class Neo4jCsvUnwindPublisher(Publisher):
 
         self._count: int = 0
         self._node_files = list_files(conf, PublisherConfigs.NODE_FILES_DIR)
-        self._node_files_iter = iter(self._node_files)
-
         self._relation_files = list_files(conf, PublisherConfigs.RELATION_FILES_DIR)
-        self._relation_files_iter = iter(self._relation_files)
 
         self._driver = self._driver_init(conf)
         self._db_name = conf.get_string(Neo4jCsvPublisherConfigs.NEO4J_DATABASE_NAME)
         self._transaction_size = conf.get_int(Neo4jCsvPublisherConfigs.NEO4J_TRANSACTION_SIZE)
+        self._publish_workers = conf.get_int(Neo4jCsvPublisherConfigs.NEO4J_PUBLISH_WORKERS)
+        self._deadlock_node_labels = set(conf.get_list(Neo4jCsvPublisherConfigs.NEO4J_DEADLOCK_NODE_LABELS,
+                                                       default=[]))
+        self._max_retries = conf.get_int(Neo4jCsvPublisherConfigs.NEO4J_MAX_RETRIES)
+        self._retry_base_sec = conf.get_float(Neo4jCsvPublisherConfigs.NEO4J_RETRY_BASE_SEC)
+        self._count_lock = threading.Lock()
 
         # config is list of node label.
         # When set, this list specifies a list of nodes that shouldn't be updated, if exists
@@ -135,38 +151,91 @@ class Neo4jCsvUnwindPublisher(Publisher):
 
         return driver
 
-    def publish_impl(self) -> None:  # noqa: C901
+    def publish_impl(self) -> None:
         """
         Publishes Nodes first and then Relations
         """
         start = time.time()
+        self._publish_files(node_files=self._node_files, relation_files=self._relation_files)
 
-        for node_file in self._node_files:
+        # TODO: Add statsd support
+        LOGGER.info('Successfully published. Elapsed: %i seconds', time.time() - start)
+
+    def publish_chunk(self, node_files: List[str], relation_files: List[str]) -> None:
+        """
+        Publishes a chunk of Node files and Relation files, e.g. handed over by the loader while the task is still
+        running (see PipelinedJob). Relations in a chunk can only refer to Nodes of the same or an earlier chunk.
+        """
+        self._publish_files(node_files=node_files, relation_files=relation_files)
+
+    def _publish_files(self, node_files: List[str], relation_files: List[str]) -> None:
+        for node_file in node_files:
             self.pre_publish_node_file(node_file)
 
-        LOGGER.info('Publishing Node files: %s', self._node_files)
-        while True:
-            try:
-                node_file = next(self._node_files_iter)
-                self._publish_node_file(node_file)
-            except StopIteration:
-                break
+        LOGGER.info('Publishing Node files: %s', node_files)
+        self._publish_concurrently(node_files, self._publish_node_file, self._get_node_file_group)
 
-        for rel_file in self._relation_files:
+        for rel_file in relation_files:
             self.pre_publish_rel_file(rel_file)
 
-        LOGGER.info('Publishing Relationship files: %s', self._relation_files)
-        while True:
-            try:
-                relation_file = next(self._relation_files_iter)
-                self._publish_relation_file(relation_file)
-            except StopIteration:
-                break
+        LOGGER.info('Publishing Relationship files: %s', relation_files)
+        self._publish_concurrently(relation_files, self._publish_relation_file, self._get_relation_file_group)
 
         LOGGER.info('Committed total %i statements', self._count)
 
-        # TODO: Add statsd support
-        LOGGER.info('Successfully published. Elapsed: %i seconds', time.time() - start)
+    def _publish_concurrently(self,
+                              files: List[str],
+                              publish_file: Callable[[str], None],
+                              get_group: Callable[[str], Any]) -> None:
+        """
+        Publishes the files on the publish workers. Files of the same group are published one after another by
+        the same worker, groups are published concurrently. If a file fails, groups that have not started yet
+        are cancelled and the error is raised.
+        :param files:
+        :param publish_file: Function publishing a single file
+        :param get_group: Function returning the group of a file
+        :return:
+        """
+        if self._publish_workers <= 1 or len(files) <= 1:
+            for file in files:
+                publish_file(file)
+            return
+
+        groups: Dict[Any, List[str]] = {}
+        for file in files:
+            groups.setdefault(get_group(file), []).append(file)
+
+        LOGGER.info('Publishing %i groups of files with %i workers', len(groups), self._publish_workers)
+        with ThreadPoolExecutor(max_workers=self._publish_workers, thread_name_prefix='neo4j_publisher') as executor:
+            futures = [executor.submit(self._publish_group, group_files, publish_file)
+                       for group_files in groups.values()]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    @staticmethod
+    def _publish_group(files: List[str], publish_file: Callable[[str], None]) -> None:
+        for file in files:
+            publish_file(file)
+
+    def _get_node_file_group(self, node_file: str) -> Any:
+        # Nodes of the same label share the same unique constraint
+        return get_node_label(node_file)
+
+    def _get_relation_file_group(self, relation_file: str) -> Any:
+        first_record = read_first_record(relation_file)
+        if not first_record:
+            return None
+
+        labels = frozenset([first_record[RELATION_START_LABEL], first_record[RELATION_END_LABEL]])
+        if labels & self._deadlock_node_labels:
+            return DEADLOCK_GROUP
+        # Relations in both directions between two labels lock the same nodes
+        return labels
 
     def get_scope(self) -> str:
         return 'publisher.neo4j'
@@ -182,15 +251,15 @@ class Neo4jCsvUnwindPublisher(Publisher):
         pass
 
     def _publish_node_file(self, node_file: str) -> None:
-        with open(node_file, 'r', encoding='utf8') as node_csv:
-            csv_dataframe = pandas.read_csv(node_csv, na_filter=False)
-            all_node_records = csv_dataframe.to_dict(orient="records")
-
-            # Get the first node label since they will be the same for all records in the file
-            merge_stmt = self._create_node_merge_statement(node_keys=csv_dataframe.columns.tolist(),
-                                                           node_label=all_node_records[0][NODE_LABEL])
+        merge_stmt = None
+        # Read a transaction worth of records at a time, so memory does not grow with the file size
+        for node_records in read_records_in_batches(node_file, self._transaction_size):
+            if merge_stmt is None:
+                # Get the first node label since they will be the same for all records in the file
+                merge_stmt = self._create_node_merge_statement(node_keys=list(node_records[0].keys()),
+                                                               node_label=node_records[0][NODE_LABEL])
 
-            self._write_transactions(merge_stmt, all_node_records)
+            self._write_transactions(merge_stmt, node_records)
 
     def _create_node_merge_statement(self, node_keys: list, node_label: str) -> str:
         template = Template("""
@@ -217,20 +286,19 @@ class Neo4jCsvUnwindPublisher(Publisher):
                                update=(node_label not in self._create_only_nodes))
 
     def _publish_relation_file(self, relation_file: str) -> None:
-        with open(relation_file, 'r', encoding='utf8') as relation_csv:
-            csv_dataframe = pandas.read_csv(relation_csv, na_filter=False)
-            all_rel_records = csv_dataframe.to_dict(orient="records")
-
-            # Get the first relation labels since they will be the same for all records in the file
-            merge_stmt = self._create_relationship_merge_statement(
-                rel_keys=csv_dataframe.columns.tolist(),
-                start_label=all_rel_records[0][RELATION_START_LABEL],
-                end_label=all_rel_records[0][RELATION_END_LABEL],
-                relation_type=all_rel_records[0][RELATION_TYPE],
-                relation_reverse_type=all_rel_records[0][RELATION_REVERSE_TYPE]
-            )
-
-            self._write_transactions(merge_stmt, all_rel_records)
+        merge_stmt = None
+        for rel_records in read_records_in_batches(relation_file, self._transaction_size):
+            if merge_stmt is None:
+                # Get the first relation labels since they will be the same for all records in the file
+                merge_stmt = self._create_relationship_merge_statement(
+                    rel_keys=list(rel_records[0].keys()),
+                    start_label=rel_records[0][RELATION_START_LABEL],
+                    end_label=rel_records[0][RELATION_END_LABEL],
+                    relation_type=rel_records[0][RELATION_TYPE],
+                    relation_reverse_type=rel_records[0][RELATION_REVERSE_TYPE]
+                )
+
+            self._write_transactions(merge_stmt, rel_records)
 
     def _create_relationship_merge_statement(self,
                                              rel_keys: list,
@@ -366,8 +434,29 @@ class Neo4jCsvUnwindPublisher(Publisher):
             for record in chunk:
                 params_list.append(create_props_param(record, self._additional_publisher_metadata_fields))
 
-            with self._driver.session(database=self._db_name) as session:
-                session.write_transaction(execute_neo4j_statement, stmt, {'batch': params_list})
+            self._write_transaction(stmt, params_list)
 
+            with self._count_lock:
                 self._count += len(params_list)
                 LOGGER.info(f'Committed {self._count} rows so far')
+
+    def _write_transaction(self, stmt: str, params_list: List[dict]) -> None:
+        """
+        Writes a batch in a transaction, retrying on transient errors such as deadlocks.
+        The transaction is explicit, as session.write_transaction would retry transient errors on its own as well.
+        """
+        attempt = 0
+        while True:
+            try:
+                with self._driver.session(database=self._db_name) as session:
+                    with session.begin_transaction() as tx:
+                        execute_neo4j_statement(tx, stmt, {'batch': params_list})
+                        tx.commit()
+                return
+            except TransientError as e:
+                if attempt >= self._max_retries:
+                    raise
+                wait_sec = jittered_backoff(attempt, self._retry_base_sec)
+                LOGGER.warning('Transient error, retrying in %.2f seconds: %s', wait_sec, e)
+                time.sleep(wait_sec)
+                attempt += 1
@@ -21,6 +21,9 @@ class PublisherConfigs:
     # Property name for last updated timestamp
     LAST_UPDATED_EPOCH_MS = 'publisher_last_updated_epoch_ms'
 
+    # Number of CSV records held in memory at a time while publishing
+    CSV_READ_BATCH_SIZE = 'csv_read_batch_size'
+
 
 class PublishBehaviorConfigs:
     # A boolean flag to indicate if publisher_metadata (e.g. published_tag,
@@ -71,3 +74,13 @@ class Neo4jCsvPublisherConfigs:
     # format <date>T<time> and <date> would apply datetime(n.start_time) and date(n.publish_tag) in the prop merge
     # statement to create the props as DateTime and Date types instead of strings.
     NEO4J_PROP_TYPES_TO_CONFIGURE = 'neo4j_prop_types_to_configure'
+
+    # Number of threads publishing files concurrently. Node files are published first, then relation files.
+    NEO4J_PUBLISH_WORKERS = 'neo4j_publish_workers'
+    # List of node labels whose relations are prone to deadlocks, e.g. ['Badge'].
+    # Relation files touching these labels are published one after another by a single worker.
+    NEO4J_DEADLOCK_NODE_LABELS = 'neo4j_deadlock_node_labels'
+    # Number of times a transaction is retried on a transient error, e.g. a deadlock
+    NEO4J_MAX_RETRIES = 'neo4j_max_retries'
+    # Base of the exponential backoff between retries, in seconds
+    NEO4J_RETRY_BASE_SEC = 'neo4j_retry_base_sec'
@@ -1,6 +1,7 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import threading
 from typing import Any, Dict
 
 from databuilder.rest_api.base_rest_api_query import BaseRestApiQuery
@@ -38,6 +39,18 @@ class QueryMerger:
         self._query_to_merge = query_to_merge
         self._merge_key = merge_key
         self._computed_query_result: Dict[Any, Any] = dict()
+        # Records can be merged by the worker threads of a RestApiQuery
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Queries are copied with the configuration, locks can not be
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
 
     def merge_into(self, record_dict: dict) -> None:
         """
@@ -48,7 +61,9 @@ class QueryMerger:
         """
         # compute query results for easy lookup later to find the exact record to merge
         if not self._computed_query_result:
-            self._computed_query_result = self._compute_query_result()
+            with self._lock:
+                if not self._computed_query_result:
+                    self._computed_query_result = self._compute_query_result()
 
         value_of_merge_key = record_dict.get(self._merge_key)
         record_dict_to_merge = self._computed_query_result.get(value_of_merge_key)
@@ -2,10 +2,17 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import copy
+import email.utils
 import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import (
-    Any, Callable, Dict, Iterator, List, Union,
+    Any, Callable, Deque, Dict, Iterator, List, Optional, Union,
 )
+from urllib.parse import urlparse
 
 import requests
 from jsonpath_rw import parse
@@ -16,6 +23,42 @@ from databuilder.rest_api.query_merger import QueryMerger
 
 LOGGER = logging.getLogger(__name__)
 
+# Responses whose Retry-After header is honored before the request is retried
+RETRY_AFTER_STATUS_CODES = (429, 503)
+MAX_RETRY_AFTER_SEC = 60
+
+
+class HostRequestLimiter(object):
+    """
+    Bounds the number of concurrent requests per host. The same limiter can be given to all the queries of a chain,
+    so that the bound applies to all of their requests.
+    """
+
+    def __init__(self, max_requests_per_host: int) -> None:
+        self._max_requests_per_host = max_requests_per_host
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Queries are copied with the configuration, locks can not be
+        return {'max_requests_per_host': self._max_requests_per_host}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._max_requests_per_host = state['max_requests_per_host']
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def limit(self, url: str) -> Iterator[None]:
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self._max_requests_per_host)
+                self._semaphores[host] = semaphore
+        with semaphore:
+            yield
+
 
 class RestApiQuery(BaseRestApiQuery):
     """
@@ -51,6 +94,10 @@ class RestApiQuery(BaseRestApiQuery):
     All extension point is designed for subclass because there's no exact standard on Oauth and pagination.
 
     (How it would work with Tableau/Looker is described in docstring of _authenticate method)
+
+    With max_workers > 1, the records of the joined query are fetched concurrently by a pool of threads, each one
+    reusing its connections, and are yielded in the same order. The pages of a record are still fetched one after
+    the other, by a copy of the query (see _copy_for_record).
     """
 
     def __init__(self,
@@ -64,6 +111,9 @@ class RestApiQuery(BaseRestApiQuery):
                  json_path_contains_or: bool = False,
                  can_skip_failure: Callable = None,
                  query_merger: QueryMerger = None,
+                 max_workers: int = 1,
+                 host_limiter: Optional[HostRequestLimiter] = None,
+                 shallow_copy: bool = False,
                  **kwargs: Any
                  ) -> None:
         """
@@ -117,6 +167,10 @@ class RestApiQuery(BaseRestApiQuery):
 
         :param can_skip_failure A function that can determine if it can skip the failure. See BaseFailureHandler for
         the function interface
+        :param max_workers: Number of records of the joined query fetched concurrently
+        :param host_limiter: Bounds the number of concurrent requests per host, e.g. across the queries of a chain
+        :param shallow_copy: Copies the records of the joined query with a shallow copy instead of a deep copy.
+        Values such as lists or dicts are then shared by the records computed from the same joined record.
 
         """
         self._inner_rest_api_query = query_to_join
@@ -134,61 +188,115 @@ class RestApiQuery(BaseRestApiQuery):
         self._can_skip_failure = can_skip_failure
         self._more_pages = False
         self._query_merger = query_merger
+        self._max_workers = max_workers
+        self._host_limiter = host_limiter
+        self._shallow_copy = shallow_copy
+        # Sessions of the worker threads, shared by the copies of the query
+        self._thread_local: Optional[threading.local] = None
 
-    def execute(self) -> Iterator[Dict[str, Any]]:  # noqa: C901
+    def execute(self) -> Iterator[Dict[str, Any]]:
         self._authenticate()
 
+        if self._max_workers > 1:
+            yield from self._execute_concurrently()
+            return
+
         for record_dict in self._inner_rest_api_query.execute():
+            yield from self._execute_record(record_dict)
 
-            first_try = True  # To control pagination. Always pass the while loop on the first try
-            while first_try or self._more_pages:
-                first_try = False
+    def _execute_concurrently(self) -> Iterator[Dict[str, Any]]:
+        """
+        Fetches the records of the joined query on a pool of threads, and yields their results in order.
+        At most 2 * max_workers records are fetched ahead of the one being yielded.
+        """
+        self._thread_local = threading.local()
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        futures: Deque[Future] = deque()
+        try:
+            for record_dict in self._inner_rest_api_query.execute():
+                futures.append(executor.submit(self._fetch_record, record_dict))
+                if len(futures) >= 2 * self._max_workers:
+                    yield from futures.popleft().result()
+
+            while futures:
+                yield from futures.popleft().result()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _fetch_record(self, record_dict: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return list(self._copy_for_record()._execute_record(record_dict))
+
+    def _copy_for_record(self) -> 'RestApiQuery':
+        """
+        Copies the query to fetch a record of the joined query on a worker thread, so that the pagination state,
+        e.g. _more_pages or the page in the URL or params, is not shared by records fetched concurrently.
+        Subclasses that keep other mutable state should override it.
+        :return:
+        """
+        query = copy.copy(self)
+        query._params = copy.deepcopy(self._params)
+        return query
 
-                url = self._preprocess_url(record=record_dict)
+    def _copy_record(self, record_dict: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(record_dict) if self._shallow_copy else copy.deepcopy(record_dict)
 
-                try:
-                    response = self._send_request(url=url)
-                except Exception as e:
-                    if self._can_skip_failure and self._can_skip_failure(exception=e):
-                        continue
-                    raise e
+    def _execute_record(self, record_dict: Dict[str, Any]) -> Iterator[Dict[str, Any]]:  # noqa: C901
+        """
+        Fetches all the pages of a record of the joined query.
+        :param record_dict:
+        :return:
+        """
+        first_try = True  # To control pagination. Always pass the while loop on the first try
+        while first_try or self._more_pages:
+            first_try = False
 
-                response_json: Union[List[Any], Dict[str, Any]] = response.json()
+            url = self._preprocess_url(record=record_dict)
 
-                # value extraction via JSON Path
-                result_list: List[Any] = [match.value for match in self._jsonpath_expr.find(response_json)]
+            try:
+                response = self._send_request(url=url)
+            except Exception as e:
+                if self._can_skip_failure and self._can_skip_failure(exception=e):
+                    continue
+                raise e
 
-                if not result_list:
-                    log_msg = f'No result from URL: {self._url}, JSONPATH: {self._json_path} , ' \
-                              f'response payload: {response_json}'
-                    LOGGER.info(log_msg)
+            response_json: Union[List[Any], Dict[str, Any]] = response.json()
 
-                    self._post_process(response)
+            # value extraction via JSON Path
+            result_list: List[Any] = [match.value for match in self._jsonpath_expr.find(response_json)]
 
-                    if self._fail_no_result:
-                        raise Exception(log_msg)
+            if not result_list:
+                log_msg = f'No result from URL: {self._url}, JSONPATH: {self._json_path} , ' \
+                          f'response payload: {response_json}'
+                LOGGER.info(log_msg)
 
-                    if self._skip_no_result:
-                        continue
+                self._post_process(response)
 
-                    yield copy.deepcopy(record_dict)
+                if self._fail_no_result:
+                    raise Exception(log_msg)
 
-                sub_records = RestApiQuery._compute_sub_records(result_list=result_list,
-                                                                field_names=self._field_names,
-                                                                json_path_contains_or=self._json_path_contains_or)
+                if self._skip_no_result:
+                    continue
 
-                for sub_record in sub_records:
-                    if not sub_record or len(sub_record) != len(self._field_names):
-                        # skip the record
-                        continue
-                    new_record_dict = copy.deepcopy(record_dict)
-                    for field_name in self._field_names:
-                        new_record_dict[field_name] = sub_record.pop(0)
-                    if self._query_merger:
-                        self._query_merger.merge_into(new_record_dict)
-                    yield new_record_dict
+                yield self._copy_record(record_dict)
 
-                self._post_process(response)
+            sub_records = RestApiQuery._compute_sub_records(result_list=result_list,
+                                                            field_names=self._field_names,
+                                                            json_path_contains_or=self._json_path_contains_or)
+
+            for sub_record in sub_records:
+                if not sub_record or len(sub_record) != len(self._field_names):
+                    # skip the record
+                    continue
+                new_record_dict = self._copy_record(record_dict)
+                for field_name in self._field_names:
+                    new_record_dict[field_name] = sub_record.pop(0)
+                if self._query_merger:
+                    self._query_merger.merge_into(new_record_dict)
+                yield new_record_dict
+
+            self._post_process(response)
 
     def _preprocess_url(self, record: Dict[str, Any]) -> str:
         """
@@ -206,10 +314,49 @@ class RestApiQuery(BaseRestApiQuery):
         :return:
         """
         LOGGER.info('Calling URL %s', url)
-        response = requests.get(url, **self._params)
+        if self._host_limiter:
+            with self._host_limiter.limit(url):
+                response = self._get(url)
+        else:
+            response = self._get(url)
+
+        if response.status_code in RETRY_AFTER_STATUS_CODES:
+            self._wait_retry_after(response)
         response.raise_for_status()
         return response
 
+    def _get(self, url: str) -> requests.Response:
+        if self._max_workers <= 1:
+            return requests.get(url, **self._params)
+
+        # Each worker thread reuses the connections of its own session
+        assert self._thread_local is not None
+        session = getattr(self._thread_local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._thread_local.session = session
+        return session.get(url, **self._params)
+
+    @staticmethod
+    def _wait_retry_after(response: requests.Response) -> None:
+        """
+        Waits for the delay of the Retry-After header of a rate limited response, if any, before it is retried.
+        :param response:
+        :return:
+        """
+        retry_after = response.headers.get('Retry-After')
+        if not retry_after:
+            return
+
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            retry_date = email.utils.parsedate_to_datetime(retry_after)
+            delay = retry_date.timestamp() - time.time() if retry_date else 0
+        delay = min(max(delay, 0), MAX_RETRY_AFTER_SEC)
+        LOGGER.info('Rate limited by %s, retrying after %.1f seconds', response.url, delay)
+        time.sleep(delay)
+
     @classmethod
     def _compute_sub_records(cls,
                              result_list: List[Any],
@@ -0,0 +1,148 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import logging
+import os
+import time
+from typing import (
+    Any, Callable, Dict, List, NamedTuple, Optional,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class DeletionCheckpoint:
+    """
+    Progress of a batched deletion per target, saved to a JSON file after every batch, so that an interrupted run
+    resumes where it left off. Progress is only resumed by a run with the same marker, which must identify what the
+    run deletes: the job publish tag, or the absolute cut off of a run expiring data by age.
+    Without a path, progress is kept in memory only.
+    """
+
+    def __init__(self, path: Optional[str], marker: Any) -> None:
+        self._path = path
+        self._marker = str(marker)
+        self._targets: Dict[str, Dict[str, Any]] = {}
+
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf8') as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+            if checkpoint.get('marker') == self._marker:
+                LOGGER.info('Resuming from checkpoint %s', path)
+                self._targets = checkpoint['targets']
+            else:
+                LOGGER.info('Ignoring checkpoint %s of a run with a different marker', path)
+
+    def get(self, target: str) -> Dict[str, Any]:
+        """
+        :param target:
+        :return: A dict with the last deleted id, the number of deleted elements and whether the target is done
+        """
+        return self._targets.get(target, {'last_id': None, 'deleted': 0, 'done': False})
+
+    def update(self, target: str, last_id: Any, deleted: int, done: bool = False) -> None:
+        self._targets[target] = {'last_id': last_id, 'deleted': deleted, 'done': done}
+        self._save()
+
+    def _save(self) -> None:
+        if not self._path:
+            return
+
+        # Write and rename, so that an interruption does not leave a partial checkpoint behind
+        tmp_path = f'{self._path}.tmp'
+        with open(tmp_path, 'w', encoding='utf8') as checkpoint_file:
+            json.dump({'marker': self._marker, 'targets': self._targets}, checkpoint_file)
+        os.replace(tmp_path, self._path)
+
+    def clear(self) -> None:
+        """
+        Removes the checkpoint, once all targets are done.
+        """
+        self._targets = {}
+        if self._path and os.path.exists(self._path):
+            os.remove(self._path)
+
+
+class DeletionMetrics(NamedTuple):
+    target: str
+    deleted: int
+    batches: int
+    elapsed_sec: float
+
+    @property
+    def per_sec(self) -> float:
+        return self.deleted / self.elapsed_sec if self.elapsed_sec else 0.0
+
+
+class BatchedDeleter:
+    """
+    Deletes stale elements (nodes, relations, records) of a target in batches. It pages through the ids of the stale
+    elements, deletes each page in a single statement, records the progress in the checkpoint and reports the
+    throughput. Used by the staleness removal tasks, which provide how to fetch and delete the ids of their store.
+    """
+
+    def __init__(self,
+                 batch_size: int,
+                 checkpoint: DeletionCheckpoint,
+                 progress_report_frequency: int = 10) -> None:
+        self._batch_size = batch_size
+        self._checkpoint = checkpoint
+        self._progress_report_frequency = progress_report_frequency
+        self.metrics: Dict[str, DeletionMetrics] = {}
+
+    def delete(self,
+               target: str,
+               fetch_stale_ids: Callable[[Any, int], List[Any]],
+               delete_ids: Callable[[List[Any]], int]) -> int:
+        """
+        :param target: Name of the target, e.g. the label of the nodes
+        :param fetch_stale_ids: Returns up to the given number of ids of stale elements, in ascending order and
+        greater than the given id (None for the first batch). Stores that cannot page by id may ignore it, as deleted
+        elements are not returned again.
+        :param delete_ids: Deletes the stale elements of the given ids, and returns the number of deleted elements
+        :return: Number of deleted elements, including the ones of a resumed run
+        """
+        progress = self._checkpoint.get(target)
+        if progress['done']:
+            LOGGER.info('Skipping %s, which was completed by a previous run', target)
+            return progress['deleted']
+
+        last_id = progress['last_id']
+        deleted = progress['deleted']
+        LOGGER.info('Deleting stale data of %s with batch size %i', target, self._batch_size)
+
+        start = time.time()
+        batches = 0
+        previous_ids: Optional[List[Any]] = None
+        while True:
+            ids = fetch_stale_ids(last_id, self._batch_size)
+            if not ids:
+                break
+            if ids == previous_ids:
+                raise RuntimeError(f'Failed to delete stale data of {target}: {ids[:10]}...')
+
+            deleted += delete_ids(ids)
+            batches += 1
+            previous_ids = ids
+            last_id = ids[-1]
+            self._checkpoint.update(target, last_id=last_id, deleted=deleted)
+
+            if batches % self._progress_report_frequency == 0:
+                elapsed = time.time() - start
+                LOGGER.info('Deleted %i stale data of %s so far, %.1f per second',
+                            deleted, target, (deleted - progress['deleted']) / elapsed if elapsed else 0)
+
+        self._checkpoint.update(target, last_id=last_id, deleted=deleted, done=True)
+        metrics = DeletionMetrics(target=target, deleted=deleted - progress['deleted'], batches=batches,
+                                  elapsed_sec=time.time() - start)
+        self.metrics[target] = metrics
+        LOGGER.info('Deleted %i stale data of %s in %i batches, %.1f seconds, %.1f per second',
+                    metrics.deleted, target, metrics.batches, metrics.elapsed_sec, metrics.per_sec)
+        return deleted
+
+    def finish(self) -> None:
+        """
+        Clears the checkpoint once all targets are done, so the next run starts from scratch.
+        """
+        self._checkpoint.clear()
@@ -4,17 +4,20 @@
 import logging
 import time
 from typing import (
-    Any, Dict, Set, Type,
+    Any, Dict, List, Set, Type,
 )
 
 from amundsen_rds.models import RDSModel
 from amundsen_rds.models.base import Base
 from pyhocon import ConfigFactory, ConfigTree
-from sqlalchemy import create_engine, func
+from sqlalchemy import (
+    create_engine, func, tuple_,
+)
 from sqlalchemy.orm import sessionmaker
 
 from databuilder import Scoped
 from databuilder.task.base_task import Task
+from databuilder.task.batched_deletion import BatchedDeleter, DeletionCheckpoint
 
 LOGGER = logging.getLogger(__name__)
 
@@ -28,7 +31,8 @@ class MySQLStalenessRemovalTask(Task):
     set specific model table names to perform this deletion.
     Note: This task performs a cascade delete and will delete all the orphan records in the child tables of the stale
     records.
-
+    Stale records are deleted in batches of primary key ranges. If CHECKPOINT_PATH is set, the progress is saved after
+    every batch, so that an interrupted run resumes where it left off.
     """
     # Connection string
     CONN_STRING = "conn_string"
@@ -48,8 +52,13 @@ class MySQLStalenessRemovalTask(Task):
     # Using this milliseconds and published timestamp to determine staleness
     MS_TO_EXPIRE = "milliseconds_to_expire"
     MIN_MS_TO_EXPIRE = "minimum_milliseconds_to_expire"
+    # Number of records deleted per statement
+    BATCH_SIZE = "batch_size"
+    # A JSON file recording the progress, so that an interrupted run resumes where it left off
+    CHECKPOINT_PATH = "checkpoint_path"
 
     _DEFAULT_CONFIG = ConfigFactory.from_dict({STALENESS_MAX_PCT: 5,
+                                              BATCH_SIZE: 10000,
                                               TARGET_TABLES: [],
                                               STALENESS_PCT_MAX_DICT: {},
                                               MIN_MS_TO_EXPIRE: 86400000,
@@ -90,6 +99,15 @@ class MySQLStalenessRemovalTask(Task):
         self._session_factory = sessionmaker(bind=self._engine)
         self._session = self._session_factory()
 
+        # Records expire relative to the start of the run. The checkpoint is marked with that cut off, so that a later
+        # run, with a later cut off, does not skip the targets completed by an interrupted run.
+        self.cutoff_epoch_ms = int(time.time() * 1000) - self.ms_to_expire if self.ms_to_expire else None
+        checkpoint = DeletionCheckpoint(conf.get_string(MySQLStalenessRemovalTask.CHECKPOINT_PATH, None),
+                                        marker=f'cutoff:{self.cutoff_epoch_ms}' if self.ms_to_expire
+                                        else self.marker)
+        self._batched_deleter = BatchedDeleter(batch_size=conf.get_int(MySQLStalenessRemovalTask.BATCH_SIZE),
+                                               checkpoint=checkpoint)
+
     def _get_target_table_model_dict(self, target_tables: Set[str]) -> Dict[str, Type[RDSModel]]:
         """
         Returns a dictionary with a table name to the corresponding RDS model class mapping.
@@ -136,6 +154,8 @@ class MySQLStalenessRemovalTask(Task):
                         self._delete_stale_records(target_model_class=target_model_class)
                 else:
                     raise Exception(f'Failed to get corresponding model for {table_name}')
+            if not self.dry_run:
+                self._batched_deleter.finish()
         except Exception as e:
             self._session.rollback()
             raise e
@@ -168,12 +188,39 @@ class MySQLStalenessRemovalTask(Task):
         return staleness_pct
 
     def _delete_stale_records(self, target_model_class: Type[RDSModel]) -> None:
+        """
+        Deletes the stale records in batches: a batch of primary keys of stale records is fetched in key order, and
+        the stale records within that key range are deleted with a single statement.
+        :param target_model_class:
+        :return:
+        """
         target_table = target_model_class.__tablename__
-        try:
-            deleted_records_count = self._session.query(target_model_class).filter(
-                self._get_stale_records_filter_condition(target_model_class=target_model_class)).delete()
+        pk_columns = list(target_model_class.__table__.primary_key.columns)
+        is_composite = len(pk_columns) > 1
+        pk = tuple_(*pk_columns) if is_composite else pk_columns[0]
+        stale_condition = self._get_stale_records_filter_condition(target_model_class=target_model_class)
+
+        def to_key(value: Any) -> Any:
+            # Composite keys are lists once restored from a checkpoint
+            return tuple_(*value) if is_composite else value
+
+        def fetch_stale_ids(after_id: Any, batch_size: int) -> List[Any]:
+            query = self._session.query(*pk_columns).filter(stale_condition)
+            if after_id is not None:
+                query = query.filter(pk > to_key(after_id))
+            rows = query.order_by(*pk_columns).limit(batch_size).all()
+            return [list(row) if is_composite else row[0] for row in rows]
+
+        def delete_ids(ids: List[Any]) -> int:
+            deleted_records_count = self._session.query(target_model_class) \
+                .filter(stale_condition) \
+                .filter(pk >= to_key(ids[0]), pk <= to_key(ids[-1])) \
+                .delete(synchronize_session=False)
             self._session.commit()
-            LOGGER.info(f'Deleted {deleted_records_count} record(s) of {target_table}')
+            return deleted_records_count
+
+        try:
+            self._batched_deleter.delete(target_table, fetch_stale_ids, delete_ids)
         except Exception as e:
             LOGGER.exception(f'Failed to delete stale records for {target_table}')
             raise e
@@ -185,9 +232,7 @@ class MySQLStalenessRemovalTask(Task):
         :return:
         """
         if self.ms_to_expire:
-            current_time = int(time.time() * 1000)
-            filter_condition = target_model_class.publisher_last_updated_epoch_ms < (
-                current_time - self.marker)
+            filter_condition = target_model_class.publisher_last_updated_epoch_ms < self.cutoff_epoch_ms
         else:
             filter_condition = target_model_class.published_tag != self.marker
         return filter_condition
@@ -5,7 +5,7 @@ import logging
 import textwrap
 import time
 from typing import (
-    Any, Dict, Iterable, Union,
+    Any, Dict, Iterable, List, Union,
 )
 
 import neo4j
@@ -18,6 +18,7 @@ from pyhocon import ConfigFactory, ConfigTree
 from databuilder import Scoped
 from databuilder.publisher.neo4j_csv_publisher import JOB_PUBLISH_TAG
 from databuilder.task.base_task import Task
+from databuilder.task.batched_deletion import BatchedDeleter, DeletionCheckpoint
 
 # A end point for Neo4j e.g: bolt://localhost:9999
 NEO4J_END_POINT_KEY = 'neo4j_endpoint'
@@ -42,8 +43,10 @@ STALENESS_PCT_MAX_DICT = "staleness_max_pct_dict"
 MS_TO_EXPIRE = "milliseconds_to_expire"
 MIN_MS_TO_EXPIRE = "minimum_milliseconds_to_expire"
 RETAIN_DATA_WITH_NO_PUBLISHER_METADATA = "retain_data_with_no_publisher_metadata"
+# A JSON file recording the progress, so that an interrupted run resumes where it left off
+CHECKPOINT_PATH = "checkpoint_path"
 
-DEFAULT_CONFIG = ConfigFactory.from_dict({BATCH_SIZE: 100,
+DEFAULT_CONFIG = ConfigFactory.from_dict({BATCH_SIZE: 10000,
                                           NEO4J_MAX_CONN_LIFE_TIME_SEC: 50,
                                           NEO4J_DATABASE_NAME: neo4j.DEFAULT_DATABASE,
                                           STALENESS_MAX_PCT: 5,
@@ -73,19 +76,33 @@ class Neo4jStalenessRemovalTask(Task):
     Not all resource is being published by Neo4jCsvPublisher and you can only set specific LABEL of the node or TYPE
     of relation to perform this deletion.
 
+    Stale data is deleted in batches: the ids of a batch of stale nodes / relations are fetched, and then deleted by
+    id. Deleted data no longer matches the staleness condition, so each batch is simply the first stale data found,
+    without sorting all of it by id. If CHECKPOINT_PATH is set, the progress is saved after every batch, so that an
+    interrupted run resumes where it left off.
     """
 
-    delete_stale_nodes_statement = textwrap.dedent("""
+    find_stale_nodes_statement = textwrap.dedent("""
         MATCH (target:{{type}})
         WHERE {staleness_condition}{{extra_condition}}
         WITH target LIMIT $batch_size
-        DETACH DELETE (target)
-        RETURN count(*) as count
+        RETURN id(target) as id
         """)
-    delete_stale_relations_statement = textwrap.dedent("""
+    find_stale_relations_statement = textwrap.dedent("""
         MATCH (start_node)-[target:{{type}}]-(end_node)
         WHERE {staleness_condition}{{extra_condition}}
-        WITH target LIMIT $batch_size
+        WITH DISTINCT target LIMIT $batch_size
+        RETURN id(target) as id
+        """)
+    delete_nodes_statement = textwrap.dedent("""
+        MATCH (target)
+        WHERE id(target) IN $ids
+        DETACH DELETE (target)
+        RETURN count(*) as count
+        """)
+    delete_relations_statement = textwrap.dedent("""
+        MATCH ()-[target]->()
+        WHERE id(target) IN $ids
         DELETE target
         RETURN count(*) as count
         """)
@@ -156,6 +173,13 @@ class Neo4jStalenessRemovalTask(Task):
         self._driver = GraphDatabase.driver(**driver_args)
 
         self.db_name = conf.get(NEO4J_DATABASE_NAME)
+        # With MS_TO_EXPIRE, the checkpoint is marked with the cut off at the start of the run, so that a later run,
+        # with a later cut off, does not skip the targets completed by an interrupted run
+        checkpoint_marker = f'cutoff:{int(time.time() * 1000) - self.ms_to_expire}' if self.ms_to_expire \
+            else self.marker
+        self._batched_deleter = BatchedDeleter(batch_size=self.batch_size,
+                                               checkpoint=DeletionCheckpoint(conf.get_string(CHECKPOINT_PATH, None),
+                                                                             marker=checkpoint_marker))
 
     def run(self) -> None:
         """
@@ -167,6 +191,7 @@ class Neo4jStalenessRemovalTask(Task):
         self.validate()
         self._delete_stale_nodes()
         self._delete_stale_relations()
+        self._batched_deleter.finish()
 
     def validate(self) -> None:
         """
@@ -178,8 +203,10 @@ class Neo4jStalenessRemovalTask(Task):
         self._validate_relation_staleness_pct()
 
     def _delete_stale_nodes(self) -> None:
-        self._batch_delete(statement=self._decorate_staleness(self.delete_stale_nodes_statement),
-                           targets=self.target_nodes)
+        self._batch_delete(find_statement=self._decorate_staleness(self.find_stale_nodes_statement),
+                           delete_statement=self.delete_nodes_statement,
+                           targets=self.target_nodes,
+                           target_kind='node')
 
     def _decorate_staleness(self,
                             statement: str
@@ -205,17 +232,23 @@ class Neo4jStalenessRemovalTask(Task):
         return statement.format(staleness_condition=condition)
 
     def _delete_stale_relations(self) -> None:
-        self._batch_delete(statement=self._decorate_staleness(self.delete_stale_relations_statement),
-                           targets=self.target_relations)
+        self._batch_delete(find_statement=self._decorate_staleness(self.find_stale_relations_statement),
+                           delete_statement=self.delete_relations_statement,
+                           targets=self.target_relations,
+                           target_kind='relation')
 
     def _batch_delete(self,
-                      statement: str,
-                      targets: Union[Iterable[str], Iterable[TargetWithCondition]]
+                      find_statement: str,
+                      delete_statement: str,
+                      targets: Union[Iterable[str], Iterable[TargetWithCondition]],
+                      target_kind: str
                       ) -> None:
         """
         Performing huge amount of deletion could degrade Neo4j performance. Therefore, it's taking batch deletion here.
-        :param statement:
+        :param find_statement: Statement returning a batch of ids of stale data
+        :param delete_statement: Statement deleting data by ids
         :param targets:
+        :param target_kind: node or relation
         :return:
         """
         for t in targets:
@@ -226,20 +259,22 @@ class Neo4jStalenessRemovalTask(Task):
                 target_type = t
                 extra_condition = ''
 
-            LOGGER.info('Deleting stale data of %s with batch size %i', target_type, self.batch_size)
-            total_count = 0
-            while True:
-                results = self._execute_cypher_query(statement=statement.format(type=target_type,
-                                                                                extra_condition=extra_condition),
-                                                     param_dict={'batch_size': self.batch_size,
+            statement = find_statement.format(type=target_type, extra_condition=extra_condition)
+
+            def fetch_stale_ids(after_id: Any, batch_size: int, statement: str = statement) -> List[Any]:
+                # The last deleted id is only a checkpoint: deleted data is not returned again
+                results = self._execute_cypher_query(statement=statement,
+                                                     param_dict={'batch_size': batch_size,
                                                                  MARKER_VAR_NAME: self.marker},
                                                      dry_run=self.dry_run)
+                return [record['id'] for record in results]
+
+            def delete_ids(ids: List[Any]) -> int:
+                results = self._execute_cypher_query(statement=delete_statement, param_dict={'ids': ids})
                 record = next(iter(results), None)
-                count = record['count'] if record else 0
-                total_count = total_count + count
-                if count == 0:
-                    break
-            LOGGER.info('Deleted %i stale data of %s', total_count, target_type)
+                return record['count'] if record else 0
+
+            self._batched_deleter.delete(f'{target_kind}:{target_type}', fetch_stale_ids, delete_ids)
 
     def _validate_staleness_pct(self,
                                 total_record_count: int,
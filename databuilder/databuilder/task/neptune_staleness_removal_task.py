@@ -19,6 +19,7 @@ from databuilder.serializers.neptune_serializer import (
     NEPTUNE_LAST_EXTRACTED_AT_RELATIONSHIP_PROPERTY_NAME,
 )
 from databuilder.task.base_task import Task  # noqa: F401
+from databuilder.task.batched_deletion import BatchedDeleter, DeletionCheckpoint
 
 LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +31,8 @@ class NeptuneStalenessRemovalTask(Task):
     the one it is getting it from the config, it will regard the node/relation as stale.
     Not all resources are being published by NeptuneCSVPublisher and you can only set specific LABEL of the node or TYPE
     of relation to perform this deletion.
+    Stale data is deleted in batches per LABEL/TYPE. If CHECKPOINT_PATH is set, the progress is saved after every
+    batch, so that an interrupted run resumes where it left off.
     """
 
     NEPTUNE_HOST = 'neptune_host'
@@ -51,8 +54,13 @@ class NeptuneStalenessRemovalTask(Task):
     STALENESS_PCT_MAX_DICT = "staleness_max_pct_dict"
     # Sets how old the nodes and relationships can be
     STALENESS_CUT_OFF_IN_SECONDS = "staleness_cut_off_in_seconds"
+    # Number of nodes or edges dropped per traversal
+    BATCH_SIZE = "batch_size"
+    # A JSON file recording the progress, so that an interrupted run resumes where it left off
+    CHECKPOINT_PATH = "checkpoint_path"
     DEFAULT_CONFIG = ConfigFactory.from_dict({
         GRAPH_LABEL_ID_PROPERTY_NAME: T.label,
+        BATCH_SIZE: 1000,
         STALENESS_MAX_PCT: 5,
         TARGET_NODES: [],
         TARGET_RELATIONS: [],
@@ -79,6 +87,13 @@ class NeptuneStalenessRemovalTask(Task):
         gremlin_client_conf = Scoped.get_scoped_conf(conf, self.gremlin_client.get_scope())
         self.gremlin_client.init(gremlin_client_conf)
 
+        # The checkpoint is marked with the cut off of the run, so that a later run, with a later cut off, does not
+        # skip the targets completed by an interrupted run
+        checkpoint = DeletionCheckpoint(conf.get_string(NeptuneStalenessRemovalTask.CHECKPOINT_PATH, None),
+                                        marker=f'cutoff:{self.cutoff_datetime.isoformat()}')
+        self._batched_deleter = BatchedDeleter(batch_size=conf.get_int(NeptuneStalenessRemovalTask.BATCH_SIZE),
+                                               checkpoint=checkpoint)
+
     def run(self) -> None:
         """
         First, performs a safety check to make sure this operation would not delete more than a threshold where
@@ -91,6 +106,7 @@ class NeptuneStalenessRemovalTask(Task):
             return
         self._delete_stale_relations()
         self._delete_stale_nodes()
+        self._batched_deleter.finish()
 
     def validate(self) -> None:
         """
@@ -105,21 +121,44 @@ class NeptuneStalenessRemovalTask(Task):
             (NEPTUNE_CREATION_TYPE_NODE_PROPERTY_NAME, NEPTUNE_CREATION_TYPE_JOB, traversal.eq),
             (NEPTUNE_LAST_EXTRACTED_AT_NODE_PROPERTY_NAME, self.cutoff_datetime, traversal.lt)
         ]
-        self.gremlin_client.delete_nodes(
-            filter_properties=filter_properties,
-            node_labels=list(self.target_nodes)
-        )
+        self._batch_delete(self.gremlin_client.get_graph().V, filter_properties, self.target_nodes, 'node')
 
     def _delete_stale_relations(self) -> None:
         filter_properties = [
             (NEPTUNE_CREATION_TYPE_RELATIONSHIP_PROPERTY_NAME, NEPTUNE_CREATION_TYPE_JOB, traversal.eq),
             (NEPTUNE_LAST_EXTRACTED_AT_RELATIONSHIP_PROPERTY_NAME, self.cutoff_datetime, traversal.lt),
         ]
+        self._batch_delete(self.gremlin_client.get_graph().E, filter_properties, self.target_relations, 'relation')
 
-        self.gremlin_client.delete_edges(
-            filter_properties=filter_properties,
-            edge_labels=list(self.target_relations)
-        )
+    def _batch_delete(
+            self,
+            traversal_source: Callable,
+            filter_properties: List[Tuple[str, Any, Callable]],
+            labels: List[str],
+            target_kind: str
+    ) -> None:
+        """
+        Drops the stale nodes or edges of each label in batches: the ids of a batch of stale elements are fetched,
+        and then dropped by id. Without labels, stale elements of any label are dropped.
+        :param traversal_source: g.V or g.E
+        :param filter_properties:
+        :param labels:
+        :param target_kind: node or relation
+        """
+        for label in labels or [None]:
+            def fetch_stale_ids(after_id: Any, batch_size: int, label: Optional[str] = label) -> List[Any]:
+                # Dropped elements are not returned again, so there is no need to page by id
+                tx = traversal_source()
+                if label:
+                    tx = tx.hasLabel(label)
+                tx = NeptuneSessionClient.filter_traversal(tx, filter_properties)
+                return tx.limit(batch_size).id().toList()
+
+            def delete_ids(ids: List[Any]) -> int:
+                traversal_source(*ids).drop().iterate()
+                return len(ids)
+
+            self._batched_deleter.delete(f'{target_kind}:{label or "*"}', fetch_stale_ids, delete_ids)
 
     def _validate_staleness_pct(
             self,
@@ -0,0 +1,295 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import inspect
+import io
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import shutil
+import tempfile
+import types
+from os.path import join
+from typing import (
+    Any, Callable, Dict, List, Tuple,
+)
+
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder import Scoped
+from databuilder.extractor.base_extractor import Extractor
+from databuilder.loader.base_loader import Loader
+from databuilder.task.task import DefaultTask, transform_and_load
+from databuilder.transformer.base_transformer import NoopTransformer, Transformer
+from databuilder.utils.publisher_utils import ARROW_FILE_EXTENSION
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _restart_generator(owner: Any, name: str) -> Any:
+    return getattr(owner, name)()
+
+
+class _RecordPickler(pickle.Pickler):
+    """
+    Pickler used to hand extracted records over to the worker processes.
+    Many models still create their node / relation generators in __init__, which the default pickler rejects.
+    A generator that has not been started yet and was created by a method of the record without arguments is
+    pickled as a call to that method, so it is recreated on the worker side.
+    """
+
+    def reducer_override(self, obj: Any) -> Any:
+        if isinstance(obj, types.GeneratorType) and inspect.getgeneratorstate(obj) == inspect.GEN_CREATED:
+            owner = obj.gi_frame.f_locals.get('self')
+            name = obj.gi_code.co_name
+            if owner is not None and obj.gi_code.co_argcount == 1 and callable(getattr(owner, name, None)):
+                return _restart_generator, (owner, name)
+        return NotImplemented
+
+
+def _dump_records(records: List[Any]) -> bytes:
+    buffer = io.BytesIO()
+    _RecordPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(records)
+    return buffer.getvalue()
+
+
+def _run_partition(transformer: Transformer,
+                   loader: Loader,
+                   transformer_conf: ConfigTree,
+                   loader_conf: ConfigTree,
+                   batch_queue: multiprocessing.Queue,
+                   result_queue: multiprocessing.Queue) -> None:
+    """
+    Worker process entry point. Transforms and loads batches of records until it receives None,
+    then closes the loader so that all of its output files are flushed before they are merged.
+    """
+    count = 0
+    transformer.init(transformer_conf)
+    loader.init(loader_conf)
+    try:
+        while True:
+            payload = batch_queue.get()
+            if payload is None:
+                break
+
+            for record in pickle.loads(payload):
+                count += transform_and_load(record, transformer, loader)
+    finally:
+        transformer.close()
+        loader.close()
+
+    result_queue.put(count)
+
+
+class ParallelTask(DefaultTask):
+    """
+    A task that extracts on a single thread, and fans the extracted records out to a pool of worker processes
+    that run the transformer and the loader. Each worker writes its own partition of the loader's output
+    directories, and the partitions are merged into the directories the loader was configured with before the
+    task finishes, so the publisher is unaware of the parallelism.
+
+    The order of records within output files is not preserved. Models that de-duplicate shared nodes within a
+    process (e.g. the cluster / database / schema nodes of TableMetadata) may emit them once per worker, which is
+    harmless as publishers merge on the key.
+    Only file system loaders that are configured with output directories (e.g. FsNeo4jCSVLoader,
+    FSMySQLCSVLoader, FsAtlasCSVLoader) are supported. Records and the (uninitialized) transformer and loader need
+    to be picklable.
+    """
+    # Number of worker processes
+    PARALLELISM = 'parallelism'
+    # Number of records sent to a worker at a time
+    BATCH_SIZE = 'batch_size'
+    # Number of batches that can be queued up before the extraction blocks
+    MAX_QUEUED_BATCHES = 'max_queued_batches'
+    # Loader config keys that point to output directories that will be partitioned per worker
+    LOADER_DIR_PATH_KEYS = 'loader_dir_path_keys'
+
+    _DEFAULT_CONFIG = ConfigFactory.from_dict({
+        PARALLELISM: os.cpu_count() or 1,
+        BATCH_SIZE: 100,
+        MAX_QUEUED_BATCHES: 16,
+        LOADER_DIR_PATH_KEYS: ['node_dir_path', 'relationship_dir_path', 'record_dir_path', 'entity_dir_path']
+    })
+
+    def __init__(self,
+                 extractor: Extractor,
+                 loader: Loader,
+                 transformer: Transformer = NoopTransformer()) -> None:
+        super(ParallelTask, self).__init__(extractor=extractor, loader=loader, transformer=transformer)
+        self._workers: List[multiprocessing.Process] = []
+
+    def init(self, conf: ConfigTree) -> None:
+        task_conf = Scoped.get_scoped_conf(conf, self.get_scope()).with_fallback(ParallelTask._DEFAULT_CONFIG)
+        self._parallelism = task_conf.get_int(ParallelTask.PARALLELISM)
+        self._batch_size = task_conf.get_int(ParallelTask.BATCH_SIZE)
+        self._max_queued_batches = task_conf.get_int(ParallelTask.MAX_QUEUED_BATCHES)
+
+        self._transformer_conf = Scoped.get_scoped_conf(conf, self.transformer.get_scope())
+        self._loader_conf = Scoped.get_scoped_conf(conf, self.loader.get_scope())
+        self._dir_paths = {key: self._loader_conf.get_string(key)
+                           for key in task_conf.get_list(ParallelTask.LOADER_DIR_PATH_KEYS)
+                           if key in self._loader_conf}
+        if not self._dir_paths:
+            raise RuntimeError(f'{self.loader.get_scope()} is not configured with any of the output directories '
+                               f'{task_conf.get_list(ParallelTask.LOADER_DIR_PATH_KEYS)}')
+
+        super(ParallelTask, self).init(conf)
+
+    def run(self) -> None:
+        """
+        Runs a task
+        """
+        LOGGER.info('Running a task with %i worker processes', self._parallelism)
+        self._partition_dir = tempfile.mkdtemp(prefix='amundsen_partitions_')
+        try:
+            self._start_workers()
+
+            count = 0
+            batch: List[Any] = []
+            record = self.extractor.extract()
+            while record:
+                batch.append(record)
+                count += 1
+                if len(batch) >= self._batch_size:
+                    self._dispatch(_dump_records(batch))
+                    batch = []
+
+                if count % self._progress_report_frequency == 0:
+                    LOGGER.info(f'Extracted {count} records so far')
+
+                # Prepare the next record
+                record = self.extractor.extract()
+
+            if batch:
+                self._dispatch(_dump_records(batch))
+            for _ in self._workers:
+                self._dispatch(None)
+
+            loaded = sum(self._wait_for(self._result_queue.get) for _ in self._workers)
+            for worker in self._workers:
+                worker.join()
+
+            LOGGER.info(f'Total extracted records: {count}, loaded records: {loaded}')
+            self._merge_partitions()
+        finally:
+            for worker in self._workers:
+                if worker.is_alive():
+                    worker.terminate()
+            shutil.rmtree(self._partition_dir, ignore_errors=True)
+            self._closer.close()
+
+    def _start_workers(self) -> None:
+        self._batch_queue: multiprocessing.Queue = multiprocessing.Queue(self._max_queued_batches)
+        self._result_queue: multiprocessing.Queue = multiprocessing.Queue()
+
+        for i in range(self._parallelism):
+            partition_conf = {key: join(self._partition_dir, str(i), key) for key in self._dir_paths}
+            partition_conf.update({'force_create_directory': False, 'delete_created_directories': False})
+            loader_conf = ConfigFactory.from_dict(partition_conf).with_fallback(self._loader_conf)
+
+            worker = multiprocessing.Process(target=_run_partition,
+                                             name=f'{self.get_scope()}-partition-{i}',
+                                             args=(self.transformer, self.loader,
+                                                   self._transformer_conf, loader_conf,
+                                                   self._batch_queue, self._result_queue),
+                                             daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _dispatch(self, payload: Any) -> None:
+        self._wait_for(lambda timeout: self._batch_queue.put(payload, timeout=timeout))
+
+    def _wait_for(self, fn: Callable[..., Any]) -> Any:
+        """
+        Blocks on a queue operation while making sure the workers are still alive,
+        so that a failed worker does not leave the task waiting forever.
+        """
+        while True:
+            try:
+                return fn(timeout=1)
+            except (queue.Full, queue.Empty):
+                failed = [worker.name for worker in self._workers
+                          if not worker.is_alive() and worker.exitcode != 0]
+                if failed:
+                    raise RuntimeError(f'Worker process(es) failed: {failed}')
+
+    def _merge_partitions(self) -> None:
+        """
+        Merges the files each worker wrote into the loader's output directories.
+        Files with the same name and header are concatenated, the record batches of Arrow IPC files being rewritten
+        into a single file. If workers wrote files with the same name but a different header, a new file name is
+        allocated, keeping the `<name>_<number>.csv` convention the loaders use.
+        """
+        for key, target_dir in self._dir_paths.items():
+            LOGGER.info('Merging partitions of %s into %s', key, target_dir)
+            partition_dirs = [join(self._partition_dir, str(i), key) for i in range(len(self._workers))]
+            _merge_dirs([d for d in partition_dirs if os.path.isdir(d)], target_dir)
+
+
+def _merge_dirs(source_dirs: List[str], target_dir: str) -> None:
+    targets: Dict[Tuple[str, Any], str] = {}
+    taken = set(os.listdir(target_dir))
+    # Arrow IPC files can not be appended to, so their writers stay open until all the partitions are merged
+    arrow_writers: Dict[str, Any] = {}
+
+    def get_target_name(file_name: str, header: Any) -> Tuple[str, bool]:
+        stem, ext = os.path.splitext(file_name)
+        prefix, _, suffix = stem.rpartition('_')
+        if not prefix or not suffix.isdigit():
+            prefix = stem
+
+        target_name = targets.get((prefix, header))
+        if target_name is not None:
+            return target_name, False
+
+        target_name = file_name
+        index = 0
+        while target_name in taken:
+            target_name = f'{prefix}_{index}{ext}'
+            index += 1
+        taken.add(target_name)
+        targets[(prefix, header)] = target_name
+        return target_name, True
+
+    try:
+        for source_dir in source_dirs:
+            for file_name in sorted(os.listdir(source_dir)):
+                source_path = join(source_dir, file_name)
+                if file_name.endswith(ARROW_FILE_EXTENSION):
+                    _merge_arrow_file(source_path, target_dir, get_target_name, arrow_writers)
+                    continue
+
+                with open(source_path, 'rb') as source:
+                    header = source.readline()
+                    target_name, is_new = get_target_name(file_name, header)
+                    with open(join(target_dir, target_name), 'ab') as target:
+                        if is_new:
+                            target.write(header)
+                        shutil.copyfileobj(source, target)
+    finally:
+        for writer in arrow_writers.values():
+            writer.close()
+
+
+def _merge_arrow_file(source_path: str,
+                      target_dir: str,
+                      get_target_name: Callable[[str, Any], Tuple[str, bool]],
+                      arrow_writers: Dict[str, Any]) -> None:
+    """
+    Rewrites the record batches of an Arrow IPC file into the writer of its target file
+    """
+    # pyarrow is an optional dependency, only needed for Arrow files
+    import pyarrow
+    from pyarrow import ipc
+
+    from databuilder.utils.arrow_utils import ArrowRecordWriter
+
+    with pyarrow.memory_map(source_path, 'r') as source:
+        reader = ipc.open_file(source)
+        target_name, is_new = get_target_name(os.path.basename(source_path), tuple(reader.schema.names))
+        if is_new:
+            arrow_writers[target_name] = ArrowRecordWriter(join(target_dir, target_name), reader.schema.names)
+        for index in range(reader.num_record_batches):
+            arrow_writers[target_name].write_batch(reader.get_batch(index))
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
-from typing import Iterator
+from typing import Any, Iterator
 
 from pyhocon import ConfigTree
 
@@ -16,6 +16,29 @@ from databuilder.utils.closer import Closer
 LOGGER = logging.getLogger(__name__)
 
 
+def transform_and_load(record: Any, transformer: Transformer, loader: Loader) -> int:
+    """
+    Transforms a single extracted record and loads the result(s).
+    :param record: A record from the extractor
+    :param transformer:
+    :param loader:
+    :return: Number of records loaded
+    """
+    record = transformer.transform(record)
+    if not record:
+        # Move on if the transformer filtered the record out
+        return 0
+
+    count = 0
+    # Support transformers which return one record, or yield multiple
+    results = record if isinstance(record, Iterator) else [record]
+    for result in results:
+        if result:
+            loader.load(result)
+            count += 1
+    return count
+
+
 class DefaultTask(Task):
     """
     A default task expecting to extract, transform and load.
@@ -55,18 +78,7 @@ class DefaultTask(Task):
             record = self.extractor.extract()
             count = 0
             while record:
-                record = self.transformer.transform(record)
-                if not record:
-                    # Move on if the transformer filtered the record out
-                    record = self.extractor.extract()
-                    continue
-
-                # Support transformers which return one record, or yield multiple
-                results = record if isinstance(record, Iterator) else [record]
-                for result in results:
-                    if result:
-                        self.loader.load(result)
-                        count += 1
+                count += transform_and_load(record, self.transformer, self.loader)
 
                 if count > 0 and count % self._progress_report_frequency == 0:
                     LOGGER.info(f'Extracted {count} records so far')
@@ -0,0 +1,120 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+from typing import (
+    Any, Dict, Iterator, List, Optional,
+)
+
+import pyarrow
+from pyarrow import ipc
+
+from databuilder.utils.closer import Closer
+from databuilder.utils.publisher_utils import ARROW_FILE_EXTENSION
+
+LOGGER = logging.getLogger(__name__)
+
+# Default number of records per record batch written into Arrow files
+DEFAULT_RECORD_BATCH_SIZE = 10000
+
+
+class ArrowRecordWriter:
+    """
+    Writes records into an Arrow IPC file, buffering them into record batches.
+    It is a drop-in replacement of the csv.DictWriter used by the file system loaders.
+
+    Every column is written as strings, the same way it would be in a CSV file, so that records of a file always
+    match its schema whatever the types of their values.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], batch_size: int = DEFAULT_RECORD_BATCH_SIZE) -> None:
+        self._fieldnames = fieldnames
+        self._batch_size = batch_size
+        self._rows: List[Dict[str, Any]] = []
+        self._schema = pyarrow.schema([(name, pyarrow.string()) for name in fieldnames])
+        self._writer: Optional[ipc.RecordBatchFileWriter] = ipc.new_file(path, self._schema)
+
+    def writerow(self, row: Dict[str, Any]) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self._batch_size:
+            self._write_batch()
+
+    def write_batch(self, batch: pyarrow.RecordBatch) -> None:
+        """
+        Writes a record batch read from another file with the same columns, e.g. to merge files
+        """
+        self._write_batch()
+        self._writer.write_batch(batch.select(self._fieldnames))  # type: ignore
+
+    def _write_batch(self) -> None:
+        if not self._rows:
+            return
+
+        columns = {name: [_to_string(row.get(name)) for row in self._rows] for name in self._fieldnames}
+        self._writer.write_batch(pyarrow.RecordBatch.from_pydict(columns, schema=self._schema))  # type: ignore
+        self._rows = []
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._write_batch()
+            self._writer.close()
+            self._writer = None
+
+
+def _to_string(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def get_arrow_writer(record_dict: Dict[str, Any],
+                     file_mapping: Dict[Any, Any],
+                     key: Any,
+                     dir_path: str,
+                     file_suffix: str,
+                     closer: Closer,
+                     batch_size: int) -> ArrowRecordWriter:
+    """
+    Finds a writer based on the record key, the way the CSV loaders do.
+    If writer does not exist, it creates an Arrow writer, registers it to the closer and updates the mapping.
+
+    :param record_dict:
+    :param file_mapping:
+    :param key:
+    :param dir_path:
+    :param file_suffix:
+    :param closer:
+    :param batch_size: Number of records per record batch
+    :return:
+    """
+    writer = file_mapping.get(key)
+    if writer:
+        return writer
+
+    LOGGER.info('Creating file for %s', key)
+
+    writer = ArrowRecordWriter(f'{dir_path}/{file_suffix}{ARROW_FILE_EXTENSION}',
+                               fieldnames=list(record_dict.keys()),
+                               batch_size=batch_size)
+    closer.register(writer.close)
+    file_mapping[key] = writer
+
+    return writer
+
+
+def read_arrow_in_batches(arrow_file: str, batch_size: int) -> Iterator[List[dict]]:
+    """
+    Reads an Arrow IPC file as batches of records. The file is memory mapped, so that only the records of the
+    current batch are materialized.
+    Null values are read as empty strings, like the empty values of a CSV file.
+    :param arrow_file:
+    :param batch_size: Maximum number of records per batch
+    :return: Iterator of record batches
+    """
+    with pyarrow.memory_map(arrow_file, 'r') as source:
+        reader = ipc.open_file(source)
+        for index in range(reader.num_record_batches):
+            record_batch = reader.get_batch(index)
+            for offset in range(0, record_batch.num_rows, batch_size):
+                yield [{k: '' if v is None else v for k, v in record.items()}
+                       for record in record_batch.slice(offset, batch_size).to_pylist()]
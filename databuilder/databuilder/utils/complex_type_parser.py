@@ -0,0 +1,284 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+from functools import lru_cache
+from typing import (
+    Any, Dict, List, NamedTuple, Optional, Tuple, Union,
+)
+
+from pyparsing import ParseException
+
+from databuilder.models.table_metadata import ColumnMetadata
+from databuilder.models.type_metadata import (
+    ArrayTypeMetadata, MapTypeMetadata, ScalarTypeMetadata, StructTypeMetadata, TypeMetadata,
+)
+
+# Number of distinct type strings whose parsed types are cached by default
+DEFAULT_CACHE_SIZE = 10000
+
+SCALAR = 'scalar'
+ARRAY = 'array'
+MAP = 'map'
+STRUCT = 'struct'
+# Union types are parsed as complex types, but result in scalar types
+_UNION = 'union'
+
+ARRAY_INNER_NAME = '_inner_'
+MAP_KEY_NAME = '_map_key'
+MAP_VALUE_NAME = '_map_value'
+
+_IDENT = 'ident'
+_END = 'end'
+_TOKEN_REGEX = re.compile(r'[ \t\n\r]*(?:([A-Za-z0-9_]+)|([<>(),:]))')
+_TRAILING_WHITESPACE_REGEX = re.compile(r'[ \t\n\r]*$')
+
+_TYPE_METADATA_CLASSES: Dict[str, Any] = {
+    SCALAR: ScalarTypeMetadata,
+    ARRAY: ArrayTypeMetadata,
+    MAP: MapTypeMetadata,
+    STRUCT: StructTypeMetadata,
+}
+
+
+class ParsedType(NamedTuple):
+    """
+    Immutable result of parsing a type string, shared by all the columns of the same type.
+    children are (name, type) pairs: the inner type of an array, the key and value of a map, the items of a struct.
+    """
+    kind: str
+    type_str: str
+    children: Tuple[Tuple[str, 'ParsedType'], ...] = ()
+
+
+class _Token(NamedTuple):
+    kind: str
+    value: str
+    start: int
+    end: int
+
+
+class _Frame:
+    """
+    A complex type being parsed.
+    """
+    __slots__ = ('kind', 'start', 'children', 'pending_name')
+
+    def __init__(self, kind: str, start: int) -> None:
+        self.kind = kind
+        self.start = start
+        self.children: List[Tuple[str, ParsedType]] = []
+        self.pending_name = ''
+
+
+class ComplexTypeParser:
+    """
+    Parses complex type strings, such as struct<a:int,b:array<string>>, into TypeMetadata trees.
+
+    Type strings are tokenized, then parsed with an explicit stack instead of recursion, so that deeply nested types
+    do not hit the recursion limit. As identical complex types repeat heavily across tables, the parsed types are kept
+    in a bounded LRU cache keyed on the type string, and only the TypeMetadata objects are created for each column.
+
+    It accepts the same types as the pyparsing grammars of the hive and trino parsers, and raises ParseException on
+    the few unusual forms it does not handle (e.g. empty structs), for which those grammars are used instead.
+    """
+
+    def __init__(self,
+                 opener: str,
+                 closer: str,
+                 struct_keyword: str,
+                 field_separator: Optional[str] = None,
+                 union_keyword: Optional[str] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        :param opener: Opens the type parameters, e.g. '<' for array<int>
+        :param closer: Closes the type parameters, e.g. '>' for array<int>
+        :param struct_keyword: Keyword of struct types, e.g. 'struct' or 'row'
+        :param field_separator: Separates the name and the type of struct fields, e.g. ':'. None if they are only
+        separated by whitespace
+        :param union_keyword: Keyword of union types, which are parsed as scalar types. None if there are no unions
+        :param cache_size: Number of distinct type strings whose parsed types are cached
+        """
+        self._opener = opener
+        self._closer = closer
+        self._field_separator = field_separator
+        self._keywords = {ARRAY: ARRAY, MAP: MAP, struct_keyword: STRUCT}
+        if union_keyword:
+            self._keywords[union_keyword] = _UNION
+        self.parse_type_str = lru_cache(maxsize=cache_size)(self._parse_type_str)
+
+    def parse(self, type_str: str, name: str, parent: Union[ColumnMetadata, TypeMetadata]) -> TypeMetadata:
+        return self.build_type_metadata(self.parse_type_str(type_str), name, parent)
+
+    def cache_info(self) -> Any:
+        return self.parse_type_str.cache_info()
+
+    def cache_clear(self) -> None:
+        self.parse_type_str.cache_clear()
+
+    @staticmethod
+    def _error(type_str: str, token: _Token, expected: str) -> ParseException:
+        return ParseException(type_str, token.start, f'Expected {expected}, found {token.value or "end of text"!r}')
+
+    @staticmethod
+    def _tokenize(type_str: str) -> List[_Token]:
+        tokens = []
+        position = 0
+        while True:
+            match = _TOKEN_REGEX.match(type_str, position)
+            if not match:
+                break
+            if match.group(1) is not None:
+                tokens.append(_Token(_IDENT, match.group(1), match.start(1), match.end(1)))
+            else:
+                tokens.append(_Token(match.group(2), match.group(2), match.start(2), match.end(2)))
+            position = match.end()
+
+        if not _TRAILING_WHITESPACE_REGEX.match(type_str, position):
+            raise ParseException(type_str, position, f'Unexpected character {type_str[position]!r}')
+        tokens.append(_Token(_END, '', len(type_str), len(type_str)))
+        return tokens
+
+    def _parse_scalar(self, type_str: str, tokens: List[_Token], index: int) -> Tuple[ParsedType, int]:
+        """
+        Parses one or more words, optionally followed by a quantifier, e.g. double precision or decimal(10,2).
+        :return: The parsed type and the index of the token following it
+        """
+        start = tokens[index]
+        if start.kind != _IDENT:
+            raise self._error(type_str, start, 'a type')
+        while tokens[index].kind == _IDENT:
+            index += 1
+
+        # Like the grammar, keeps the whitespace following words that are not followed by a quantifier
+        end = tokens[index].start
+        if tokens[index].kind == '(':
+            if tokens[index + 1].kind != _IDENT or not tokens[index + 1].value.isdigit():
+                raise self._error(type_str, tokens[index + 1], 'a number')
+            index += 2
+            if tokens[index].kind == ',':
+                if tokens[index + 1].kind != _IDENT or not tokens[index + 1].value.isdigit():
+                    raise self._error(type_str, tokens[index + 1], 'a number')
+                index += 2
+            if tokens[index].kind != ')':
+                raise self._error(type_str, tokens[index], "')'")
+            end = tokens[index].end
+            index += 1
+
+        return ParsedType(SCALAR, type_str[start.start:end]), index
+
+    def _start_item(self, type_str: str, tokens: List[_Token], index: int, frame: _Frame) -> int:
+        """
+        Consumes what precedes the next type parameter of a complex type, e.g. the name of a struct field.
+        :return: The index of the token starting the type parameter
+        """
+        if frame.kind == ARRAY:
+            frame.pending_name = ARRAY_INNER_NAME
+        elif frame.kind == MAP:
+            if not frame.children:
+                frame.pending_name = MAP_KEY_NAME
+            else:
+                if tokens[index].kind != ',':
+                    raise self._error(type_str, tokens[index], "','")
+                index += 1
+                frame.pending_name = MAP_VALUE_NAME
+        elif frame.kind == STRUCT:
+            if tokens[index].kind != _IDENT:
+                raise self._error(type_str, tokens[index], 'a field name')
+            frame.pending_name = tokens[index].value
+            index += 1
+            if self._field_separator:
+                if tokens[index].kind != self._field_separator:
+                    raise self._error(type_str, tokens[index], repr(self._field_separator))
+                index += 1
+        return index
+
+    def _parse_type_str(self, type_str: str) -> ParsedType:
+        """
+        Parses a type string, which is expected to be normalized (e.g. lower case) by the caller.
+        """
+        tokens = self._tokenize(type_str)
+        index = 0
+        stack: List[_Frame] = []
+
+        while True:
+            token = tokens[index]
+            kind = self._keywords.get(token.value) if token.kind == _IDENT else None
+            if kind and tokens[index + 1].kind == self._opener:
+                frame = _Frame(kind, token.start)
+                stack.append(frame)
+                index = self._start_item(type_str, tokens, index + 2, frame)
+                continue
+            if kind == ARRAY and tokens[index + 1].kind == self._closer:
+                # The grammar parses it as an array without inner type
+                raise self._error(type_str, tokens[index + 1], 'an array inner type')
+
+            parsed, index = self._parse_scalar(type_str, tokens, index)
+
+            # Adds the parsed type to the complex types it completes
+            while stack:
+                frame = stack[-1]
+                if frame.kind == MAP and not frame.children and parsed.kind != SCALAR:
+                    raise self._error(type_str, tokens[index], 'a scalar map key')
+                frame.children.append((frame.pending_name, parsed))
+
+                token = tokens[index]
+                if token.kind == self._closer and (frame.kind != MAP or len(frame.children) == 2):
+                    stack.pop()
+                    index += 1
+                    text = type_str[frame.start:token.end]
+                    if frame.kind == _UNION:
+                        parsed = ParsedType(SCALAR, text)
+                    else:
+                        parsed = ParsedType(frame.kind, text, tuple(frame.children))
+                elif frame.kind == MAP and len(frame.children) == 1 or \
+                        token.kind == ',' and frame.kind in (STRUCT, _UNION):
+                    index = self._start_item(type_str, tokens, index + (frame.kind != MAP), frame)
+                    break
+                else:
+                    raise self._error(type_str, token, repr(self._closer))
+            else:
+                if tokens[index].kind != _END:
+                    raise self._error(type_str, tokens[index], 'end of text')
+                # The type string of the top level type is not stripped
+                return parsed._replace(type_str=type_str)
+
+    @staticmethod
+    def _create_type_metadata(parsed: ParsedType,
+                              name: str,
+                              parent: Union[ColumnMetadata, TypeMetadata]) -> TypeMetadata:
+        return _TYPE_METADATA_CLASSES[parsed.kind](name=name, parent=parent, type_str=parsed.type_str)
+
+    def build_type_metadata(self,
+                            parsed: ParsedType,
+                            name: str,
+                            parent: Union[ColumnMetadata, TypeMetadata]) -> TypeMetadata:
+        """
+        Creates the TypeMetadata tree of a parsed type, iteratively.
+        """
+        root = self._create_type_metadata(parsed, name, parent)
+        stack: List[Tuple[ParsedType, TypeMetadata]] = [(parsed, root)]
+        while stack:
+            parsed, type_metadata = stack.pop()
+            children = []
+            for child_name, child in parsed.children:
+                child_type_metadata = self._create_type_metadata(child, child_name, type_metadata)
+                children.append((child_name, child_type_metadata))
+                stack.append((child, child_type_metadata))
+
+            if isinstance(type_metadata, ArrayTypeMetadata):
+                # Scalar inner types are not kept
+                inner_type = children[0][1]
+                if not isinstance(inner_type, ScalarTypeMetadata):
+                    type_metadata.array_inner_type = inner_type
+            elif isinstance(type_metadata, MapTypeMetadata):
+                type_metadata.map_key_type = children[0][1]
+                type_metadata.map_value_type = children[1][1]
+            elif isinstance(type_metadata, StructTypeMetadata):
+                struct_items = {}
+                for index, (child_name, child_type_metadata) in enumerate(children):
+                    struct_items[child_name] = child_type_metadata
+                    struct_items[child_name].sort_order = index
+                type_metadata.struct_items = struct_items
+
+        return root
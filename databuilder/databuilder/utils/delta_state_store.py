@@ -0,0 +1,118 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from typing import (
+    Any, Dict, Optional,
+)
+
+from databuilder.callback.call_back import Callback
+
+LOGGER = logging.getLogger(__name__)
+
+
+class DeltaStateStore(Callback):
+    """
+    Keeps a fingerprint of each row of the last successful publish in a SQLite database, so that a loader can tell
+    which rows changed since then (see FsNeo4jCSVLoader.DELTA_STATE_STORE).
+
+    Fingerprints of the rows seen during a run are staged, and only replace the published fingerprints once the
+    publish succeeded. The store therefore needs to be registered as a call back of the publisher:
+
+        state_store = DeltaStateStore('/var/lib/amundsen/hive_job_state.db')
+        publisher.register_call_back(state_store)
+
+    A store holds the state of a single job, as rows that were not seen in a successful run are forgotten.
+    The store needs to be deleted whenever the graph is rebuilt or modified outside of databuilder, otherwise rows
+    it considers unchanged will not be re-published.
+    """
+    # Number of staged fingerprints after which they are committed
+    COMMIT_FREQUENCY = 1000
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._pending_count = 0
+
+        conn = self._connection()
+        conn.execute('CREATE TABLE IF NOT EXISTS published (key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL)')
+        conn.execute('CREATE TABLE IF NOT EXISTS staged (key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL)')
+        # Leftovers of a run that neither succeeded nor failed, e.g. killed
+        conn.execute('DELETE FROM staged')
+        conn.commit()
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The store may be handed over to other processes, e.g. with the loader of a ParallelTask
+        state = self.__dict__.copy()
+        state.update({'_conn': None, '_pid': None, '_pending_count': 0})
+        return state
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self._path, timeout=60)
+            self._pid = os.getpid()
+        return self._conn
+
+    def is_unchanged(self, key: str, row: Dict[str, Any]) -> bool:
+        """
+        Stages the fingerprint of the row, and returns whether it is the same as in the last successful publish.
+        :param key: Unique key of the row, e.g. label and key of a node
+        :param row: The serialized row
+        :return:
+        """
+        fingerprint = hashlib.sha1(json.dumps(row, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+        conn = self._connection()
+        published = conn.execute('SELECT fingerprint FROM published WHERE key = ?', (key,)).fetchone()
+        conn.execute('INSERT OR REPLACE INTO staged (key, fingerprint) VALUES (?, ?)', (key, fingerprint))
+        self._pending_count += 1
+        if self._pending_count >= DeltaStateStore.COMMIT_FREQUENCY:
+            self.flush()
+
+        return published is not None and published[0] == fingerprint
+
+    def flush(self) -> None:
+        """
+        Commits the staged fingerprints.
+        :return:
+        """
+        if self._conn is not None:
+            self._conn.commit()
+        self._pending_count = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def on_success(self) -> None:
+        """
+        Replaces the published fingerprints with the ones staged during the run.
+        :return:
+        """
+        self.flush()
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM published')
+            conn.execute('INSERT INTO published (key, fingerprint) SELECT key, fingerprint FROM staged')
+            conn.execute('DELETE FROM staged')
+        LOGGER.info('Saved the state of the publish into %s', self._path)
+        self.close()
+
+    def on_failure(self) -> None:
+        """
+        Discards the fingerprints staged during the run.
+        :return:
+        """
+        self.flush()
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM staged')
+        self.close()
@@ -2,10 +2,11 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+import random
 from os import listdir
 from os.path import isfile, join
 from typing import (
-    Iterator, List, Set,
+    Any, Iterator, List, Optional, Set,
 )
 
 import pandas
@@ -22,6 +23,12 @@ LOGGER = logging.getLogger(__name__)
 NEO4J_EQUIVALENT_SCHEMA_RULE_ALREADY_EXISTS_ERROR_CODE = 'Neo.ClientError.Schema.EquivalentSchemaRuleAlreadyExists'
 NEO4J_INDEX_ALREADY_EXISTS_ERROR_CODE = 'Neo.ClientError.Schema.IndexWithNameAlreadyExists'
 
+# Default number of records held in memory at a time when reading CSV files
+DEFAULT_CSV_READ_BATCH_SIZE = 1000
+
+# Extension of the Arrow IPC files written by the Arrow loaders
+ARROW_FILE_EXTENSION = '.arrow'
+
 
 def chunkify_list(records: List[dict], chunk_size: int) -> Iterator[List[dict]]:
     """
@@ -36,33 +43,30 @@ def create_neo4j_node_key_constraint(node_file: str,
                                      driver: Neo4jDriver,
                                      db_name: str) -> Set:
     """
-    Go over the node file and try creating unique indices.
+    Try creating unique index for the label of the node file.
     For any label seen first time for this publisher it will try to create unique index.
     Neo4j ignores a second creation in 3.x, but raises an error in 4.x.
     """
     LOGGER.info('Creating indices using Node file: %s. (Existing indices will be ignored)', node_file)
 
     labels = set(current_labels)
-    with open(node_file, 'r', encoding='utf8') as node_csv:
-        for node_record in pandas.read_csv(node_csv,
-                                           na_filter=False).to_dict(orient='records'):
-            label = node_record[NODE_LABEL]
-            if label not in labels:
-                with driver.session(database=db_name) as session:
-                    try:
-                        create_stmt = Template("""
-                            CREATE CONSTRAINT ON (node:{{ LABEL }}) ASSERT node.key IS UNIQUE
-                        """).render(LABEL=label)
-
-                        LOGGER.info(f'Trying to create index for label {label} if not exist: {create_stmt}')
-
-                        session.write_transaction(execute_neo4j_statement, create_stmt)
-                    except Neo4jError as e:
-                        if e.code != NEO4J_EQUIVALENT_SCHEMA_RULE_ALREADY_EXISTS_ERROR_CODE\
-                                and e.code != NEO4J_INDEX_ALREADY_EXISTS_ERROR_CODE:
-                            raise
-                        # Else, swallow the exception, to make this function idempotent.
-                labels.add(label)
+    label = get_node_label(node_file)
+    if label is not None and label not in labels:
+        with driver.session(database=db_name) as session:
+            try:
+                create_stmt = Template("""
+                    CREATE CONSTRAINT ON (node:{{ LABEL }}) ASSERT node.key IS UNIQUE
+                """).render(LABEL=label)
+
+                LOGGER.info(f'Trying to create index for label {label} if not exist: {create_stmt}')
+
+                session.write_transaction(execute_neo4j_statement, create_stmt)
+            except Neo4jError as e:
+                if e.code != NEO4J_EQUIVALENT_SCHEMA_RULE_ALREADY_EXISTS_ERROR_CODE\
+                        and e.code != NEO4J_INDEX_ALREADY_EXISTS_ERROR_CODE:
+                    raise
+                # Else, swallow the exception, to make this function idempotent.
+        labels.add(label)
 
     LOGGER.info('Indices have been created.')
     return labels
@@ -74,12 +78,56 @@ def create_props_param(record_dict: dict, additional_publisher_metadata_fields:
     """
     params = {}
 
-    for k, v in {**record_dict, **additional_publisher_metadata_fields}.items():
-        params[strip_unquoted_suffix(k)] = v
+    for k, v in record_dict.items():
+        if k.endswith(PublisherConfigs.UNQUOTED_SUFFIX):
+            params[strip_unquoted_suffix(k)] = parse_unquoted_value(v)
+        else:
+            params[k] = v
 
+    params.update(additional_publisher_metadata_fields)
     return params
 
 
+def parse_unquoted_value(value: Any) -> Any:
+    """
+    Returns the value of an UNQUOTED column, read as a string, as the boolean or number it was written from.
+    Other values, e.g. empty ones, are returned as is.
+    """
+    if not isinstance(value, str):
+        return value
+    if value.lower() in ('true', 'false'):
+        return value.lower() == 'true'
+    for number_type in (int, float):
+        try:
+            return number_type(value)
+        except ValueError:
+            pass
+    return value
+
+
+def get_node_label(node_file: str) -> Optional[str]:
+    """
+    Returns the label of a node file, without reading the whole file.
+    A node file is expected to hold nodes of a single label, as written by FsNeo4jCSVLoader.
+    :param node_file:
+    :return: The label, or None if the file has no records
+    """
+    first_record = read_first_record(node_file)
+    return first_record[NODE_LABEL] if first_record else None
+
+
+def jittered_backoff(attempt: int, base_sec: float, max_sec: float = 60.0) -> float:
+    """
+    Returns the time to wait before retrying, using exponential backoff with full jitter,
+    so that concurrent writers that failed together do not retry in lockstep.
+    :param attempt: Number of the retry, starting at 0
+    :param base_sec:
+    :param max_sec: Upper bound of the wait
+    :return: Wait time in seconds
+    """
+    return random.uniform(0, min(max_sec, base_sec * 2 ** attempt))
+
+
 def execute_neo4j_statement(tx: Transaction,
                             stmt: str,
                             params: dict = None) -> None:
@@ -119,5 +167,45 @@ def list_files(conf: ConfigTree, path_key: str) -> List[str]:
     return [join(path, f) for f in listdir(path) if isfile(join(path, f))]
 
 
+def read_first_record(csv_file: str) -> Optional[dict]:
+    """
+    Returns the first record of a CSV or Arrow file, without reading the whole file.
+    :param csv_file:
+    :return: The first record, or None if the file has no records
+    """
+    first_batch = next(read_records_in_batches(csv_file, batch_size=1), None)
+    return first_batch[0] if first_batch else None
+
+
+def read_csv_in_batches(csv_file: str, batch_size: int = DEFAULT_CSV_READ_BATCH_SIZE) -> Iterator[List[dict]]:
+    """
+    Reads a CSV file as batches of records, so that only a single batch is held in memory at a time.
+    Values are read as strings, empty values as empty strings, so that a column has the same type in every batch.
+    :param csv_file:
+    :param batch_size: Number of records per batch
+    :return: Iterator of record batches
+    """
+    with open(csv_file, 'r', encoding='utf8') as csv_io:
+        for data_frame in pandas.read_csv(csv_io, dtype=str, na_filter=False, chunksize=batch_size):
+            yield data_frame.to_dict(orient='records')
+
+
+def read_records_in_batches(record_file: str,
+                            batch_size: int = DEFAULT_CSV_READ_BATCH_SIZE) -> Iterator[List[dict]]:
+    """
+    Reads a file written by a file system loader as batches of records, either a CSV file or an Arrow IPC file
+    (see FsNeo4jArrowLoader), based on the file extension.
+    :param record_file:
+    :param batch_size: Maximum number of records per batch
+    :return: Iterator of record batches
+    """
+    if record_file.endswith(ARROW_FILE_EXTENSION):
+        # pyarrow is an optional dependency, only needed for Arrow files
+        from databuilder.utils.arrow_utils import read_arrow_in_batches
+        return read_arrow_in_batches(record_file, batch_size)
+
+    return read_csv_in_batches(record_file, batch_size)
+
+
 def strip_unquoted_suffix(key: str) -> str:
     return key[:-len(PublisherConfigs.UNQUOTED_SUFFIX)] if key.endswith(PublisherConfigs.UNQUOTED_SUFFIX) else key
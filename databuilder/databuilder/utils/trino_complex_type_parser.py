@@ -4,13 +4,15 @@
 from typing import Union
 
 from pyparsing import (
-    Forward, Group, Keyword, OneOrMore, Optional, Word, alphanums, delimitedList, nestedExpr, nums, originalTextFor,
+    Forward, Group, Keyword, OneOrMore, Optional, ParseException, Word, alphanums, delimitedList, nestedExpr, nums,
+    originalTextFor,
 )
 
 from databuilder.models.table_metadata import ColumnMetadata
 from databuilder.models.type_metadata import (
     ArrayTypeMetadata, MapTypeMetadata, ScalarTypeMetadata, StructTypeMetadata, TypeMetadata,
 )
+from databuilder.utils.complex_type_parser import ComplexTypeParser
 
 array_keyword = Keyword("array")
 map_keyword = Keyword("map")
@@ -44,7 +46,25 @@ complex_type = (array_type("array_type") | map_type("map_type") | struct_type("s
                 scalar_type("scalar_type"))
 
 
+_parser = ComplexTypeParser(opener='(', closer=')', struct_keyword='row')
+
+
 def parse_trino_type(type_str: str, name: str, parent: Union[ColumnMetadata, TypeMetadata]) -> TypeMetadata:
+    type_str = type_str.lower()
+    type_str = type_str.replace('\"', '')  # Remove quotes around names that are added when querying from HMS
+    try:
+        return _parser.parse(type_str, name, parent)
+    except ParseException:
+        # The grammar accepts a few unusual types that the ComplexTypeParser rejects, e.g. empty structs
+        return parse_trino_type_with_pyparsing(type_str, name, parent)
+
+
+def parse_trino_type_with_pyparsing(type_str: str, name: str,
+                                    parent: Union[ColumnMetadata, TypeMetadata]) -> TypeMetadata:
+    """
+    Parses the type with the pyparsing grammar, recursively. Slower than parse_trino_type, which only falls back to it
+    for the types it does not handle.
+    """
     type_str = type_str.lower()
     type_str = type_str.replace('\"', '')  # Remove quotes around names that are added when querying from HMS
     parsed_type = complex_type.parseString(type_str, parseAll=True)
@@ -59,7 +79,7 @@ def parse_trino_type(type_str: str, name: str, parent: Union[ColumnMetadata, Typ
         array_type_metadata = ArrayTypeMetadata(name=name,
                                                 parent=parent,
                                                 type_str=type_str)
-        array_inner_type = parse_trino_type(results.type, '_inner_', array_type_metadata)
+        array_inner_type = parse_trino_type_with_pyparsing(results.type, '_inner_', array_type_metadata)
         if not isinstance(array_inner_type, ScalarTypeMetadata):
             array_type_metadata.array_inner_type = array_inner_type
         return array_type_metadata
@@ -67,8 +87,9 @@ def parse_trino_type(type_str: str, name: str, parent: Union[ColumnMetadata, Typ
         map_type_metadata = MapTypeMetadata(name=name,
                                             parent=parent,
                                             type_str=type_str)
-        map_type_metadata.map_key_type = parse_trino_type(results.key, '_map_key', map_type_metadata)
-        map_type_metadata.map_value_type = parse_trino_type(results.type, '_map_value', map_type_metadata)
+        map_type_metadata.map_key_type = parse_trino_type_with_pyparsing(results.key, '_map_key', map_type_metadata)
+        map_type_metadata.map_value_type = parse_trino_type_with_pyparsing(results.type, '_map_value',
+                                                                           map_type_metadata)
         return map_type_metadata
     elif parsed_type.struct_type:
         struct_type_metadata = StructTypeMetadata(name=name,
@@ -76,7 +97,7 @@ def parse_trino_type(type_str: str, name: str, parent: Union[ColumnMetadata, Typ
                                                   type_str=type_str)
         struct_items = {}
         for index, result in enumerate(results):
-            struct_items[result.name] = parse_trino_type(result.type, result.name, struct_type_metadata)
+            struct_items[result.name] = parse_trino_type_with_pyparsing(result.type, result.name, struct_type_metadata)
             struct_items[result.name].sort_order = index
 
         struct_type_metadata.struct_items = struct_items
@@ -0,0 +1,113 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import heapq
+import json
+import logging
+import os
+import shutil
+import tempfile
+from itertools import groupby
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+# Default number of distinct keys counted in memory before they are spilled to disk
+DEFAULT_MAX_KEYS_IN_MEMORY = 1000000
+
+
+def _sort_key(item: Tuple[Tuple, Any]) -> Tuple:
+    """
+    Orders items by key, with None fields (e.g. a missing email) after strings instead of failing to compare them
+    """
+    return tuple((field is None, field or '') for field in item[0])
+
+
+class UsageAggregator:
+    """
+    Counts the occurrences of usage keys, e.g. (table, user) pairs read from an audit log, with bounded memory.
+
+    At most max_keys_in_memory distinct keys are counted in memory. Beyond that, the partial counts are sorted
+    and spilled to a file, and counting starts over. Once all usage is added, items() merges the spilled files
+    and yields each key with its total count, in the order of the keys.
+
+    Keys are tuples (e.g. namedtuples) of strings or None. They are rebuilt from the spilled files with key_factory.
+    """
+
+    def __init__(self,
+                 max_keys_in_memory: int = DEFAULT_MAX_KEYS_IN_MEMORY,
+                 spill_dir: Optional[str] = None,
+                 key_factory: Callable[[Iterable[str]], Tuple] = tuple) -> None:
+        """
+        :param max_keys_in_memory: Number of distinct keys counted in memory before they are spilled to disk
+        :param spill_dir: Directory in which a temporary directory for the spilled files is created,
+        the default temporary directory if None
+        :param key_factory: Builds a key from its fields, e.g. the _make method of a namedtuple
+        """
+        self._max_keys_in_memory = max_keys_in_memory
+        self._spill_dir = spill_dir
+        self._key_factory = key_factory
+        self._counts: Dict[Tuple, int] = {}
+        self._tmp_dir: Optional[str] = None
+        self._spill_files: List[str] = []
+
+    @property
+    def spill_count(self) -> int:
+        return len(self._spill_files)
+
+    def add(self, key: Tuple, count: int = 1) -> None:
+        self._counts[key] = self._counts.get(key, 0) + count
+        if len(self._counts) >= self._max_keys_in_memory:
+            self._spill()
+
+    def _spill(self) -> None:
+        if self._tmp_dir is None:
+            self._tmp_dir = tempfile.mkdtemp(prefix='usage_aggregator_', dir=self._spill_dir)
+
+        path = os.path.join(self._tmp_dir, f'{len(self._spill_files)}.jsonl')
+        with open(path, 'w', encoding='utf8') as spill_file:
+            for key, count in sorted(self._counts.items(), key=_sort_key):
+                spill_file.write(json.dumps([list(key), count]))
+                spill_file.write('\n')
+
+        LOGGER.info('Spilled %i usage keys to %s', len(self._counts), path)
+        self._spill_files.append(path)
+        self._counts = {}
+
+    def _read_spill_file(self, path: str) -> Iterator[Tuple[Tuple, int]]:
+        with open(path, 'r', encoding='utf8') as spill_file:
+            for line in spill_file:
+                fields, count = json.loads(line)
+                yield self._key_factory(fields), count
+
+    def items(self) -> Iterator[Tuple[Any, int]]:
+        """
+        Yields each key with its total count, sorted by key. Spilled files are removed once all items are yielded.
+        :return:
+        """
+        if not self._spill_files:
+            counts, self._counts = self._counts, {}
+            yield from sorted(counts.items(), key=_sort_key)
+            return
+
+        # The remaining counts are sorted in memory and merged with the spilled files
+        runs: List[Iterator[Tuple[Tuple, int]]] = [iter(sorted(self._counts.items(), key=_sort_key))]
+        runs.extend(self._read_spill_file(path) for path in self._spill_files)
+        self._counts = {}
+
+        try:
+            for key, group in groupby(heapq.merge(*runs, key=_sort_key), key=lambda item: item[0]):
+                yield key, sum(count for _, count in group)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """
+        Removes the spilled files.
+        """
+        if self._tmp_dir is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
+        self._spill_files = []
@@ -0,0 +1,105 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compares the parsing of hive complex types with the pyparsing grammar (parse_hive_type_with_pyparsing) and with the
+ComplexTypeParser used by parse_hive_type, with and without its cache. Columns are given one of --distinct-types
+synthetic types, with a wide struct of --fields fields, so that types repeat across columns like they do across
+tables:
+
+    python example/scripts/benchmark_complex_type_parser.py --columns 500 --distinct-types 20 --fields 50
+
+It also finds the deepest array<...> type that each parser handles.
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import (
+    Any, Callable, List,
+)
+
+from databuilder.models.table_metadata import ColumnMetadata
+from databuilder.utils import hive_complex_type_parser
+from databuilder.utils.hive_complex_type_parser import parse_hive_type, parse_hive_type_with_pyparsing
+
+SCALAR_TYPES = ['int', 'bigint', 'string', 'double precision', 'decimal(10,2)', 'varchar(32)', 'timestamp']
+
+
+def random_type(depth: int, fields: int) -> str:
+    choice = random.random()
+    if depth >= 3 or choice < 0.4:
+        return random.choice(SCALAR_TYPES)
+    if choice < 0.6:
+        return f'array<{random_type(depth + 1, fields)}>'
+    if choice < 0.7:
+        return f'map<string,{random_type(depth + 1, fields)}>'
+    field_count = fields if depth == 0 else random.randint(1, 10)
+    return 'struct<' + ','.join(f'field_{i}:{random_type(depth + 1, fields)}' for i in range(field_count)) + '>'
+
+
+def create_columns(column_count: int, distinct_types: int, fields: int) -> List[ColumnMetadata]:
+    random.seed(0)
+    type_strs = [f'struct<id:bigint,payload:{random_type(0, fields)}>' for _ in range(distinct_types)]
+    columns = []
+    for i in range(column_count):
+        column = ColumnMetadata(f'column_{i}', None, type_strs[i % distinct_types], i)
+        column.set_column_key(f'hive://gold.schema/table_{i}/column_{i}')
+        columns.append(column)
+    return columns
+
+
+def run(parse: Callable[..., Any], columns: List[ColumnMetadata]) -> List[Any]:
+    return [parse(column.type, column.name, column) for column in columns]
+
+
+def max_depth(parse: Callable[..., Any], limit: int) -> int:
+    column = ColumnMetadata('column', None, 'int', 0)
+    low, high = 0, limit
+    while low < high:
+        depth = (low + high + 1) // 2
+        try:
+            parse('array<' * depth + 'int' + '>' * depth, column.name, column)
+            low = depth
+        except RecursionError:
+            high = depth - 1
+    return low
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--columns', type=int, default=500, help='Number of columns')
+    parser.add_argument('--distinct-types', type=int, default=20, help='Number of distinct column types')
+    parser.add_argument('--fields', type=int, default=50, help='Number of fields of the top level structs')
+    args = parser.parse_args()
+
+    columns = create_columns(args.columns, args.distinct_types, args.fields)
+    print(f'{args.columns} columns of {args.distinct_types} distinct types, '
+          f'{sum(len(column.type) for column in columns) / len(columns):.0f} characters per type on average')
+
+    start = time.time()
+    expected = run(parse_hive_type_with_pyparsing, columns)
+    print(f'pyparsing grammar: {time.time() - start:.2f}s')
+
+    def parse_without_cache(type_str: str, name: str, parent: ColumnMetadata) -> Any:
+        hive_complex_type_parser._parser.cache_clear()
+        return parse_hive_type(type_str, name, parent)
+
+    for label, parse in (('ComplexTypeParser without cache', parse_without_cache),
+                         ('ComplexTypeParser with cache', parse_hive_type)):
+        hive_complex_type_parser._parser.cache_clear()
+        start = time.time()
+        actual = run(parse, columns)
+        elapsed = time.time() - start
+        assert actual == expected, f'{label} does not produce the same TypeMetadata'
+        print(f'{label}: {elapsed:.2f}s')
+
+    limit = sys.getrecursionlimit() * 2
+    print(f'Deepest array type parsed (up to {limit}): '
+          f'pyparsing grammar {max_depth(parse_hive_type_with_pyparsing, limit)}, '
+          f'ComplexTypeParser {max_depth(parse_hive_type, limit)}')
+
+
+if __name__ == '__main__':
+    main()
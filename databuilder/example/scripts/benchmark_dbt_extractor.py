@@ -0,0 +1,145 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmarks the DbtExtractor on a synthetic dbt project, loading the manifest and catalog files at once
+and parsing them incrementally (streaming_parse). The synthetic files are generated from the models
+of the sample dbt project, repeated until the given number of models.
+
+Each mode runs in its own process, so that its peak memory usage can be compared:
+
+    python example/scripts/benchmark_dbt_extractor.py --models 50000
+
+Requires ijson (pip install amundsen-databuilder[dbt]).
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from typing import (
+    Any, Dict, Tuple,
+)
+
+from pyhocon import ConfigFactory
+
+from databuilder import Scoped
+from databuilder.extractor.dbt_extractor import DbtExtractor
+
+SAMPLE_DIR = os.path.join(os.path.dirname(__file__), '..', 'sample_data', 'dbt')
+
+
+def _write_object(f: Any, items: Any) -> None:
+    # Writes a JSON object one item at a time, so that large files are generated with little memory
+    f.write('{')
+    for i, (key, value) in enumerate(items):
+        if i:
+            f.write(', ')
+        f.write(f'{json.dumps(key)}: {json.dumps(value)}')
+    f.write('}')
+
+
+def generate_dbt_files(model_count: int, output_dir: str) -> Tuple[str, str]:
+    """
+    Generates a manifest and a catalog file of model_count models, based on the sample dbt project.
+    :return: The locations of the manifest and catalog files
+    """
+    with open(os.path.join(SAMPLE_DIR, 'manifest.json'), 'r') as f:
+        manifest = json.load(f)
+    with open(os.path.join(SAMPLE_DIR, 'catalog.json'), 'r') as f:
+        catalog = json.load(f)
+
+    sample_ids = [node_id for node_id in manifest['nodes']
+                  if node_id.startswith('model.') and node_id in catalog['nodes']]
+
+    def _node_id(i: int) -> str:
+        return f'{sample_ids[i % len(sample_ids)]}_{i}'
+
+    def _manifest_nodes() -> Any:
+        for i in range(model_count):
+            node: Dict[str, Any] = dict(manifest['nodes'][sample_ids[i % len(sample_ids)]])
+            node['name'] = node['alias'] = f'{node["name"]}_{i}'
+            yield _node_id(i), node
+
+    def _catalog_nodes() -> Any:
+        for i in range(model_count):
+            yield _node_id(i), catalog['nodes'][sample_ids[i % len(sample_ids)]]
+
+    def _child_map() -> Any:
+        for i in range(model_count):
+            yield _node_id(i), [_node_id(i + 1)] if i + 1 < model_count else []
+
+    manifest_file = os.path.join(output_dir, 'manifest.json')
+    with open(manifest_file, 'w') as f:
+        f.write(f'{{"metadata": {json.dumps(manifest["metadata"])}, "nodes": ')
+        _write_object(f, _manifest_nodes())
+        f.write(', "sources": {}, "child_map": ')
+        _write_object(f, _child_map())
+        f.write('}')
+
+    catalog_file = os.path.join(output_dir, 'catalog.json')
+    with open(catalog_file, 'w') as f:
+        f.write(f'{{"metadata": {json.dumps(catalog["metadata"])}, "nodes": ')
+        _write_object(f, _catalog_nodes())
+        f.write(', "sources": {}, "errors": null}')
+
+    return manifest_file, catalog_file
+
+
+def run_extractor(manifest_file: str, catalog_file: str, streaming_parse: bool, results: Any) -> None:
+    start = time.time()
+    conf = ConfigFactory.from_dict({
+        f'extractor.dbt.{DbtExtractor.DATABASE_NAME}': 'snowflake',
+        f'extractor.dbt.{DbtExtractor.MANIFEST_JSON}': manifest_file,
+        f'extractor.dbt.{DbtExtractor.CATALOG_JSON}': catalog_file,
+        f'extractor.dbt.{DbtExtractor.STREAMING_PARSE}': streaming_parse,
+    })
+    extractor = DbtExtractor()
+    extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
+
+    record_count = 0
+    first_record_sec = None
+    record = extractor.extract()
+    while record:
+        if first_record_sec is None:
+            first_record_sec = time.time() - start
+        record_count += 1
+        record = extractor.extract()
+
+    results.put({
+        'streaming_parse': streaming_parse,
+        'records': record_count,
+        'first_record_sec': first_record_sec,
+        'total_sec': time.time() - start,
+        # Kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models', type=int, default=20000, help='Number of models of the synthetic project')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        manifest_file, catalog_file = generate_dbt_files(args.models, output_dir)
+        print(f'Generated {args.models} models: manifest of {os.path.getsize(manifest_file) / 2 ** 20:.1f} MB, '
+              f'catalog of {os.path.getsize(catalog_file) / 2 ** 20:.1f} MB')
+
+        results: Any = multiprocessing.Queue()
+        for streaming_parse in (False, True):
+            process = multiprocessing.Process(target=run_extractor,
+                                              args=(manifest_file, catalog_file, streaming_parse, results))
+            process.start()
+            result = results.get()
+            process.join()
+            print(f'streaming_parse={result["streaming_parse"]}: {result["records"]} records, '
+                  f'first record after {result["first_record_sec"]:.2f}s, total {result["total_sec"]:.2f}s, '
+                  f'peak RSS {result["peak_rss_mb"]:.0f} MB')
+
+
+if __name__ == '__main__':
+    main()
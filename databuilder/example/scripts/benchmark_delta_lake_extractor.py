@@ -0,0 +1,93 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmarks the table scraping of the DeltaLakeMetadataExtractor on a local mode SparkSession.
+It creates many small delta tables (and a few parquet tables, which are filtered out per schema), then
+extracts them with different numbers of workers:
+
+    python example/scripts/benchmark_delta_lake_extractor.py --schemas 5 --tables 40 --workers 1 4 8
+
+Requires pyspark and the delta-core package matching the spark version (downloaded by spark).
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+
+from pyhocon import ConfigFactory
+from pyspark.sql import SparkSession
+
+from databuilder import Scoped
+from databuilder.extractor.delta_lake_metadata_extractor import DeltaLakeMetadataExtractor
+
+
+def create_spark(warehouse_dir: str) -> SparkSession:
+    return SparkSession.builder \
+        .appName("Amundsen Delta Lake Extractor Benchmark") \
+        .master("local[*]") \
+        .config("spark.jars.packages", "io.delta:delta-core_2.12:0.7.0") \
+        .config("spark.sql.warehouse.dir", warehouse_dir) \
+        .config("spark.sql.extensions", "io.delta.sql.DeltaSparkSessionExtension") \
+        .config("spark.driver.host", "127.0.0.1") \
+        .config("spark.driver.bindAddress", "127.0.0.1") \
+        .config("spark.sql.catalog.spark_catalog", "org.apache.spark.sql.delta.catalog.DeltaCatalog") \
+        .getOrCreate()
+
+
+def create_tables(spark: SparkSession, schema_count: int, table_count: int) -> None:
+    for i in range(schema_count):
+        schema = f"benchmark_schema{i}"
+        spark.sql(f"create schema if not exists {schema}")
+        for j in range(table_count):
+            table_format = "parquet" if j % 10 == 9 else "delta"
+            spark.sql(f"create table if not exists {schema}.table{j} (id int, name string, day date) "
+                      f"using {table_format} partitioned by (day)")
+            spark.sql(f"insert into {schema}.table{j} values (1, 'a', '2021-01-01'), (2, 'b', '2021-01-02')")
+
+
+def run_extractor(spark: SparkSession, schema_count: int, max_workers: int) -> None:
+    conf = ConfigFactory.from_dict({
+        f'extractor.delta_lake_table_metadata.{DeltaLakeMetadataExtractor.CLUSTER_KEY}': 'benchmark',
+        f'extractor.delta_lake_table_metadata.{DeltaLakeMetadataExtractor.SCHEMA_LIST_KEY}':
+            [f"benchmark_schema{i}" for i in range(schema_count)],
+        f'extractor.delta_lake_table_metadata.{DeltaLakeMetadataExtractor.MAX_WORKERS_KEY}': max_workers,
+        f'extractor.delta_lake_table_metadata.{DeltaLakeMetadataExtractor.TABLE_TIMEOUT_SEC_KEY}': 300,
+    })
+    extractor = DeltaLakeMetadataExtractor()
+    extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
+    extractor.set_spark(spark)
+
+    start = time.time()
+    first_record_sec = None
+    record_count = 0
+    record = extractor.extract()
+    while record:
+        if first_record_sec is None:
+            first_record_sec = time.time() - start
+        record_count += 1
+        record = extractor.extract()
+
+    print(f"max_workers={max_workers}: {record_count} records, first record after {first_record_sec or 0:.2f}s, "
+          f"total {time.time() - start:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--schemas', type=int, default=5, help='Number of schemas')
+    parser.add_argument('--tables', type=int, default=40, help='Number of tables per schema')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8], help='Numbers of workers to compare')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as warehouse_dir:
+        spark = create_spark(warehouse_dir)
+        create_tables(spark, args.schemas, args.tables)
+        for max_workers in args.workers:
+            run_extractor(spark, args.schemas, max_workers)
+        spark.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Measures the memory used by TableMetadata models kept alive during an extraction, e.g. 1M synthetic columns
+in tables of 100 columns, each column with a description, a badge and its type metadata:
+
+    python example/scripts/benchmark_model_memory.py --columns 1000000 --columns-per-table 100
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import List
+
+from databuilder.models.table_metadata import ColumnMetadata, TableMetadata
+from databuilder.models.type_metadata import ScalarTypeMetadata
+
+
+def create_tables(column_count: int, columns_per_table: int) -> List[TableMetadata]:
+    tables = []
+    for i in range(column_count // columns_per_table):
+        columns = []
+        for j in range(columns_per_table):
+            columns.append(ColumnMetadata(name=f'column_{j}', description=f'description of column {j}',
+                                          col_type='string', sort_order=j, badges=['pii'] if j % 10 == 0 else None))
+        table = TableMetadata(database='hive', cluster='gold', schema=f'schema_{i % 100}', name=f'table_{i}',
+                              description=f'description of table {i}', columns=columns, tags=['tag_a', 'tag_b'])
+        # The same way as the ComplexTypeTransformer
+        for column in columns:
+            column.set_column_key(table._get_col_key(column))
+            column.set_type_metadata(ScalarTypeMetadata(name=column.name, parent=column, type_str=column.type))
+        tables.append(table)
+    return tables
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--columns', type=int, default=1000000, help='Number of columns')
+    parser.add_argument('--columns-per-table', type=int, default=100, help='Number of columns per table')
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    tables = create_tables(args.columns, args.columns_per_table)
+    elapsed = time.time() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{len(tables)} tables, {args.columns} columns created in {elapsed:.2f}s: '
+          f'{current / 2 ** 20:.1f} MB, {current / args.columns:.0f} bytes per column')
+
+    start = time.time()
+    node_count = 0
+    for table in tables:
+        node = table.create_next_node()
+        while node:
+            node_count += 1
+            node = table.create_next_node()
+    print(f'{node_count} nodes serialized in {time.time() - start:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
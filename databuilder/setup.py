@@ -99,9 +99,17 @@ schema_registry = [
     'python-schema-registry-client==2.4.0'
 ]
 
+arrow = [
+    'pyarrow>=7.0.0'
+]
+
+dbt = [
+    'ijson>=3.1.0'
+]
+
 all_deps = requirements + requirements_dev + kafka + cassandra + glue + snowflake + athena + \
     bigquery + jsonpath + db2 + dremio + druid + spark + feast + neptune + rds \
-    + atlas + salesforce + oracle + teradata + schema_registry
+    + atlas + salesforce + oracle + teradata + schema_registry + arrow + dbt
 
 setup(
     name='amundsen-databuilder',
@@ -137,6 +145,8 @@ setup(
         'oracle': oracle,
         'teradata': teradata,
         'schema_registry': schema_registry,
+        'arrow': arrow,
+        'dbt': dbt,
     },
     classifiers=[
         'Programming Language :: Python :: 3.7',
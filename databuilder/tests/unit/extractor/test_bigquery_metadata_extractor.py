@@ -2,13 +2,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+import threading
+import time
 import unittest
-from typing import Any
+from typing import (
+    Any, Dict, List,
+)
 
 from mock import Mock, patch
 from pyhocon import ConfigFactory
 
 from databuilder import Scoped
+from databuilder.extractor.base_bigquery_extractor import ProjectRateLimiter
 from databuilder.extractor.bigquery_metadata_extractor import BigQueryMetadataExtractor
 from databuilder.models.table_metadata import TableMetadata
 
@@ -212,6 +217,47 @@ class MockBigQueryClient():
         return self.tables_method
 
 
+class StubRequest():
+    def __init__(self, response: Any, delay: float = 0, calls: List[Dict[str, Any]] = None) -> None:
+        self.response = response
+        self.delay = delay
+        self.calls = calls if calls is not None else []
+
+    def execute(self, **kwargs: Any) -> Any:
+        time.sleep(self.delay)
+        self.calls.append(dict(kwargs, thread=threading.current_thread().name))
+        return self.response
+
+
+class StubBigQueryClient():
+    """
+    Stub of the discovery client, listing many tables whose get requests complete in reverse order
+    """
+
+    def __init__(self, table_count: int) -> None:
+        self.table_count = table_count
+        self.get_calls: List[Dict[str, Any]] = []
+
+    def datasets(self) -> Any:
+        return self
+
+    def tables(self) -> Any:
+        return self
+
+    def list(self, **kwargs: Any) -> Any:
+        if 'datasetId' not in kwargs:
+            return StubRequest(ONE_DATASET)
+        return StubRequest({'tables': [
+            {'tableReference': {'projectId': 'your-project-here', 'datasetId': 'fdgdfgh', 'tableId': f'table_{i}'}}
+            for i in range(self.table_count)
+        ]})
+
+    def get(self, projectId: str, datasetId: str, tableId: str) -> Any:
+        index = int(tableId.split('_')[-1])
+        delay = (self.table_count - index) * 0.005
+        return StubRequest(dict(TABLE_DATA, description=tableId), delay=delay, calls=self.get_calls)
+
+
 # Patch fallback auth method to avoid actually calling google API
 @patch('google.auth.default', lambda scopes: ['dummy', 'dummy'])
 class TestBigQueryMetadataExtractor(unittest.TestCase):
@@ -384,3 +430,51 @@ class TestBigQueryMetadataExtractor(unittest.TestCase):
         third_col = result.columns[2]
         self.assertEqual(third_col.name, 'nested.nested2.repeated')
         self.assertEqual(third_col.type, 'STRING:REPEATED')
+
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_concurrent_tables_in_listed_order(self, mock_build: Any) -> None:
+        client = StubBigQueryClient(table_count=10)
+        mock_build.return_value = client
+        config_dict = {
+            f'extractor.bigquery_table_metadata.{BigQueryMetadataExtractor.PROJECT_ID_KEY}': 'your-project-here',
+            f'extractor.bigquery_table_metadata.{BigQueryMetadataExtractor.MAX_WORKERS_KEY}': 4
+        }
+        extractor = BigQueryMetadataExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=ConfigFactory.from_dict(config_dict),
+                                              scope=extractor.get_scope()))
+
+        names = []
+        result = extractor.extract()
+        while result:
+            names.append(result.name)
+            result = extractor.extract()
+
+        self.assertEqual(names, [f'table_{i}' for i in range(10)])
+        self.assertEqual(len(client.get_calls), 10)
+        self.assertGreater(len({call['thread'] for call in client.get_calls}), 1)
+        # Each thread sends its requests through its own http client
+        http_by_thread: Dict[str, Any] = {}
+        for call in client.get_calls:
+            self.assertIs(http_by_thread.setdefault(call['thread'], call['http']), call['http'])
+        self.assertEqual(len({id(http) for http in http_by_thread.values()}), len(http_by_thread))
+
+
+class TestProjectRateLimiter(unittest.TestCase):
+    def test_requests_are_spaced_per_project(self) -> None:
+        limiter = ProjectRateLimiter(max_requests_per_second=50)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire('project_a')
+        # 5 intervals of 20ms for project_a
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+        # project_b has its own quota, so its first request is not delayed
+        start = time.monotonic()
+        limiter.acquire('project_b')
+        self.assertLess(time.monotonic() - start, 0.02)
+
+    def test_unlimited(self) -> None:
+        limiter = ProjectRateLimiter(max_requests_per_second=0)
+        for _ in range(100):
+            limiter.acquire('project_a')
+        self.assertEqual(limiter._next_slot, {})
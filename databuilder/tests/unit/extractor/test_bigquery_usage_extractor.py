@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import base64
+import copy
+import os
 import tempfile
 import unittest
 from typing import Any
@@ -222,6 +224,39 @@ class TestBigqueryUsageExtractor(unittest.TestCase):
         self.assertEqual(key.email, 'your-user-here@test.com')
         self.assertEqual(value, 1)
 
+    @patch('databuilder.extractor.base_bigquery_extractor.build')
+    def test_spilled_usage_counts(self, mock_build: Any) -> None:
+        entries = []
+        for email in ['b@test.com', 'a@test.com', 'b@test.com', 'c@test.com', 'b@test.com']:
+            entry = copy.deepcopy(CORRECT_DATA['entries'][0])
+            entry['protoPayload']['authenticationInfo']['principalEmail'] = email
+            entries.append(entry)
+
+        with tempfile.TemporaryDirectory() as spill_dir:
+            config_dict = {
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.PROJECT_ID_KEY}': 'bigquery-public-data',
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.MAX_KEYS_IN_MEMORY_KEY}': 1,
+                f'extractor.bigquery_table_usage.{BigQueryTableUsageExtractor.SPILL_DIR_KEY}': spill_dir,
+            }
+            conf = ConfigFactory.from_dict(config_dict)
+
+            mock_build.return_value = MockLoggingClient({'entries': entries})
+            extractor = BigQueryTableUsageExtractor()
+            extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                                  scope=extractor.get_scope()))
+            self.assertEqual(extractor.table_usage_counts.spill_count, 5)
+
+            counts = []
+            result = extractor.extract()
+            while result:
+                key, value = result
+                self.assertIsInstance(key, TableColumnUsageTuple)
+                counts.append((key.email, value))
+                result = extractor.extract()
+
+            self.assertEqual(counts, [('a@test.com', 1), ('b@test.com', 3), ('c@test.com', 1)])
+            self.assertEqual(os.listdir(spill_dir), [])
+
     @patch('databuilder.extractor.base_bigquery_extractor.build')
     def test_no_entries(self, mock_build: Any) -> None:
         config_dict = {
@@ -2,9 +2,11 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
+import os
+import tempfile
 import unittest
 from typing import (
-    Any, Optional, Union, no_type_check,
+    Any, List, Optional, Union, no_type_check,
 )
 
 import pyhocon
@@ -353,3 +355,62 @@ class TestCsvExtractor(unittest.TestCase):
             extractor = DbtExtractor()
             with pytest.raises(InvalidDbtInputs):
                 extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
+
+    def _extract_all(self, catalog_file_loc: str, manifest_file_loc: str, streaming_parse: bool) -> List[str]:
+        config_dict = {
+            f'extractor.dbt.{DbtExtractor.DATABASE_NAME}': self.database_name,
+            f'extractor.dbt.{DbtExtractor.CATALOG_JSON}': catalog_file_loc,
+            f'extractor.dbt.{DbtExtractor.MANIFEST_JSON}': manifest_file_loc,
+            f'extractor.dbt.{DbtExtractor.SOURCE_URL}': self.source_url,
+            f'extractor.dbt.{DbtExtractor.STREAMING_PARSE}': streaming_parse
+        }
+        conf = ConfigFactory.from_dict(config_dict)
+        extractor = DbtExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
+
+        records = []
+        record = extractor.extract()
+        while record:
+            records.append(repr(record))
+            record = extractor.extract()
+        return records
+
+    def test_streaming_parse(self) -> None:
+        """
+        Test that parsing the files incrementally extracts the same records as loading them at once
+        """
+        expected = self._extract_all(self.catalog_file_loc, self.manifest_data, streaming_parse=False)
+        self.assertTrue(any('TableLineage' in record for record in expected))
+        self.assertEqual(self._extract_all(self.catalog_file_loc, self.manifest_data, streaming_parse=True), expected)
+
+    def test_streaming_parse_non_ascii(self) -> None:
+        """
+        Test that only ASCII letters are lowercased when parsing the files incrementally, like when loading them
+        at once
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_locs = []
+            for file_loc in (self.catalog_file_loc, self.manifest_data):
+                with open(file_loc, 'r', encoding='utf-8') as f:
+                    content = f.read().replace('The item sku', 'The ITEM SKU (RÉFÉRENCE)')
+                file_locs.append(os.path.join(tmp_dir, os.path.basename(file_loc)))
+                with open(file_locs[-1], 'w', encoding='utf-8') as f:
+                    f.write(content)
+
+            expected = self._extract_all(*file_locs, streaming_parse=False)
+            self.assertTrue(any('the item sku (rÉfÉrence)' in record for record in expected))
+            self.assertEqual(self._extract_all(*file_locs, streaming_parse=True), expected)
+
+    def test_streaming_parse_requires_files(self) -> None:
+        with open(self.catalog_file_loc, 'r') as f:
+            catalog_json = f.read()
+
+        conf = ConfigFactory.from_dict({
+            f'extractor.dbt.{DbtExtractor.DATABASE_NAME}': self.database_name,
+            f'extractor.dbt.{DbtExtractor.CATALOG_JSON}': catalog_json,
+            f'extractor.dbt.{DbtExtractor.MANIFEST_JSON}': self.manifest_data,
+            f'extractor.dbt.{DbtExtractor.STREAMING_PARSE}': True
+        })
+        extractor = DbtExtractor()
+        with pytest.raises(InvalidDbtInputs):
+            extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
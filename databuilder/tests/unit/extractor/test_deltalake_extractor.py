@@ -3,9 +3,12 @@
 
 import logging
 import tempfile
+import threading
+import time
 import unittest
-from typing import Dict
+from typing import Dict, Optional
 
+from mock import MagicMock
 from pyhocon import ConfigFactory
 # patch whole class to avoid actually calling for boto3.client during tests
 from pyspark.sql import SparkSession
@@ -266,7 +269,7 @@ class TestDeltaLakeExtractor(unittest.TestCase):
                         tableType="delta", isTemporary=False),
                   Table(name="test_table3", database="test_schema1", description=None,
                         tableType="delta", isTemporary=False)]
-        actual = self.dExtractor.scrape_all_tables(tables)
+        actual = list(self.dExtractor.scrape_all_tables(tables))
         self.assertEqual(2, len(actual))
 
     def test_scrape_complex_schema_no_config(self) -> None:
@@ -450,5 +453,83 @@ class TestDeltaLakeExtractor(unittest.TestCase):
             self.assertIsNone(found)
 
 
+class TestDeltaLakeExtractorScheduling(unittest.TestCase):
+
+    def setUp(self) -> None:
+        config_dict = {
+            f'extractor.delta_lake_table_metadata.{DeltaLakeMetadataExtractor.CLUSTER_KEY}': 'test_cluster',
+            f'extractor.delta_lake_table_metadata.{DeltaLakeMetadataExtractor.MAX_WORKERS_KEY}': 3,
+            f'extractor.delta_lake_table_metadata.{DeltaLakeMetadataExtractor.TABLE_TIMEOUT_SEC_KEY}': 0.3
+        }
+        conf = ConfigFactory.from_dict(config_dict)
+        self.spark = MagicMock()
+        self.dExtractor = DeltaLakeMetadataExtractor()
+        self.dExtractor.init(Scoped.get_scoped_conf(conf=conf, scope=self.dExtractor.get_scope()))
+        self.dExtractor.set_spark(self.spark)
+        self.release = threading.Event()
+
+    def tearDown(self) -> None:
+        self.release.set()
+
+    def _scrape_table(self, table: Table) -> Optional[ScrapedTableMetadata]:
+        if table.name == 'slow_table':
+            self.release.wait(5)
+        if table.name == 'failing_table':
+            raise RuntimeError('Failed to describe table')
+        time.sleep(0.05)
+        return ScrapedTableMetadata(schema=table.database, table=table.name)
+
+    def test_scrape_all_tables_isolates_failures_and_timeouts(self) -> None:
+        self.dExtractor.scrape_table = self._scrape_table  # type: ignore
+        names = ['test_table1', 'slow_table', 'test_table2', 'failing_table', 'test_table3', 'test_table4']
+        tables = [Table(name=name, database="test_schema1", description=None, tableType="delta", isTemporary=False)
+                  for name in names]
+
+        start = time.monotonic()
+        actual = list(self.dExtractor.scrape_all_tables(tables))
+
+        # The slow table does not hold back the others
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(sorted(t.table for t in actual if t),
+                         ['test_table1', 'test_table2', 'test_table3', 'test_table4'])
+        self.assertEqual(actual.count(None), 2)
+        self.spark.sparkContext.cancelJobGroup.assert_called_once_with('amundsen_scrape_test_schema1.slow_table')
+
+    def test_scrape_all_tables_with_more_hanging_tables_than_workers(self) -> None:
+        def scrape_table(table: Table) -> Optional[ScrapedTableMetadata]:
+            if table.name.startswith('hanging_table'):
+                # Blocks forever, cancelling the spark jobs of the table does not stop it
+                self.release.wait()
+            return ScrapedTableMetadata(schema=table.database, table=table.name)
+
+        self.dExtractor.scrape_table = scrape_table  # type: ignore
+        names = [f'hanging_table{i}' for i in range(4)] + ['test_table1', 'test_table2']
+        tables = [Table(name=name, database="test_schema1", description=None, tableType="delta", isTemporary=False)
+                  for name in names]
+
+        start = time.monotonic()
+        actual = list(self.dExtractor.scrape_all_tables(tables))
+
+        # The threads of the hanging tables do not keep the other tables from being scraped
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(sorted(t.table for t in actual if t), ['test_table1', 'test_table2'])
+        self.assertEqual(actual.count(None), 4)
+
+    def test_filter_delta_tables(self) -> None:
+        rows = []
+        for name, provider in [('test_parquet', 'parquet'), ('test_table1', 'delta')]:
+            row = MagicMock()
+            row.asDict.return_value = {'tableName': name,
+                                       'information': f'Database: test_schema1\nProvider: {provider}\n'}
+            rows.append(row)
+        self.spark.sql.return_value.collect.return_value = rows
+
+        tables = [Table(name=name, database="test_schema1", description=None, tableType="delta", isTemporary=False)
+                  for name in ['test_parquet', 'test_table1', 'unlisted_table']]
+        actual = [t.name for t in self.dExtractor.filter_delta_tables(tables)]
+        self.assertEqual(actual, ['test_table1', 'unlisted_table'])
+        self.spark.sql.assert_called_once_with("show table extended in test_schema1 like '*'")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -70,6 +70,38 @@ class TestGenericUsageExtractor(unittest.TestCase):
             self.assertEqual(expected.__repr__(), actual.__repr__())
             self.assertIsNone(extractor.extract())
 
+    def test_extraction_with_aggregation(self) -> None:
+        with patch.object(SQLAlchemyExtractor, '_get_connection') as mock_connection:
+            connection = MagicMock()
+            mock_connection.return_value = connection
+            sql_execute = MagicMock()
+            connection.execute = sql_execute
+
+            # Daily read counts
+            sql_execute.return_value = [
+                {'database': 'gold', 'schema': 'scm', 'name': name, 'user_email': email, 'read_count': count}
+                for name, email, count in [('foo', 'john@example.com', 1), ('bar', 'jane@example.com', 4),
+                                           ('foo', 'jane@example.com', 2), ('foo', 'john@example.com', 3)]
+            ]
+
+            conf = self.conf.with_fallback(ConfigFactory.from_dict({
+                GenericUsageExtractor.AGGREGATE_USAGE: True,
+                GenericUsageExtractor.MAX_KEYS_IN_MEMORY: 2
+            }))
+            extractor = GenericUsageExtractor()
+            extractor.init(conf)
+
+            actual = []
+            result = extractor.extract()
+            while result:
+                reader = result.col_readers[0]
+                actual.append((reader.start_key, reader.user_email, reader.read_count))
+                result = extractor.extract()
+
+            self.assertEqual(actual, [('snowflake://gold.scm/bar', 'jane@example.com', 4),
+                                      ('snowflake://gold.scm/foo', 'jane@example.com', 2),
+                                      ('snowflake://gold.scm/foo', 'john@example.com', 4)])
+
 
 class TestGenericUsageExtractorWithWhereClause(unittest.TestCase):
     def setUp(self) -> None:
@@ -1,9 +1,16 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import copy
 import logging
+import time
 import unittest
+from typing import (
+    Any, Dict, List,
+)
 
+import botocore.session
+from botocore.stub import Stubber
 from mock import patch
 from pyhocon import ConfigFactory
 
@@ -58,7 +65,7 @@ test_table = {
 
 
 # patch whole class to avoid actually calling for boto3.client during tests
-@patch('databuilder.extractor.glue_extractor.boto3.client', lambda x: None)
+@patch('databuilder.extractor.glue_extractor.boto3.client', lambda *args, **kwargs: None)
 class TestGlueExtractor(unittest.TestCase):
     def setUp(self) -> None:
         logging.basicConfig(level=logging.INFO)
@@ -300,6 +307,134 @@ class TestGlueExtractor(unittest.TestCase):
                                      ], False)
             self.assertEqual(expected.__repr__(), actual.__repr__())
 
+    def test_extraction_is_streamed(self) -> None:
+        glue = botocore.session.get_session().create_client('glue', region_name='us-east-1',
+                                                            aws_access_key_id='key', aws_secret_access_key='secret')
+        table2 = dict(copy.deepcopy(test_table), Name='test_table2')
+        with Stubber(glue) as stubber, \
+                patch('databuilder.extractor.glue_extractor.boto3.client', return_value=glue):
+            stubber.add_response('search_tables', {'TableList': [test_table], 'NextToken': 'token1'},
+                                 {'ResourceShareType': 'ALL'})
+            stubber.add_response('search_tables', {'TableList': [table2]},
+                                 {'ResourceShareType': 'ALL', 'NextToken': 'token1'})
+
+            extractor = GlueExtractor()
+            extractor.init(self.conf)
+
+            self.assertEqual(extractor.extract().name, 'test_table')
+            # The next page is only requested once the tables of the first page are extracted
+            with self.assertRaises(AssertionError):
+                stubber.assert_no_pending_responses()
+
+            self.assertEqual(extractor.extract().name, 'test_table2')
+            self.assertIsNone(extractor.extract())
+            stubber.assert_no_pending_responses()
+            self.assertEqual(len(extractor.page_latencies), 2)
+
+    def test_extraction_per_database(self) -> None:
+        glue = botocore.session.get_session().create_client('glue', region_name='us-east-1',
+                                                            aws_access_key_id='key', aws_secret_access_key='secret')
+        with Stubber(glue) as stubber, \
+                patch('databuilder.extractor.glue_extractor.boto3.client', return_value=glue):
+            stubber.add_response('get_databases', {'DatabaseList': [{'Name': 'test_schema'}]},
+                                 {'ResourceShareType': 'ALL'})
+            stubber.add_response('get_tables', {'TableList': [test_table], 'NextToken': 'token1'},
+                                 {'DatabaseName': 'test_schema', 'MaxResults': 100})
+            stubber.add_response('get_tables', {'TableList': [dict(copy.deepcopy(test_table), Name='test_table2')]},
+                                 {'DatabaseName': 'test_schema', 'MaxResults': 100, 'NextToken': 'token1'})
+
+            extractor = GlueExtractor()
+            extractor.init(ConfigFactory.from_dict({GlueExtractor.DATABASE_CONCURRENCY_KEY: 1}))
+
+            self.assertEqual([extractor.extract().name, extractor.extract().name], ['test_table', 'test_table2'])
+            self.assertIsNone(extractor.extract())
+            stubber.assert_no_pending_responses()
+
+    def test_extraction_per_database_concurrently(self) -> None:
+        glue = FakeGlueClient({f'schema{i}': [f'table{j}' for j in range(i * 3)] for i in range(5)})
+        with patch('databuilder.extractor.glue_extractor.boto3.client', return_value=glue) as mock_client:
+            extractor = GlueExtractor()
+            extractor.init(ConfigFactory.from_dict({GlueExtractor.DATABASE_CONCURRENCY_KEY: 3,
+                                                    GlueExtractor.MAX_RESULTS_KEY: 2}))
+
+            # Calls are retried, at an adaptive rate when throttled
+            self.assertEqual(mock_client.call_args[1]['config'].retries, {'max_attempts': 10, 'mode': 'adaptive'})
+
+            tables = []
+            table = extractor.extract()
+            while table:
+                tables.append(f'{table.schema}.{table.name}')
+                table = extractor.extract()
+
+            self.assertCountEqual(tables, [f'schema{i}.table{j}' for i in range(5) for j in range(i * 3)])
+            # 1 page of databases, and the pages of tables of each database
+            self.assertEqual(len(extractor.page_latencies), 1 + 1 + 2 + 3 + 5 + 6)
+
+    def test_extraction_per_database_failure(self) -> None:
+        glue = FakeGlueClient({'schema0': ['table0'], 'schema1': ['table0']}, failing_database='schema1')
+        with patch('databuilder.extractor.glue_extractor.boto3.client', return_value=glue):
+            extractor = GlueExtractor()
+            extractor.init(ConfigFactory.from_dict({GlueExtractor.DATABASE_CONCURRENCY_KEY: 2}))
+
+            with self.assertRaises(RuntimeError):
+                while extractor.extract():
+                    pass
+
+    def test_extraction_per_database_stops_on_failure(self) -> None:
+        tables_by_database = {f'schema{i}': [f'table{j}' for j in range(3)] for i in range(1, 6)}
+        glue = FakeGlueClient(dict(schema0=['table0'], **tables_by_database), failing_database='schema0',
+                              delay_sec=0.2)
+        with patch('databuilder.extractor.glue_extractor.boto3.client', return_value=glue):
+            extractor = GlueExtractor()
+            extractor.init(ConfigFactory.from_dict({GlueExtractor.DATABASE_CONCURRENCY_KEY: 1,
+                                                    GlueExtractor.MAX_RESULTS_KEY: 1}))
+
+            with self.assertRaises(RuntimeError):
+                while extractor.extract():
+                    pass
+
+        # At most the page requested while the failure was handed over, no more pages nor databases
+        self.assertEqual(glue.get_tables_calls[0], 'schema0')
+        self.assertLessEqual(len(glue.get_tables_calls), 2)
+
+    def test_filters_per_database(self) -> None:
+        extractor = GlueExtractor()
+        with self.assertRaises(ValueError):
+            extractor.init(ConfigFactory.from_dict({
+                GlueExtractor.DATABASE_CONCURRENCY_KEY: 2,
+                GlueExtractor.FILTER_KEY: [{'Key': 'Name', 'Value': 'test'}],
+            }))
+
+
+class FakeGlueClient:
+    """
+    Thread safe stand-in of the glue client, as the responses of a Stubber are ordered
+    """
+
+    def __init__(self, tables_by_database: Dict[str, List[str]], failing_database: str = '',
+                 delay_sec: float = 0) -> None:
+        self._tables_by_database = tables_by_database
+        self._failing_database = failing_database
+        self._delay_sec = delay_sec
+        self.get_tables_calls: List[str] = []
+
+    def get_databases(self, **kwargs: Any) -> Dict[str, Any]:
+        return {'DatabaseList': [{'Name': name} for name in self._tables_by_database]}
+
+    def get_tables(self, DatabaseName: str, MaxResults: int, NextToken: str = '0') -> Dict[str, Any]:
+        self.get_tables_calls.append(DatabaseName)
+        if DatabaseName == self._failing_database:
+            raise RuntimeError('Glue is unavailable')
+        time.sleep(self._delay_sec)
+
+        start = int(NextToken)
+        names = self._tables_by_database[DatabaseName][start:start + MaxResults]
+        response: Dict[str, Any] = {'TableList': [dict(copy.deepcopy(test_table), Name=name,
+                                                       DatabaseName=DatabaseName) for name in names]}
+        if start + MaxResults < len(self._tables_by_database[DatabaseName]):
+            response['NextToken'] = str(start + MaxResults)
+        return response
+
 
 if __name__ == '__main__':
     unittest.main()
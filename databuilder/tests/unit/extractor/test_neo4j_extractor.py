@@ -4,7 +4,7 @@
 import unittest
 from typing import Any
 
-from mock import patch
+from mock import MagicMock, patch
 from neo4j import GraphDatabase
 from pyhocon import ConfigFactory
 
@@ -123,3 +123,33 @@ class TestNeo4jExtractor(unittest.TestCase):
 
             self.assertIsInstance(result_obj, TableESDocument)
             self.assertDictEqual(vars(result_obj), result_dict)
+
+    def test_extraction_is_streamed(self: Any) -> None:
+        """
+        Test that records are consumed from the result as they are extracted
+        """
+        self.conf.put(f'extractor.neo4j.{Neo4jExtractor.NEO4J_FETCH_SIZE}', 2)
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            consumed = []
+
+            def records() -> Any:
+                for i in range(3):
+                    consumed.append(i)
+                    yield {'key': i}
+
+            mock_session = MagicMock()
+            mock_session.run.return_value = records()
+            mock_driver.return_value.session.return_value.__enter__.return_value = mock_session
+
+            extractor = Neo4jExtractor()
+            extractor.init(Scoped.get_scoped_conf(conf=self.conf,
+                                                  scope=extractor.get_scope()))
+
+            self.assertEqual(extractor.extract(), {'key': 0})
+            self.assertEqual(consumed, [0])
+            self.assertEqual(mock_driver.return_value.session.call_args[1]['fetch_size'], 2)
+            mock_session.run.assert_called_once_with('TEST_QUERY')
+
+            self.assertEqual(extractor.extract(), {'key': 1})
+            self.assertEqual(extractor.extract(), {'key': 2})
+            self.assertIsNone(extractor.extract())
@@ -1,9 +1,12 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import threading
 import unittest
-from typing import Any
-from unittest.mock import patch
+from typing import (
+    Any, Dict, List,
+)
+from unittest.mock import MagicMock, patch
 
 from neo4j import GraphDatabase
 from pyhocon import ConfigFactory
@@ -11,6 +14,7 @@ from pyhocon import ConfigFactory
 from databuilder import Scoped
 from databuilder.extractor.neo4j_extractor import Neo4jExtractor
 from databuilder.extractor.neo4j_search_data_extractor import Neo4jSearchDataExtractor
+from databuilder.models.table_elasticsearch_document import TableESDocument
 from databuilder.publisher.neo4j_csv_publisher import JOB_PUBLISH_TAG
 
 
@@ -64,6 +68,98 @@ class TestNeo4jExtractor(unittest.TestCase):
                              Neo4jSearchDataExtractor.DEFAULT_NEO4J_DASHBOARD_CYPHER_QUERY.format(
                                  publish_tag_filter="""WHERE dashboard.published_tag = 'test-date'"""))
 
+    def test_paginated_extraction(self: Any) -> None:
+        for page_concurrency in (1, 3):
+            with patch.object(GraphDatabase, 'driver') as mock_driver:
+                keys = [f'hive://gold.test_schema/table{i}' for i in range(7)]
+                queries = self._mock_graph(mock_driver, keys)
+
+                extractor = Neo4jSearchDataExtractor()
+                extractor.init(Scoped.get_scoped_conf(conf=self._paginated_conf(page_concurrency),
+                                                      scope=extractor.get_scope()))
+                records = []
+                record = extractor.extract()
+                while record:
+                    records.append(record)
+                    record = extractor.extract()
+
+                # Pages are yielded in key order, whatever the concurrency
+                self.assertEqual([record['key'] for record in records], keys)
+
+                key_queries = [params for query, params in queries if 'LIMIT $page_size' in query]
+                self.assertEqual([params['last_key'] for params in key_queries],
+                                 ['', keys[2], keys[5], keys[6]])
+                self.assertTrue(all(params['publish_tag'] == 'test-tag' for params in key_queries))
+
+                page_queries = [(query, params) for query, params in queries if 'UNWIND $keys' in query]
+                self.assertEqual([params['keys'] for _, params in page_queries], [keys[0:3], keys[3:6], keys[6:]])
+                page_query = page_queries[0][0]
+                self.assertIn('MATCH (table:Table {key: page_key})', page_query)
+                # The publish tag is filtered on when walking the keys only
+                self.assertNotIn('published_tag', page_query)
+
+    def test_paginated_extraction_with_model_class(self: Any) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            self._mock_graph(mock_driver, ['hive://gold.test_schema/table0'])
+
+            conf = self._paginated_conf(page_concurrency=1)
+            conf.put(f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.MODEL_CLASS_CONFIG_KEY}',
+                     'databuilder.models.table_elasticsearch_document.TableESDocument')
+            extractor = Neo4jSearchDataExtractor()
+            extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
+
+            record = extractor.extract()
+            self.assertIsInstance(record, TableESDocument)
+            self.assertEqual(record.key, 'hive://gold.test_schema/table0')
+            self.assertIsNone(extractor.extract())
+
+    def test_paginated_extraction_with_custom_query(self: Any) -> None:
+        with patch.object(GraphDatabase, 'driver'):
+            conf = self._paginated_conf(page_concurrency=1)
+            conf.put(f'extractor.search_data.{Neo4jSearchDataExtractor.CYPHER_QUERY_CONFIG_KEY}',
+                     'MATCH (table:Table) RETURN table.key AS key')
+            extractor = Neo4jSearchDataExtractor()
+            with self.assertRaises(ValueError):
+                extractor.init(Scoped.get_scoped_conf(conf=conf, scope=extractor.get_scope()))
+
+    def _paginated_conf(self: Any, page_concurrency: int) -> Any:
+        return ConfigFactory.from_dict({
+            f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.GRAPH_URL_CONFIG_KEY}':
+                'bolt://example.com:7687',
+            f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_USER}': 'test-user',
+            f'extractor.search_data.extractor.neo4j.{Neo4jExtractor.NEO4J_AUTH_PW}': 'test-passwd',
+            f'extractor.search_data.{Neo4jSearchDataExtractor.PAGE_SIZE}': 3,
+            f'extractor.search_data.{Neo4jSearchDataExtractor.PAGE_CONCURRENCY}': page_concurrency,
+            f'extractor.search_data.{JOB_PUBLISH_TAG}': 'test-tag',
+        })
+
+    def _mock_graph(self: Any, mock_driver: Any, keys: List[str]) -> List[Any]:
+        """
+        Mocks the sessions of the driver, answering key queries and page queries from the given table keys
+        """
+        queries: List[Any] = []
+        lock = threading.Lock()
+
+        def run(query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+            with lock:
+                queries.append((query, parameters))
+            if 'LIMIT $page_size' in query:
+                return [{'key': key} for key in keys if key > parameters['last_key']][:parameters['page_size']]
+            return [dict(database='hive', cluster='gold', schema='test_schema', name=key.split('/')[-1], key=key,
+                         description='', last_updated_timestamp=None, column_names=[], column_descriptions=[],
+                         total_usage=0, unique_usage=0, tags=[], badges=[], schema_description='',
+                         programmatic_descriptions=[])
+                    for key in parameters['keys']]
+
+        def read_transaction(transaction_function: Any) -> Any:
+            tx = MagicMock()
+            tx.run.side_effect = run
+            return transaction_function(tx)
+
+        mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+        mock_session.read_transaction.side_effect = read_transaction
+        return queries
+
 
 if __name__ == '__main__':
     unittest.main()
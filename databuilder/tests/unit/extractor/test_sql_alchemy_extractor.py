@@ -94,6 +94,47 @@ class TestSqlAlchemyExtractor(unittest.TestCase):
         self.assertIsInstance(result, TableMetadataResult)
         self.assertEqual(result.name, 'test_table')
 
+    def test_extraction_with_lazy_model_class(self: Any) -> None:
+        """
+        Test that results are converted to model as they are extracted
+        """
+        config_dict = {
+            'extractor.sqlalchemy.conn_string': 'TEST_CONNECTION',
+            'extractor.sqlalchemy.extract_sql': 'SELECT 1 FROM TEST_TABLE;',
+            'extractor.sqlalchemy.model_class':
+                'tests.unit.extractor.test_sql_alchemy_extractor.TableMetadataResult'
+        }
+        self.conf = ConfigFactory.from_dict(config_dict)
+
+        with patch.object(SQLAlchemyExtractor, '_get_connection'), \
+                patch.object(TableMetadataResult, '__init__', return_value=None) as mock_model:
+            extractor = SQLAlchemyExtractor()
+            extractor.results = [dict(name='test_table1'), dict(name='test_table2')]
+            extractor.init(Scoped.get_scoped_conf(conf=self.conf,
+                                                  scope=extractor.get_scope()))
+            self.assertEqual(mock_model.call_count, 0)
+
+            extractor.extract()
+            mock_model.assert_called_once_with(name='test_table1')
+
+    def test_extraction_is_streamed(self: Any) -> None:
+        """
+        Test that results are streamed from a database
+        """
+        config_dict = {
+            'extractor.sqlalchemy.conn_string': 'sqlite://',
+            'extractor.sqlalchemy.extract_sql': 'SELECT 1 AS id UNION SELECT 2 AS id;'
+        }
+        conf = ConfigFactory.from_dict(config_dict)
+
+        extractor = SQLAlchemyExtractor()
+        extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                              scope=extractor.get_scope()))
+        self.assertEqual(extractor.connection.get_execution_options(),
+                         {'stream_results': True, 'max_row_buffer': 1000})
+        self.assertEqual([extractor.extract()['id'], extractor.extract()['id'], extractor.extract()], [1, 2, None])
+        extractor.close()
+
     @patch('databuilder.extractor.sql_alchemy_extractor.create_engine')
     def test_get_connection(self: Any, mock_method: Any) -> None:
         """
@@ -108,7 +149,8 @@ class TestSqlAlchemyExtractor(unittest.TestCase):
         extractor.init(Scoped.get_scoped_conf(conf=conf,
                                               scope=extractor.get_scope()))
         extractor._get_connection()
-        mock_method.assert_called_with('TEST_CONNECTION', connect_args={})
+        mock_method.assert_called_with('TEST_CONNECTION', connect_args={},
+                                       execution_options={'stream_results': True, 'max_row_buffer': 1000})
 
         extractor = SQLAlchemyExtractor()
         config_dict = {
@@ -120,7 +162,20 @@ class TestSqlAlchemyExtractor(unittest.TestCase):
         extractor.init(Scoped.get_scoped_conf(conf=conf,
                                               scope=extractor.get_scope()))
         extractor._get_connection()
-        mock_method.assert_called_with('TEST_CONNECTION', connect_args={"protocol": "https"})
+        mock_method.assert_called_with('TEST_CONNECTION', connect_args={"protocol": "https"},
+                                       execution_options={'stream_results': True, 'max_row_buffer': 1000})
+
+        extractor = SQLAlchemyExtractor()
+        config_dict = {
+            'extractor.sqlalchemy.conn_string': 'TEST_CONNECTION',
+            'extractor.sqlalchemy.extract_sql': 'SELECT 1 FROM TEST_TABLE;',
+            'extractor.sqlalchemy.stream_results': False,
+        }
+        conf = ConfigFactory.from_dict(config_dict)
+        extractor.init(Scoped.get_scoped_conf(conf=conf,
+                                              scope=extractor.get_scope()))
+        extractor._get_connection()
+        mock_method.assert_called_with('TEST_CONNECTION', connect_args={})
 
 
 class TableMetadataResult:
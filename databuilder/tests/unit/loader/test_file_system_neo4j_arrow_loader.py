@@ -0,0 +1,90 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import os
+import unittest
+from operator import itemgetter
+from os import listdir
+from os.path import join
+from typing import (
+    Any, Callable, Dict, List,
+)
+
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder.job.base_job import Job
+from databuilder.loader.file_system_neo4j_arrow_loader import FsNeo4jArrowLoader
+from databuilder.utils.publisher_utils import read_records_in_batches
+from tests.unit.models.test_graph_serializable import (
+    Actor, City, Movie,
+)
+
+here = os.path.dirname(__file__)
+
+
+class TestFsNeo4jArrowLoader(unittest.TestCase):
+    def setUp(self) -> None:
+        logging.basicConfig(level=logging.INFO)
+
+    def tearDown(self) -> None:
+        Job.closer.close()
+
+    def test_load(self) -> None:
+        actors = [Actor('Tom Cruise'), Actor('Meg Ryan')]
+        cities = [City('San Diego'), City('Oakland')]
+        movie = Movie('Top Gun', actors, cities)
+
+        loader = FsNeo4jArrowLoader()
+        conf = self._make_conf('movies')
+        loader.init(conf)
+        loader.load(movie)
+        loader.close()
+
+        node_dir = conf.get_string(FsNeo4jArrowLoader.NODE_DIR_PATH)
+        self.assertEqual(sorted(listdir(node_dir)), ['Actor_0.arrow', 'City_0.arrow', 'Movie_0.arrow'])
+
+        # Same records as the ones of FsNeo4jCSVLoader
+        expected_path = os.path.join(here, '../resources/fs_neo4j_csv_loader/movies')
+        self.assertEqual(self._get_rows(f'{expected_path}/nodes', itemgetter('KEY')),
+                         self._get_rows(node_dir, itemgetter('KEY')))
+        self.assertEqual(self._get_rows(f'{expected_path}/relationships', itemgetter('START_KEY', 'END_KEY')),
+                         self._get_rows(conf.get_string(FsNeo4jArrowLoader.RELATION_DIR_PATH),
+                                        itemgetter('START_KEY', 'END_KEY')))
+
+    def test_load_record_batches(self) -> None:
+        loader = FsNeo4jArrowLoader()
+        conf = self._make_conf('record_batches').with_fallback(
+            ConfigFactory.from_dict({FsNeo4jArrowLoader.RECORD_BATCH_SIZE: 1}))
+        loader.init(conf)
+        loader.load(Movie('Top Gun', [Actor('Tom Cruise'), Actor('Meg Ryan')], []))
+        loader.load(Movie('Heat', [Actor('Al Pacino')], []))
+        loader.close()
+
+        actor_file = join(conf.get_string(FsNeo4jArrowLoader.NODE_DIR_PATH), 'Actor_0.arrow')
+        batches = list(read_records_in_batches(actor_file, batch_size=10))
+        self.assertEqual([len(batch) for batch in batches], [1, 1, 1])
+        self.assertEqual([batch[0]['KEY'] for batch in batches],
+                         ['actor://Tom Cruise', 'actor://Meg Ryan', 'actor://Al Pacino'])
+
+    def _make_conf(self, test_name: str) -> ConfigTree:
+        prefix = '/var/tmp/TestFsNeo4jArrowLoader'
+
+        return ConfigFactory.from_dict({
+            FsNeo4jArrowLoader.NODE_DIR_PATH: f'{prefix}/{test_name}/nodes',
+            FsNeo4jArrowLoader.RELATION_DIR_PATH: f'{prefix}/{test_name}/relationships',
+            FsNeo4jArrowLoader.FORCE_CREATE_DIR: True,
+            FsNeo4jArrowLoader.SHOULD_DELETE_CREATED_DIR: True
+        })
+
+    def _get_rows(self, path: str, sorting_key_getter: Callable) -> List[Dict[str, Any]]:
+        result = []
+        for f in listdir(path):
+            for records in read_records_in_batches(join(path, f)):
+                result.extend({k: str(v) for k, v in record.items()} for record in records)
+
+        return sorted(result, key=sorting_key_getter)
+
+
+if __name__ == '__main__':
+    unittest.main()
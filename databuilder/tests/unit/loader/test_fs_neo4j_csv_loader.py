@@ -5,6 +5,8 @@ import collections
 import csv
 import logging
 import os
+import shutil
+import tempfile
 import unittest
 from operator import itemgetter
 from os import listdir
@@ -20,6 +22,7 @@ from databuilder.loader.file_system_neo4j_csv_loader import FsNeo4jCSVLoader
 from databuilder.models.graph_serializable import (
     GraphNode, GraphRelationship, GraphSerializable,
 )
+from databuilder.utils.delta_state_store import DeltaStateStore
 from tests.unit.models.test_graph_serializable import (
     Actor, City, Movie,
 )
@@ -82,6 +85,37 @@ class TestFsNeo4jCSVLoader(unittest.TestCase):
                                           itemgetter('KEY'))
         self.assertEqual(expected_nodes, actual_nodes)
 
+    def test_load_delta(self) -> None:
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+
+        def load(people: Iterable[GraphSerializable]) -> Dict[str, Dict[str, Any]]:
+            state_store = DeltaStateStore(join(temp_dir, 'state.db'))
+            conf = self._make_conf('delta').with_fallback(
+                ConfigFactory.from_dict({FsNeo4jCSVLoader.DELTA_STATE_STORE: state_store}))
+            loader = FsNeo4jCSVLoader()
+            loader.init(conf)
+            for person in people:
+                loader.load(person)
+            loader.close()
+
+            rows = self._get_csv_rows(conf.get_string(FsNeo4jCSVLoader.NODE_DIR_PATH), itemgetter('KEY'))
+            # Publisher succeeded
+            state_store.on_success()
+            Job.closer.close()
+            return {row['KEY']: dict(row) for row in rows}
+
+        first = load([Person('Taylor', job='Engineer'), Person('Griffin', pet='Lion')])
+        self.assertEqual(first['person://Griffin'], {'KEY': 'person://Griffin', 'LABEL': 'Person',
+                                                     'name': 'Griffin', 'pet': 'Lion'})
+
+        second = load([Person('Taylor', job='Manager'), Person('Griffin', pet='Lion')])
+        self.assertEqual(second, {
+            'person://Taylor': {'KEY': 'person://Taylor', 'LABEL': 'Person', 'name': 'Taylor', 'job': 'Manager'},
+            # Unchanged, only marked as still alive
+            'person://Griffin': {'KEY': 'person://Griffin', 'LABEL': 'Person'},
+        })
+
     def _make_conf(self, test_name: str) -> ConfigTree:
         prefix = '/var/tmp/TestFsNeo4jCSVLoader'
 
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import copy
+import pickle
 import unittest
 from typing import Dict, List
 
@@ -421,6 +422,31 @@ class TestTableMetadata(unittest.TestCase):
             self.assertNotEqual(node_row_serialized.get('LABEL'), 'Tag')
             node_row = self.table_metadata7.next_node()
 
+    def test_models_are_compact_and_picklable(self) -> None:
+        # Models use __slots__ and create their iterators on first use, so they can be pickled until serialized
+        column = self.table_metadata.columns[0]
+        self.assertFalse(hasattr(self.table_metadata, '__dict__'))
+        self.assertFalse(hasattr(column, '__dict__'))
+        self.assertFalse(hasattr(self.table_metadata.columns[6].get_type_metadata(), '__dict__'))
+
+        copied = pickle.loads(pickle.dumps(self.table_metadata))
+        self.assertEqual(copied.columns[6].get_type_metadata(), self.table_metadata.columns[6].get_type_metadata())
+
+        expected_nodes = []
+        node = self.table_metadata.create_next_node()
+        while node:
+            expected_nodes.append(neo4_serializer.serialize_node(node))
+            node = self.table_metadata.create_next_node()
+
+        # Database, cluster and schema nodes are only emitted once per process
+        TableMetadata.serialized_nodes_keys = set()
+        actual_nodes = []
+        node = copied.create_next_node()
+        while node:
+            actual_nodes.append(neo4_serializer.serialize_node(node))
+            node = copied.create_next_node()
+        self.assertEqual(expected_nodes, actual_nodes)
+
 
 if __name__ == '__main__':
     unittest.main()
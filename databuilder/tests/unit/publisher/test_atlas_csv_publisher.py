@@ -1,10 +1,19 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
+import json
 import logging
 import os
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import (
+    Any, Dict, List, Tuple,
+)
 from unittest.mock import MagicMock
+from urllib.parse import parse_qsl, urlparse
 
+from apache_atlas.client.base_client import AtlasClient
 from pyhocon import ConfigFactory
 
 from databuilder import Scoped
@@ -45,3 +54,154 @@ class TestAtlasCsvPublisher(unittest.TestCase):
 
         # 2 relationships to create
         self.assertEqual(self.mock_atlas_client.relationship.create_relationship.call_count, 2)
+
+
+class StubAtlasServer(ThreadingHTTPServer):
+    """
+    Serves the Atlas REST endpoints used by the publisher, keeping the created entities and relationships.
+    """
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super(StubAtlasServer, self).__init__(('127.0.0.1', 0), StubAtlasHandler)
+        self.lock = threading.Lock()
+        self.active_requests = 0
+        self.max_active_requests = 0
+        self.guids: Dict[Tuple[str, str], str] = {}
+        self.relationships: List[Dict[str, Any]] = []
+        self.guid_lookups: List[Tuple[str, List[str]]] = []
+
+
+class StubAtlasHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: StubAtlasServer
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def _handle(self) -> None:
+        with self.server.lock:
+            self.server.active_requests += 1
+            self.server.max_active_requests = max(self.server.max_active_requests, self.server.active_requests)
+        try:
+            time.sleep(0.05)
+            self._respond()
+        finally:
+            with self.server.lock:
+                self.server.active_requests -= 1
+
+    def _respond(self) -> None:
+        url = urlparse(self.path)
+        path = url.path.rstrip('/').split('/')[4:]
+        params = parse_qsl(url.query)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+
+        with self.server.lock:
+            if self.command == 'POST' and path == ['entity', 'bulk']:
+                for entity in body['entities']:
+                    qualified_name = entity['attributes']['qualifiedName']
+                    self.server.guids[(entity['typeName'], qualified_name)] = f'guid-{qualified_name}'
+                self._send(200, {})
+            elif self.command == 'GET' and path[:4] == ['entity', 'bulk', 'uniqueAttribute', 'type']:
+                qualified_names = [value for key, value in params if key.startswith('attr_')]
+                self.server.guid_lookups.append((path[4], qualified_names))
+                self._send(200, {'entities': [
+                    {'guid': self.server.guids[(path[4], qualified_name)], 'typeName': path[4],
+                     'attributes': {'qualifiedName': qualified_name}}
+                    for qualified_name in qualified_names if (path[4], qualified_name) in self.server.guids]})
+            elif self.command == 'POST' and path == ['relationship']:
+                self.server.relationships.append(body)
+                self._send(200, {})
+            else:
+                self._send(404, {})
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class TestAtlasCsvPublisherBulk(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = StubAtlasServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        resource_path = os.path.join(os.path.dirname(__file__), '../resources/atlas_csv_publisher_bulk')
+        atlas_client = AtlasClient(f'http://127.0.0.1:{self.server.server_address[1]}', ('admin', 'admin'))
+
+        self.publisher = AtlasCSVPublisher()
+        self.publisher.init(conf=ConfigFactory.from_dict({
+            AtlasCSVPublisher.ENTITY_DIR_PATH: f'{resource_path}/entities',
+            AtlasCSVPublisher.RELATIONSHIP_DIR_PATH: f'{resource_path}/relationships',
+            AtlasCSVPublisher.ATLAS_ENTITY_CREATE_BATCH_SIZE: 1,
+            AtlasCSVPublisher.ATLAS_CLIENT: atlas_client,
+            AtlasCSVPublisher.REGISTER_ENTITY_TYPES: False,
+            AtlasCSVPublisher.ENTITY_SYNC_WORKERS: 4,
+            AtlasCSVPublisher.BULK_RELATIONSHIPS: True,
+        }))
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_publisher(self) -> None:
+        self.publisher.publish()
+
+        self.assertEqual({
+            ('Actor', 'actor://Tom Cruise'): 'guid-actor://Tom Cruise',
+            ('Actor', 'actor://Meg Ryan'): 'guid-actor://Meg Ryan',
+            ('City', 'city://San Diego'): 'guid-city://San Diego',
+            ('City', 'city://Oakland'): 'guid-city://Oakland',
+            ('Movie', 'movie://Top Gun'): 'guid-movie://Top Gun',
+        }, self.server.guids)
+        # The chunks of the actors, then of the cities, are sent concurrently
+        self.assertEqual(2, self.server.max_active_requests)
+
+        # One lookup per entity type, relations refer to their ends by GUID
+        self.assertEqual([('City', ['city://Oakland', 'city://San Diego']), ('Movie', ['movie://Top Gun'])],
+                         sorted((entity_type, sorted(qualified_names))
+                                for entity_type, qualified_names in self.server.guid_lookups))
+        self.assertEqual([('guid-movie://Top Gun', 'guid-city://Oakland'),
+                          ('guid-movie://Top Gun', 'guid-city://San Diego')],
+                         sorted((relationship['end1']['guid'], relationship['end2']['guid'])
+                                for relationship in self.server.relationships))
+
+        self.assertEqual(5, self.publisher.get_phase_metrics()['entity_create'][0])
+        self.assertEqual(3, self.publisher.get_phase_metrics()['guid_resolution'][0])
+        self.assertEqual(2, self.publisher.get_phase_metrics()['relation'][0])
+
+        # GUIDs are cached
+        self.publisher.publish()
+        self.assertEqual(2, len(self.server.guid_lookups))
+        self.assertEqual(4, len(self.server.relationships))
+
+    def test_unresolved_relation_ends_refer_to_qualified_names(self) -> None:
+        self.server.guids[('Movie', 'movie://Top Gun')] = 'guid-movie://Top Gun'
+        self.server.guids[('City', 'city://San Diego')] = 'guid-city://San Diego'
+        self.publisher._create_relations(self.publisher._relationship_files[0])
+
+        ends = [(relationship['end2']['guid'], relationship['end2']['uniqueAttributes'])
+                for relationship in self.server.relationships]
+        self.assertEqual([('guid-city://San Diego', None), (None, {'qualifiedName': 'city://Oakland'})],
+                         sorted(ends, key=str))
+
+    def test_guid_cache_is_bounded(self) -> None:
+        self.publisher._guid_cache_size = 2
+        self.publisher._cache_guid('Actor', 'a', 'guid-a')
+        self.publisher._cache_guid('Actor', 'b', 'guid-b')
+        self.assertEqual('guid-a', self.publisher._get_cached_guid('Actor', 'a'))
+        self.publisher._cache_guid('Actor', 'c', 'guid-c')
+
+        self.assertEqual('guid-a', self.publisher._get_cached_guid('Actor', 'a'))
+        self.assertIsNone(self.publisher._get_cached_guid('Actor', 'b'))
+        self.assertEqual('guid-c', self.publisher._get_cached_guid('Actor', 'c'))
@@ -2,12 +2,16 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import tempfile
 import unittest
 from typing import Any
 from unittest.mock import MagicMock, patch
 
+from amundsen_rds.models.column import TableColumn as RDSTableColumn
+from amundsen_rds.models.table import Table as RDSTable
 from freezegun import freeze_time
 from pyhocon import ConfigFactory
+from sqlalchemy import create_engine
 
 from databuilder.publisher import mysql_csv_publisher
 from databuilder.publisher.mysql_csv_publisher import MySQLCSVPublisher
@@ -59,5 +63,91 @@ class TestMySQLPublish(unittest.TestCase):
         self.assertEqual(3, mock_commit.call_count)
 
 
+class TestMySQLBulkUpsertPublish(unittest.TestCase):
+
+    def setUp(self) -> None:
+        mysql_csv_publisher.Base = Base
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.conn_string = f'sqlite:///{self.temp_dir.name}/test.db'
+        self.engine = create_engine(self.conn_string)
+        Base.metadata.create_all(self.engine)
+        self.records_dir = os.path.join(here, '../resources/mysql_csv_publisher/records')
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        self.temp_dir.cleanup()
+
+    def _publish(self, publish_tag: str, bulk_upsert: bool) -> None:
+        conf = ConfigFactory.from_dict(
+            {
+                MySQLCSVPublisher.CONN_STRING: self.conn_string,
+                MySQLCSVPublisher.RECORD_FILES_DIR: self.records_dir,
+                MySQLCSVPublisher.JOB_PUBLISH_TAG: publish_tag,
+                MySQLCSVPublisher.BULK_UPSERT: bulk_upsert,
+                MySQLCSVPublisher.UPSERT_BATCH_SIZE: 1
+            }
+        )
+        publisher = MySQLCSVPublisher()
+        publisher.init(conf)
+        publisher.publish()
+
+    def _rows(self, table: str) -> list:
+        return [tuple(row) for row in self.engine.execute(f'SELECT * FROM {table} ORDER BY 1, 2')]
+
+    def test_bulk_upsert_inserts_then_updates(self) -> None:
+        with freeze_time('2021-01-01 01:01:00'):
+            self._publish('first', bulk_upsert=True)
+        with freeze_time('2021-01-02 01:01:00'):
+            self._publish('second', bulk_upsert=True)
+
+        self.assertEqual([('actor://Meg Ryan', 'Meg Ryan', 'second', 1609549260000),
+                          ('actor://Tom Cruise', 'Tom Cruise', 'second', 1609549260000)], self._rows('actor'))
+        self.assertEqual([('movie://Top Gun', 'Top Gun', 'second', 1609549260000)], self._rows('movie'))
+        self.assertEqual([('movie://Top Gun', 'actor://Meg Ryan', 'second', 1609549260000),
+                          ('movie://Top Gun', 'actor://Tom Cruise', 'second', 1609549260000)],
+                         self._rows('movie_actor'))
+
+    @freeze_time('2021-01-01 01:01:00')
+    def test_bulk_upsert_matches_merge(self) -> None:
+        self._publish('test', bulk_upsert=False)
+        merged = {table: self._rows(table) for table in ('actor', 'movie', 'movie_actor')}
+
+        for table in merged:
+            self.engine.execute(f'DELETE FROM {table}')
+        self._publish('test', bulk_upsert=True)
+
+        self.assertEqual(merged, {table: self._rows(table) for table in merged})
+
+    def test_convert_record(self) -> None:
+        publisher = MySQLCSVPublisher()
+        self.assertEqual(publisher._convert_record(RDSTable.__table__,
+                                                   {'rk': 'hive://gold.test/1', 'name': '1', 'is_view': 'False',
+                                                    'schema_rk': 'hive://gold.test'}),
+                         {'rk': 'hive://gold.test/1', 'name': '1', 'is_view': False, 'schema_rk': 'hive://gold.test'})
+        self.assertEqual(publisher._convert_record(RDSTableColumn.__table__,
+                                                   {'rk': 'hive://gold.test/1/col', 'sort_order': '2'}),
+                         {'rk': 'hive://gold.test/1/col', 'sort_order': 2})
+        self.assertEqual(publisher._convert_record(RDSTableColumn.__table__,
+                                                   {'rk': 'hive://gold.test/1/col', 'sort_order': ''}),
+                         {'rk': 'hive://gold.test/1/col', 'sort_order': None})
+
+    def test_upsert_statements(self) -> None:
+        publisher = MySQLCSVPublisher()
+        publisher._upsert_statements = {}
+        table = Base.metadata.tables['movie_actor']
+        columns = ('movie_rk', 'actor_rk', 'published_tag', 'publisher_last_updated_epoch_ms')
+
+        publisher._engine = create_engine('mysql://', strategy='mock', executor=None)
+        statement = str(publisher._get_upsert_statement(table, columns).compile(dialect=publisher._engine.dialect))
+        self.assertIn('ON DUPLICATE KEY UPDATE published_tag = VALUES(published_tag), '
+                      'publisher_last_updated_epoch_ms = VALUES(publisher_last_updated_epoch_ms)', statement)
+
+        publisher._upsert_statements = {}
+        publisher._engine = create_engine('postgresql://', strategy='mock', executor=None)
+        statement = str(publisher._get_upsert_statement(table, columns).compile(dialect=publisher._engine.dialect))
+        self.assertIn('ON CONFLICT (movie_rk, actor_rk) DO UPDATE SET published_tag = excluded.published_tag, '
+                      'publisher_last_updated_epoch_ms = excluded.publisher_last_updated_epoch_ms', statement)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,6 +3,8 @@
 
 import logging
 import os
+import shutil
+import tempfile
 import unittest
 import uuid
 
@@ -12,6 +14,8 @@ from pyhocon import ConfigFactory
 
 from databuilder.publisher import neo4j_csv_publisher
 from databuilder.publisher.neo4j_csv_publisher import Neo4jCsvPublisher
+from databuilder.utils.arrow_utils import ArrowRecordWriter
+from databuilder.utils.publisher_utils import read_csv_in_batches
 
 here = os.path.dirname(__file__)
 
@@ -53,6 +57,169 @@ class TestPublish(unittest.TestCase):
             # 2 node files, 1 relation file
             self.assertEqual(mock_commit.call_count, 1)
 
+    def test_publisher_batched(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_transaction.run = mock_run
+            mock_commit = MagicMock()
+            mock_transaction.commit = mock_commit
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'bolt://999.999.999.999:7687',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                 neo4j_csv_publisher.RELATION_FILES_DIR: f'{self._resource_path}/relations',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_BATCH_SIZE: 100,
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish()
+
+            # One statement per file, as all rows of a file share the same statement
+            self.assertEqual(mock_run.call_count, 3)
+            for call in mock_run.call_args_list:
+                self.assertIn('UNWIND $batch AS row', call[0][0])
+                self.assertEqual(len(call[1]['parameters']['batch']), 2)
+
+            self.assertEqual(mock_commit.call_count, 1)
+
+    def test_publisher_csv_read_batch_size(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_transaction.run = mock_run
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'bolt://999.999.999.999:7687',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{self._resource_path}/nodes',
+                 neo4j_csv_publisher.RELATION_FILES_DIR: f'{self._resource_path}/relations',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_BATCH_SIZE: 100,
+                 neo4j_csv_publisher.CSV_READ_BATCH_SIZE: 1,
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish()
+
+            # Statements never span more rows than are read from the file at a time
+            self.assertEqual(mock_run.call_count, 6)
+            for call in mock_run.call_args_list:
+                self.assertEqual(len(call[1]['parameters']['batch']), 1)
+
+    def test_publisher_arrow_files(self) -> None:
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        for sub_dir in ('nodes', 'relations'):
+            os.makedirs(os.path.join(temp_dir, sub_dir))
+            for csv_file in os.listdir(os.path.join(self._resource_path, sub_dir)):
+                records = next(read_csv_in_batches(os.path.join(self._resource_path, sub_dir, csv_file)))
+                writer = ArrowRecordWriter(os.path.join(temp_dir, sub_dir, csv_file.replace('.csv', '.arrow')),
+                                           fieldnames=list(records[0].keys()))
+                for record in records:
+                    writer.writerow(record)
+                writer.close()
+
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_transaction.run = mock_run
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'bolt://999.999.999.999:7687',
+                 neo4j_csv_publisher.NODE_FILES_DIR: f'{temp_dir}/nodes',
+                 neo4j_csv_publisher.RELATION_FILES_DIR: f'{temp_dir}/relations',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish()
+
+            # Same statements as for the CSV files
+            self.assertEqual(mock_run.call_count, 6)
+            self.assertIn({'KEY': 'presto://gold.test_schema1/test_table1/test_id1', 'name': 'test_id1',
+                           'order_pos': 1, 'type': 'bigint', 'LABEL': 'Column'},
+                          [call[1]['parameters'] for call in mock_run.call_args_list])
+
+    def test_statement_cache(self) -> None:
+        with patch.object(GraphDatabase, 'driver'):
+            publisher = Neo4jCsvPublisher()
+            publisher.init(ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'bolt://999.999.999.999:7687',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.NEO4J_CREATE_ONLY_NODES: ['Badge'],
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: 'tag'}
+            ))
+
+            stmt = publisher.create_node_merge_statement({'KEY': 'k1', 'name': 'n1', 'LABEL': 'Table'})
+            self.assertIs(stmt, publisher.create_node_merge_statement({'KEY': 'k2', 'name': 'n2', 'LABEL': 'Table'}))
+            self.assertIn('node.name = $name', stmt)
+            self.assertIn('ON MATCH SET', stmt)
+
+            badge_stmt = publisher.create_node_merge_statement({'KEY': 'k1', 'name': 'n1', 'LABEL': 'Badge'})
+            self.assertNotIn('ON MATCH SET', badge_stmt)
+
+            batched_stmt = publisher.create_node_merge_statement({'KEY': 'k1', 'name': 'n1', 'LABEL': 'Table'},
+                                                                 batched=True)
+            self.assertIn('MERGE (node:Table {key: row.KEY})', batched_stmt)
+            self.assertIn('node.name = row.name', batched_stmt)
+
+    def test_publish_chunk(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_transaction = MagicMock()
+            mock_session.begin_transaction.return_value = mock_transaction
+
+            mock_run = MagicMock()
+            mock_transaction.run = mock_run
+            mock_commit = MagicMock()
+            mock_transaction.commit = mock_commit
+
+            publisher = Neo4jCsvPublisher()
+
+            conf = ConfigFactory.from_dict(
+                {neo4j_csv_publisher.NEO4J_END_POINT_KEY: 'bolt://999.999.999.999:7687',
+                 neo4j_csv_publisher.NEO4J_USER: 'neo4j_user',
+                 neo4j_csv_publisher.NEO4J_PASSWORD: 'neo4j_password',
+                 neo4j_csv_publisher.JOB_PUBLISH_TAG: str(uuid.uuid4())}
+            )
+            publisher.init(conf)
+            publisher.publish_chunk([f'{self._resource_path}/nodes/test_column.csv'],
+                                    [f'{self._resource_path}/relations/test_edge_short.csv'])
+            publisher.publish_chunk([f'{self._resource_path}/nodes/test_table.csv'], [])
+
+            self.assertEqual(mock_run.call_count, 6)
+
+            # Each chunk is committed separately
+            self.assertEqual(mock_commit.call_count, 2)
+
     def test_preprocessor(self) -> None:
         with patch.object(GraphDatabase, 'driver') as mock_driver:
             mock_session = MagicMock()
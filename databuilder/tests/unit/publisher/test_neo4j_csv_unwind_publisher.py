@@ -3,19 +3,34 @@
 
 import logging
 import os
+import shutil
+import tempfile
+import threading
 import unittest
 import uuid
+from typing import Any, Dict
 
 from mock import MagicMock, patch
 from neo4j import GraphDatabase
+from neo4j.exceptions import TransientError
 from pyhocon import ConfigFactory
 
-from databuilder.publisher.neo4j_csv_unwind_publisher import Neo4jCsvUnwindPublisher
+from databuilder.publisher import neo4j_csv_unwind_publisher
+from databuilder.publisher.neo4j_csv_unwind_publisher import DEADLOCK_GROUP, Neo4jCsvUnwindPublisher
 from databuilder.publisher.publisher_config_constants import Neo4jCsvPublisherConfigs, PublisherConfigs
 
 here = os.path.dirname(__file__)
 
 
+def _mock_run(mock_session: Any, **kwargs: Any) -> MagicMock:
+    """
+    Mocks the run of the statements in the explicit transactions of the session
+    """
+    mock_run = MagicMock(**kwargs)
+    mock_session.begin_transaction.return_value.__enter__.return_value.run = mock_run
+    return mock_run
+
+
 class TestPublish(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -29,6 +44,7 @@ class TestPublish(unittest.TestCase):
 
             mock_write_transaction = MagicMock(side_effect=Exception('Could not write'))
             mock_session.__enter__.return_value.write_transaction = mock_write_transaction
+            _mock_run(mock_session.__enter__.return_value, side_effect=Exception('Could not write'))
 
             publisher = Neo4jCsvUnwindPublisher()
 
@@ -52,6 +68,7 @@ class TestPublish(unittest.TestCase):
 
             mock_write_transaction = MagicMock()
             mock_session.__enter__.return_value.write_transaction = mock_write_transaction
+            mock_run = _mock_run(mock_session.__enter__.return_value)
 
             publisher = Neo4jCsvUnwindPublisher()
 
@@ -66,8 +83,123 @@ class TestPublish(unittest.TestCase):
             publisher.init(conf)
             publisher.publish()
 
-            # Create 2 indices, write 2 node files, write 1 relation file
-            self.assertEqual(5, mock_write_transaction.call_count)
+            # Create 2 indices, then write 2 node files and 1 relation file, each in an explicit transaction
+            self.assertEqual(2, mock_write_transaction.call_count)
+            self.assertEqual(3, mock_run.call_count)
+
+    def _write_files(self, path: str) -> None:
+        os.makedirs(f'{path}/nodes')
+        os.makedirs(f'{path}/relations')
+        for label in ['Table', 'Column', 'Badge', 'User']:
+            with open(f'{path}/nodes/{label}_0.csv', 'w') as f:
+                f.write('"KEY","name","LABEL"\n')
+                f.writelines(f'"{label}_{i}","{i}","{label}"\n' for i in range(3))
+        for start_label, end_label in [('Table', 'Column'), ('Column', 'Table'), ('Table', 'Badge'),
+                                       ('Column', 'Badge'), ('Table', 'User')]:
+            with open(f'{path}/relations/{start_label}_{end_label}_0.csv', 'w') as f:
+                f.write('"START_LABEL","START_KEY","END_LABEL","END_KEY","TYPE","REVERSE_TYPE"\n')
+                f.writelines(f'"{start_label}","{start_label}_{i}","{end_label}","{end_label}_{i}","A","B"\n'
+                             for i in range(3))
+
+    def _init_publisher(self, path: str, conf: Dict[str, Any]) -> Neo4jCsvUnwindPublisher:
+        publisher = Neo4jCsvUnwindPublisher()
+        publisher.init(ConfigFactory.from_dict({
+            Neo4jCsvPublisherConfigs.NEO4J_END_POINT_KEY: 'bolt://999.999.999.999:7687/',
+            PublisherConfigs.NODE_FILES_DIR: f'{path}/nodes',
+            PublisherConfigs.RELATION_FILES_DIR: f'{path}/relations',
+            Neo4jCsvPublisherConfigs.NEO4J_USER: 'neo4j_user',
+            Neo4jCsvPublisherConfigs.NEO4J_PASSWORD: 'neo4j_password',
+            PublisherConfigs.JOB_PUBLISH_TAG: str(uuid.uuid4()),
+            **conf
+        }))
+        return publisher
+
+    def test_publisher_concurrent(self) -> None:
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        self._write_files(path)
+
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            written = []
+            lock = threading.Lock()
+
+            def write(fn: Any, stmt: str, params: Dict = None) -> None:
+                with lock:
+                    written.append(stmt)
+
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_session.write_transaction = write
+            _mock_run(mock_session, side_effect=lambda stmt, parameters: write(None, stmt, parameters))
+
+            publisher = self._init_publisher(path, {Neo4jCsvPublisherConfigs.NEO4J_PUBLISH_WORKERS: 3,
+                                                    Neo4jCsvPublisherConfigs.NEO4J_DEADLOCK_NODE_LABELS: ['Badge']})
+            publisher.publish()
+
+            # Create 4 indices, write 4 node files, write 5 relation files
+            self.assertEqual(len(written), 13)
+            merges = [stmt for stmt in written if 'MERGE' in stmt]
+            # All nodes are written before any relation
+            self.assertTrue(all('MERGE (node:' in stmt for stmt in merges[:4]))
+            self.assertTrue(all('MATCH (n1:' in stmt for stmt in merges[4:]))
+            self.assertEqual(publisher._count, 27)
+
+            self.assertEqual(publisher._get_relation_file_group(f'{path}/relations/Table_Column_0.csv'),
+                             publisher._get_relation_file_group(f'{path}/relations/Column_Table_0.csv'))
+            self.assertEqual(publisher._get_relation_file_group(f'{path}/relations/Table_Badge_0.csv'), DEADLOCK_GROUP)
+            self.assertEqual(publisher._get_relation_file_group(f'{path}/relations/Column_Badge_0.csv'), DEADLOCK_GROUP)
+            self.assertNotEqual(publisher._get_relation_file_group(f'{path}/relations/Table_User_0.csv'),
+                                DEADLOCK_GROUP)
+
+    def test_publisher_concurrent_write_exception(self) -> None:
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        self._write_files(path)
+
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            _mock_run(mock_driver.return_value.session.return_value.__enter__.return_value,
+                      side_effect=Exception('Could not write'))
+
+            publisher = self._init_publisher(path, {Neo4jCsvPublisherConfigs.NEO4J_PUBLISH_WORKERS: 3})
+
+            with self.assertRaises(Exception):
+                publisher.publish()
+
+    def test_publisher_transient_error_retry(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver, \
+                patch.object(neo4j_csv_unwind_publisher.time, 'sleep') as mock_sleep:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            # Fail the first node file write twice, then succeed
+            mock_run = _mock_run(mock_session.__enter__.return_value,
+                                 side_effect=[TransientError(), TransientError(), None, None, None])
+
+            publisher = self._init_publisher(self._resource_path,
+                                             {Neo4jCsvPublisherConfigs.NEO4J_RETRY_BASE_SEC: 0.5})
+            publisher.publish()
+
+            self.assertEqual(5, mock_run.call_count)
+            # Batches are not written with write_transaction, which would retry transient errors as well: it only
+            # creates the 2 constraints
+            self.assertEqual(2, mock_session.__enter__.return_value.write_transaction.call_count)
+            self.assertEqual(2, mock_sleep.call_count)
+            self.assertLessEqual(mock_sleep.call_args_list[0][0][0], 0.5)
+            self.assertLessEqual(mock_sleep.call_args_list[1][0][0], 1)
+
+    def test_publisher_transient_error_retries_exhausted(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver, \
+                patch.object(neo4j_csv_unwind_publisher.time, 'sleep') as mock_sleep:
+            mock_session = MagicMock()
+            mock_driver.return_value.session.return_value = mock_session
+
+            mock_run = _mock_run(mock_session.__enter__.return_value, side_effect=[TransientError()] * 3)
+
+            publisher = self._init_publisher(self._resource_path, {Neo4jCsvPublisherConfigs.NEO4J_MAX_RETRIES: 2})
+            with self.assertRaises(TransientError):
+                publisher.publish()
+
+            self.assertEqual(2, mock_sleep.call_count)
+            self.assertEqual(3, mock_run.call_count)
 
 
 if __name__ == '__main__':
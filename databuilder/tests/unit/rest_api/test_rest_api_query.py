@@ -1,12 +1,21 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import json
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import (
+    Any, Dict, List, Set,
+)
+from urllib.parse import parse_qs, urlparse
 
 from mock import patch
 
 from databuilder.rest_api.base_rest_api_query import EmptyRestApiQuerySeed, RestApiQuerySeed
-from databuilder.rest_api.rest_api_query import RestApiQuery
+from databuilder.rest_api.mode_analytics.mode_paginated_rest_api_query import ModePaginatedRestApiQuery
+from databuilder.rest_api.rest_api_query import HostRequestLimiter, RestApiQuery
 
 
 class TestRestApiQuery(unittest.TestCase):
@@ -139,5 +148,126 @@ class TestRestApiQuery(unittest.TestCase):
         self.assertEqual(expected_records, sub_records)
 
 
+class StubServer(ThreadingHTTPServer):
+    """
+    Serves 3 reports per dashboard, 2 per page: /dashboards/<id>/reports?page=<page>
+    The first request of /rate_limited is answered with 429 and a Retry-After header.
+    """
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super(StubServer, self).__init__(('127.0.0.1', 0), StubHandler)
+        self.lock = threading.Lock()
+        self.active_requests = 0
+        self.max_active_requests = 0
+        self.client_ports: Set[int] = set()
+        self.rate_limited_requests = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Keeps connections alive
+    protocol_version = 'HTTP/1.1'
+    server: StubServer
+
+    def do_GET(self) -> None:
+        with self.server.lock:
+            self.server.active_requests += 1
+            self.server.max_active_requests = max(self.server.max_active_requests, self.server.active_requests)
+            self.server.client_ports.add(self.client_address[1])
+        try:
+            time.sleep(0.01)
+            self._respond()
+        finally:
+            with self.server.lock:
+                self.server.active_requests -= 1
+
+    def _respond(self) -> None:
+        url = urlparse(self.path)
+        if url.path == '/rate_limited':
+            with self.server.lock:
+                self.server.rate_limited_requests += 1
+                rate_limited = self.server.rate_limited_requests == 1
+            if rate_limited:
+                self._send(429, {}, {'Retry-After': '3'})
+            else:
+                self._send(200, {'reports': [{'token': 'r1'}]})
+            return
+
+        dashboard_id = url.path.split('/')[2]
+        page = int(parse_qs(url.query).get('page', ['1'])[0])
+        tokens = [f'{dashboard_id}_r{i}' for i in range(3)][(page - 1) * 2:page * 2]
+        self._send(200, {'reports': [{'token': token} for token in tokens]})
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = {}) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class TestConcurrentRestApiQuery(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = StubServer()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _execute_reports_query(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        seed_query = RestApiQuerySeed(seed_record=[{'dashboard_id': f'd{i}', 'tags': ['a']} for i in range(20)])
+        query = ModePaginatedRestApiQuery(query_to_join=seed_query, url=self.url + '/dashboards/{dashboard_id}/reports',
+                                          params={}, json_path='reports[*].token', field_names=['report_id'],
+                                          pagination_json_path='reports[*]', max_record_size=2, **kwargs)
+        return list(query.execute())
+
+    def test_concurrent_pagination_in_order(self) -> None:
+        expected = self._execute_reports_query()
+        self.assertEqual(len(expected), 60)
+        self.assertEqual(expected[:4], [{'dashboard_id': 'd0', 'tags': ['a'], 'report_id': 'd0_r0'},
+                                        {'dashboard_id': 'd0', 'tags': ['a'], 'report_id': 'd0_r1'},
+                                        {'dashboard_id': 'd0', 'tags': ['a'], 'report_id': 'd0_r2'},
+                                        {'dashboard_id': 'd1', 'tags': ['a'], 'report_id': 'd1_r0'}])
+
+        self.server.client_ports.clear()
+        self.server.max_active_requests = 0
+        actual = self._execute_reports_query(max_workers=4)
+        self.assertEqual(actual, expected)
+        self.assertLessEqual(self.server.max_active_requests, 4)
+        # Connections are reused by the worker threads
+        self.assertLessEqual(len(self.server.client_ports), 4)
+
+    def test_host_limiter(self) -> None:
+        actual = self._execute_reports_query(max_workers=8, host_limiter=HostRequestLimiter(max_requests_per_host=2))
+        self.assertEqual(len(actual), 60)
+        self.assertLessEqual(self.server.max_active_requests, 2)
+
+    def test_shallow_copy(self) -> None:
+        actual = self._execute_reports_query(max_workers=2, shallow_copy=True)
+        self.assertEqual(actual, self._execute_reports_query())
+        self.assertIs(actual[0]['tags'], actual[1]['tags'])
+
+    def test_retry_after(self) -> None:
+        seed_query = RestApiQuerySeed(seed_record=[{'foo': 'bar'}])
+        query = RestApiQuery(query_to_join=seed_query, url=self.url + '/rate_limited', params={},
+                             json_path='reports[*].token', field_names=['report_id'], max_workers=2)
+
+        with patch('databuilder.rest_api.rest_api_query.time.sleep') as mock_sleep:
+            actual = list(query.execute())
+
+        self.assertEqual(actual, [{'foo': 'bar', 'report_id': 'r1'}])
+        self.assertEqual(self.server.rate_limited_requests, 2)
+        mock_sleep.assert_any_call(3.0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,91 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import shutil
+import tempfile
+import unittest
+from typing import Any, List
+
+from databuilder.task.batched_deletion import BatchedDeleter, DeletionCheckpoint
+
+
+class FakeStore:
+    def __init__(self, fail_on_batch: int = -1) -> None:
+        self.stale_ids = {i for i in range(100) if i % 3 == 0}
+        self.fetched_after: List[Any] = []
+        self.batches = 0
+        self.fail_on_batch = fail_on_batch
+
+    def fetch_stale_ids(self, after_id: Any, batch_size: int) -> List[Any]:
+        self.fetched_after.append(after_id)
+        return sorted(i for i in self.stale_ids if after_id is None or i > after_id)[:batch_size]
+
+    def delete_ids(self, ids: List[Any]) -> int:
+        if self.batches == self.fail_on_batch:
+            raise RuntimeError('Connection lost')
+        self.batches += 1
+        self.stale_ids -= set(ids)
+        return len(ids)
+
+
+class TestBatchedDeleter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.checkpoint_path = os.path.join(self.temp_dir, 'checkpoint.json')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_delete(self) -> None:
+        store = FakeStore()
+        deleter = BatchedDeleter(batch_size=10, checkpoint=DeletionCheckpoint(None, marker='tag'))
+
+        self.assertEqual(deleter.delete('node:Table', store.fetch_stale_ids, store.delete_ids), 34)
+        self.assertEqual(store.stale_ids, set())
+        self.assertEqual(store.fetched_after, [None, 27, 57, 87, 99])
+        self.assertEqual((deleter.metrics['node:Table'].deleted, deleter.metrics['node:Table'].batches), (34, 4))
+
+    def test_resume_from_checkpoint(self) -> None:
+        store = FakeStore(fail_on_batch=2)
+        deleter = BatchedDeleter(batch_size=10, checkpoint=DeletionCheckpoint(self.checkpoint_path, marker='tag'))
+        deleter.delete('node:Column', lambda after_id, batch_size: [], store.delete_ids)
+        with self.assertRaises(RuntimeError):
+            deleter.delete('node:Table', store.fetch_stale_ids, store.delete_ids)
+
+        store.fail_on_batch = -1
+        store.fetched_after = []
+        deleter = BatchedDeleter(batch_size=10, checkpoint=DeletionCheckpoint(self.checkpoint_path, marker='tag'))
+        column_ids = self._fail_if_called
+        self.assertEqual(deleter.delete('node:Column', column_ids, column_ids), 0)
+        self.assertEqual(deleter.delete('node:Table', store.fetch_stale_ids, store.delete_ids), 34)
+
+        # Resumed after the last deleted id
+        self.assertEqual(store.fetched_after[0], 57)
+        self.assertEqual(store.stale_ids, set())
+        self.assertEqual(deleter.metrics['node:Table'].deleted, 14)
+
+        deleter.finish()
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_checkpoint_of_other_marker(self) -> None:
+        checkpoint = DeletionCheckpoint(self.checkpoint_path, marker='old_tag')
+        checkpoint.update('node:Table', last_id=50, deleted=17, done=True)
+
+        store = FakeStore()
+        deleter = BatchedDeleter(batch_size=10, checkpoint=DeletionCheckpoint(self.checkpoint_path, marker='tag'))
+        self.assertEqual(deleter.delete('node:Table', store.fetch_stale_ids, store.delete_ids), 34)
+        self.assertEqual(store.fetched_after[0], None)
+
+    def test_no_progress(self) -> None:
+        deleter = BatchedDeleter(batch_size=10, checkpoint=DeletionCheckpoint(None, marker='tag'))
+        with self.assertRaises(RuntimeError):
+            deleter.delete('node:Table', lambda after_id, batch_size: [1, 2], lambda ids: 0)
+
+    def _fail_if_called(self, *args: Any) -> Any:
+        raise AssertionError('Completed target should be skipped')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,18 +2,37 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+import os
+import shutil
+import tempfile
+import time
 import unittest
 from typing import Any
 from unittest.mock import patch
 
-from amundsen_rds.models.table import Table
+from amundsen_rds.models.base import Base
+from amundsen_rds.models.table import Table, TableOwner
 from pyhocon import ConfigFactory
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
 
 from databuilder.publisher.mysql_csv_publisher import MySQLCSVPublisher
 from databuilder.task import mysql_staleness_removal_task
 from databuilder.task.mysql_staleness_removal_task import MySQLStalenessRemovalTask
 
 
+def _create_sqlite_engine(*args: Any, **kwargs: Any) -> Engine:
+    engine = create_engine(*args, **kwargs)
+
+    # RDS models use MySQL collations
+    @event.listens_for(engine, 'connect')
+    def register_collation(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.create_collation('latin1_general_cs', lambda a, b: (a > b) - (a < b))
+
+    return engine
+
+
 class TestMySQLStalenessRemovalTask(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -146,6 +165,93 @@ class TestMySQLStalenessRemovalTask(unittest.TestCase):
         self.assertTrue(str(filter_statement) == 'table_metadata.publisher_last_updated_epoch_ms < '
                                                  ':publisher_last_updated_epoch_ms_1')
 
+    def test_batched_delete(self) -> None:
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        conn_string = f'sqlite:///{temp_dir}/amundsen.db'
+        Base.metadata.create_all(_create_sqlite_engine(conn_string),
+                                 tables=[Table.__table__, TableOwner.__table__])
+
+        session = sessionmaker(bind=_create_sqlite_engine(conn_string))()
+        # Stale records are interleaved with fresh ones on a composite primary key
+        session.add_all(TableOwner(table_rk=f'table_{i // 10}', user_rk=f'user_{i % 10}',
+                                   published_tag='old' if i % 25 == 0 else 'foo')
+                        for i in range(100))
+        session.commit()
+
+        task = MySQLStalenessRemovalTask()
+        with patch.object(mysql_staleness_removal_task, 'create_engine', _create_sqlite_engine):
+            task.init(ConfigFactory.from_dict({
+                'job.identifier': 'mysql_remove_stale_data_job',
+                f'{task.get_scope()}.{MySQLStalenessRemovalTask.CONN_STRING}': conn_string,
+                f'{task.get_scope()}.{MySQLStalenessRemovalTask.STALENESS_MAX_PCT}': 5,
+                f'{task.get_scope()}.{MySQLStalenessRemovalTask.TARGET_TABLES}': ['table_owner'],
+                f'{task.get_scope()}.{MySQLStalenessRemovalTask.BATCH_SIZE}': 3,
+                f'{task.get_scope()}.{MySQLStalenessRemovalTask.CHECKPOINT_PATH}': f'{temp_dir}/checkpoint.json',
+                MySQLCSVPublisher.JOB_PUBLISH_TAG: 'foo'
+            }))
+        task.run()
+
+        self.assertEqual(session.query(TableOwner).count(), 96)
+        self.assertEqual(session.query(TableOwner).filter(TableOwner.published_tag == 'old').count(), 0)
+        metrics = task._batched_deleter.metrics['table_owner']
+        self.assertEqual((metrics.deleted, metrics.batches), (4, 2))
+        # Progress of a completed run is not kept
+        self.assertFalse(os.path.exists(f'{temp_dir}/checkpoint.json'))
+        session.close()
+
+    def test_checkpoint_of_interrupted_run_with_ms_to_expire(self) -> None:
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        conn_string = f'sqlite:///{temp_dir}/amundsen.db'
+        Base.metadata.create_all(_create_sqlite_engine(conn_string), tables=[TableOwner.__table__])
+
+        day_ms = 24 * 60 * 60 * 1000
+        now_ms = int(time.time() * 1000)
+        session = sessionmaker(bind=_create_sqlite_engine(conn_string))()
+
+        def add_owners(start: int, epoch_ms: int) -> None:
+            session.add_all(TableOwner(table_rk=f'table_{i}', user_rk='user', published_tag='foo',
+                                       publisher_last_updated_epoch_ms=epoch_ms)
+                            for i in range(start, start + 10))
+            session.commit()
+
+        add_owners(0, now_ms)
+        add_owners(10, now_ms - 2 * day_ms)
+
+        def run(run_ms: int, interrupted: bool) -> None:
+            task = MySQLStalenessRemovalTask()
+            with patch.object(mysql_staleness_removal_task, 'create_engine', _create_sqlite_engine), \
+                    patch.object(time, 'time', return_value=run_ms / 1000):
+                task.init(ConfigFactory.from_dict({
+                    'job.identifier': 'mysql_remove_stale_data_job',
+                    f'{task.get_scope()}.{MySQLStalenessRemovalTask.CONN_STRING}': conn_string,
+                    f'{task.get_scope()}.{MySQLStalenessRemovalTask.STALENESS_MAX_PCT}': 100,
+                    f'{task.get_scope()}.{MySQLStalenessRemovalTask.TARGET_TABLES}': ['table_owner'],
+                    f'{task.get_scope()}.{MySQLStalenessRemovalTask.BATCH_SIZE}': 3,
+                    f'{task.get_scope()}.{MySQLStalenessRemovalTask.CHECKPOINT_PATH}': f'{temp_dir}/checkpoint.json',
+                    f'{task.get_scope()}.{MySQLStalenessRemovalTask.MS_TO_EXPIRE}': day_ms
+                }))
+            if interrupted:
+                # The run is interrupted once table_owner is done, before the checkpoint is cleared
+                with patch.object(task._batched_deleter, 'finish', side_effect=RuntimeError('interrupted')):
+                    with self.assertRaises(RuntimeError):
+                        task.run()
+            else:
+                task.run()
+
+        run(now_ms, interrupted=True)
+        self.assertEqual(session.query(TableOwner).count(), 10)
+        self.assertTrue(os.path.exists(f'{temp_dir}/checkpoint.json'))
+
+        # Records that became stale before the next run, an hour later, are deleted by it, despite the checkpoint left
+        # behind
+        add_owners(20, now_ms - 2 * day_ms)
+        run(now_ms + 60 * 60 * 1000, interrupted=False)
+        self.assertEqual(session.query(TableOwner).count(), 10)
+        self.assertFalse(os.path.exists(f'{temp_dir}/checkpoint.json'))
+        session.close()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -357,25 +357,23 @@ class TestRemoveStaleData(unittest.TestCase):
             task._delete_stale_relations()
 
             mock_execute.assert_any_call(dry_run=False,
-                                         param_dict={'marker': u'foo', 'batch_size': 100},
+                                         param_dict={'marker': u'foo', 'batch_size': 10000},
                                          statement=textwrap.dedent("""
             MATCH (target:Foo)
             WHERE (target.published_tag < $marker
             OR NOT EXISTS(target.published_tag))
             WITH target LIMIT $batch_size
-            DETACH DELETE (target)
-            RETURN count(*) as count
+            RETURN id(target) as id
             """))
 
             mock_execute.assert_any_call(dry_run=False,
-                                         param_dict={'marker': u'foo', 'batch_size': 100},
+                                         param_dict={'marker': u'foo', 'batch_size': 10000},
                                          statement=textwrap.dedent("""
             MATCH (start_node)-[target:BAR]-(end_node)
             WHERE (target.published_tag < $marker
             OR NOT EXISTS(target.published_tag))
-            WITH target LIMIT $batch_size
-            DELETE target
-            RETURN count(*) as count
+            WITH DISTINCT target LIMIT $batch_size
+            RETURN id(target) as id
             """))
 
     def test_delete_statement_publish_tag_retain_data_with_no_publisher_metadata(self) -> None:
@@ -400,23 +398,21 @@ class TestRemoveStaleData(unittest.TestCase):
             task._delete_stale_relations()
 
             mock_execute.assert_any_call(dry_run=False,
-                                         param_dict={'marker': u'foo', 'batch_size': 100},
+                                         param_dict={'marker': u'foo', 'batch_size': 10000},
                                          statement=textwrap.dedent("""
             MATCH (target:Foo)
             WHERE (target.published_tag < $marker)
             WITH target LIMIT $batch_size
-            DETACH DELETE (target)
-            RETURN count(*) as count
+            RETURN id(target) as id
             """))
 
             mock_execute.assert_any_call(dry_run=False,
-                                         param_dict={'marker': u'foo', 'batch_size': 100},
+                                         param_dict={'marker': u'foo', 'batch_size': 10000},
                                          statement=textwrap.dedent("""
             MATCH (start_node)-[target:BAR]-(end_node)
             WHERE (target.published_tag < $marker)
-            WITH target LIMIT $batch_size
-            DELETE target
-            RETURN count(*) as count
+            WITH DISTINCT target LIMIT $batch_size
+            RETURN id(target) as id
             """))
 
     def test_delete_statement_ms_to_expire(self) -> None:
@@ -440,25 +436,23 @@ class TestRemoveStaleData(unittest.TestCase):
             task._delete_stale_relations()
 
             mock_execute.assert_any_call(dry_run=False,
-                                         param_dict={'marker': 9876543210, 'batch_size': 100},
+                                         param_dict={'marker': 9876543210, 'batch_size': 10000},
                                          statement=textwrap.dedent("""
             MATCH (target:Foo)
             WHERE (target.publisher_last_updated_epoch_ms < (timestamp() - $marker)
             OR NOT EXISTS(target.publisher_last_updated_epoch_ms))
             WITH target LIMIT $batch_size
-            DETACH DELETE (target)
-            RETURN count(*) as count
+            RETURN id(target) as id
             """))
 
             mock_execute.assert_any_call(dry_run=False,
-                                         param_dict={'marker': 9876543210, 'batch_size': 100},
+                                         param_dict={'marker': 9876543210, 'batch_size': 10000},
                                          statement=textwrap.dedent("""
             MATCH (start_node)-[target:BAR]-(end_node)
             WHERE (target.publisher_last_updated_epoch_ms < (timestamp() - $marker)
             OR NOT EXISTS(target.publisher_last_updated_epoch_ms))
-            WITH target LIMIT $batch_size
-            DELETE target
-            RETURN count(*) as count
+            WITH DISTINCT target LIMIT $batch_size
+            RETURN id(target) as id
             """))
 
     def test_delete_statement_ms_to_expire_retain_data_with_no_publisher_metadata(self) -> None:
@@ -483,23 +477,21 @@ class TestRemoveStaleData(unittest.TestCase):
             task._delete_stale_relations()
 
             mock_execute.assert_any_call(dry_run=False,
-                                         param_dict={'marker': 9876543210, 'batch_size': 100},
+                                         param_dict={'marker': 9876543210, 'batch_size': 10000},
                                          statement=textwrap.dedent("""
             MATCH (target:Foo)
             WHERE (target.publisher_last_updated_epoch_ms < (timestamp() - $marker))
             WITH target LIMIT $batch_size
-            DETACH DELETE (target)
-            RETURN count(*) as count
+            RETURN id(target) as id
             """))
 
             mock_execute.assert_any_call(dry_run=False,
-                                         param_dict={'marker': 9876543210, 'batch_size': 100},
+                                         param_dict={'marker': 9876543210, 'batch_size': 10000},
                                          statement=textwrap.dedent("""
             MATCH (start_node)-[target:BAR]-(end_node)
             WHERE (target.publisher_last_updated_epoch_ms < (timestamp() - $marker))
-            WITH target LIMIT $batch_size
-            DELETE target
-            RETURN count(*) as count
+            WITH DISTINCT target LIMIT $batch_size
+            RETURN id(target) as id
             """))
 
     def test_delete_statement_with_target_condition(self) -> None:
@@ -523,25 +515,23 @@ class TestRemoveStaleData(unittest.TestCase):
             task._delete_stale_relations()
 
             mock_execute.assert_any_call(dry_run=False,
-                                         param_dict={'marker': u'foo', 'batch_size': 100},
+                                         param_dict={'marker': u'foo', 'batch_size': 10000},
                                          statement=textwrap.dedent("""
             MATCH (target:Foo)
             WHERE (target.published_tag < $marker
             OR NOT EXISTS(target.published_tag)) AND (target)-[:BAR]->(:Foo) AND target.name=\'foo_name\'
             WITH target LIMIT $batch_size
-            DETACH DELETE (target)
-            RETURN count(*) as count
+            RETURN id(target) as id
             """))
 
             mock_execute.assert_any_call(dry_run=False,
-                                         param_dict={'marker': u'foo', 'batch_size': 100},
+                                         param_dict={'marker': u'foo', 'batch_size': 10000},
                                          statement=textwrap.dedent("""
             MATCH (start_node)-[target:BAR]-(end_node)
             WHERE (target.published_tag < $marker
             OR NOT EXISTS(target.published_tag)) AND (start_node:Foo)-[target]->(end_node:Foo)
-            WITH target LIMIT $batch_size
-            DELETE target
-            RETURN count(*) as count
+            WITH DISTINCT target LIMIT $batch_size
+            RETURN id(target) as id
             """))
 
     def test_ms_to_expire_too_small(self) -> None:
@@ -578,6 +568,34 @@ class TestRemoveStaleData(unittest.TestCase):
             })
             task.init(job_config)
 
+    def test_delete_in_batches(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jStalenessRemovalTask, '_execute_cypher_query') \
+                as mock_execute:
+            mock_execute.side_effect = [[{'id': 3}, {'id': 7}], [{'count': 2}],
+                                        [{'id': 9}], [{'count': 1}],
+                                        []]
+            task = Neo4jStalenessRemovalTask()
+            job_config = ConfigFactory.from_dict({
+                f'job.identifier': 'remove_stale_data_job',
+                f'{task.get_scope()}.{neo4j_staleness_removal_task.NEO4J_END_POINT_KEY}': 'neo4j://example.com:7687',
+                f'{task.get_scope()}.{neo4j_staleness_removal_task.NEO4J_USER}': 'foo',
+                f'{task.get_scope()}.{neo4j_staleness_removal_task.NEO4J_PASSWORD}': 'bar',
+                f'{task.get_scope()}.{neo4j_staleness_removal_task.TARGET_NODES}': ['Foo'],
+                f'{task.get_scope()}.{neo4j_staleness_removal_task.BATCH_SIZE}': 2,
+                neo4j_csv_publisher.JOB_PUBLISH_TAG: 'foo',
+            })
+
+            task.init(job_config)
+            task._delete_stale_nodes()
+
+            calls = mock_execute.call_args_list
+            # Deleted nodes are not found again, so every batch is fetched with the same statement
+            self.assertEqual([c[1]['param_dict'] for c in calls[::2]], [{'marker': 'foo', 'batch_size': 2}] * 3)
+            self.assertEqual(calls[1][1]['param_dict'], {'ids': [3, 7]})
+            self.assertEqual(calls[3][1]['param_dict'], {'ids': [9]})
+            self.assertEqual(calls[1][1]['statement'], Neo4jStalenessRemovalTask.delete_nodes_statement)
+            self.assertEqual(task._batched_deleter.metrics['node:Foo'].deleted, 3)
+
     def test_delete_dry_run(self) -> None:
         with patch.object(GraphDatabase, 'driver') as mock_driver:
             session_mock = mock_driver.return_value.session
@@ -0,0 +1,145 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from typing import (
+    Any, Dict, List, Set, Tuple,
+)
+
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder.extractor.base_extractor import Extractor
+from databuilder.job.base_job import Job
+from databuilder.loader.file_system_neo4j_arrow_loader import FsNeo4jArrowLoader
+from databuilder.loader.file_system_neo4j_csv_loader import FsNeo4jCSVLoader
+from databuilder.models.table_metadata import ColumnMetadata, TableMetadata
+from databuilder.task.parallel_task import ParallelTask, _merge_dirs
+from databuilder.task.task import DefaultTask
+from databuilder.utils.arrow_utils import ArrowRecordWriter
+from databuilder.utils.publisher_utils import read_records_in_batches
+
+
+class SyntheticTableExtractor(Extractor):
+    def init(self, conf: ConfigTree) -> None:
+        self._iter = iter([
+            TableMetadata('hive', 'gold', 'schema', f'table_{i}', f'description {i}',
+                          [ColumnMetadata(f'col_{j}', None, 'string', j) for j in range(3)],
+                          tags=['tag_a'] if i % 2 else None)
+            for i in range(25)
+        ])
+
+    def extract(self) -> Any:
+        return next(self._iter, None)
+
+    def get_scope(self) -> str:
+        return 'extractor.synthetic'
+
+
+class TestParallelTask(unittest.TestCase):
+
+    def setUp(self) -> None:
+        logging.basicConfig(level=logging.INFO)
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        Job.closer.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, task: DefaultTask, name: str, task_conf: Dict[str, Any]) -> Set[Tuple[str, str]]:
+        loader_scope = 'loader.filesystem_csv_neo4j'
+        conf_dict = {
+            f'{loader_scope}.node_dir_path': os.path.join(self.temp_dir, name, 'nodes'),
+            f'{loader_scope}.relationship_dir_path': os.path.join(self.temp_dir, name, 'relationships'),
+            f'{loader_scope}.delete_created_directories': False,
+        }
+        conf_dict.update({f'task.{k}': v for k, v in task_conf.items()})
+        TableMetadata.serialized_nodes_keys = set()
+        TableMetadata.serialized_rels_keys = set()
+        task.init(ConfigFactory.from_dict(conf_dict))
+        task.run()
+        return self._read_rows(os.path.join(self.temp_dir, name))
+
+    def _read_rows(self, path: str) -> Set[Tuple[str, str]]:
+        rows = set()
+        for dir_name in ('nodes', 'relationships'):
+            for file_name in os.listdir(os.path.join(path, dir_name)):
+                for records in read_records_in_batches(os.path.join(path, dir_name, file_name)):
+                    for record in records:
+                        rows.add((dir_name, str(sorted((k, str(v)) for k, v in record.items()))))
+        return rows
+
+    def test_output_matches_default_task(self) -> None:
+        expected = self._run(DefaultTask(SyntheticTableExtractor(), FsNeo4jCSVLoader()), 'default', {})
+        actual = self._run(ParallelTask(SyntheticTableExtractor(), FsNeo4jCSVLoader()), 'parallel',
+                           {ParallelTask.PARALLELISM: 3, ParallelTask.BATCH_SIZE: 4})
+
+        self.assertTrue(expected)
+        self.assertEqual(expected, actual)
+
+    def test_arrow_output_matches_default_task(self) -> None:
+        expected = self._run(DefaultTask(SyntheticTableExtractor(), FsNeo4jArrowLoader()), 'default', {})
+        actual = self._run(ParallelTask(SyntheticTableExtractor(), FsNeo4jArrowLoader()), 'parallel',
+                           {ParallelTask.PARALLELISM: 2, ParallelTask.BATCH_SIZE: 4})
+
+        self.assertIn(('nodes', str(sorted({'KEY': 'hive://gold.schema/table_24', 'LABEL': 'Table',
+                                            'is_view:UNQUOTED': 'False', 'name': 'table_24'}.items()))), expected)
+        self.assertEqual(expected, actual)
+
+    def test_loader_without_output_dirs(self) -> None:
+        task = ParallelTask(SyntheticTableExtractor(), FsNeo4jCSVLoader())
+        with self.assertRaises(RuntimeError):
+            task.init(ConfigFactory.from_dict({}))
+
+    def test_merge_dirs(self) -> None:
+        sources: List[str] = []
+        for i, files in enumerate([{'Table_0.csv': 'a,b\n1,2\n', 'Column_0.csv': 'k\nc1\n'},
+                                   {'Table_0.csv': 'a,b,c\n3,4,5\n', 'Table_1.csv': 'a,b\n6,7\n'}]):
+            source = os.path.join(self.temp_dir, str(i))
+            os.makedirs(source)
+            for file_name, content in files.items():
+                with open(os.path.join(source, file_name), 'w') as f:
+                    f.write(content)
+            sources.append(source)
+        target = os.path.join(self.temp_dir, 'target')
+        os.makedirs(target)
+
+        _merge_dirs(sources, target)
+
+        merged = {}
+        for file_name in os.listdir(target):
+            with open(os.path.join(target, file_name)) as f:
+                merged[file_name] = f.read()
+        self.assertEqual(merged, {'Table_0.csv': 'a,b\n1,2\n6,7\n',
+                                  'Table_1.csv': 'a,b,c\n3,4,5\n',
+                                  'Column_0.csv': 'k\nc1\n'})
+
+    def test_merge_arrow_dirs(self) -> None:
+        sources: List[str] = []
+        for i, files in enumerate([{'Table_0.arrow': [{'a': '1', 'b': '2'}, {'a': '3', 'b': '4'}]},
+                                   {'Table_0.arrow': [{'a': '5', 'b': '6'}], 'Table_1.arrow': [{'c': '7'}]}]):
+            source = os.path.join(self.temp_dir, str(i))
+            os.makedirs(source)
+            for file_name, records in files.items():
+                writer = ArrowRecordWriter(os.path.join(source, file_name), list(records[0].keys()), batch_size=1)
+                for record in records:
+                    writer.writerow(record)
+                writer.close()
+            sources.append(source)
+        target = os.path.join(self.temp_dir, 'target')
+        os.makedirs(target)
+
+        _merge_dirs(sources, target)
+
+        merged = {file_name: [record for records in read_records_in_batches(os.path.join(target, file_name))
+                              for record in records]
+                  for file_name in os.listdir(target)}
+        self.assertEqual(merged, {'Table_0.arrow': [{'a': '1', 'b': '2'}, {'a': '3', 'b': '4'}, {'a': '5', 'b': '6'}],
+                                  'Table_1.arrow': [{'c': '7'}]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import csv
+import shutil
+import tempfile
+import threading
+import unittest
+from typing import (
+    Any, List, Optional,
+)
+
+from mock import MagicMock, patch
+from pyhocon import ConfigFactory, ConfigTree
+
+from databuilder.extractor.base_extractor import Extractor
+from databuilder.job.pipelined_job import PipelinedJob
+from databuilder.loader.file_system_neo4j_csv_loader import FsNeo4jCSVLoader
+from databuilder.models.table_metadata import ColumnMetadata, TableMetadata
+from databuilder.publisher.base_publisher import NoopPublisher, Publisher
+from databuilder.task.task import DefaultTask
+
+
+class TableExtractor(Extractor):
+    def __init__(self, fail_after: int = -1, fail_when: Optional[threading.Event] = None) -> None:
+        self.fail_after = fail_after
+        self.fail_when = fail_when
+
+    def init(self, conf: ConfigTree) -> None:
+        self._count = 0
+        self._iter = iter([TableMetadata('hive', 'gold', 'schema', f'table_{i}', None,
+                                         [ColumnMetadata('col', None, 'string', 0)])
+                           for i in range(10)])
+
+    def extract(self) -> Any:
+        if self._count == self.fail_after:
+            if self.fail_when:
+                self.fail_when.wait(timeout=10)
+            raise RuntimeError('Failed to extract')
+        self._count += 1
+        return next(self._iter, None)
+
+    def get_scope(self) -> str:
+        return 'extractor.table'
+
+
+def _read_table_keys(node_files: List[str]) -> List[str]:
+    keys = []
+    for file_path in node_files:
+        with open(file_path, 'r', encoding='utf8') as f:
+            keys.extend(row['KEY'] for row in csv.DictReader(f) if row['LABEL'] == 'Table')
+    return sorted(keys)
+
+
+class ChunkRecordingPublisher(Publisher):
+    def __init__(self, fail_on_chunk: int = -1) -> None:
+        super(ChunkRecordingPublisher, self).__init__()
+        self.fail_on_chunk = fail_on_chunk
+        self.chunks: List[List[str]] = []
+
+    def init(self, conf: ConfigTree) -> None:
+        pass
+
+    def publish_impl(self) -> None:
+        pass
+
+    def publish_chunk(self, node_files: List[str], relation_files: List[str]) -> None:
+        if len(self.chunks) == self.fail_on_chunk:
+            raise RuntimeError('Failed to publish')
+
+        self.chunks.append(_read_table_keys(node_files))
+
+    def get_scope(self) -> str:
+        return 'publisher.recording'
+
+
+class TestPipelinedJob(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir_path = tempfile.mkdtemp()
+        self.conf = ConfigFactory.from_dict({
+            'loader.filesystem_csv_neo4j.node_dir_path': f'{self.temp_dir_path}/nodes',
+            'loader.filesystem_csv_neo4j.relationship_dir_path': f'{self.temp_dir_path}/relationships',
+            'loader.filesystem_csv_neo4j.chunk_size': 20,
+        })
+        TableMetadata.serialized_nodes_keys = set()
+        TableMetadata.serialized_rels_keys = set()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir_path, ignore_errors=True)
+
+    def test_publishes_chunks(self) -> None:
+        publisher = ChunkRecordingPublisher()
+        call_back = MagicMock()
+        publisher.register_call_back(call_back)
+
+        task = DefaultTask(TableExtractor(), FsNeo4jCSVLoader())
+        PipelinedJob(self.conf, task, publisher).launch()
+
+        self.assertGreater(len(publisher.chunks), 1)
+        published = [key for chunk in publisher.chunks for key in chunk]
+        self.assertEqual(published, [f'hive://gold.schema/table_{i}' for i in range(10)])
+        call_back.on_success.assert_called_once()
+
+    def test_publish_failure(self) -> None:
+        publisher = ChunkRecordingPublisher(fail_on_chunk=1)
+        call_back = MagicMock()
+        publisher.register_call_back(call_back)
+
+        task = DefaultTask(TableExtractor(), FsNeo4jCSVLoader())
+        with self.assertRaises(RuntimeError):
+            PipelinedJob(self.conf, task, publisher).launch()
+
+        self.assertEqual(len(publisher.chunks), 1)
+        call_back.on_failure.assert_called_once()
+
+    def test_task_failure(self) -> None:
+        publisher = ChunkRecordingPublisher()
+        call_back = MagicMock()
+        publisher.register_call_back(call_back)
+
+        # The task fails once the loader handed over a first chunk, and then hands over its last, partial, chunk
+        # when the task closes it
+        chunk_handed_over = threading.Event()
+        task = DefaultTask(TableExtractor(fail_after=5, fail_when=chunk_handed_over), FsNeo4jCSVLoader())
+        job = PipelinedJob(self.conf, task, publisher)
+        handed_over: List[List[str]] = []
+        on_chunk = job._on_chunk
+
+        def record_chunk(node_files: List[str], relation_files: List[str]) -> None:
+            handed_over.append(_read_table_keys(node_files))
+            on_chunk(node_files, relation_files)
+            chunk_handed_over.set()
+
+        with patch.object(job, '_on_chunk', record_chunk), \
+                self.assertRaisesRegex(RuntimeError, 'Failed to extract'):
+            job.launch()
+
+        self.assertEqual(len(handed_over), 2)
+        published = {key for chunk in publisher.chunks for key in chunk}
+        self.assertTrue(published.isdisjoint(handed_over[-1]))
+        self.assertLessEqual(published, set(handed_over[0]))
+        call_back.on_failure.assert_called_once()
+
+    def test_unsupported_publisher(self) -> None:
+        task = DefaultTask(TableExtractor(), FsNeo4jCSVLoader())
+        with self.assertRaises(RuntimeError):
+            PipelinedJob(self.conf, task, NoopPublisher())
+
+
+if __name__ == '__main__':
+    unittest.main()
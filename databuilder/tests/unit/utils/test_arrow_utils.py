@@ -0,0 +1,66 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from databuilder.utils.arrow_utils import ArrowRecordWriter, read_arrow_in_batches
+
+
+class TestArrowUtils(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.arrow_file = os.path.join(self.temp_dir, 'Table_0.arrow')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip(self) -> None:
+        writer = ArrowRecordWriter(self.arrow_file, ['KEY', 'LABEL', 'description', 'sort_order:UNQUOTED',
+                                                     'is_view:UNQUOTED', 'score'], batch_size=2)
+        writer.writerow({'KEY': 'hive://gold.test/t1', 'LABEL': 'Table', 'description': None,
+                         'sort_order:UNQUOTED': 1, 'is_view:UNQUOTED': True, 'score': 1})
+        writer.writerow({'KEY': 'hive://gold.test/t2', 'LABEL': 'Table', 'description': 'a,"quoted"\ndescription',
+                         'sort_order:UNQUOTED': None, 'is_view:UNQUOTED': False, 'score': 0.5})
+        writer.writerow({'KEY': 'hive://gold.test/t3', 'LABEL': 'Table', 'description': ['not', 'a', 'string'],
+                         'sort_order:UNQUOTED': 3, 'is_view:UNQUOTED': False, 'score': 2})
+        writer.close()
+
+        batches = list(read_arrow_in_batches(self.arrow_file, batch_size=1000))
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+
+        records = [record for batch in batches for record in batch]
+        # Like DictWriter, values are written as strings
+        self.assertEqual(records[0], {'KEY': 'hive://gold.test/t1', 'LABEL': 'Table', 'description': '',
+                                      'sort_order:UNQUOTED': '1', 'is_view:UNQUOTED': 'True', 'score': '1'})
+        self.assertEqual(records[1]['description'], 'a,"quoted"\ndescription')
+        self.assertEqual(records[1]['sort_order:UNQUOTED'], '')
+        self.assertEqual(records[1]['score'], '0.5')
+        self.assertEqual(records[2]['description'], "['not', 'a', 'string']")
+
+    def test_read_in_smaller_batches(self) -> None:
+        writer = ArrowRecordWriter(self.arrow_file, ['KEY'], batch_size=5)
+        for i in range(7):
+            writer.writerow({'KEY': f'key{i}'})
+        writer.close()
+
+        batches = list(read_arrow_in_batches(self.arrow_file, batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1, 2])
+        self.assertEqual([record['KEY'] for batch in batches for record in batch], [f'key{i}' for i in range(7)])
+
+    def test_types_changing_across_batches(self) -> None:
+        writer = ArrowRecordWriter(self.arrow_file, ['KEY', 'count', 'description'], batch_size=1)
+        writer.writerow({'KEY': 'key0', 'count': 1, 'description': None})
+        writer.writerow({'KEY': 'key1', 'count': 'many', 'description': 'a description'})
+        writer.close()
+
+        records = [record for batch in read_arrow_in_batches(self.arrow_file, batch_size=1000) for record in batch]
+        self.assertEqual(records, [{'KEY': 'key0', 'count': '1', 'description': ''},
+                                   {'KEY': 'key1', 'count': 'many', 'description': 'a description'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
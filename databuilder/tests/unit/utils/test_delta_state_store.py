@@ -0,0 +1,64 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from databuilder.utils.delta_state_store import DeltaStateStore
+
+
+class TestDeltaStateStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'state.db')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, rows: dict, success: bool = True) -> dict:
+        store = DeltaStateStore(self.path)
+        unchanged = {key: store.is_unchanged(key, row) for key, row in rows.items()}
+        store.close()
+        if success:
+            store.on_success()
+        else:
+            store.on_failure()
+        return unchanged
+
+    def test_unchanged_after_success(self) -> None:
+        rows = {'a': {'KEY': 'a', 'name': 'x'}, 'b': {'KEY': 'b', 'name': 'y'}}
+        self.assertEqual(self._run(rows), {'a': False, 'b': False})
+        self.assertEqual(self._run(rows), {'a': True, 'b': True})
+
+        rows['b'] = {'KEY': 'b', 'name': 'z'}
+        self.assertEqual(self._run(rows), {'a': True, 'b': False})
+
+    def test_failed_run_is_discarded(self) -> None:
+        rows = {'a': {'KEY': 'a', 'name': 'x'}}
+        self.assertEqual(self._run(rows, success=False), {'a': False})
+        self.assertEqual(self._run(rows), {'a': False})
+
+    def test_rows_not_seen_are_forgotten(self) -> None:
+        self._run({'a': {'KEY': 'a'}, 'b': {'KEY': 'b'}})
+        self._run({'a': {'KEY': 'a'}})
+        self.assertEqual(self._run({'a': {'KEY': 'a'}, 'b': {'KEY': 'b'}}), {'a': True, 'b': False})
+
+    def test_pickle(self) -> None:
+        store = DeltaStateStore(self.path)
+        self.assertFalse(store.is_unchanged('a', {'KEY': 'a'}))
+        store.flush()
+
+        copied = pickle.loads(pickle.dumps(store))
+        self.assertFalse(copied.is_unchanged('b', {'KEY': 'b'}))
+        copied.close()
+        store.on_success()
+
+        self.assertEqual(self._run({'a': {'KEY': 'a'}, 'b': {'KEY': 'b'}}), {'a': True, 'b': True})
+
+
+if __name__ == '__main__':
+    unittest.main()
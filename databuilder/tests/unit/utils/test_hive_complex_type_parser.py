@@ -9,7 +9,7 @@ from databuilder.models.table_metadata import ColumnMetadata
 from databuilder.models.type_metadata import (
     ArrayTypeMetadata, MapTypeMetadata, ScalarTypeMetadata, StructTypeMetadata,
 )
-from databuilder.utils.hive_complex_type_parser import parse_hive_type
+from databuilder.utils.hive_complex_type_parser import parse_hive_type, parse_hive_type_with_pyparsing
 
 
 class TestHiveComplexTypeParser(unittest.TestCase):
@@ -295,6 +295,47 @@ class TestHiveComplexTypeParser(unittest.TestCase):
         with self.assertRaises(ParseException):
             parse_hive_type(column.type, column.name, column)
 
+    def test_same_types_as_pyparsing_grammar(self) -> None:
+        type_strs = ['STRUCT<a:INT,b:ARRAY<MAP<STRING,DECIMAL(10, 2)>>>',
+                     'map< string , struct<c: double precision ,d:uniontype<int,struct<e:int>> > >',
+                     'struct<a:int,a:string>',
+                     'struct<>']
+        for type_str in type_strs:
+            column = ColumnMetadata('col1', None, type_str, 0)
+            column.set_column_key(self.column_key)
+            self.assertEqual(parse_hive_type(column.type, column.name, column),
+                             parse_hive_type_with_pyparsing(column.type, column.name, column))
+
+    def test_transform_repeated_type(self) -> None:
+        column1 = ColumnMetadata('col1', None, 'struct<a:int,b:array<struct<c:string>>>', 0)
+        column1.set_column_key(self.column_key)
+        column2 = ColumnMetadata('col2', None, column1.type, 1)
+        column2.set_column_key('hive://gold.test_schema/test_table/col2')
+
+        # The parsed type is cached, but each column gets its own TypeMetadata
+        actual1 = parse_hive_type(column1.type, column1.name, column1)
+        actual2 = parse_hive_type(column2.type, column2.name, column2)
+        assert isinstance(actual1, StructTypeMetadata) and isinstance(actual2, StructTypeMetadata)
+        assert actual1.struct_items and actual2.struct_items
+        self.assertIs(actual2.parent, column2)
+        self.assertIs(actual2.struct_items['b'].parent, actual2)
+        self.assertEqual(actual2.struct_items['b'].key(),
+                         'hive://gold.test_schema/test_table/col2/type/col2/b')
+        self.assertEqual(actual1.struct_items['b'].key(),
+                         'hive://gold.test_schema/test_table/col1/type/col1/b')
+
+    def test_transform_deeply_nested_type(self) -> None:
+        column = ColumnMetadata('col1', None, 'array<' * 2000 + 'int' + '>' * 2000, 0)
+        column.set_column_key(self.column_key)
+
+        actual = parse_hive_type(column.type, column.name, column)
+        depth = 0
+        while isinstance(actual, ArrayTypeMetadata) and actual.array_inner_type:
+            actual = actual.array_inner_type
+            depth += 1
+        self.assertEqual(depth, 1999)
+        self.assertEqual(actual.type_str, 'array<int>')
+
 
 if __name__ == '__main__':
     unittest.main()
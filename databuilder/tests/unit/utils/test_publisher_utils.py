@@ -0,0 +1,73 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+
+from databuilder.utils.publisher_utils import (
+    create_props_param, get_node_label, read_csv_in_batches,
+)
+
+here = os.path.dirname(__file__)
+
+
+class TestPublisherUtils(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._node_file = os.path.join(here, '../resources/csv_publisher/nodes/test_column.csv')
+
+    def test_read_csv_in_batches(self) -> None:
+        batches = list(read_csv_in_batches(self._node_file, batch_size=1))
+
+        self.assertEqual(len(batches), 2)
+        self.assertEqual([len(batch) for batch in batches], [1, 1])
+        self.assertEqual(batches[0][0], {'KEY': 'presto://gold.test_schema1/test_table1/test_id1',
+                                         'name': 'test_id1',
+                                         'order_pos:UNQUOTED': '1',
+                                         'type': 'bigint',
+                                         'LABEL': 'Column'})
+        self.assertEqual(batches[1][0]['name'], 'test_id2')
+
+        self.assertEqual(list(read_csv_in_batches(self._node_file, batch_size=10)),
+                         [batches[0] + batches[1]])
+
+    def test_read_csv_in_batches_empty_values(self) -> None:
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csv_file:
+            csv_file.write('"KEY","description","LABEL"\n"key_1","","Table"\n')
+        try:
+            records = [record for batch in read_csv_in_batches(csv_file.name) for record in batch]
+            self.assertEqual(records, [{'KEY': 'key_1', 'description': '', 'LABEL': 'Table'}])
+        finally:
+            os.remove(csv_file.name)
+
+    def test_read_csv_in_batches_types(self) -> None:
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csv_file:
+            csv_file.write('"KEY","value"\n"key_1","1"\n"key_2","True"\n"key_3","many"\n')
+        try:
+            # Values of a column have the same type whatever the batch they are read in
+            batches = list(read_csv_in_batches(csv_file.name, batch_size=1))
+            self.assertEqual([batch[0]['value'] for batch in batches], ['1', 'True', 'many'])
+        finally:
+            os.remove(csv_file.name)
+
+    def test_create_props_param(self) -> None:
+        params = create_props_param({'KEY': 'key_1', 'name': '1', 'sort_order:UNQUOTED': '1',
+                                     'is_view:UNQUOTED': 'False', 'score:UNQUOTED': '0.5', 'other:UNQUOTED': ''},
+                                    {'published_tag': 'tag'})
+        self.assertEqual(params, {'KEY': 'key_1', 'name': '1', 'sort_order': 1, 'is_view': False, 'score': 0.5,
+                                  'other': '', 'published_tag': 'tag'})
+
+    def test_get_node_label(self) -> None:
+        self.assertEqual(get_node_label(self._node_file), 'Column')
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csv_file:
+            csv_file.write('"KEY","LABEL"\n')
+        try:
+            self.assertIsNone(get_node_label(csv_file.name))
+        finally:
+            os.remove(csv_file.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,7 @@ from databuilder.models.table_metadata import ColumnMetadata
 from databuilder.models.type_metadata import (
     ArrayTypeMetadata, MapTypeMetadata, ScalarTypeMetadata, StructTypeMetadata,
 )
-from databuilder.utils.trino_complex_type_parser import parse_trino_type
+from databuilder.utils.trino_complex_type_parser import parse_trino_type, parse_trino_type_with_pyparsing
 
 
 class TestTrinoComplexTypeParser(unittest.TestCase):
@@ -297,6 +297,17 @@ class TestTrinoComplexTypeParser(unittest.TestCase):
         with self.assertRaises(ParseException):
             parse_trino_type(column.type, column.name, column)
 
+    def test_same_types_as_pyparsing_grammar(self) -> None:
+        type_strs = ['ROW("a" INT,"b" ARRAY(MAP(VARCHAR,DECIMAL(10, 2))))',
+                     'map( varchar , row(c double precision ,d timestamp(3) ) )',
+                     'array(10)',
+                     'row()']
+        for type_str in type_strs:
+            column = ColumnMetadata('col1', None, type_str, 0)
+            column.set_column_key(self.column_key)
+            self.assertEqual(parse_trino_type(column.type, column.name, column),
+                             parse_trino_type_with_pyparsing(column.type, column.name, column))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,76 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from collections import Counter, namedtuple
+
+from databuilder.utils.usage_aggregator import UsageAggregator
+
+UsageKey = namedtuple('UsageKey', ['table', 'email'])
+
+
+class TestUsageAggregator(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.spill_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def test_in_memory(self) -> None:
+        aggregator = UsageAggregator(spill_dir=self.spill_dir)
+        aggregator.add(('b', 'jane'))
+        aggregator.add(('a', 'john'), count=3)
+        aggregator.add(('b', 'jane'))
+
+        self.assertEqual(list(aggregator.items()), [(('a', 'john'), 3), (('b', 'jane'), 2)])
+        self.assertEqual(aggregator.spill_count, 0)
+        self.assertEqual(os.listdir(self.spill_dir), [])
+
+    def test_spill_and_merge(self) -> None:
+        rng = random.Random(42)
+        keys = [UsageKey(f'table_{rng.randint(0, 50)}', f'user_{rng.randint(0, 5)}') for _ in range(2000)]
+
+        aggregator = UsageAggregator(max_keys_in_memory=20, spill_dir=self.spill_dir, key_factory=UsageKey._make)
+        for key in keys:
+            aggregator.add(key)
+        self.assertGreater(aggregator.spill_count, 1)
+
+        items = list(aggregator.items())
+        self.assertEqual(items, sorted(Counter(keys).items()))
+        self.assertTrue(all(isinstance(key, UsageKey) for key, _ in items))
+
+        # Spilled files are removed once merged
+        self.assertEqual(os.listdir(self.spill_dir), [])
+
+    def test_null_key_field(self) -> None:
+        keys = [('b', 'jane'), ('a', None), ('a', 'john'), ('a', None), ('b', ''), ('a', 'john')]
+        expected = [(('a', 'john'), 2), (('a', None), 2), (('b', ''), 1), (('b', 'jane'), 1)]
+
+        aggregator = UsageAggregator(spill_dir=self.spill_dir)
+        for key in keys:
+            aggregator.add(key)
+        self.assertEqual(list(aggregator.items()), expected)
+
+        aggregator = UsageAggregator(max_keys_in_memory=2, spill_dir=self.spill_dir)
+        for key in keys:
+            aggregator.add(key)
+        self.assertGreater(aggregator.spill_count, 1)
+        self.assertEqual(list(aggregator.items()), expected)
+
+    def test_close_removes_spilled_files(self) -> None:
+        aggregator = UsageAggregator(max_keys_in_memory=1, spill_dir=self.spill_dir)
+        aggregator.add(('a', 'john'))
+        aggregator.add(('b', 'jane'))
+        self.assertEqual(len(os.listdir(self.spill_dir)), 1)
+
+        aggregator.close()
+        self.assertEqual(os.listdir(self.spill_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -36,7 +36,7 @@ from metadata_service.api.system import Neo4jDetailAPI, StatisticsMetricsAPI
 from metadata_service.api.table import (TableBadgeAPI, TableDashboardAPI,
                                         TableDescriptionAPI, TableDetailAPI,
                                         TableLineageAPI, TableOwnerAPI,
-                                        TableTagAPI)
+                                        TablesAPI, TableTagAPI)
 from metadata_service.api.tag import TagAPI
 from metadata_service.api.type_metadata import (TypeMetadataBadgeAPI,
                                                 TypeMetadataDescriptionAPI)
@@ -118,6 +118,7 @@ def create_app(*, config_module_class: str) -> Flask:
                      '/popular_resources/',
                      '/popular_resources/<path:user_id>')
     api.add_resource(TableDetailAPI, '/table/<path:table_uri>')
+    api.add_resource(TablesAPI, '/tables')
     api.add_resource(TableDescriptionAPI,
                      '/table/<path:id>/description')
     api.add_resource(TableTagAPI,
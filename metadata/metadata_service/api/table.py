@@ -9,6 +9,7 @@ from amundsen_common.entity.resource_type import ResourceType
 from amundsen_common.models.lineage import LineageSchema
 from amundsen_common.models.table import TableSchema
 from flasgger import swag_from
+from flask import current_app as app
 from flask import request
 from flask_restful import Resource, reqparse
 
@@ -39,6 +40,35 @@ class TableDetailAPI(Resource):
             return {'message': 'table_uri {} does not exist'.format(table_uri)}, HTTPStatus.NOT_FOUND
 
 
+class TablesAPI(Resource):
+    """
+    Tables API to get the details of many tables at once
+    """
+
+    def __init__(self) -> None:
+        self.client = get_proxy_client()
+
+    @swag_from('swagger_doc/table/tables_post.yml')
+    def post(self) -> Iterable[Union[Mapping, int, None]]:
+        """
+        Gets the details of the tables whose URIs are passed in the request body, e.g. {"table_uris": [...]}
+        :return: The tables found, and the URIs of the tables not found
+        """
+        try:
+            table_uris = json.loads(request.data).get('table_uris')
+        except (ValueError, AttributeError):
+            table_uris = None
+        if not isinstance(table_uris, list) or not all(isinstance(table_uri, str) for table_uri in table_uris):
+            return {'message': 'table_uris must be a list of table URIs'}, HTTPStatus.BAD_REQUEST
+
+        max_size = app.config['TABLES_BATCH_MAX_SIZE']
+        if len(table_uris) > max_size:
+            return {'message': f'At most {max_size} tables can be requested at once'}, HTTPStatus.BAD_REQUEST
+
+        tables, not_found = self.client.get_tables(table_uris=table_uris)
+        return {'tables': TableSchema().dump(tables, many=True), 'not_found': not_found}, HTTPStatus.OK
+
+
 class TableLineageAPI(Resource):
     def __init__(self) -> None:
         self.client = get_proxy_client()
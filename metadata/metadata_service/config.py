@@ -4,6 +4,7 @@
 import distutils.util
 import logging
 import os
+import tempfile
 from typing import Any, Callable, Dict, List, Optional, Set  # noqa: F401
 
 import boto3
@@ -34,6 +35,20 @@ PROXY_CLIS = {
 }
 
 IS_STATSD_ON = 'IS_STATSD_ON'
+
+# PROXY_CACHE configuration keys
+PROXY_CACHE_ENABLED = 'PROXY_CACHE_ENABLED'
+PROXY_CACHE_MAX_SIZE = 'PROXY_CACHE_MAX_SIZE'
+PROXY_CACHE_TTL_SEC = 'PROXY_CACHE_TTL_SEC'
+PROXY_CACHE_SHARED_BACKEND_OPTIONS = 'PROXY_CACHE_SHARED_BACKEND_OPTIONS'
+PROXY_CACHE_PUBLISH_CHECK_INTERVAL_SEC = 'PROXY_CACHE_PUBLISH_CHECK_INTERVAL_SEC'
+
+# POPULAR_RESOURCES_RANKING configuration keys
+POPULAR_RESOURCES_RANKING_ENABLED = 'POPULAR_RESOURCES_RANKING_ENABLED'
+POPULAR_RESOURCES_RANKING_PATH = 'POPULAR_RESOURCES_RANKING_PATH'
+POPULAR_RESOURCES_RANKING_MAX_ENTRIES = 'POPULAR_RESOURCES_RANKING_MAX_ENTRIES'
+POPULAR_RESOURCES_RANKING_REFRESH_INTERVAL_SEC = 'POPULAR_RESOURCES_RANKING_REFRESH_INTERVAL_SEC'
+POPULAR_RESOURCES_RANKING_CHECK_INTERVAL_SEC = 'POPULAR_RESOURCES_RANKING_CHECK_INTERVAL_SEC'
 USER_OTHER_KEYS = 'USER_OTHER_KEYS'
 
 
@@ -63,6 +78,21 @@ class Config:
 
     IS_STATSD_ON = False
 
+    # Whether tables, dashboards, features and users returned by the proxy are cached
+    PROXY_CACHE_ENABLED = False
+    # Number of resources kept in the in-process cache
+    PROXY_CACHE_MAX_SIZE = 10000
+    # Number of seconds resources are cached for
+    PROXY_CACHE_TTL_SEC = 3600
+    # Beaker cache options of a cache shared by the processes, replacing the in-process cache,
+    # e.g. {'cache.type': 'ext:memcached', 'cache.url': 'localhost:11211'}
+    PROXY_CACHE_SHARED_BACKEND_OPTIONS = None  # type: Optional[Dict[str, Any]]
+    # Number of seconds between checks of the last publish, invalidating the resources cached before it
+    PROXY_CACHE_PUBLISH_CHECK_INTERVAL_SEC = 60
+
+    # Maximum number of tables fetched by one POST /tables request
+    TABLES_BATCH_MAX_SIZE = 100
+
     # Configurable dictionary to influence format of column statistics displayed in UI
     STATISTICS_FORMAT_SPEC: Dict[str, Dict] = {}
 
@@ -83,6 +113,18 @@ class Config:
     POPULAR_TABLE_MINIMUM_READER_COUNT = None
     POPULAR_RESOURCES_MINIMUM_READER_COUNT = 10  # type: int
 
+    # Whether the global popular tables and dashboards are served from a ranking materialized in the background,
+    # with the Neo4j and MySQL proxies
+    POPULAR_RESOURCES_RANKING_ENABLED = False
+    # File of the ranking, shared by the processes of the host
+    POPULAR_RESOURCES_RANKING_PATH = os.path.join(tempfile.gettempdir(), 'amundsen_popular_resources_ranking.json')
+    # Number of resources of each type ranked, larger popular resources requests are computed by the proxy
+    POPULAR_RESOURCES_RANKING_MAX_ENTRIES = 100
+    # Number of seconds after which the ranking is refreshed, besides after each publish
+    POPULAR_RESOURCES_RANKING_REFRESH_INTERVAL_SEC = 3600
+    # Number of seconds between checks of the ranking and of the last publish
+    POPULAR_RESOURCES_RANKING_CHECK_INTERVAL_SEC = 60
+
     # List of regexes which will exclude certain parameters from appearing as Programmatic Descriptions
     PROGRAMMATIC_DESCRIPTIONS_EXCLUDE_FILTERS = []  # type: list
 
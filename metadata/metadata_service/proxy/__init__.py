@@ -1,6 +1,7 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import logging
 from threading import Lock
 
 from flask import current_app
@@ -8,6 +9,11 @@ from werkzeug.utils import import_string
 
 from metadata_service import config
 from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.proxy.cache import create_proxy_cache
+from metadata_service.proxy.popular_ranking import \
+    create_popular_resources_ranking
+
+LOGGER = logging.getLogger(__name__)
 
 _proxy_client = None
 _proxy_client_lock = Lock()
@@ -48,4 +54,15 @@ def get_proxy_client() -> BaseProxy:
                                    database_name=database_name,
                                    client_kwargs=client_kwargs)
 
+            if current_app.config.get(config.PROXY_CACHE_ENABLED):
+                create_proxy_cache(current_app.config).install(_proxy_client)
+
+            if current_app.config.get(config.POPULAR_RESOURCES_RANKING_ENABLED):
+                if hasattr(_proxy_client, '_get_global_popular_resources_uris'):
+                    popular_resources_ranking = create_popular_resources_ranking(current_app.config)
+                    popular_resources_ranking.install(_proxy_client)
+                    popular_resources_ranking.start(current_app._get_current_object())  # type: ignore
+                else:
+                    LOGGER.warning('%s does not support the popular resources ranking', type(_proxy_client).__name__)
+
     return _proxy_client
@@ -18,6 +18,7 @@ from flask import current_app as app
 from metadata_service.entity.dashboard_detail import \
     DashboardDetail as DashboardDetailEntity
 from metadata_service.entity.description import Description
+from metadata_service.exception import NotFoundException
 from metadata_service.util import UserResourceRel
 
 
@@ -69,6 +70,22 @@ class BaseProxy(metaclass=ABCMeta):
     def get_table(self, *, table_uri: str) -> Table:
         pass
 
+    def get_tables(self, *, table_uris: List[str]) -> Tuple[List[Table], List[str]]:
+        """
+        Fetches the tables one by one with get_table. Proxies able to fetch many tables in a constant number of
+        queries override it.
+        :param table_uris: Table URIs
+        :return: The tables found, in the order of the table URIs, and the table URIs not found
+        """
+        tables = []
+        not_found = []
+        for table_uri in dict.fromkeys(table_uris):
+            try:
+                tables.append(self.get_table(table_uri=table_uri))
+            except NotFoundException:
+                not_found.append(table_uri)
+        return tables, not_found
+
     @abstractmethod
     def delete_owner(self, *, table_uri: str, owner: str) -> None:
         pass
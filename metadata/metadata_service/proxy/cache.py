@@ -0,0 +1,350 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import inspect
+import logging
+import pickle
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from functools import wraps
+from typing import (Any, Callable, Dict, List, Mapping, Optional,  # noqa: F401
+                    Tuple)
+
+from amundsen_common.entity.resource_type import ResourceType
+from beaker.cache import CacheManager
+from beaker.util import parse_cache_config_options
+
+from metadata_service import config
+from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.proxy.statsd_utilities import _get_statsd_client
+
+LOGGER = logging.getLogger(__name__)
+
+# Proxy methods served from the cache, and the type of the resource they return
+CACHED_METHODS = {
+    'get_table': ResourceType.Table,
+    'get_dashboard': ResourceType.Dashboard,
+    'get_feature': ResourceType.Feature,
+    'get_user': ResourceType.User,
+}
+
+
+def _get_table_uri(key: str) -> str:
+    """
+    Returns the table URI of a column or type metadata key,
+    e.g. hive://gold.schema/table for hive://gold.schema/table/column/type/column
+    """
+    database, path = key.split('://', 1)
+    return f'{database}://' + '/'.join(path.split('/')[:2])
+
+
+def _table_resources(arguments: Mapping[str, Any]) -> List[Tuple[ResourceType, str]]:
+    return [(ResourceType.Table, arguments['table_uri'])]
+
+
+def _type_metadata_resources(arguments: Mapping[str, Any]) -> List[Tuple[ResourceType, str]]:
+    return [(ResourceType.Table, _get_table_uri(arguments['type_metadata_key']))]
+
+
+def _dashboard_resources(arguments: Mapping[str, Any]) -> List[Tuple[ResourceType, str]]:
+    return [(ResourceType.Dashboard, arguments['id'])]
+
+
+def _user_resources(arguments: Mapping[str, Any]) -> List[Tuple[ResourceType, str]]:
+    # Users are fetched by user id or email
+    user = arguments['user']
+    return [(ResourceType.User, user_id) for user_id in {user.user_id, user.email} if user_id]
+
+
+def _typed_resources(arguments: Mapping[str, Any]) -> List[Tuple[ResourceType, str]]:
+    resource_id = arguments['id'] if 'id' in arguments else arguments['uri']
+    resource_type = arguments['resource_type']
+    if resource_type in (ResourceType.Column, ResourceType.Type_Metadata):
+        return [(ResourceType.Table, _get_table_uri(resource_id))]
+    return [(resource_type, resource_id)]
+
+
+# Proxy methods writing metadata, and the function returning the cached resources they change from their arguments
+INVALIDATING_METHODS = {
+    'create_update_user': _user_resources,
+    'add_owner': _table_resources,
+    'delete_owner': _table_resources,
+    'put_table_description': _table_resources,
+    'put_column_description': _table_resources,
+    'put_type_metadata_description': _type_metadata_resources,
+    'put_dashboard_description': _dashboard_resources,
+    'add_tag': _typed_resources,
+    'delete_tag': _typed_resources,
+    'add_badge': _typed_resources,
+    'delete_badge': _typed_resources,
+    'put_resource_description': _typed_resources,
+    'add_resource_owner': _typed_resources,
+    'delete_resource_owner': _typed_resources,
+}  # type: Dict[str, Callable[[Mapping[str, Any]], List[Tuple[ResourceType, str]]]]
+
+
+class CacheBackend(metaclass=ABCMeta):
+    """
+    Stores serialized resources by key
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    In-process cache keeping the max_size most recently used resources, for at most ttl_sec seconds
+    """
+
+    def __init__(self, *, max_size: int, ttl_sec: int) -> None:
+        self._max_size = max_size
+        self._ttl_sec = ttl_sec
+        self._entries = OrderedDict()  # type: OrderedDict[str, Tuple[float, bytes]]
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expiry, value = entry
+            if expiry < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + self._ttl_sec, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class BeakerCacheBackend(CacheBackend):
+    """
+    Cache shared by the metadata service processes, on any backend supported by beaker, e.g. memcached or redis
+    """
+
+    def __init__(self, *, options: Dict[str, Any], ttl_sec: int) -> None:
+        self._cache = CacheManager(**parse_cache_config_options(options)).get_cache('proxy_cache', expire=ttl_sec)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._cache.get(key)
+        except KeyError:
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        self._cache.put(key, value)
+
+    def delete(self, key: str) -> None:
+        self._cache.remove_value(key)
+
+
+class ProxyCache:
+    """
+    Read-through cache in front of the proxy methods returning a single table, dashboard, feature or user, and of
+    get_tables, sharing the tables cached by get_table.
+
+    Writes through the proxy invalidate the resources they change. Resources are cached per publish watermark
+    (get_latest_updated_ts), checked at most every publish_check_interval_sec seconds, so that resources cached
+    before a databuilder publish are not served after it.
+
+    Hits and misses of each method are counted, and timed, with statsd when IS_STATSD_ON is set, e.g.
+    metadata_service.proxy.cache.get_table.hit and metadata_service.proxy.cache.get_table.miss.
+    """
+
+    def __init__(self, *, backend: CacheBackend, publish_check_interval_sec: int) -> None:
+        self._backend = backend
+        self._publish_check_interval_sec = publish_check_interval_sec
+        self._publish_watermark = None  # type: Any
+        self._publish_checked_at = 0.0
+        self._lock = threading.Lock()
+        # Number of invalidations, so that resources read while they are invalidated are not cached
+        self._invalidation_count = 0
+
+    def install(self, proxy: BaseProxy) -> BaseProxy:
+        """
+        Serves the cached methods of the proxy from the cache, and makes its write methods invalidate it
+        :param proxy:
+        :return: The proxy
+        """
+        get_latest_updated_ts = proxy.get_latest_updated_ts
+        for name, resource_type in CACHED_METHODS.items():
+            setattr(proxy, name, self._read_through(name, resource_type, getattr(proxy, name),
+                                                    get_latest_updated_ts))
+        setattr(proxy, 'get_tables', self._read_through_tables(proxy.get_tables, get_latest_updated_ts))
+        for name, get_resources in INVALIDATING_METHODS.items():
+            setattr(proxy, name, self._invalidating(getattr(proxy, name), get_resources, get_latest_updated_ts))
+        return proxy
+
+    def _get_generation(self, get_latest_updated_ts: Callable[[], Any]) -> str:
+        now = time.time()
+        with self._lock:
+            check = now - self._publish_checked_at >= self._publish_check_interval_sec
+            if check:
+                self._publish_checked_at = now
+
+        if check:
+            try:
+                publish_watermark = get_latest_updated_ts()
+            except Exception:
+                LOGGER.warning('Failed to get the latest updated timestamp', exc_info=True)
+            else:
+                if publish_watermark != self._publish_watermark:
+                    LOGGER.info('Invalidating the proxy cache, last publish changed from %s to %s',
+                                self._publish_watermark, publish_watermark)
+                    self._publish_watermark = publish_watermark
+        return str(self._publish_watermark)
+
+    def _get_key(self, generation: str, resource_type: ResourceType, resource_id: str) -> str:
+        return f'{generation}:{resource_type.name}:{resource_id}'
+
+    def _read_through(self,
+                      name: str,
+                      resource_type: ResourceType,
+                      method: Callable,
+                      get_latest_updated_ts: Callable[[], Any]) -> Callable:
+        signature = inspect.signature(method)
+
+        @wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            arguments = signature.bind(*args, **kwargs).arguments
+            if len(arguments) != 1:
+                return method(*args, **kwargs)
+
+            start = time.time()
+            key = self._get_key(self._get_generation(get_latest_updated_ts), resource_type,
+                                str(next(iter(arguments.values()))))
+            cached = self._backend.get(key)
+            if cached is not None:
+                value = pickle.loads(cached)
+                self._emit_metrics(name, 'hit', start)
+                return value
+
+            invalidation_count = self._invalidation_count
+            value = method(*args, **kwargs)
+            if value is not None and invalidation_count == self._invalidation_count:
+                self._backend.set(key, pickle.dumps(value))
+            self._emit_metrics(name, 'miss', start)
+            return value
+
+        return wrapper
+
+    def _read_through_tables(self, method: Callable, get_latest_updated_ts: Callable[[], Any]) -> Callable:
+        """
+        Serves get_tables from the tables cached by get_table, fetching the tables not cached in one call
+        """
+
+        @wraps(method)
+        def wrapper(*, table_uris: List[str]) -> Tuple[List[Any], List[str]]:
+            start = time.time()
+            generation = self._get_generation(get_latest_updated_ts)
+            tables_by_uri = {}  # type: Dict[str, Any]
+            missing_table_uris = []
+            for table_uri in dict.fromkeys(table_uris):
+                cached = self._backend.get(self._get_key(generation, ResourceType.Table, table_uri))
+                if cached is None:
+                    missing_table_uris.append(table_uri)
+                else:
+                    tables_by_uri[table_uri] = pickle.loads(cached)
+
+            hit_count = len(tables_by_uri)
+            not_found = []  # type: List[str]
+            if missing_table_uris:
+                invalidation_count = self._invalidation_count
+                tables, not_found = method(table_uris=missing_table_uris)
+                # Tables are returned in the order of the table URIs found
+                not_found_table_uris = set(not_found)
+                found_table_uris = [table_uri for table_uri in missing_table_uris
+                                    if table_uri not in not_found_table_uris]
+                for table_uri, table in zip(found_table_uris, tables):
+                    tables_by_uri[table_uri] = table
+                    if invalidation_count == self._invalidation_count:
+                        self._backend.set(self._get_key(generation, ResourceType.Table, table_uri), pickle.dumps(table))
+
+            self._emit_metrics('get_tables', 'miss' if missing_table_uris else 'hit', start,
+                               hit_count=hit_count, miss_count=len(missing_table_uris))
+            return [tables_by_uri[table_uri] for table_uri in dict.fromkeys(table_uris)
+                    if table_uri in tables_by_uri], not_found
+
+        return wrapper
+
+    def _invalidating(self,
+                      method: Callable,
+                      get_resources: Callable[[Mapping[str, Any]], List[Tuple[ResourceType, str]]],
+                      get_latest_updated_ts: Callable[[], Any]) -> Callable:
+        signature = inspect.signature(method)
+
+        @wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return method(*args, **kwargs)
+            finally:
+                # Also after failures, which may have partially written the resources
+                self.invalidate(get_resources(signature.bind(*args, **kwargs).arguments), get_latest_updated_ts)
+
+        return wrapper
+
+    def invalidate(self, resources: List[Tuple[ResourceType, str]], get_latest_updated_ts: Callable[[], Any]) -> None:
+        """
+        Removes the resources from the cache
+        :param resources: (resource type, resource id) pairs
+        :param get_latest_updated_ts:
+        :return:
+        """
+        with self._lock:
+            self._invalidation_count += 1
+        generation = self._get_generation(get_latest_updated_ts)
+        for resource_type, resource_id in resources:
+            self._backend.delete(self._get_key(generation, resource_type, str(resource_id)))
+
+    @staticmethod
+    def _emit_metrics(name: str, result: str, start: float, hit_count: Optional[int] = None,
+                      miss_count: Optional[int] = None) -> None:
+        """
+        Counts the call as a hit or a miss, or its resources when hit_count and miss_count are given, and times it
+        """
+        statsd_client = _get_statsd_client(prefix=__name__)
+        if statsd_client:
+            if hit_count is None or miss_count is None:
+                statsd_client.incr(f'{name}.{result}')
+            else:
+                statsd_client.incr(f'{name}.hit', hit_count)
+                statsd_client.incr(f'{name}.miss', miss_count)
+            statsd_client.timing(f'{name}.{result}', (time.time() - start) * 1000)
+
+
+def create_proxy_cache(app_config: Mapping[str, Any]) -> ProxyCache:
+    """
+    Creates the proxy cache from the app config: shared by the processes if PROXY_CACHE_SHARED_BACKEND_OPTIONS is
+    set, in-process otherwise
+    :param app_config:
+    :return:
+    """
+    ttl_sec = app_config[config.PROXY_CACHE_TTL_SEC]
+    shared_backend_options = app_config.get(config.PROXY_CACHE_SHARED_BACKEND_OPTIONS)
+    if shared_backend_options:
+        backend = BeakerCacheBackend(options=shared_backend_options, ttl_sec=ttl_sec)  # type: CacheBackend
+    else:
+        backend = LRUCacheBackend(max_size=app_config[config.PROXY_CACHE_MAX_SIZE], ttl_sec=ttl_sec)
+    return ProxyCache(backend=backend,
+                      publish_check_interval_sec=app_config[config.PROXY_CACHE_PUBLISH_CHECK_INTERVAL_SEC])
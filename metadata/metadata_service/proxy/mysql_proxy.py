@@ -60,7 +60,8 @@ from beaker.cache import CacheManager
 from beaker.util import parse_cache_config_options
 from flask import current_app as app
 from sqlalchemy import func, literal
-from sqlalchemy.orm import Session, load_only, subqueryload
+from sqlalchemy.orm import (Session, joinedload, load_only, selectinload,
+                            subqueryload)
 
 from metadata_service.client.rds_client import RDSClient
 from metadata_service.entity.dashboard_detail import \
@@ -136,7 +137,9 @@ class MySQLProxy(BaseProxy):
         :return:
         """
         with self.client.create_session() as session:
-            user_record = session.query(RDSUser).filter(RDSUser.rk == id).first()
+            user_record = session.query(RDSUser).filter(RDSUser.rk == id).options(
+                joinedload(RDSUser.manager)
+            ).first()
             if not user_record:
                 return user_record
 
@@ -220,30 +223,100 @@ class MySQLProxy(BaseProxy):
             # usage
             readers = self._get_table_readers(session=session, table_uri=table_uri)
 
-        table_result = Table(database=table['database'].name,
-                             cluster=table['cluster'].name,
-                             schema=table['schema'].name,
-                             name=table['table'].name,
-                             tags=table['tags'],
-                             badges=table['badges'],
-                             description=table['description'].description if table['description'] else None,
-                             columns=cols,
-                             owners=table['owners'],
-                             table_readers=readers,
-                             watermarks=table['watermarks'],
-                             table_writer=table['table_writer'],
-                             last_updated_timestamp=table['last_updated_timestamp'],
-                             source=table['source'],
-                             is_view=table['table'].is_view,
-                             programmatic_descriptions=table['programmatic_descriptions'])
-        return table_result
+        return self._build_table(table=table, cols=cols, readers=readers)
+
+    @timer_with_counter
+    def get_tables(self, *, table_uris: List[str]) -> Tuple[List[Table], List[str]]:
+        """
+        Retrieve the details of many tables, with IN queries instead of the queries of get_table for each table.
+        :param table_uris:
+        :return: The tables found, in the order of the table uris, and the table uris not found
+        """
+        table_uris = list(dict.fromkeys(table_uris))
+        if not table_uris:
+            return [], []
+
+        with self.client.create_session() as session:
+            tables_by_uri = self._get_tables_metadata(session=session, table_uris=table_uris)
+            if not tables_by_uri:
+                return [], table_uris
+
+            found_table_uris = list(tables_by_uri)
+            cols_by_uri = self._get_tables_columns(session=session, table_uris=found_table_uris)
+            readers_by_uri = self._get_tables_readers(session=session, table_uris=found_table_uris)
+
+        table_results = []
+        not_found = []
+        for table_uri in table_uris:
+            if table_uri not in tables_by_uri:
+                not_found.append(table_uri)
+                continue
+            table_results.append(self._build_table(table=tables_by_uri[table_uri],
+                                                   cols=cols_by_uri.get(table_uri, []),
+                                                   readers=readers_by_uri.get(table_uri, [])))
+        return table_results, not_found
+
+    @staticmethod
+    def _build_table(*, table: Dict[str, Any], cols: List[Column], readers: List[Reader]) -> Table:
+        return Table(database=table['database'].name,
+                     cluster=table['cluster'].name,
+                     schema=table['schema'].name,
+                     name=table['table'].name,
+                     tags=table['tags'],
+                     badges=table['badges'],
+                     description=table['description'].description if table['description'] else None,
+                     columns=cols,
+                     owners=table['owners'],
+                     table_readers=readers,
+                     watermarks=table['watermarks'],
+                     table_writer=table['table_writer'],
+                     last_updated_timestamp=table['last_updated_timestamp'],
+                     source=table['source'],
+                     is_view=table['table'].is_view,
+                     programmatic_descriptions=table['programmatic_descriptions'])
 
     @timer_with_counter
     def _get_table_metadata(self, *, session: Session, table_uri: str) -> Optional[Dict[str, Any]]:
-        table = session.query(RDSTable).filter(RDSTable.rk == table_uri).first()
+        # the table joined with its single-valued relationships, each collection loaded with its own statement
+        # so that the collections do not multiply the joined rows
+        table = session.query(RDSTable).filter(RDSTable.rk == table_uri).options(
+            joinedload(RDSTable.schema).joinedload(RDSSchema.cluster).joinedload(RDSCluster.database),
+            joinedload(RDSTable.application),
+            joinedload(RDSTable.timestamp),
+            joinedload(RDSTable.source),
+            joinedload(RDSTable.description),
+            selectinload(RDSTable.watermarks),
+            selectinload(RDSTable.tags),
+            selectinload(RDSTable.badges),
+            selectinload(RDSTable.owners),
+            selectinload(RDSTable.programmatic_descriptions)
+        ).first()
         if not table:
             return None
 
+        return self._build_table_metadata(table)
+
+    @timer_with_counter
+    def _get_tables_metadata(self, *, session: Session, table_uris: List[str]) -> Dict[str, Dict[str, Any]]:
+        query = session.query(RDSTable).filter(RDSTable.rk.in_(table_uris))
+
+        # every relationship of the tables is loaded with one query for all the tables
+        query = query.options(
+            subqueryload(RDSTable.schema).subqueryload(RDSSchema.cluster).subqueryload(RDSCluster.database),
+            subqueryload(RDSTable.watermarks),
+            subqueryload(RDSTable.tags),
+            subqueryload(RDSTable.badges),
+            subqueryload(RDSTable.application),
+            subqueryload(RDSTable.timestamp),
+            subqueryload(RDSTable.owners),
+            subqueryload(RDSTable.source),
+            subqueryload(RDSTable.description),
+            subqueryload(RDSTable.programmatic_descriptions)
+        )
+
+        return {table.rk: self._build_table_metadata(table) for table in query.all()}
+
+    def _build_table_metadata(self, table: RDSTable) -> Dict[str, Any]:
         schema = table.schema
         cluster = schema.cluster
         database = cluster.database
@@ -331,42 +404,59 @@ class MySQLProxy(BaseProxy):
 
         # description, stats, badges
         query = query.options(
-            subqueryload(RDSColumn.description),
-            subqueryload(RDSColumn.stats),
-            subqueryload(RDSColumn.badges)
+            joinedload(RDSColumn.description),
+            selectinload(RDSColumn.stats),
+            selectinload(RDSColumn.badges)
         )
 
         columns = query.all()
 
-        col_results = []
-        for column in columns:
-            col_stat_results = []
-            for stat in column.stats:
-                col_stat_result = Stat(
-                    stat_type=stat.stat_type,
-                    stat_val=stat.stat_val,
-                    start_epoch=int(float(stat.start_epoch)),
-                    end_epoch=int(float(stat.end_epoch))
-                )
-                col_stat_results.append(col_stat_result)
+        return [self._build_column(column) for column in columns]
 
-            col_badge_results = []
-            for badge in column.badges:
-                col_badge_results.append(
-                    TableBadge(badge_name=badge.rk, category=badge.category)
-                )
+    @timer_with_counter
+    def _get_tables_columns(self, *, session: Session, table_uris: List[str]) -> Dict[str, List[Column]]:
+        # column
+        query = session.query(RDSColumn).filter(RDSColumn.table_rk.in_(table_uris))
+
+        # description, stats, badges
+        query = query.options(
+            subqueryload(RDSColumn.description),
+            subqueryload(RDSColumn.stats),
+            subqueryload(RDSColumn.badges)
+        ).order_by(RDSColumn.table_rk, RDSColumn.sort_order)
 
-            col_result = Column(name=column.name,
-                                description=column.description.description
-                                if column.description else None,
-                                col_type=column.type,
-                                sort_order=int(column.sort_order),
-                                stats=col_stat_results,
-                                badges=col_badge_results)
-            col_results.append(col_result)
+        col_results = {}  # type: Dict[str, List[Column]]
+        for column in query.all():
+            col_results.setdefault(column.table_rk, []).append(self._build_column(column))
 
         return col_results
 
+    @staticmethod
+    def _build_column(column: RDSColumn) -> Column:
+        col_stat_results = []
+        for stat in column.stats:
+            col_stat_result = Stat(
+                stat_type=stat.stat_type,
+                stat_val=stat.stat_val,
+                start_epoch=int(float(stat.start_epoch)),
+                end_epoch=int(float(stat.end_epoch))
+            )
+            col_stat_results.append(col_stat_result)
+
+        col_badge_results = []
+        for badge in column.badges:
+            col_badge_results.append(
+                TableBadge(badge_name=badge.rk, category=badge.category)
+            )
+
+        return Column(name=column.name,
+                      description=column.description.description
+                      if column.description else None,
+                      col_type=column.type,
+                      sort_order=int(column.sort_order),
+                      stats=col_stat_results,
+                      badges=col_badge_results)
+
     @timer_with_counter
     def _get_table_readers(self, *, session: Session, table_uri: str) -> List[Reader]:
         readers = session.query(RDSTableUsage).filter(
@@ -381,6 +471,21 @@ class MySQLProxy(BaseProxy):
 
         return reader_results
 
+    @timer_with_counter
+    def _get_tables_readers(self, *, session: Session, table_uris: List[str]) -> Dict[str, List[Reader]]:
+        # the readers of get_table for each table, in one UNION ALL query
+        queries = [session.query(RDSTableUsage).filter(
+            RDSTableUsage.table_rk == table_uri
+        ).order_by(RDSTableUsage.read_count).limit(5) for table_uri in table_uris]
+
+        reader_results = {}  # type: Dict[str, List[Reader]]
+        for reader in queries[0].union_all(*queries[1:]).all():
+            reader_result = Reader(user=User(email=reader.user_rk),
+                                   read_count=reader.read_count)
+            reader_results.setdefault(reader.table_rk, []).append(reader_result)
+
+        return reader_results
+
     @timer_with_counter
     def delete_owner(self, *, table_uri: str, owner: str) -> None:
         """
@@ -1265,7 +1370,17 @@ class MySQLProxy(BaseProxy):
 
     @timer_with_counter
     def _get_dashboard_metadata(self, session: Session, id: str) -> Optional[Dict[str, Any]]:
-        dashboard = session.query(RDSDashboard).filter(RDSDashboard.rk == id).first()
+        # the dashboard joined with its single-valued relationships, each collection loaded with its own statement
+        dashboard = session.query(RDSDashboard).filter(RDSDashboard.rk == id).options(
+            joinedload(RDSDashboard.group).joinedload(RDSDashboardGroup.cluster),
+            joinedload(RDSDashboard.description),
+            joinedload(RDSDashboard.timestamp),
+            selectinload(RDSDashboard.execution),
+            selectinload(RDSDashboard.owners),
+            selectinload(RDSDashboard.tags),
+            selectinload(RDSDashboard.badges),
+            selectinload(RDSDashboard.usage).load_only(RDSDashboardUsage.read_count)
+        ).first()
         if not dashboard:
             return None
 
@@ -1308,7 +1423,7 @@ class MySQLProxy(BaseProxy):
     @timer_with_counter
     def _get_dashboard_queries(self, session: Session, id: str) -> Dict[str, Any]:
         dashboard_queries = session.query(RDSDashboardQuery).filter(RDSDashboardQuery.dashboard_rk == id).options(
-            subqueryload(RDSDashboardQuery.charts).options(
+            joinedload(RDSDashboardQuery.charts).options(
                 load_only(RDSDashboardChart.name)
             )
         ).all()
@@ -1328,14 +1443,14 @@ class MySQLProxy(BaseProxy):
 
         tables_query = session.query(RDSTable).filter(RDSTable.rk.in_(table_subquery)).options(
             load_only(RDSTable.rk, RDSTable.name, RDSTable.schema_rk),
-            subqueryload(RDSTable.description).options(
+            joinedload(RDSTable.description).options(
                 load_only(RDSTableDescription.description)
             ),
-            subqueryload(RDSTable.schema).options(
+            joinedload(RDSTable.schema).options(
                 load_only(RDSSchema.name, RDSSchema.cluster_rk),
-                subqueryload(RDSSchema.cluster).options(
+                joinedload(RDSSchema.cluster).options(
                     load_only(RDSCluster.name, RDSCluster.database_rk),
-                    subqueryload(RDSCluster.database).options(
+                    joinedload(RDSCluster.database).options(
                         load_only(RDSDatabase.name)
                     )
                 )
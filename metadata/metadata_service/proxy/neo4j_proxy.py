@@ -5,9 +5,10 @@ import logging
 import re
 import textwrap
 import time
+from concurrent.futures import ThreadPoolExecutor
 from random import randint
-from typing import (Any, Dict, Iterable, List, Optional, Tuple,  # noqa: F401
-                    Union, no_type_check)
+from typing import (Any, Callable, Dict, Iterable, List,  # noqa: F401
+                    Optional, Tuple, Union, no_type_check)
 
 import neo4j
 from amundsen_common.entity.resource_type import ResourceType, to_resource_type
@@ -26,7 +27,7 @@ from amundsen_common.models.user import User as UserEntity
 from amundsen_common.models.user import UserSchema
 from beaker.cache import CacheManager
 from beaker.util import parse_cache_config_options
-from flask import current_app, has_app_context
+from flask import Flask, current_app, has_app_context
 from neo4j import GraphDatabase, Record, Transaction  # noqa: F401
 from neo4j.api import (SECURITY_TYPE_SECURE,
                        SECURITY_TYPE_SELF_SIGNED_CERTIFICATE, parse_neo4j_uri)
@@ -53,6 +54,9 @@ CREATED_EPOCH_MS = 'publisher_created_epoch_ms'
 LAST_UPDATED_EPOCH_MS = 'publisher_last_updated_epoch_ms'
 PUBLISHED_TAG_PROPERTY_NAME = 'published_tag'
 
+# Key of PROXY_CLIENT_KWARGS setting the number of threads running the sub-queries of get_table concurrently
+GET_TABLE_WORKERS = 'get_table_workers'
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -95,6 +99,7 @@ class Neo4jProxy(BaseProxy):
                  encrypted: bool = False,
                  validate_ssl: bool = False,
                  database_name: str = neo4j.DEFAULT_DATABASE,
+                 client_kwargs: Dict = dict(),
                  **kwargs: dict) -> None:
         """
         There's currently no request timeout from client side where server
@@ -106,11 +111,18 @@ class Neo4jProxy(BaseProxy):
         words, connection lifetime longer than this value won't be reused and closed on garbage collection. This
         value needs to be smaller than surrounding network environment's timeout.
         :param database_name: the neo4j database to be queried if different from the default
+        :param client_kwargs: with get_table_workers above 1, the sub-queries of get_table run concurrently on that
+        many threads, each with its own session from the driver's connection pool
         """
         endpoint = f'{host}:{port}'
 
         self._database_name = database_name
 
+        get_table_workers = client_kwargs.get(GET_TABLE_WORKERS, 1)
+        self._get_table_executor = ThreadPoolExecutor(max_workers=get_table_workers,
+                                                      thread_name_prefix='neo4j_get_table') \
+            if get_table_workers > 1 else None
+
         driver_args = {
             'uri': endpoint,
             'max_connection_lifetime': max_connection_lifetime_sec,
@@ -156,39 +168,97 @@ class Neo4jProxy(BaseProxy):
         :param table_uri: Table URI
         :return:  A Table object
         """
-        cols, last_neo4j_record = self._exec_col_query(table_uri)
+        (cols, last_neo4j_record), readers, owners, table_query_result, (joins, filters) = self._exec_table_sub_queries(
+            table_uri, [self._exec_col_query,
+                        self._exec_usage_query,
+                        self._exec_owners_query,
+                        self._exec_table_query,
+                        self._exec_table_query_query])
 
-        readers = self._exec_usage_query(table_uri)
-        owners = self._exec_owners_query(table_uri)
+        return self._build_table(last_neo4j_record, cols, readers, owners, table_query_result, joins, filters)
 
+    @timer_with_counter
+    def get_tables(self, *, table_uris: List[str]) -> Tuple[List[Table], List[str]]:
+        """
+        Fetches all the tables with one query per sub-query of get_table, instead of one per table
+        :param table_uris: Table URIs
+        :return: The tables found, in the order of the table URIs, and the table URIs not found
+        """
+        table_uris = list(dict.fromkeys(table_uris))
+        if not table_uris:
+            return [], []
+
+        cols_by_uri, readers_by_uri, owners_by_uri, table_query_results_by_uri, joins_filters_by_uri = \
+            self._exec_table_sub_queries(table_uris, [self._exec_col_query_by_table,
+                                                      self._exec_usage_query_by_table,
+                                                      self._exec_owners_query_by_table,
+                                                      self._exec_table_query_by_table,
+                                                      self._exec_table_query_query_by_table])
+
+        tables = []
+        not_found = []
+        for table_uri in table_uris:
+            if table_uri not in cols_by_uri:
+                not_found.append(table_uri)
+                continue
+            cols, last_neo4j_record = cols_by_uri[table_uri]
+            joins, filters = joins_filters_by_uri.get(table_uri, ([], []))
+            tables.append(self._build_table(last_neo4j_record, cols, readers_by_uri.get(table_uri, []),
+                                            owners_by_uri.get(table_uri, []), table_query_results_by_uri[table_uri],
+                                            joins, filters))
+        return tables, not_found
+
+    def _build_table(self, last_neo4j_record: Record, cols: List[Column], readers: List[Reader], owners: List[User],
+                     table_query_result: Tuple, joins: List[Dict], filters: List[Dict]) -> Table:
         wmk_results, table_writer, table_apps, timestamp_value, tags, source, \
-            badges, prog_descs, resource_reports = self._exec_table_query(table_uri)
-
-        joins, filters = self._exec_table_query_query(table_uri)
-
-        table = Table(database=last_neo4j_record['db']['name'],
-                      cluster=last_neo4j_record['clstr']['name'],
-                      schema=last_neo4j_record['schema']['name'],
-                      name=last_neo4j_record['tbl']['name'],
-                      tags=tags,
-                      badges=badges,
-                      description=self._safe_get(last_neo4j_record, 'tbl_dscrpt', 'description'),
-                      columns=cols,
-                      owners=owners,
-                      table_readers=readers,
-                      watermarks=wmk_results,
-                      table_writer=table_writer,
-                      table_apps=table_apps,
-                      last_updated_timestamp=timestamp_value,
-                      source=source,
-                      is_view=self._safe_get(last_neo4j_record, 'tbl', 'is_view'),
-                      programmatic_descriptions=prog_descs,
-                      common_joins=joins,
-                      common_filters=filters,
-                      resource_reports=resource_reports
-                      )
-
-        return table
+            badges, prog_descs, resource_reports = table_query_result
+
+        return Table(database=last_neo4j_record['db']['name'],
+                     cluster=last_neo4j_record['clstr']['name'],
+                     schema=last_neo4j_record['schema']['name'],
+                     name=last_neo4j_record['tbl']['name'],
+                     tags=tags,
+                     badges=badges,
+                     description=self._safe_get(last_neo4j_record, 'tbl_dscrpt', 'description'),
+                     columns=cols,
+                     owners=owners,
+                     table_readers=readers,
+                     watermarks=wmk_results,
+                     table_writer=table_writer,
+                     table_apps=table_apps,
+                     last_updated_timestamp=timestamp_value,
+                     source=source,
+                     is_view=self._safe_get(last_neo4j_record, 'tbl', 'is_view'),
+                     programmatic_descriptions=prog_descs,
+                     common_joins=joins,
+                     common_filters=filters,
+                     resource_reports=resource_reports
+                     )
+
+    def _exec_table_sub_queries(self, table_uris: Union[str, List[str]], sub_queries: List[Callable]) -> List[Any]:
+        """
+        Runs the independent sub-queries of tables, concurrently if get_table_workers is above 1.
+        Results, and the first exception, are returned in the order of the sub-queries, as when they run one after
+        another: a table that does not exist raises NotFoundException from the column query of get_table.
+        :param table_uris: Table URI of get_table, or table URIs of get_tables
+        :param sub_queries: Functions taking the table URI(s)
+        :return: The results of the sub-queries
+        """
+        if not self._get_table_executor:
+            return [sub_query(table_uris) for sub_query in sub_queries]
+
+        # Sub-queries emit their statsd metrics from the app context of the request
+        app = current_app._get_current_object() if has_app_context() else None  # type: ignore
+        futures = [self._get_table_executor.submit(self._exec_in_app_context, app, sub_query, table_uris)
+                   for sub_query in sub_queries]
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _exec_in_app_context(app: Optional[Flask], sub_query: Callable, table_uris: Union[str, List[str]]) -> Any:
+        if app is None:
+            return sub_query(table_uris)
+        with app.app_context():
+            return sub_query(table_uris)
 
     @timer_with_counter
     def _exec_col_query(self, table_uri: str) -> Tuple:
@@ -214,6 +284,45 @@ class Neo4jProxy(BaseProxy):
         tbl_col_neo4j_records = self._execute_cypher_query(
             statement=column_level_query, param_dict={'tbl_key': table_uri})
 
+        cols, last_neo4j_record = self._build_columns(tbl_col_neo4j_records)
+
+        if not cols:
+            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+
+        return cols, last_neo4j_record
+
+    @timer_with_counter
+    def _exec_col_query_by_table(self, table_uris: List[str]) -> Dict[str, Tuple]:
+        # Return Value: (Columns, Last Processed Record) by table URI, for the tables found
+
+        column_level_query = textwrap.dedent("""
+        UNWIND $tbl_keys AS tbl_key
+        MATCH (db:Database)-[:CLUSTER]->(clstr:Cluster)-[:SCHEMA]->(schema:Schema)
+        -[:TABLE]->(tbl:Table {key: tbl_key})-[:COLUMN]->(col:Column)
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
+        OPTIONAL MATCH (col:Column)-[:DESCRIPTION]->(col_dscrpt:Description)
+        OPTIONAL MATCH (col:Column)-[:STAT]->(stat:Stat)
+        OPTIONAL MATCH (col:Column)-[:HAS_BADGE]->(badge:Badge)
+        OPTIONAL MATCH (col:Column)-[:TYPE_METADATA]->(Type_Metadata)-[:SUBTYPE *0..]->(tm:Type_Metadata)
+        OPTIONAL MATCH (tm:Type_Metadata)-[:DESCRIPTION]->(tm_dscrpt:Description)
+        OPTIONAL MATCH (tm:Type_Metadata)-[:HAS_BADGE]->(tm_badge:Badge)
+        WITH tbl_key, db, clstr, schema, tbl, tbl_dscrpt, col, col_dscrpt, collect(distinct stat) as col_stats,
+        collect(distinct badge) as col_badges,
+        {node: tm, description: tm_dscrpt, badges: collect(distinct tm_badge)} as tm_results
+        RETURN tbl_key, db, clstr, schema, tbl, tbl_dscrpt, col, col_dscrpt, col_stats, col_badges,
+        collect(distinct tm_results) as col_type_metadata
+        ORDER BY tbl_key, col.sort_order;""")
+
+        tbl_col_neo4j_records = self._execute_cypher_query(
+            statement=column_level_query, param_dict={'tbl_keys': table_uris})
+
+        records_by_uri = {}  # type: Dict[str, List[Record]]
+        for tbl_col_neo4j_record in tbl_col_neo4j_records:
+            records_by_uri.setdefault(tbl_col_neo4j_record['tbl_key'], []).append(tbl_col_neo4j_record)
+
+        return {table_uri: self._build_columns(records) for table_uri, records in records_by_uri.items()}
+
+    def _build_columns(self, tbl_col_neo4j_records: Iterable[Record]) -> Tuple:
         cols = []
         last_neo4j_record = None
         for tbl_col_neo4j_record in tbl_col_neo4j_records:
@@ -243,9 +352,6 @@ class Neo4jProxy(BaseProxy):
 
             cols.append(col)
 
-        if not cols:
-            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
-
         return sorted(cols, key=lambda item: item.sort_order), last_neo4j_record
 
     def _get_type_metadata(self, type_metadata_results: List) -> Optional[TypeMetadata]:
@@ -332,6 +438,26 @@ class Neo4jProxy(BaseProxy):
 
         usage_neo4j_records = self._execute_cypher_query(statement=usage_query,
                                                          param_dict={'tbl_key': table_uri})
+        return self._build_readers(usage_neo4j_records)
+
+    @timer_with_counter
+    def _exec_usage_query_by_table(self, table_uris: List[str]) -> Dict[str, List[Reader]]:
+        # Return Value: List[Reader] by table URI, for the tables read
+
+        usage_query = textwrap.dedent("""\
+        UNWIND $tbl_keys AS tbl_key
+        MATCH (user:User)-[read:READ]->(table:Table {key: tbl_key})
+        WITH tbl_key, user, read
+        ORDER BY read.read_count DESC
+        RETURN tbl_key, collect({email: user.email, read_count: read.read_count})[0..5] as readers;
+        """)
+
+        usage_neo4j_records = self._execute_cypher_query(statement=usage_query,
+                                                         param_dict={'tbl_keys': table_uris})
+        return {usage_neo4j_record['tbl_key']: self._build_readers(usage_neo4j_record['readers'])
+                for usage_neo4j_record in usage_neo4j_records}
+
+    def _build_readers(self, usage_neo4j_records: Iterable[Any]) -> List[Reader]:
         readers = []  # type: List[Reader]
         for usage_neo4j_record in usage_neo4j_records:
             reader_data = self._get_user_details(user_id=usage_neo4j_record['email'])
@@ -353,8 +479,25 @@ class Neo4jProxy(BaseProxy):
 
         owners_neo4j_records = get_single_record(owners_neo4j_records)
 
+        return self._build_owners(owners_neo4j_records.get('owner_records', []))
+
+    @timer_with_counter
+    def _exec_owners_query_by_table(self, table_uris: List[str]) -> Dict[str, List[User]]:
+        # Return Value: List[User] by table URI, for the tables owned
+        owners_query = textwrap.dedent("""
+            UNWIND $tbl_keys AS tbl_key
+            MATCH (owner:User)<-[:OWNER]-(tbl:Table {key: tbl_key})
+            RETURN tbl_key, collect(distinct owner) as owner_records
+        """)
+        owners_neo4j_records = self._execute_cypher_query(statement=owners_query,
+                                                          param_dict={'tbl_keys': table_uris})
+
+        return {owners_neo4j_record['tbl_key']: self._build_owners(owners_neo4j_record['owner_records'])
+                for owners_neo4j_record in owners_neo4j_records}
+
+    def _build_owners(self, owner_records: Iterable[Any]) -> List[User]:
         owners = []  # type: List[User]
-        for owner_neo4j_record in owners_neo4j_records.get('owner_records', []):
+        for owner_neo4j_record in owner_records:
             owner_data = self._get_user_details(user_id=owner_neo4j_record['email'])
             owner = self._build_user_from_record(record=owner_data)
             owners.append(owner)
@@ -398,6 +541,49 @@ class Neo4jProxy(BaseProxy):
 
         table_records = get_single_record(table_records)
 
+        return self._build_table_query_result(table_records)
+
+    @timer_with_counter
+    def _exec_table_query_by_table(self, table_uris: List[str]) -> Dict[str, Tuple]:
+        """
+        Queries one Cypher record per table with watermark list, Application,
+        ,timestamp, and tag records.
+        """
+
+        # Return Value: (Watermark Results, Table Writer, Last Updated Timestamp, tag records) by table URI
+
+        table_level_query = textwrap.dedent("""\
+        UNWIND $tbl_keys AS tbl_key
+        MATCH (tbl:Table {key: tbl_key})
+        OPTIONAL MATCH (wmk:Watermark)-[:BELONG_TO_TABLE]->(tbl)
+        OPTIONAL MATCH (app_producer:Application)-[:GENERATES]->(tbl)
+        OPTIONAL MATCH (app_consumer:Application)-[:CONSUMES]->(tbl)
+        OPTIONAL MATCH (tbl)-[:LAST_UPDATED_AT]->(t:Timestamp)
+        OPTIONAL MATCH (tbl)-[:TAGGED_BY]->(tag:Tag{tag_type: $tag_normal_type})
+        OPTIONAL MATCH (tbl)-[:HAS_BADGE]->(badge:Badge)
+        OPTIONAL MATCH (tbl)-[:SOURCE]->(src:Source)
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(prog_descriptions:Programmatic_Description)
+        OPTIONAL MATCH (tbl)-[:HAS_REPORT]->(resource_reports:Report)
+        RETURN tbl_key,
+        collect(distinct wmk) as wmk_records,
+        collect(distinct app_producer) as producing_apps,
+        collect(distinct app_consumer) as consuming_apps,
+        t.last_updated_timestamp as last_updated_timestamp,
+        collect(distinct tag) as tag_records,
+        collect(distinct badge) as badge_records,
+        src,
+        collect(distinct prog_descriptions) as prog_descriptions,
+        collect(distinct resource_reports) as resource_reports
+        """)
+
+        table_records = self._execute_cypher_query(statement=table_level_query,
+                                                   param_dict={'tbl_keys': table_uris,
+                                                               'tag_normal_type': 'default'})
+
+        return {table_record['tbl_key']: self._build_table_query_result(table_record)
+                for table_record in table_records}
+
+    def _build_table_query_result(self, table_records: Record) -> Tuple:
         wmk_results = []
         wmk_records = table_records['wmk_records']
         for record in wmk_records:
@@ -503,6 +689,73 @@ class Neo4jProxy(BaseProxy):
 
         table_query_records = get_single_record(query_records)
 
+        return self._build_joins_and_filters(table_query_records)
+
+    @timer_with_counter
+    def _exec_table_query_query_by_table(self, table_uris: List[str]) -> Dict[str, Tuple]:
+        """
+        Queries one Cypher record per table with results that contain information about queries
+        and entities (e.g. joins, where clauses, etc.) associated to queries that are executed
+        on the table.
+        """
+
+        # Return Value: (Joins, Filters) by table URI
+        table_query_level_query = textwrap.dedent("""
+        UNWIND $tbl_keys AS tbl_key
+        MATCH (tbl:Table {key: tbl_key})
+        OPTIONAL MATCH (tbl)-[:COLUMN]->(col:Column)-[COLUMN_JOINS_WITH]->(j:Join)
+        OPTIONAL MATCH (j)-[JOIN_OF_COLUMN]->(col2:Column)
+        OPTIONAL MATCH (j)-[JOIN_OF_QUERY]->(jq:Query)-[:HAS_EXECUTION]->(exec:Execution)
+        WITH tbl_key, tbl, j, col, col2,
+            sum(coalesce(exec.execution_count, 0)) as join_exec_cnt
+        ORDER BY join_exec_cnt desc
+        WITH tbl_key, tbl,
+            COLLECT(DISTINCT {
+            join: {
+                joined_on_table: {
+                    database: case when j.left_table_key = tbl_key
+                              then j.right_database
+                              else j.left_database
+                              end,
+                    cluster: case when j.left_table_key = tbl_key
+                             then j.right_cluster
+                             else j.left_cluster
+                             end,
+                    schema: case when j.left_table_key = tbl_key
+                            then j.right_schema
+                            else j.left_schema
+                            end,
+                    name: case when j.left_table_key = tbl_key
+                          then j.right_table
+                          else j.left_table
+                          end
+                },
+                joined_on_column: col2.name,
+                column: col.name,
+                join_type: j.join_type,
+                join_sql: j.join_sql
+            },
+            join_exec_cnt: join_exec_cnt
+        })[0..5] as joins
+        OPTIONAL MATCH (tbl)-[:COLUMN]->(col:Column)-[USES_WHERE_CLAUSE]->(whr:Where)
+        OPTIONAL MATCH (whr)-[WHERE_CLAUSE_OF]->(wq:Query)-[:HAS_EXECUTION]->(whrexec:Execution)
+        WITH tbl_key, joins,
+            whr, sum(coalesce(whrexec.execution_count, 0)) as where_exec_cnt
+        ORDER BY where_exec_cnt desc
+        RETURN tbl_key, joins,
+          COLLECT(DISTINCT {
+            where_clause: whr.where_clause,
+            where_exec_cnt: where_exec_cnt
+          })[0..5] as filters
+        """)
+
+        query_records = self._execute_cypher_query(statement=table_query_level_query,
+                                                   param_dict={'tbl_keys': table_uris})
+
+        return {table_query_record['tbl_key']: self._build_joins_and_filters(table_query_record)
+                for table_query_record in query_records}
+
+    def _build_joins_and_filters(self, table_query_records: Record) -> Tuple:
         joins = self._extract_joins_from_query(table_query_records.get('joins', [{}]))
         filters = self._extract_filters_from_query(table_query_records.get('filters', [{}]))
 
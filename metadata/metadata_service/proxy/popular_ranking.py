@@ -0,0 +1,224 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import fcntl
+import inspect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from functools import partial, wraps
+from typing import (Any, Callable, Dict, List, Mapping, Optional,  # noqa: F401
+                    Tuple)
+
+from amundsen_common.entity.resource_type import ResourceType
+from flask import Flask, current_app
+
+from metadata_service import config
+from metadata_service.proxy.base_proxy import BaseProxy
+
+LOGGER = logging.getLogger(__name__)
+
+# Resource types ranked by _get_global_popular_resources_uris
+RANKED_RESOURCE_TYPES = (ResourceType.Table, ResourceType.Dashboard)
+
+# Version of the ranking file format
+_RANKING_VERSION = 1
+
+
+class PopularResourcesRanking:
+    """
+    Materialized ranking of the globally popular tables and dashboards, shared by the metadata service processes
+    through a local file, in place of computing it with a full scan of the resource usage in every process.
+
+    A background thread of each process checks every check_interval_sec seconds whether the ranking file is stale:
+    missing, older than refresh_interval_sec, or computed before the last publish (get_latest_updated_ts). One process
+    at a time, holding a lock on the file, refreshes it with the top max_entries resources of each type; the others
+    keep serving the previous ranking until it is replaced.
+
+    Rankings of up to max_entries resources are served from the file, reloaded when it changes. Larger rankings, and
+    rankings requested before the file is first written, are computed by the proxy like before.
+    """
+
+    def __init__(self, *,
+                 path: str,
+                 max_entries: int,
+                 refresh_interval_sec: int,
+                 check_interval_sec: int) -> None:
+        self._path = path
+        self._max_entries = max_entries
+        self._refresh_interval_sec = refresh_interval_sec
+        self._check_interval_sec = check_interval_sec
+        self._ranking = None  # type: Optional[Dict[str, Any]]
+        self._ranking_file_id = None  # type: Optional[Tuple[int, int]]
+        self._lock = threading.Lock()
+        self._compute = None  # type: Optional[Callable[..., List[str]]]
+        self._get_latest_updated_ts = None  # type: Optional[Callable[[], Any]]
+        self._stopped = threading.Event()
+
+    def install(self, proxy: BaseProxy) -> BaseProxy:
+        """
+        Serves the global popular resources of the proxy from the ranking
+        :param proxy: Proxy implementing _get_global_popular_resources_uris, e.g. Neo4jProxy or MySQLProxy
+        :return: The proxy
+        """
+        method = proxy._get_global_popular_resources_uris  # type: ignore
+        # The ranking is computed without the in-process cache of the proxy
+        self._compute = partial(inspect.unwrap(getattr(type(proxy), '_get_global_popular_resources_uris')), proxy)
+        self._get_latest_updated_ts = proxy.get_latest_updated_ts
+
+        @wraps(method)
+        def wrapper(num_entries: int, resource_type: ResourceType = ResourceType.Table) -> List[str]:
+            resource_uris = self.get(num_entries=num_entries, resource_type=resource_type)
+            if resource_uris is None:
+                return method(num_entries, resource_type=resource_type)
+            return resource_uris
+
+        setattr(proxy, '_get_global_popular_resources_uris', wrapper)
+        return proxy
+
+    def start(self, app: Flask) -> threading.Thread:
+        """
+        Starts the background thread refreshing the ranking when it is stale
+        :param app: Application whose context the ranking is computed in
+        :return: The thread
+        """
+        thread = threading.Thread(target=self._run, args=(app,), name='popular-resources-ranking', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        """
+        Stops the background thread after its current check
+        """
+        self._stopped.set()
+
+    def _run(self, app: Flask) -> None:
+        while True:
+            try:
+                with app.app_context():
+                    self.refresh_if_stale()
+            except Exception:
+                LOGGER.exception('Failed to refresh the popular resources ranking')
+            if self._stopped.wait(self._check_interval_sec):
+                return
+
+    def get(self, *, num_entries: int, resource_type: ResourceType) -> Optional[List[str]]:
+        """
+        Returns the URIs of the num_entries most popular resources of the type, or None if the ranking does not have
+        them
+        :param num_entries:
+        :param resource_type:
+        :return:
+        """
+        if num_entries > self._max_entries:
+            return None
+        ranking = self._load()
+        if ranking is None:
+            return None
+        resource_uris = ranking['resources'].get(resource_type.name)
+        if resource_uris is None:
+            return None
+        return resource_uris[:num_entries]
+
+    def refresh_if_stale(self) -> bool:
+        """
+        Refreshes the ranking if it is stale and no other process is refreshing it. Needs an application context.
+        :return: Whether the ranking was refreshed
+        """
+        if self._compute is None or self._get_latest_updated_ts is None:
+            raise RuntimeError('The popular resources ranking is not installed on a proxy')
+
+        publish_watermark = str(self._get_latest_updated_ts())
+        minimum_reader_count = current_app.config['POPULAR_RESOURCES_MINIMUM_READER_COUNT']
+        with open(f'{self._path}.lock', 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                LOGGER.debug('The popular resources ranking is being refreshed by another process')
+                return False
+
+            try:
+                if not self._is_stale(self._load(), publish_watermark, minimum_reader_count):
+                    return False
+
+                start = time.time()
+                resources = {resource_type.name: self._compute(self._max_entries, resource_type=resource_type)
+                             for resource_type in RANKED_RESOURCE_TYPES}
+                self._write({
+                    'version': _RANKING_VERSION,
+                    'refreshed_at': time.time(),
+                    'publish_watermark': publish_watermark,
+                    'minimum_reader_count': minimum_reader_count,
+                    'max_entries': self._max_entries,
+                    'resources': resources,
+                })
+                LOGGER.info('Refreshed the popular resources ranking in %.2fs', time.time() - start)
+                return True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _is_stale(self, ranking: Optional[Dict[str, Any]], publish_watermark: str, minimum_reader_count: int) -> bool:
+        return (ranking is None
+                or ranking['max_entries'] != self._max_entries
+                or ranking['minimum_reader_count'] != minimum_reader_count
+                or ranking['publish_watermark'] != publish_watermark
+                or time.time() - ranking['refreshed_at'] >= self._refresh_interval_sec)
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the ranking of the file, read again only when the file changes
+        """
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            return None
+
+        # Replacing the file changes its inode
+        file_id = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            if file_id == self._ranking_file_id:
+                return self._ranking
+
+        try:
+            with open(self._path) as f:
+                ranking = json.load(f)
+        except (OSError, ValueError):
+            LOGGER.warning('Failed to read the popular resources ranking %s', self._path, exc_info=True)
+            return None
+        if ranking.get('version') != _RANKING_VERSION:
+            return None
+
+        with self._lock:
+            self._ranking = ranking
+            self._ranking_file_id = file_id
+        return ranking
+
+    def _write(self, ranking: Dict[str, Any]) -> None:
+        """
+        Replaces the ranking file atomically, so that other processes never read a partial ranking
+        """
+        directory, name = os.path.split(os.path.abspath(self._path))
+        fd, temp_path = tempfile.mkstemp(prefix=f'{name}.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(ranking, f)
+            os.replace(temp_path, self._path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def create_popular_resources_ranking(app_config: Mapping[str, Any]) -> PopularResourcesRanking:
+    """
+    Creates the popular resources ranking from the app config
+    :param app_config:
+    :return:
+    """
+    return PopularResourcesRanking(
+        path=app_config[config.POPULAR_RESOURCES_RANKING_PATH],
+        max_entries=app_config[config.POPULAR_RESOURCES_RANKING_MAX_ENTRIES],
+        refresh_interval_sec=app_config[config.POPULAR_RESOURCES_RANKING_REFRESH_INTERVAL_SEC],
+        check_interval_sec=app_config[config.POPULAR_RESOURCES_RANKING_CHECK_INTERVAL_SEC])
@@ -0,0 +1,41 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+
+from amundsen_common.models.table import Table
+
+from tests.unit.api.table.table_test_case import TableTestCase
+
+TABLE_URIS = ['hive://gold.schema/table', 'hive://gold.schema/missing']
+
+
+class TestTablesAPI(TableTestCase):
+    def test_should_get_tables(self) -> None:
+        self.mock_proxy.get_tables.return_value = ([Table(database='hive', cluster='gold', schema='schema',
+                                                          name='table', columns=[])],
+                                                   ['hive://gold.schema/missing'])
+
+        response = self.app.test_client().post('/tables', json={'table_uris': TABLE_URIS})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(['table'], [table['name'] for table in response.json['tables']])
+        self.assertEqual(['hive://gold.schema/missing'], response.json['not_found'])
+        self.mock_proxy.get_tables.assert_called_with(table_uris=TABLE_URIS)
+
+    def test_should_fail_without_table_uris(self) -> None:
+        for body in [{}, {'table_uris': 'hive://gold.schema/table'}, {'table_uris': [1]}, []]:
+            response = self.app.test_client().post('/tables', json=body)
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+        response = self.app.test_client().post('/tables', data='not json', content_type='application/json')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.mock_proxy.get_tables.assert_not_called()
+
+    def test_should_fail_with_too_many_table_uris(self) -> None:
+        self.app.config['TABLES_BATCH_MAX_SIZE'] = 1
+
+        response = self.app.test_client().post('/tables', json={'table_uris': TABLE_URIS})
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.mock_proxy.get_tables.assert_not_called()
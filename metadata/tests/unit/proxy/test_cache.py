@@ -0,0 +1,207 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+import unittest
+from typing import Any, List, Optional  # noqa: F401
+from unittest.mock import MagicMock, patch
+
+from amundsen_common.entity.resource_type import ResourceType
+from amundsen_common.models.table import Table
+from amundsen_common.models.user import User
+from flask import Flask
+from neo4j import GraphDatabase
+
+import metadata_service
+from metadata_service import config
+from metadata_service.proxy import cache, get_proxy_client
+from metadata_service.proxy.cache import (BeakerCacheBackend, LRUCacheBackend,
+                                          ProxyCache)
+from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+
+
+class TestProxyCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.calls = []  # type: List[str]
+        self.latest_updated_ts = 1  # type: Optional[int]
+
+        with patch.object(GraphDatabase, 'driver'):
+            self.proxy = Neo4jProxy(host='neo4j://example.com', port=0000)
+
+        def get_table(*, table_uri: str) -> Table:
+            self.calls.append(table_uri)
+            return Table(database='hive', cluster='gold', schema='schema', name=table_uri.split('/')[-1],
+                         columns=[], description=f'description {len(self.calls)}')
+
+        def get_tables(*, table_uris: List[str]) -> Any:
+            self.calls.append(','.join(table_uris))
+            return ([Table(database='hive', cluster='gold', schema='schema', name=table_uri.split('/')[-1],
+                           columns=[]) for table_uri in table_uris if not table_uri.endswith('missing')],
+                    [table_uri for table_uri in table_uris if table_uri.endswith('missing')])
+
+        def get_user(*, id: str) -> Optional[User]:
+            self.calls.append(id)
+            return User(user_id=id, email=id) if id != 'missing' else None
+
+        def put_table_description(*, table_uri: str, description: str) -> None:
+            pass
+
+        def add_badge(*, id: str, badge_name: str, category: str = '', resource_type: ResourceType) -> None:
+            pass
+
+        def create_update_user(*, user: User) -> Any:
+            return user, True
+
+        self.proxy.get_table = get_table  # type: ignore
+        self.proxy.get_tables = get_tables  # type: ignore
+        self.proxy.get_user = get_user  # type: ignore
+        self.proxy.put_table_description = put_table_description  # type: ignore
+        self.proxy.add_badge = add_badge  # type: ignore
+        self.proxy.create_update_user = create_update_user  # type: ignore
+        self.proxy.get_latest_updated_ts = lambda: self.latest_updated_ts  # type: ignore
+
+        self.proxy_cache = ProxyCache(backend=LRUCacheBackend(max_size=100, ttl_sec=60), publish_check_interval_sec=0)
+        self.proxy_cache.install(self.proxy)
+
+    def test_read_through(self) -> None:
+        table = self.proxy.get_table(table_uri='hive://gold.schema/table')
+        cached_table = self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.proxy.get_table(table_uri='hive://gold.schema/other_table')
+
+        self.assertEqual(table, cached_table)
+        # Callers get their own copy
+        self.assertIsNot(table, cached_table)
+        self.assertEqual(['hive://gold.schema/table', 'hive://gold.schema/other_table'], self.calls)
+
+    def test_get_tables_read_through(self) -> None:
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        tables, not_found = self.proxy.get_tables(table_uris=['hive://gold.schema/missing',
+                                                              'hive://gold.schema/other_table',
+                                                              'hive://gold.schema/table'])
+        self.proxy.get_tables(table_uris=['hive://gold.schema/table', 'hive://gold.schema/other_table'])
+        self.proxy.get_table(table_uri='hive://gold.schema/other_table')
+
+        self.assertEqual(['other_table', 'table'], [table.name for table in tables])
+        self.assertEqual(['hive://gold.schema/missing'], not_found)
+        # Only the tables not cached are fetched, in one call
+        self.assertEqual(['hive://gold.schema/table', 'hive://gold.schema/missing,hive://gold.schema/other_table'],
+                         self.calls)
+
+    def test_none_is_not_cached(self) -> None:
+        self.assertIsNone(self.proxy.get_user(id='missing'))
+        self.assertIsNone(self.proxy.get_user(id='missing'))
+        self.assertEqual(['missing', 'missing'], self.calls)
+
+    def test_write_invalidates_resource(self) -> None:
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.proxy.get_table(table_uri='hive://gold.schema/other_table')
+        self.proxy.put_table_description(table_uri='hive://gold.schema/table', description='new')
+
+        self.assertEqual('description 3', self.proxy.get_table(table_uri='hive://gold.schema/table').description)
+        self.proxy.get_table(table_uri='hive://gold.schema/other_table')
+        self.assertEqual(3, len(self.calls))
+
+    def test_column_write_invalidates_table(self) -> None:
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.proxy.add_badge(id='hive://gold.schema/table/column', badge_name='pii', category='data',
+                             resource_type=ResourceType.Column)
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.assertEqual(2, len(self.calls))
+
+    def test_user_write_invalidates_user_id_and_email(self) -> None:
+        self.proxy.get_user(id='user_id')
+        self.proxy.get_user(id='user@example.com')
+        self.proxy.create_update_user(user=User(user_id='user_id', email='user@example.com'))
+        self.proxy.get_user(id='user_id')
+        self.proxy.get_user(id='user@example.com')
+        self.assertEqual(4, len(self.calls))
+
+    def test_publish_invalidates_all_resources(self) -> None:
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.latest_updated_ts = 2
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.assertEqual(2, len(self.calls))
+
+    def test_publish_is_checked_at_interval(self) -> None:
+        self.proxy_cache._publish_check_interval_sec = 3600
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.latest_updated_ts = 2
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.assertEqual(1, len(self.calls))
+
+    def test_resource_invalidated_while_read_is_not_cached(self) -> None:
+        get_table = self.proxy.get_table.__wrapped__  # type: ignore
+
+        def get_table_during_write(*, table_uri: str) -> Table:
+            table = get_table(table_uri=table_uri)
+            self.proxy.put_table_description(table_uri=table_uri, description='new')
+            return table
+
+        self.proxy.get_table = self.proxy_cache._read_through(  # type: ignore
+            'get_table', ResourceType.Table, get_table_during_write, self.proxy.get_latest_updated_ts)
+
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.proxy.get_table(table_uri='hive://gold.schema/table')
+        self.assertEqual(2, len(self.calls))
+
+    def test_metrics(self) -> None:
+        mock_statsd_client = MagicMock()
+        with patch.object(cache, '_get_statsd_client', return_value=mock_statsd_client):
+            self.proxy.get_table(table_uri='hive://gold.schema/table')
+            self.proxy.get_table(table_uri='hive://gold.schema/table')
+            self.proxy.get_table(table_uri='hive://gold.schema/table')
+
+        self.assertEqual(['get_table.miss', 'get_table.hit', 'get_table.hit'],
+                         [call.args[0] for call in mock_statsd_client.incr.call_args_list])
+        self.assertEqual(['get_table.miss', 'get_table.hit', 'get_table.hit'],
+                         [call.args[0] for call in mock_statsd_client.timing.call_args_list])
+
+
+class TestCacheBackends(unittest.TestCase):
+
+    def test_lru_eviction(self) -> None:
+        backend = LRUCacheBackend(max_size=2, ttl_sec=60)
+        backend.set('a', b'a')
+        backend.set('b', b'b')
+        self.assertEqual(b'a', backend.get('a'))
+        backend.set('c', b'c')
+
+        self.assertEqual(b'a', backend.get('a'))
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(b'c', backend.get('c'))
+
+    def test_lru_expiry(self) -> None:
+        backend = LRUCacheBackend(max_size=2, ttl_sec=60)
+        backend.set('a', b'a')
+        with patch.object(time, 'time', return_value=time.time() + 61):
+            self.assertIsNone(backend.get('a'))
+
+    def test_beaker_backend(self) -> None:
+        backend = BeakerCacheBackend(options={'cache.type': 'memory'}, ttl_sec=60)
+        self.assertIsNone(backend.get('a'))
+        backend.set('a', b'a')
+        self.assertEqual(b'a', backend.get('a'))
+        backend.delete('a')
+        self.assertIsNone(backend.get('a'))
+
+
+class TestProxyCacheCreation(unittest.TestCase):
+
+    @patch('neo4j.GraphDatabase.driver', MagicMock())
+    def test_proxy_client_with_cache(self) -> None:
+        app = Flask(__name__)
+        app.config.from_object(metadata_service.config.LocalConfig())
+        app.config[config.PROXY_CACHE_ENABLED] = True
+        metadata_service.proxy._proxy_client = None
+
+        try:
+            with app.app_context():
+                proxy = get_proxy_client()
+        finally:
+            metadata_service.proxy._proxy_client = None
+
+        self.assertEqual(Neo4jProxy.get_table, proxy.get_table.__wrapped__.__func__)  # type: ignore
+        self.assertEqual(Neo4jProxy.add_tag, proxy.add_tag.__wrapped__.__func__)  # type: ignore
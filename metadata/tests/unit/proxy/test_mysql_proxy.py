@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import unittest
-from typing import Any
+from typing import Any, List  # noqa: F401
 from unittest.mock import MagicMock, patch
 
 from amundsen_common.entity.resource_type import ResourceType
@@ -17,6 +17,7 @@ from amundsen_common.models.table import (Application, Badge, Column,
 from amundsen_common.models.user import User as UserEntity
 from amundsen_rds.models.application import Application as RDSApplication
 from amundsen_rds.models.badge import Badge as RDSBadge
+from amundsen_rds.models.base import Base
 from amundsen_rds.models.cluster import Cluster as RDSCluster
 from amundsen_rds.models.column import \
     ColumnDescription as RDSColumnDescription
@@ -47,6 +48,8 @@ from amundsen_rds.models.table import TableUsage as RDSTableUsage
 from amundsen_rds.models.table import TableWatermark as RDSTableWatermark
 from amundsen_rds.models.tag import Tag as RDSTag
 from amundsen_rds.models.user import User as RDSUser
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 from metadata_service import create_app
 from metadata_service.entity.dashboard_detail import DashboardDetail
@@ -129,7 +132,6 @@ class TestMySQLProxy(unittest.TestCase):
 
         mock_session_query_filter = MagicMock()
         mock_session_query.filter.return_value = mock_session_query_filter
-        mock_session_query_filter.first.return_value = table
 
         mock_session_query_filter_orderby = MagicMock()
         mock_session_query_filter.order_by.return_value = mock_session_query_filter_orderby
@@ -140,6 +142,7 @@ class TestMySQLProxy(unittest.TestCase):
 
         mock_session_query_filter_options = MagicMock()
         mock_session_query_filter.options.return_value = mock_session_query_filter_options
+        mock_session_query_filter_options.first.return_value = table
         mock_session_query_filter_options.all.return_value = columns
 
         proxy = MySQLProxy()
@@ -187,6 +190,69 @@ class TestMySQLProxy(unittest.TestCase):
 
         self.assertEqual(str(expected), str(actual_table))
 
+    @patch.object(mysql_proxy, 'RDSClient')
+    def test_get_tables(self, mock_rds_client: Any) -> None:
+        tables = []
+        columns = []
+        readers = []
+        for table_uri in ('hive://gold.foo_schema/foo_table_1', 'hive://gold.foo_schema/foo_table_2'):
+            database = RDSDatabase(name='hive')
+            cluster = RDSCluster(name='gold')
+            schema = RDSSchema(name='foo_schema')
+            schema.cluster = cluster
+            cluster.database = database
+
+            table = RDSTable(rk=table_uri, name=table_uri.split('/')[-1])
+            table.schema = schema
+            tables.append(table)
+
+            col = RDSColumn(table_rk=table_uri, name='bar_id', type='varchar', sort_order=0)
+            col.stats = [RDSColumnStat(stat_type='avg', start_epoch='1', end_epoch='1', stat_val='1')]
+            columns.append(col)
+
+            readers.append(RDSTableUsage(table_rk=table_uri, user_rk='tester@example.com', read_count=5))
+
+        mock_client = MagicMock()
+        mock_rds_client.return_value = mock_client
+
+        mock_create_session = MagicMock()
+        mock_client.create_session.return_value = mock_create_session
+
+        mock_session = MagicMock()
+        mock_create_session.__enter__.return_value = mock_session
+
+        query_results = {RDSTable: tables, RDSColumn: columns}
+
+        def query(model: Any) -> MagicMock:
+            mock_session_query = MagicMock()
+            mock_session_query_filter = mock_session_query.filter.return_value
+            mock_session_query_filter.options.return_value.all.return_value = query_results.get(model)
+            mock_session_query_filter.options.return_value.order_by.return_value.all.return_value = \
+                query_results.get(model)
+            # the readers of every table in one UNION ALL query
+            mock_session_query_filter.order_by.return_value.limit.return_value.union_all.return_value.all.\
+                return_value = readers
+            return mock_session_query
+
+        mock_session.query.side_effect = query
+
+        proxy = MySQLProxy()
+        actual_tables, not_found = proxy.get_tables(table_uris=['hive://gold.foo_schema/foo_table_2',
+                                                                'hive://gold.foo_schema/missing',
+                                                                'hive://gold.foo_schema/foo_table_1'])
+
+        self.assertEqual(['foo_table_2', 'foo_table_1'], [table.name for table in actual_tables])
+        self.assertEqual(['hive://gold.foo_schema/missing'], not_found)
+        for actual_table in actual_tables:
+            self.assertEqual([Column(name='bar_id', col_type='varchar', sort_order=0,
+                                     stats=[Stat(start_epoch=1, end_epoch=1, stat_type='avg', stat_val='1')],
+                                     badges=[])], actual_table.columns)
+            self.assertEqual([Reader(user=User(email='tester@example.com'), read_count=5)],
+                             actual_table.table_readers)
+        # the tables and columns queries, and a member of the readers UNION ALL query per table found
+        self.assertEqual([RDSTable, RDSColumn, RDSTableUsage, RDSTableUsage],
+                         [call.args[0] for call in mock_session.query.call_args_list])
+
     @patch.object(mysql_proxy, 'RDSClient')
     def test_health_mysql(self, mock_rds_client: Any) -> None:
         proxy = MySQLProxy()
@@ -598,7 +664,7 @@ class TestMySQLProxy(unittest.TestCase):
         mock_session_query_filter = MagicMock()
         mock_session_query.filter.return_value = mock_session_query_filter
 
-        mock_session_query_filter.first.return_value = user
+        mock_session_query_filter.options.return_value.first.return_value = user
 
         expected = UserEntity(email='test_email',
                               first_name='test_first_name',
@@ -874,8 +940,6 @@ class TestMySQLProxy(unittest.TestCase):
         mock_session_query_filter = MagicMock()
         mock_session_query.filter.return_value = mock_session_query_filter
 
-        mock_session_query_filter.first.return_value = dashboard
-
         # queries
         query1 = RDSDashboardQuery(name='query1')
         query2 = RDSDashboardQuery(name='query2',
@@ -908,6 +972,7 @@ class TestMySQLProxy(unittest.TestCase):
         mock_session_query_filter_options = MagicMock()
         mock_session_query_filter.options.return_value = mock_session_query_filter_options
 
+        mock_session_query_filter_options.first.return_value = dashboard
         mock_session_query_filter_options.all.side_effect = [queries, tables]
 
         expected = DashboardDetail(uri='foo_dashboard://gold.bar/dashboard_id', cluster='cluster_name',
@@ -1112,3 +1177,150 @@ class TestMySQLProxy(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main()
+
+
+def _create_sqlite_collation(dbapi_connection: Any, _: Any) -> None:
+    # The key columns of the amundsen_rds models use a MySQL collation
+    if hasattr(dbapi_connection, 'create_collation'):
+        dbapi_connection.create_collation('latin1_general_cs', lambda a, b: (a > b) - (a < b))
+
+
+class TestMySQLProxyQueryCount(unittest.TestCase):
+    """
+    Bounds the number of statements of the detail pages, against a SQLite database
+    """
+
+    def setUp(self) -> None:
+        event.listen(Engine, 'connect', _create_sqlite_collation)
+        self.app = create_app(config_module_class='metadata_service.config.MySQLConfig')
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.proxy = MySQLProxy()
+        engine = self.proxy.client.engine
+        Base.metadata.create_all(engine)
+        self._insert_rows()
+
+        self.statements = []  # type: List[str]
+        event.listen(engine, 'before_cursor_execute', self._count_statement)
+
+    def tearDown(self) -> None:
+        event.remove(self.proxy.client.engine, 'before_cursor_execute', self._count_statement)
+        event.remove(Engine, 'connect', _create_sqlite_collation)
+        self.app_context.pop()
+
+    def _count_statement(self, conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        self.statements.append(statement)
+
+    def _insert_rows(self) -> None:
+        table_rk = 'hive://gold.foo_schema/foo_table'
+        dashboard_rk = 'foo_dashboard://gold.bar/dashboard_id'
+        rows = {
+            'database_metadata': [dict(rk='hive', name='hive')],
+            'cluster_metadata': [dict(rk='hive://gold', name='gold', database_rk='hive')],
+            'schema_metadata': [dict(rk='hive://gold.foo_schema', name='foo_schema', cluster_rk='hive://gold')],
+            'table_metadata': [dict(rk=table_rk, name='foo_table', is_view=False,
+                                    schema_rk='hive://gold.foo_schema')],
+            'table_description': [dict(rk=f'{table_rk}/_description', description_source='description',
+                                       description='foo description', table_rk=table_rk)],
+            'table_programmatic_description': [
+                dict(rk=f'{table_rk}/_{source}_description', description_source=source, description=source,
+                     table_rk=table_rk) for source in ('s3_crawler', 'quality_report')],
+            'table_watermark': [dict(rk=f'{table_rk}/{watermark}/', partition_key='ds', partition_value='value',
+                                     create_time='time', table_rk=table_rk)
+                                for watermark in ('high_watermark', 'low_watermark')],
+            'table_timestamp': [dict(rk=f'{table_rk}/_timestamp', last_updated_timestamp=1, timestamp=1,
+                                     name='last_updated_timestamp', table_rk=table_rk)],
+            'table_source': [dict(rk=f'{table_rk}/_source', source='/source_file_loc', source_type='github',
+                                  table_rk=table_rk)],
+            'application': [dict(rk='application', application_url='url', name='Airflow', id='dag/task_id',
+                                 description='DAG generating a table')],
+            'application_table': [dict(rk=table_rk, application_rk='application')],
+            'tag': [dict(rk=tag, tag_type='default') for tag in ('tag1', 'tag2')],
+            'table_tag': [dict(table_rk=table_rk, tag_rk=tag) for tag in ('tag1', 'tag2')],
+            'badge': [dict(rk=badge, category='table_status') for badge in ('golden', 'primary key')],
+            'table_badge': [dict(table_rk=table_rk, badge_rk=badge) for badge in ('golden', 'primary key')],
+            'users': [dict(rk='manager@example.com', email='manager@example.com', full_name='manager',
+                           manager_rk=None),
+                      dict(rk='owner@example.com', email='owner@example.com', full_name='owner',
+                           manager_rk='manager@example.com')],
+            'table_owner': [dict(table_rk=table_rk, user_rk=user) for user in ('manager@example.com',
+                                                                               'owner@example.com')],
+            'table_usage': [dict(table_rk=table_rk, user_rk=user, read_count=5) for user in ('manager@example.com',
+                                                                                             'owner@example.com')],
+            'column_metadata': [dict(rk=f'{table_rk}/col{i}', name=f'col{i}', type='int', sort_order=i,
+                                     table_rk=table_rk) for i in range(3)],
+            'column_description': [dict(rk=f'{table_rk}/col{i}/_description', description_source='description',
+                                        description=f'col{i} description', column_rk=f'{table_rk}/col{i}')
+                                   for i in range(3)],
+            'column_stat': [dict(rk=f'{table_rk}/col{i}/{stat}', stat_type=stat, stat_val='1', start_epoch='1',
+                                 end_epoch='1', column_rk=f'{table_rk}/col{i}')
+                            for i in range(3) for stat in ('avg', 'max')],
+            'column_badge': [dict(column_rk=f'{table_rk}/col{i}', badge_rk='primary key') for i in range(3)],
+            'dashboard_cluster': [dict(rk='foo_dashboard://gold', name='gold')],
+            'dashboard_group': [dict(rk='foo_dashboard://gold.bar', name='bar', cluster_rk='foo_dashboard://gold')],
+            'dashboard': [dict(rk=dashboard_rk, name='dashboard', dashboard_group_rk='foo_dashboard://gold.bar')],
+            'dashboard_description': [dict(rk=f'{dashboard_rk}/_description', description='description',
+                                           dashboard_rk=dashboard_rk)],
+            'dashboard_timestamp': [dict(rk=f'{dashboard_rk}/_last_reload_time', timestamp=1, name='timestamp',
+                                         dashboard_rk=dashboard_rk)],
+            'dashboard_execution': [dict(rk=f'{dashboard_rk}/{execution}', timestamp=1, state='good_state',
+                                         dashboard_rk=dashboard_rk)
+                                    for execution in ('_last_execution', '_last_successful_execution')],
+            'dashboard_owner': [dict(dashboard_rk=dashboard_rk, user_rk='owner@example.com')],
+            'dashboard_tag': [dict(dashboard_rk=dashboard_rk, tag_rk=tag) for tag in ('tag1', 'tag2')],
+            'dashboard_badge': [dict(dashboard_rk=dashboard_rk, badge_rk='golden')],
+            'dashboard_usage': [dict(dashboard_rk=dashboard_rk, user_rk=user, read_count=10)
+                                for user in ('manager@example.com', 'owner@example.com')],
+            'dashboard_query': [dict(rk=f'{dashboard_rk}/query{i}', id=f'query{i}', name=f'query{i}',
+                                     dashboard_rk=dashboard_rk) for i in range(2)],
+            'dashboard_chart': [dict(rk=f'{dashboard_rk}/query{i}/chart{j}', id=f'chart{j}', name=f'chart{i}{j}',
+                                     query_rk=f'{dashboard_rk}/query{i}') for i in range(2) for j in range(2)],
+            'dashboard_table': [dict(dashboard_rk=dashboard_rk, table_rk=table_rk)],
+        }
+        with self.proxy.client.engine.begin() as conn:
+            for table_name, table_rows in rows.items():
+                conn.execute(Base.metadata.tables[table_name].insert(),
+                             [dict(row, published_tag='unique_tag', publisher_last_updated_epoch_ms=0)
+                              for row in table_rows])
+
+    def test_get_table(self) -> None:
+        table = self.proxy.get_table(table_uri='hive://gold.foo_schema/foo_table')
+
+        # the table with its single-valued relationships and one statement per collection (watermarks, tags,
+        # badges, owners, programmatic descriptions), the columns with their descriptions and one statement for
+        # their stats and one for their badges, the readers
+        self.assertEqual(10, len(self.statements))
+        self.assertEqual('gold', table.cluster)
+        self.assertEqual(2, len(table.watermarks))
+        self.assertEqual(['tag1', 'tag2'], [tag.tag_name for tag in table.tags])
+        self.assertEqual(['golden', 'primary key'], [badge.badge_name for badge in table.badges])
+        self.assertEqual(['manager@example.com', 'owner@example.com'], [owner.email for owner in table.owners])
+        self.assertEqual(['quality_report', 's3_crawler'],
+                         [prog_desc.source for prog_desc in table.programmatic_descriptions])
+        self.assertEqual('Airflow', table.table_writer.name)
+        self.assertEqual(['col0', 'col1', 'col2'], [col.name for col in table.columns])
+        self.assertEqual([2, 2, 2], [len(col.stats) for col in table.columns])
+        self.assertEqual([1, 1, 1], [len(col.badges) for col in table.columns])
+        self.assertEqual(2, len(table.table_readers))
+
+    def test_get_dashboard(self) -> None:
+        dashboard = self.proxy.get_dashboard(id='foo_dashboard://gold.bar/dashboard_id')
+
+        # the dashboard with its single-valued relationships and one statement per collection (executions, owners,
+        # tags, badges, usage), the queries with their charts, the tables
+        self.assertEqual(8, len(self.statements))
+        self.assertEqual('gold', dashboard.cluster)
+        self.assertEqual(['owner@example.com'], [owner.email for owner in dashboard.owners])
+        self.assertEqual(['tag1', 'tag2'], [tag.tag_name for tag in dashboard.tags])
+        self.assertEqual('good_state', dashboard.last_run_state)
+        self.assertEqual(20, dashboard.recent_view_count)
+        self.assertEqual(['chart00', 'chart01', 'chart10', 'chart11'], dashboard.chart_names)
+        self.assertEqual(['foo_table'], [table.name for table in dashboard.tables])
+
+    def test_get_user(self) -> None:
+        user = self.proxy.get_user(id='owner@example.com')
+
+        self.assertEqual(1, len(self.statements))
+        self.assertEqual('manager', user.manager_fullname)
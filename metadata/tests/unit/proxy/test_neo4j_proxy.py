@@ -3,9 +3,11 @@
 
 import copy
 import textwrap
+import threading
+import time
 import unittest
 from collections import namedtuple
-from typing import Any, Dict  # noqa: F401
+from typing import Any, Dict, List  # noqa: F401
 from unittest.mock import MagicMock, patch
 
 from amundsen_common.entity.resource_type import ResourceType
@@ -16,7 +18,7 @@ from amundsen_common.models.generation_code import GenerationCode
 from amundsen_common.models.lineage import Lineage, LineageItem
 from amundsen_common.models.popular_table import PopularTable
 from amundsen_common.models.table import (Application, Badge, Column,
-                                          ProgrammaticDescription,
+                                          ProgrammaticDescription, Reader,
                                           ResourceReport, Source, SqlJoin,
                                           SqlWhere, Stat, Table, TableSummary,
                                           Tag, TypeMetadata, User, Watermark)
@@ -24,12 +26,13 @@ from amundsen_common.models.user import User as UserModel
 from neo4j import GraphDatabase
 from neo4j.exceptions import ClientError
 
-from metadata_service import create_app
+from metadata_service import config, create_app
 from metadata_service.entity.dashboard_detail import DashboardDetail
 from metadata_service.entity.dashboard_query import DashboardQuery
 from metadata_service.entity.tag_detail import TagDetail
 from metadata_service.exception import NotFoundException
-from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+from metadata_service.proxy import statsd_utilities
+from metadata_service.proxy.neo4j_proxy import GET_TABLE_WORKERS, Neo4jProxy
 from metadata_service.util import UserResourceRel
 
 
@@ -441,6 +444,118 @@ class TestNeo4jProxy(unittest.TestCase):
 
             self.assertEqual(str(expected), str(table))
 
+    def _table_sub_query_results(self, statement: str, **kwargs: Any) -> Any:
+        # Results of the sub-queries of get_table, in any order
+        if 'tbl_dscrpt' in statement:
+            return self.col_usage_return_value
+        if '[read:READ]' in statement:
+            return []
+        if '[:OWNER]' in statement:
+            return self.owners_return_value
+        if 'COLUMN_JOINS_WITH' in statement:
+            return self.table_common_usage
+        return self.table_level_return_value
+
+    def test_get_table_concurrently(self) -> None:
+        lock = threading.Lock()
+        active_queries = [0, 0]  # active, max active
+
+        def execute_cypher_query(statement: str, **kwargs: Any) -> Any:
+            with lock:
+                active_queries[0] += 1
+                active_queries[1] = max(active_queries[1], active_queries[0])
+            time.sleep(0.05)
+            with lock:
+                active_queries[0] -= 1
+            return self._table_sub_query_results(statement)
+
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = execute_cypher_query
+            expected = Neo4jProxy(host='neo4j://example.com', port=0000).get_table(table_uri='dummy_uri')
+            self.assertEqual(1, active_queries[1])
+
+            neo4j_proxy = Neo4jProxy(host='neo4j://example.com', port=0000, client_kwargs={GET_TABLE_WORKERS: 5})
+            table = neo4j_proxy.get_table(table_uri='dummy_uri')
+
+            self.assertEqual(str(expected), str(table))
+            self.assertEqual(5, active_queries[1])
+
+    def test_get_table_concurrently_not_found(self) -> None:
+        def execute_cypher_query(statement: str, **kwargs: Any) -> Any:
+            if 'tbl_dscrpt' in statement:
+                return []
+            # Fails after the column query
+            time.sleep(0.05)
+            raise RuntimeError('unexpected')
+
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = execute_cypher_query
+            neo4j_proxy = Neo4jProxy(host='neo4j://example.com', port=0000, client_kwargs={GET_TABLE_WORKERS: 5})
+
+            with self.assertRaises(NotFoundException):
+                neo4j_proxy.get_table(table_uri='dummy_uri')
+
+    def test_get_table_concurrently_emits_sub_query_metrics(self) -> None:
+        self.app.config[config.IS_STATSD_ON] = True
+        mock_statsd_client = MagicMock()
+
+        with patch.object(GraphDatabase, 'driver'), \
+                patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute, \
+                patch.object(statsd_utilities, '_get_statsd_client') as mock_get_statsd_client:
+            mock_execute.side_effect = self._table_sub_query_results
+            # Like _get_statsd_client, only emits metrics within an app context
+            mock_get_statsd_client.side_effect = \
+                lambda prefix: mock_statsd_client if statsd_utilities.has_app_context() else None
+            neo4j_proxy = Neo4jProxy(host='neo4j://example.com', port=0000, client_kwargs={GET_TABLE_WORKERS: 5})
+            neo4j_proxy.get_table(table_uri='dummy_uri')
+
+        timers = sorted(call.args[0] for call in mock_statsd_client.timer.call_args_list)
+        self.assertEqual(['_exec_col_query', '_exec_owners_query', '_exec_table_query', '_exec_table_query_query',
+                          '_exec_usage_query', 'get_table'], timers)
+
+    def _tables_sub_query_results(self, statement: str, param_dict: Dict[str, Any]) -> Any:
+        # Results of the sub-queries of get_tables, for every table URI but 'missing'
+        table_uris = [table_uri for table_uri in param_dict['tbl_keys'] if table_uri != 'missing']
+        if '[read:READ]' in statement:
+            return [{'tbl_key': table_uri, 'readers': [{'email': 'reader@example.com', 'read_count': 5}]}
+                    for table_uri in table_uris]
+        if 'tbl_dscrpt' in statement:
+            results = [dict(record, tbl_key=table_uri)
+                       for table_uri in table_uris for record in self.col_usage_return_value]
+        else:
+            results = [dict(record, tbl_key=table_uri)
+                       for table_uri in table_uris for record in self._table_sub_query_results(statement)]
+        return results
+
+    def test_get_tables(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = self._table_sub_query_results
+            neo4j_proxy = Neo4jProxy(host='neo4j://example.com', port=0000)
+            expected = neo4j_proxy.get_table(table_uri='dummy_uri')
+            expected.table_readers = [Reader(user=User(email='reader@example.com', user_id='reader@example.com'),
+                                             read_count=5)]
+
+            mock_execute.reset_mock()
+            mock_execute.side_effect = self._tables_sub_query_results
+            tables, not_found = neo4j_proxy.get_tables(table_uris=['table_1', 'missing', 'table_2', 'table_1'])
+
+            self.assertEqual([str(expected), str(expected)], [str(table) for table in tables])
+            self.assertEqual(['missing'], not_found)
+            # One query per sub-query of get_table, whatever the number of tables
+            self.assertEqual(5, mock_execute.call_count)
+            for call in mock_execute.call_args_list:
+                self.assertIn('UNWIND $tbl_keys AS tbl_key', call.kwargs['statement'])
+                self.assertEqual(['table_1', 'missing', 'table_2'], call.kwargs['param_dict']['tbl_keys'])
+
+    def test_get_tables_not_found(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = self._tables_sub_query_results
+            neo4j_proxy = Neo4jProxy(host='neo4j://example.com', port=0000, client_kwargs={GET_TABLE_WORKERS: 5})
+
+            self.assertEqual(([], ['missing']), neo4j_proxy.get_tables(table_uris=['missing']))
+            self.assertEqual(([], []), neo4j_proxy.get_tables(table_uris=[]))
+            self.assertEqual(5, mock_execute.call_count)
+
     def test_get_table_view_only(self) -> None:
         col_usage_return_value = copy.deepcopy(self.col_usage_return_value)
         for col in col_usage_return_value:
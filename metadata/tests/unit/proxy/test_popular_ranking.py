@@ -0,0 +1,130 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import fcntl
+import os
+import tempfile
+import time
+import unittest
+from typing import Any, List, Optional  # noqa: F401
+from unittest.mock import MagicMock, patch
+
+from amundsen_common.entity.resource_type import ResourceType
+from flask import Flask
+from neo4j import GraphDatabase
+
+import metadata_service
+from metadata_service import config
+from metadata_service.proxy import get_proxy_client
+from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+from metadata_service.proxy.popular_ranking import PopularResourcesRanking
+
+
+class TestPopularResourcesRanking(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = Flask(__name__)
+        self.app.config.from_object(metadata_service.config.LocalConfig())
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, 'ranking.json')
+
+        self.calls = []  # type: List[Any]
+        self.latest_updated_ts = 1  # type: Optional[int]
+
+        with patch.object(GraphDatabase, 'driver'):
+            self.proxy = Neo4jProxy(host='neo4j://example.com', port=0000)
+
+        def execute_cypher_query(*, statement: str, param_dict: dict) -> List[dict]:
+            resource_type = 'Dashboard' if ':Dashboard' in statement else 'Table'
+            self.calls.append((resource_type, param_dict['num_entries']))
+            return [{'resource_key': f'{resource_type.lower()}_{i}'} for i in range(param_dict['num_entries'])]
+
+        self.proxy._execute_cypher_query = execute_cypher_query  # type: ignore
+        self.proxy.get_latest_updated_ts = lambda: self.latest_updated_ts  # type: ignore
+
+        self.ranking = self._create_ranking()
+        self.ranking.install(self.proxy)
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def _create_ranking(self) -> PopularResourcesRanking:
+        return PopularResourcesRanking(path=self.path, max_entries=20, refresh_interval_sec=3600, check_interval_sec=60)
+
+    def test_served_from_ranking(self) -> None:
+        self.assertTrue(self.ranking.refresh_if_stale())
+        self.assertEqual([('Table', 20), ('Dashboard', 20)], self.calls)
+
+        self.assertEqual(['table_0', 'table_1'], self.proxy._get_global_popular_resources_uris(2))
+        self.assertEqual(['dashboard_0'],
+                         self.proxy._get_global_popular_resources_uris(num_entries=1,
+                                                                       resource_type=ResourceType.Dashboard))
+        self.assertEqual(2, len(self.calls))
+
+    def test_shared_by_processes(self) -> None:
+        self.ranking.refresh_if_stale()
+
+        other_ranking = self._create_ranking()
+        other_ranking.install(self.proxy)
+        self.assertFalse(other_ranking.refresh_if_stale())
+        self.assertEqual(['table_0'], other_ranking.get(num_entries=1, resource_type=ResourceType.Table))
+        self.assertEqual(2, len(self.calls))
+
+    def test_computed_by_proxy_without_ranking(self) -> None:
+        # Before the ranking is first refreshed, and for more resources than ranked
+        self.assertEqual(['table_0'], self.proxy._get_global_popular_resources_uris(1))
+        self.ranking.refresh_if_stale()
+        self.assertEqual(21, len(self.proxy._get_global_popular_resources_uris(21)))
+        self.assertEqual([('Table', 1), ('Table', 20), ('Dashboard', 20), ('Table', 21)], self.calls)
+
+    def test_refreshed_after_publish(self) -> None:
+        self.ranking.refresh_if_stale()
+        self.assertFalse(self.ranking.refresh_if_stale())
+        self.latest_updated_ts = 2
+        self.assertTrue(self.ranking.refresh_if_stale())
+        self.assertEqual(4, len(self.calls))
+
+    def test_refreshed_after_interval(self) -> None:
+        self.ranking.refresh_if_stale()
+        with patch.object(time, 'time', return_value=time.time() + 3600):
+            self.assertTrue(self.ranking.refresh_if_stale())
+        self.assertEqual(4, len(self.calls))
+
+    def test_not_refreshed_while_locked(self) -> None:
+        with open(f'{self.path}.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self.assertFalse(self.ranking.refresh_if_stale())
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual([], self.calls)
+
+    def test_background_refresh(self) -> None:
+        thread = self.ranking.start(self.app)
+        self.ranking.stop()
+        thread.join(timeout=10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(['table_0'], self.ranking.get(num_entries=1, resource_type=ResourceType.Table))
+
+
+class TestPopularResourcesRankingCreation(unittest.TestCase):
+
+    @patch('neo4j.GraphDatabase.driver', MagicMock())
+    def test_proxy_client_with_ranking(self) -> None:
+        app = Flask(__name__)
+        app.config.from_object(metadata_service.config.LocalConfig())
+        app.config[config.POPULAR_RESOURCES_RANKING_ENABLED] = True
+        metadata_service.proxy._proxy_client = None
+
+        try:
+            with app.app_context(), patch.object(PopularResourcesRanking, 'start') as mock_start:
+                proxy = get_proxy_client()
+        finally:
+            metadata_service.proxy._proxy_client = None
+
+        mock_start.assert_called_once_with(app)
+        self.assertEqual(Neo4jProxy._get_global_popular_resources_uris,
+                         proxy._get_global_popular_resources_uris.__wrapped__.__func__)  # type: ignore